@@ -0,0 +1,68 @@
+"""Add simulation_files and simulation_file_locations tables
+
+Revision ID: 3f9c2a7d1b04
+Revises: 
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1b04'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'simulation_files',
+        sa.Column('simulation_id', sa.String(), nullable=False),
+        sa.Column('relative_path', sa.String(), nullable=False),
+        sa.Column('file_type', sa.String(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=False),
+        sa.Column('importance', sa.String(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=True),
+        sa.Column('parent_file_id', sa.String(), nullable=True),
+        sa.Column('simulation_date', sa.DateTime(), nullable=True),
+        sa.Column('location_name', sa.String(), nullable=True),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('simulation_id', 'relative_path'),
+    )
+    op.create_index('ix_simulation_files_relative_path', 'simulation_files', ['relative_path'])
+    op.create_index('ix_simulation_files_parent_file_id', 'simulation_files', ['parent_file_id'])
+    op.create_index('ix_simulation_files_content_type_date', 'simulation_files',
+                    ['content_type', 'simulation_date'])
+    op.create_index('ix_simulation_files_file_type', 'simulation_files', ['file_type'])
+
+    op.create_table(
+        'simulation_file_locations',
+        sa.Column('simulation_id', sa.String(), nullable=False),
+        sa.Column('relative_path', sa.String(), nullable=False),
+        sa.Column('location_name', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['simulation_id', 'relative_path'],
+            ['simulation_files.simulation_id', 'simulation_files.relative_path'],
+            ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('simulation_id', 'relative_path', 'location_name'),
+    )
+    op.create_index('ix_simulation_file_locations_location_name', 'simulation_file_locations',
+                    ['location_name'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_simulation_file_locations_location_name', table_name='simulation_file_locations')
+    op.drop_table('simulation_file_locations')
+    op.drop_index('ix_simulation_files_file_type', table_name='simulation_files')
+    op.drop_index('ix_simulation_files_content_type_date', table_name='simulation_files')
+    op.drop_index('ix_simulation_files_parent_file_id', table_name='simulation_files')
+    op.drop_index('ix_simulation_files_relative_path', table_name='simulation_files')
+    op.drop_table('simulation_files')
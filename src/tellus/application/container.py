@@ -7,15 +7,22 @@ for use by interface layers (CLI, TUI, REST API, etc.).
 """
 
 import logging
+import os
 from pathlib import Path
 from typing import Optional
 
 from ..application.dtos import CacheConfigurationDto
 from ..application.service_factory import ApplicationServiceFactory
+from ..application.services.location_service import \
+    AsyncLocationApplicationService
 from ..application.services.progress_tracking_service import \
     ProgressTrackingService
+from ..application.services.simulation_service import \
+    AsyncSimulationApplicationService
 from ..infrastructure.repositories.json_progress_tracking_repository import \
     JsonProgressTrackingRepository
+from ..infrastructure.repositories.indexed_simulation_file_repository import \
+    IndexedSimulationFileRepository
 from ..infrastructure.repositories.json_simulation_file_repository import \
     JsonSimulationFileRepository
 from ..infrastructure.repositories.json_network_topology_repository import \
@@ -30,14 +37,20 @@ logger = logging.getLogger(__name__)
 
 class ServiceContainer:
     """Dependency injection container for Tellus application services."""
+
+    # Storage backends available for simulation file inventories
+    SIMULATION_FILE_BACKENDS = ("json", "indexed", "sql")
     
-    def __init__(self, config_path: Optional[Path] = None, project_path: Optional[Path] = None):
+    def __init__(self, config_path: Optional[Path] = None, project_path: Optional[Path] = None,
+                 simulation_file_backend: Optional[str] = None):
         """
         Initialize the service container with hybrid data persistence paths.
         
         Args:
             config_path: Configuration path parameter
             project_path: Path to the current project directory (defaults to current working directory)
+            simulation_file_backend: Storage backend for simulation files ("json", "indexed" or "sql").
+                Defaults to the TELLUS_FILE_STORAGE environment variable, then "json".
         """
         # For backward compatibility, config_path overrides project_path if provided
         if config_path is not None:
@@ -50,10 +63,22 @@ class ServiceContainer:
         
         # Project-specific data directory
         self._project_data_path = self._project_path / ".tellus"
+
+        self._simulation_file_backend = (
+            simulation_file_backend or os.getenv("TELLUS_FILE_STORAGE", "json")
+        ).lower()
+        if self._simulation_file_backend not in self.SIMULATION_FILE_BACKENDS:
+            raise ValueError(
+                f"Unsupported simulation file backend: {self._simulation_file_backend}. "
+                f"Choose one of: {', '.join(self.SIMULATION_FILE_BACKENDS)}"
+            )
         
         self._service_factory: Optional[ApplicationServiceFactory] = None
         self._progress_tracking_service: Optional[ProgressTrackingService] = None
+        self._async_simulation_service: Optional[AsyncSimulationApplicationService] = None
+        self._async_location_service: Optional[AsyncLocationApplicationService] = None
         self._network_topology_service: Optional[NetworkTopologyApplicationService] = None
+        self._network_topology_repo: Optional[JsonNetworkTopologyRepository] = None
         
         # Ensure directories exist
         self._global_data_path.mkdir(parents=True, exist_ok=True)
@@ -93,9 +118,7 @@ class ServiceContainer:
             progress_tracking_repo = JsonProgressTrackingRepository(
                 storage_path=str(self._global_data_path / "progress_tracking.json")
             )
-            simulation_file_repo = JsonSimulationFileRepository(
-                storage_dir=str(self._project_data_path)
-            )
+            simulation_file_repo = self._create_simulation_file_repository()
             
             # Configure cache settings
             cache_config = CacheConfigurationDto(
@@ -118,13 +141,51 @@ class ServiceContainer:
                 location_repository=location_repo,
                 simulation_file_repository=simulation_file_repo,
                 progress_tracking_service=self._progress_tracking_service,
-                cache_config=cache_config
+                cache_config=cache_config,
+                network_topology_repository=self._get_network_topology_repository(),
+                transfer_journal_directory=self._project_data_path / "transfer-journal"
             )
             
             logger.info("Service factory initialized with repositories")
             
         return self._service_factory
     
+    def _create_simulation_file_repository(self):
+        """Create the simulation file repository for the configured backend."""
+        if self._simulation_file_backend == "indexed":
+            return IndexedSimulationFileRepository(storage_dir=str(self._project_data_path))
+        if self._simulation_file_backend == "sql":
+            from ..infrastructure.repositories.postgres_simulation_file_repository import (
+                AsyncSimulationFileRepositoryWrapper, PostgresSimulationFileRepository)
+            return AsyncSimulationFileRepositoryWrapper(PostgresSimulationFileRepository())
+        return JsonSimulationFileRepository(storage_dir=str(self._project_data_path))
+    
+    @property
+    def async_simulation_service(self) -> AsyncSimulationApplicationService:
+        """Get the async simulation service for callers running an event loop."""
+        if self._async_simulation_service is None:
+            from ..infrastructure.database.event_loop import get_background_loop
+            from ..infrastructure.repositories.postgres_simulation_repository import PostgresSimulationRepository
+
+            self._async_simulation_service = AsyncSimulationApplicationService(
+                simulation_repository=PostgresSimulationRepository(),
+                loop=get_background_loop()
+            )
+        return self._async_simulation_service
+    
+    @property
+    def async_location_service(self) -> AsyncLocationApplicationService:
+        """Get the async location service for callers running an event loop."""
+        if self._async_location_service is None:
+            from ..infrastructure.database.event_loop import get_background_loop
+            from ..infrastructure.repositories.postgres_location_repository import PostgresLocationRepository
+
+            self._async_location_service = AsyncLocationApplicationService(
+                location_repository=PostgresLocationRepository(),
+                loop=get_background_loop()
+            )
+        return self._async_location_service
+    
     @property
     def progress_tracking_service(self) -> ProgressTrackingService:
         """Get the progress tracking service."""
@@ -132,13 +193,18 @@ class ServiceContainer:
         _ = self.service_factory
         return self._progress_tracking_service
     
+    def _get_network_topology_repository(self) -> JsonNetworkTopologyRepository:
+        """Get or create the network topology repository (global data)."""
+        if self._network_topology_repo is None:
+            self._network_topology_repo = JsonNetworkTopologyRepository(
+                storage_file=self._global_data_path / "network_topologies.json"
+            )
+        return self._network_topology_repo
+    
     def get_network_topology_service(self) -> NetworkTopologyApplicationService:
         """Get or create the network topology service."""
         if self._network_topology_service is None:
-            # Initialize network topology repository (global data)
-            topology_repo = JsonNetworkTopologyRepository(
-                storage_file=self._global_data_path / "network_topologies.json"
-            )
+            topology_repo = self._get_network_topology_repository()
             
             # Initialize benchmarking adapter with caching
             benchmarking_adapter = CachedNetworkBenchmarkingAdapter(
@@ -174,7 +240,10 @@ class ServiceContainer:
         """Reset the service container (useful for testing)."""
         self._service_factory = None
         self._progress_tracking_service = None
+        self._async_simulation_service = None
+        self._async_location_service = None
         self._network_topology_service = None
+        self._network_topology_repo = None
         logger.debug("Service container reset")
 
 
@@ -71,6 +71,7 @@ class PaginationInfo(BaseModel):
     total_count: Optional[int] = None
     has_next: bool = False
     has_previous: bool = False
+    next_cursor: Optional[str] = None  # Keyset cursor for the next page, if supported
 
 
 class FilterOptions(BaseModel):
@@ -79,6 +80,8 @@ class FilterOptions(BaseModel):
     
     search_term: Optional[str] = None
     tags: Set[str] = Field(default_factory=set)
+    attributes: Dict[str, str] = Field(default_factory=dict)  # Exact attribute matches
+    location: Optional[str] = None
     created_after: Optional[str] = None  # ISO format datetime
     created_before: Optional[str] = None
     modified_after: Optional[str] = None
@@ -1035,6 +1038,9 @@ class FileTransferOperationDto(BaseModel):
     overwrite: bool = False
     verify_checksum: bool = True
     chunk_size: int = 8 * 1024 * 1024  # 8MB chunks
+    parallel_streams: Optional[int] = None  # None: from network metrics for large files
+    operation_id: Optional[str] = None  # Resume this operation's journaled transfer
+    via_locations: List[str] = Field(default_factory=list)  # Relay through these intermediate locations
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -1047,6 +1053,7 @@ class BatchFileTransferOperationDto(BaseModel):
     parallel_transfers: int = 3
     stop_on_error: bool = False
     verify_all_checksums: bool = True
+    operation_id: Optional[str] = None  # Resume this operation's journaled transfers
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -1065,6 +1072,7 @@ class DirectoryTransferOperationDto(BaseModel):
     exclude_patterns: List[str] = Field(default_factory=list)  # glob patterns
     include_patterns: List[str] = Field(default_factory=list)  # glob patterns
     preserve_permissions: bool = False
+    operation_id: Optional[str] = None  # Resume this operation's journaled transfers
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -1087,6 +1095,7 @@ class FileTransferResultDto(BaseModel, JsonSerializableMixin):
     error_message: Optional[str] = None
     retry_count: int = 0
     partial_transfer: bool = False  # True if transfer was resumed
+    metadata: Dict[str, Any] = Field(default_factory=dict)  # e.g. the network route taken, or why the file was skipped
 
 
 class BatchFileTransferResultDto(BaseModel, JsonSerializableMixin):
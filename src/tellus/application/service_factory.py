@@ -7,10 +7,13 @@ dependency injection for use in Earth System Model workflows.
 
 import logging
 from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any, Dict, Optional
 
 from ..domain.entities.workflow import WorkflowEngine
 from ..domain.repositories.location_repository import ILocationRepository
+from ..domain.repositories.network_topology_repository import \
+    INetworkTopologyRepository
 from ..domain.repositories.simulation_repository import ISimulationRepository
 from ..domain.repositories.simulation_file_repository import ISimulationFileRepository
 from ..infrastructure.adapters.progress_tracking import ProgressTracker
@@ -49,7 +52,9 @@ class ApplicationServiceFactory:
         progress_tracker: Optional[ProgressTracker] = None,
         progress_tracking_service: Optional[IProgressTrackingService] = None,
         cache_config: Optional[CacheConfigurationDto] = None,
-        workflow_executor: Optional[ThreadPoolExecutor] = None
+        workflow_executor: Optional[ThreadPoolExecutor] = None,
+        network_topology_repository: Optional[INetworkTopologyRepository] = None,
+        transfer_journal_directory: Optional[Path] = None
     ):
         """
         Initialize the service factory.
@@ -65,6 +70,9 @@ class ApplicationServiceFactory:
             progress_tracking_service: New progress tracking service
             cache_config: Optional cache configuration
             workflow_executor: Thread pool for workflow execution
+            network_topology_repository: Network metrics used to tune transfers
+            transfer_journal_directory: Directory for checkpoint journals of
+                resumable transfers
         """
         self._simulation_repo = simulation_repository
         self._location_repo = location_repository
@@ -77,6 +85,8 @@ class ApplicationServiceFactory:
         self._progress_tracking_service = progress_tracking_service
         self._cache_config = cache_config
         self._workflow_executor = workflow_executor
+        self._network_topology_repo = network_topology_repository
+        self._transfer_journal_directory = transfer_journal_directory
         self._logger = logger
         
         # Service instances (created lazily)
@@ -171,7 +181,9 @@ class ApplicationServiceFactory:
             self._logger.debug("Creating FileTransferApplicationService")
             self._file_transfer_service = FileTransferApplicationService(
                 location_repo=self._location_repo,
-                progress_service=self._progress_tracking_service
+                progress_service=self._progress_tracking_service,
+                network_repository=self._network_topology_repo,
+                journal_directory=self._transfer_journal_directory
             )
         return self._file_transfer_service
     
@@ -1,8 +1,10 @@
 """Application services - Use case implementations."""
 
-from .location_service import LocationApplicationService
+from .location_service import (AsyncLocationApplicationService,
+                               LocationApplicationService)
 from .path_resolution_service import PathResolutionService
-from .simulation_service import SimulationApplicationService
+from .simulation_service import (AsyncSimulationApplicationService,
+                                 SimulationApplicationService)
 from .workflow_execution_service import WorkflowExecutionService
 from .workflow_service import WorkflowApplicationService
 
@@ -11,5 +13,7 @@ __all__ = [
     "LocationApplicationService", 
     "WorkflowApplicationService",
     "WorkflowExecutionService",
-    "PathResolutionService"
+    "PathResolutionService",
+    "AsyncSimulationApplicationService",
+    "AsyncLocationApplicationService"
 ]
\ No newline at end of file
@@ -599,7 +599,8 @@ class LocationApplicationService:
         else:
             raise ConfigurationError(protocol, f"Unsupported protocol for filesystem access: {protocol}")
     
-    def _entity_to_dto(self, location: LocationEntity) -> LocationDto:
+    @staticmethod
+    def _entity_to_dto(location: LocationEntity) -> LocationDto:
         """Convert domain entity to DTO."""
         return LocationDto(
             name=location.name,
@@ -614,8 +615,8 @@ class LocationApplicationService:
             is_remote=location.is_remote()
         )
     
+    @staticmethod
     def _apply_filters(
-        self,
         locations: List[LocationEntity],
         filters: FilterOptions
     ) -> List[LocationEntity]:
@@ -947,4 +948,109 @@ class LocationApplicationService:
             raise LocationAccessError(
                 "localhost", 
                 f"Could not create localhost location for archive operation: {e}"
-            )
\ No newline at end of file
+            )
+
+
+class AsyncLocationApplicationService:
+    """
+    Native async variant of the location application service.
+
+    Awaits an async location repository (such as PostgresLocationRepository)
+    instead of blocking on a sync wrapper, so async callers like the web API
+    do not tie up their event loop. Covers the read use cases; writes and
+    connectivity tests go through LocationApplicationService.
+    """
+
+    def __init__(self, location_repository, loop=None):
+        """
+        Initialize the async location service.
+
+        Args:
+            location_repository: Async repository with the methods of
+                ILocationRepository returning awaitables
+            loop: Optional background event loop the repository's coroutines
+                run on; without one they are awaited on the caller's loop
+        """
+        self._location_repo = location_repository
+        self._loop = loop
+        self._logger = logger
+
+    async def _call(self, coro):
+        """Await a repository coroutine on the configured event loop."""
+        if self._loop is None:
+            return await coro
+        return await self._loop.submit(coro)
+
+    async def get_location(self, name: str) -> LocationDto:
+        """
+        Get a location by its name.
+
+        Args:
+            name: The name of the location to retrieve
+
+        Returns:
+            Location DTO
+
+        Raises:
+            EntityNotFoundError: If location not found
+        """
+        self._logger.debug(f"Retrieving location: {name}")
+
+        try:
+            location = await self._call(self._location_repo.get_by_name(name))
+        except LocationNotFoundError as e:
+            raise EntityNotFoundError("Location", e.name)
+        except RepositoryError as e:
+            self._logger.error(f"Repository error retrieving location: {str(e)}")
+            raise
+
+        if location is None:
+            raise EntityNotFoundError("Location", name)
+        return LocationApplicationService._entity_to_dto(location)
+
+    async def list_locations(
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        filters: Optional[FilterOptions] = None
+    ) -> LocationListDto:
+        """
+        List locations with pagination and filtering.
+
+        Args:
+            page: Page number (1-based)
+            page_size: Number of locations per page
+            filters: Optional filtering criteria
+
+        Returns:
+            Paginated list of locations
+        """
+        self._logger.debug(f"Listing locations (page {page}, size {page_size})")
+
+        try:
+            all_locations = await self._call(self._location_repo.list_all())
+        except RepositoryError as e:
+            self._logger.error(f"Repository error listing locations: {str(e)}")
+            raise
+
+        if filters:
+            all_locations = LocationApplicationService._apply_filters(all_locations, filters)
+
+        total_count = len(all_locations)
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size
+
+        pagination = PaginationInfo(
+            page=page,
+            page_size=page_size,
+            total_count=total_count,
+            has_next=end_idx < total_count,
+            has_previous=page > 1
+        )
+
+        return LocationListDto(
+            locations=[LocationApplicationService._entity_to_dto(loc)
+                       for loc in all_locations[start_idx:end_idx]],
+            pagination=pagination,
+            filters_applied=filters or FilterOptions()
+        )
@@ -8,6 +8,7 @@ distributed climate modeling systems.
 
 import asyncio
 import logging
+import math
 import time
 import warnings
 from typing import Dict, List, Optional, Any
@@ -26,6 +27,7 @@ from ..exceptions import (
     ValidationError, ExternalServiceError, OperationNotAllowedError
 )
 from ...domain.entities.location import LocationEntity
+from ...domain.entities.network_connection import DEFAULT_STREAM_WINDOW_BYTES
 
 
 logger = logging.getLogger(__name__)
@@ -65,6 +67,10 @@ class NetworkAwareFileTransferService:
         # Performance settings
         self.route_optimization_timeout = 30  # seconds
         self.topology_refresh_threshold = 0.7  # Refresh if >70% connections stale
+        self.max_route_concurrency = 16  # Concurrent transfers along one route
+        self.small_file_threshold = 4 * 1024 * 1024  # Pack files smaller than 4MB
+        self.pack_size = 64 * 1024 * 1024  # Up to 64MB per pack
+        self.max_pack_files = 1000
         
     async def transfer_file_optimized(
         self, 
@@ -109,7 +115,7 @@ class NetworkAwareFileTransferService:
             # Check if multi-hop transfer is needed and enabled
             if len(primary_path.intermediate_hops) > 0 and self._enable_multi_hop:
                 self._logger.info(f"Using multi-hop transfer via: {' -> '.join(primary_path.intermediate_hops)}")
-                return await self._execute_multi_hop_transfer(dto, primary_path)
+                return await self._execute_multi_hop_transfer(dto, primary_path, route_response)
             
             # Direct transfer with route metadata
             result = await self._base_service.transfer_file(dto)
@@ -136,7 +142,11 @@ class NetworkAwareFileTransferService:
         Batch transfer with route optimization and grouping.
         
         Groups transfers by optimal routes to maximize efficiency and
-        minimize network topology discovery overhead.
+        minimize network topology discovery overhead. All route groups run
+        concurrently, at most ``dto.parallel_transfers`` transfers at a time
+        overall, and each route at most as many as its measured path can
+        carry (see ``_route_concurrency``). Small files on direct routes are
+        packed together (see ``_pack_transfers``).
         
         Args:
             dto: Batch transfer operation details
@@ -147,48 +157,52 @@ class NetworkAwareFileTransferService:
             Batch transfer result with routing optimization data
         """
         self._logger.info(f"Starting optimized batch transfer of {len(dto.transfers)} files")
+        start_time = time.time()
+        global_limit = asyncio.Semaphore(max(1, dto.parallel_transfers))
         
         if not group_by_route:
             # Process transfers individually with optimization
+            async def transfer_with_limit(transfer_dto: FileTransferOperationDto) -> FileTransferResultDto:
+                async with global_limit:
+                    return await self.transfer_file_optimized(transfer_dto, optimize_for=optimize_for)
+            
+            results = await asyncio.gather(
+                *(transfer_with_limit(transfer_dto) for transfer_dto in dto.transfers), return_exceptions=True
+            )
             optimized_transfers = []
-            for transfer_dto in dto.transfers:
-                try:
-                    result = await self.transfer_file_optimized(
-                        transfer_dto, optimize_for=optimize_for
-                    )
-                    optimized_transfers.append(result)
-                except Exception as e:
-                    self._logger.error(f"Transfer failed: {e}")
+            for result in results:
+                if isinstance(result, Exception):
+                    self._logger.error(f"Transfer failed: {result}")
                     # Continue with other transfers
+                else:
+                    optimized_transfers.append(result)
                     
             # Convert individual results to batch result
-            return self._convert_to_batch_result(optimized_transfers, dto)
+            return self._convert_to_batch_result(optimized_transfers, dto, time.time() - start_time)
         
         # Group transfers by source-destination pairs for route optimization
         route_groups = self._group_transfers_by_route(dto.transfers)
         
-        # Optimize routes for each group
-        optimized_groups = []
-        for (source_loc, dest_loc), group_transfers in route_groups.items():
+        async def transfer_group(source_loc: str, dest_loc: str,
+                                 group_transfers: List[FileTransferOperationDto]) -> List[FileTransferResultDto]:
             try:
-                route_response = await self._find_optimal_route(
-                    source_loc, dest_loc, optimize_for
-                )
-                optimized_groups.append((group_transfers, route_response))
+                route_response = await self._find_optimal_route(source_loc, dest_loc, optimize_for)
             except Exception as e:
                 self._logger.warning(f"Route optimization failed for {source_loc} -> {dest_loc}: {e}")
                 # Use transfers without optimization
-                optimized_groups.append((group_transfers, None))
-        
-        # Execute transfers by optimized groups
-        all_results = []
-        for group_transfers, route_response in optimized_groups:
-            group_results = await self._execute_group_transfers(
-                group_transfers, route_response, optimize_for
+                route_response = None
+            return await self._execute_group_transfers(
+                group_transfers, route_response, optimize_for, global_limit
             )
-            all_results.extend(group_results)
         
-        return self._convert_to_batch_result(all_results, dto)
+        # Execute all route groups at once
+        group_results = await asyncio.gather(*(
+            transfer_group(source_loc, dest_loc, group_transfers)
+            for (source_loc, dest_loc), group_transfers in route_groups.items()
+        ))
+        all_results = [result for results in group_results for result in results]
+        
+        return self._convert_to_batch_result(all_results, dto, time.time() - start_time)
     
     async def get_transfer_recommendation(
         self,
@@ -370,22 +384,26 @@ class NetworkAwareFileTransferService:
     async def _execute_multi_hop_transfer(
         self,
         dto: FileTransferOperationDto,
-        path: Any
+        path: Any,
+        route_response: Optional[Any] = None
     ) -> FileTransferResultDto:
-        """Execute multi-hop file transfer through intermediate locations."""
-        self._logger.info(f"Executing multi-hop transfer via {len(path.intermediate_hops)} hops")
+        """
+        Execute multi-hop file transfer through intermediate locations.
         
-        # Multi-hop transfers are complex and would require:
-        # 1. Transfer to first intermediate location
-        # 2. Transfer between intermediate locations
-        # 3. Transfer to final destination
-        # 4. Cleanup of intermediate copies
+        The file is relayed rather than stored and forwarded: every hop
+        forwards data as soon as the previous hop has written it to the
+        intermediate location, so the transfer takes about as long as its
+        slowest link. The copies on intermediate locations are removed once
+        the transfer ends, whether it succeeded or not.
+        """
+        self._logger.info(f"Executing multi-hop transfer via {len(path.intermediate_hops)} hops")
         
-        # For now, fall back to direct transfer with a warning
-        self._logger.warning("Multi-hop transfers not fully implemented, using direct transfer")
-        warnings.warn("Multi-hop transfers are not yet fully implemented")
+        relay_dto = dto.model_copy(update={'via_locations': list(path.intermediate_hops)})
+        result = await self._base_service.transfer_file(relay_dto)
         
-        return await self._base_service.transfer_file(dto)
+        if result.success and route_response is not None:
+            result = self._enhance_transfer_result(result, route_response, path)
+        return result
     
     def _enhance_transfer_result(
         self,
@@ -428,54 +446,160 @@ class NetworkAwareFileTransferService:
         self,
         transfers: List[FileTransferOperationDto],
         route_response: Optional[Any],
-        optimize_for: str
+        optimize_for: str,
+        global_limit: Optional[asyncio.Semaphore] = None
     ) -> List[FileTransferResultDto]:
-        """Execute a group of transfers with shared route optimization."""
-        results = []
+        """
+        Execute a group of transfers with shared route optimization.
         
-        for transfer_dto in transfers:
-            try:
-                if route_response:
-                    # Use the pre-calculated route
-                    result = await self._base_service.transfer_file(transfer_dto)
-                    if result.success:
-                        result = self._enhance_transfer_result(
-                            result, route_response, route_response.primary_path
-                        )
-                else:
-                    # Direct transfer without optimization
-                    result = await self._base_service.transfer_file(transfer_dto)
-                
-                results.append(result)
-                
-            except Exception as e:
-                self._logger.error(f"Group transfer failed: {e}")
-                # Create error result
-                error_result = FileTransferResultDto(
-                    operation_id=f"error_{int(time.time())}",
-                    operation_type="file_transfer",
-                    success=False,
-                    source_location=transfer_dto.source_location,
-                    source_path=transfer_dto.source_path,
-                    dest_location=transfer_dto.dest_location,
-                    dest_path=transfer_dto.dest_path,
-                    error_message=str(e)
+        Transfers run concurrently, limited by the route's concurrency and
+        by ``global_limit``, which is shared with the other groups of the
+        batch. Results are returned in the order of ``transfers``.
+        """
+        global_limit = global_limit or asyncio.Semaphore(len(transfers) or 1)
+        route_limit = asyncio.Semaphore(self._route_concurrency(route_response, len(transfers)))
+        relayed = bool(route_response and route_response.primary_path.intermediate_hops and self._enable_multi_hop)
+        # Relays already overlap their hops; only direct transfers are packed
+        units = [[index] for index in range(len(transfers))] if relayed else await self._pack_transfers(transfers)
+        
+        async def execute_unit(indices: List[int]) -> List[FileTransferResultDto]:
+            async with route_limit, global_limit:
+                if len(indices) > 1:
+                    try:
+                        results = await self._base_service.transfer_small_files([transfers[i] for i in indices])
+                    except Exception as e:
+                        return [self._group_error_result(transfers[i], e) for i in indices]
+                    if route_response:
+                        results = [
+                            self._enhance_transfer_result(result, route_response, route_response.primary_path)
+                            if result.success else result
+                            for result in results
+                        ]
+                    return results
+                return [await self._execute_route_transfer(transfers[indices[0]], route_response, relayed)]
+        
+        unit_results = await asyncio.gather(*(execute_unit(indices) for indices in units))
+        
+        results: List[Optional[FileTransferResultDto]] = [None] * len(transfers)
+        for indices, unit_result in zip(units, unit_results):
+            for index, result in zip(indices, unit_result):
+                results[index] = result
+        return results
+    
+    async def _execute_route_transfer(
+        self,
+        transfer_dto: FileTransferOperationDto,
+        route_response: Optional[Any],
+        relayed: bool
+    ) -> FileTransferResultDto:
+        """Transfer a single file along a pre-calculated route."""
+        try:
+            if relayed:
+                # Relay along the pre-calculated route
+                return await self._execute_multi_hop_transfer(
+                    transfer_dto, route_response.primary_path, route_response
                 )
-                results.append(error_result)
+            
+            # Use the pre-calculated route, or transfer directly without one
+            result = await self._base_service.transfer_file(transfer_dto)
+            if route_response and result.success:
+                result = self._enhance_transfer_result(
+                    result, route_response, route_response.primary_path
+                )
+            return result
+            
+        except Exception as e:
+            return self._group_error_result(transfer_dto, e)
+    
+    def _group_error_result(self, transfer_dto: FileTransferOperationDto, error: Exception) -> FileTransferResultDto:
+        """Create an error result for a transfer of a group."""
+        self._logger.error(f"Group transfer failed: {error}")
+        return FileTransferResultDto(
+            operation_id=f"error_{int(time.time())}",
+            operation_type="file_transfer",
+            success=False,
+            source_location=transfer_dto.source_location,
+            source_path=transfer_dto.source_path,
+            dest_location=transfer_dto.dest_location,
+            dest_path=transfer_dto.dest_path,
+            error_message=str(error)
+        )
+    
+    def _route_concurrency(self, route_response: Optional[Any], default: int) -> int:
+        """
+        Number of transfers to run at once along a route.
         
-        return results
+        Like ``NetworkConnection.recommended_parallel_streams``, this is the
+        bandwidth-delay product of the route's path divided by the window of
+        a stream: more concurrent transfers than that only compete for the
+        same bandwidth. Routes without measurements are limited by
+        ``default`` only.
+        """
+        if not route_response:
+            return max(1, default)
+        
+        path = route_response.primary_path
+        if not path.estimated_bandwidth_mbps or not path.estimated_latency_ms:
+            return max(1, default)
+        
+        bandwidth_bytes_per_second = path.estimated_bandwidth_mbps * 1_000_000 / 8
+        round_trip_seconds = path.estimated_latency_ms / 1000
+        transfers = math.ceil(bandwidth_bytes_per_second * round_trip_seconds / DEFAULT_STREAM_WINDOW_BYTES)
+        return max(1, min(self.max_route_concurrency, transfers))
+    
+    async def _pack_transfers(self, transfers: List[FileTransferOperationDto]) -> List[List[int]]:
+        """
+        Split a group's transfers into units transferred together.
+        
+        Files smaller than ``small_file_threshold`` are packed, in order,
+        into units of up to ``pack_size`` bytes and ``max_pack_files``
+        files, so that per-file overhead does not dominate their transfer.
+        Every other file, including those whose size is unknown, is a unit
+        of its own. Units hold indices into ``transfers``.
+        """
+        if len(transfers) < 2:
+            return [[index] for index in range(len(transfers))]
+        
+        try:
+            sizes = await self._base_service.get_file_sizes(
+                transfers[0].source_location, [dto.source_path for dto in transfers]
+            )
+        except Exception as e:
+            self._logger.warning(f"Could not list file sizes, transferring files individually: {e}")
+            return [[index] for index in range(len(transfers))]
+        
+        units: List[List[int]] = []
+        pack: List[int] = []
+        pack_bytes = 0
+        for index, dto in enumerate(transfers):
+            size = sizes.get(dto.source_path)
+            if size is None or size >= self.small_file_threshold:
+                units.append([index])
+                continue
+            if pack and (pack_bytes + size > self.pack_size or len(pack) >= self.max_pack_files):
+                units.append(pack)
+                pack, pack_bytes = [], 0
+            pack.append(index)
+            pack_bytes += size
+        if pack:
+            units.append(pack)
+        
+        return units
     
     def _convert_to_batch_result(
         self,
         individual_results: List[FileTransferResultDto],
-        original_dto: BatchFileTransferOperationDto
+        original_dto: BatchFileTransferOperationDto,
+        duration: Optional[float] = None
     ) -> BatchFileTransferResultDto:
         """Convert individual transfer results to batch result."""
         successful_transfers = [r for r in individual_results if r.success]
         failed_transfers = [r for r in individual_results if not r.success]
         
         total_bytes = sum(r.bytes_transferred for r in successful_transfers)
-        total_duration = max((r.duration_seconds for r in individual_results), default=0.0)
+        if duration is None:
+            duration = max((r.duration_seconds for r in individual_results), default=0.0)
+        total_duration = duration
         avg_throughput = (total_bytes / (1024 * 1024)) / total_duration if total_duration > 0 else 0
         
         return BatchFileTransferResultDto(
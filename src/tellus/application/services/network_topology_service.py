@@ -88,6 +88,16 @@ class NetworkPathDto:
         self.bottleneck_location = bottleneck_location
         self.path_type = path_type
 
+    @property
+    def hop_count(self) -> int:
+        """Get total number of hops including source and destination."""
+        return len(self.intermediate_hops) + 2
+
+    @property
+    def full_path(self) -> List[str]:
+        """Get complete path including source, hops, and destination."""
+        return [self.source_location] + self.intermediate_hops + [self.destination_location]
+
 
 class OptimalRouteRequestDto:
     """DTO for optimal route requests."""
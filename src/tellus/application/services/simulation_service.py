@@ -12,12 +12,14 @@ from typing import Any, Dict, List, Optional, Set
 
 from ...domain.entities.location import LocationEntity
 from ...domain.entities.simulation import SimulationEntity
-from ...domain.repositories.exceptions import (LocationNotFoundError,
+from ...domain.repositories.exceptions import (InvalidPaginationError,
+                                               LocationNotFoundError,
                                                RepositoryError,
                                                SimulationExistsError,
                                                SimulationNotFoundError)
 from ...domain.repositories.location_repository import ILocationRepository
-from ...domain.repositories.simulation_repository import ISimulationRepository
+from ...domain.repositories.simulation_repository import (ISimulationRepository,
+                                                          SimulationFilters)
 from ..dtos import (CreateSimulationDto, FileRegistrationDto, FileRegistrationResultDto,
                     FilterOptions, PaginationInfo, SimulationDto, SimulationFileDto,
                     SimulationListDto, SimulationLocationAssociationDto, UpdateSimulationDto)
@@ -304,46 +306,53 @@ class SimulationApplicationService:
         self,
         page: int = 1,
         page_size: int = 50,
-        filters: Optional[FilterOptions] = None
+        filters: Optional[FilterOptions] = None,
+        cursor: Optional[str] = None,
+        order_by: str = "simulation_id"
     ) -> SimulationListDto:
         """
         List simulations with pagination and filtering.
         
+        Filtering, ordering and pagination are done by the repository, so only
+        the requested page is loaded.
+        
         Args:
-            page: Page number (1-based)
+            page: Page number (1-based), ignored when a cursor is given
             page_size: Number of simulations per page
             filters: Optional filtering criteria
+            cursor: Optional cursor from the previous page's pagination info
+            order_by: Field to order by, prefixed with "-" for descending order
             
         Returns:
             Paginated list of simulations
+            
+        Raises:
+            ValidationError: If the cursor or ordering is invalid
         """
         self._logger.debug(f"Listing simulations (page {page}, size {page_size})")
         
         try:
-            # Get all simulations (repository would typically handle pagination)
-            all_simulations = self._simulation_repo.list_all()
-            
-            # Apply filters if provided
-            if filters:
-                all_simulations = self._apply_filters(all_simulations, filters)
-            
-            # Calculate pagination
-            total_count = len(all_simulations)
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            
-            simulations_page = all_simulations[start_idx:end_idx]
+            repository_filters = self._to_repository_filters(filters)
+            result = self._simulation_repo.query(
+                filters=repository_filters,
+                offset=(page - 1) * page_size,
+                limit=page_size,
+                order_by=order_by,
+                cursor=cursor
+            )
+            total_count = self._simulation_repo.count_matching(repository_filters)
             
             # Convert to DTOs
-            simulation_dtos = [self._entity_to_dto(sim) for sim in simulations_page]
+            simulation_dtos = [self._entity_to_dto(sim) for sim in result.simulations]
             
             # Create pagination info
             pagination = PaginationInfo(
                 page=page,
                 page_size=page_size,
                 total_count=total_count,
-                has_next=end_idx < total_count,
-                has_previous=page > 1
+                has_next=result.next_cursor is not None,
+                has_previous=page > 1 or cursor is not None,
+                next_cursor=result.next_cursor
             )
             
             return SimulationListDto(
@@ -352,6 +361,8 @@ class SimulationApplicationService:
                 filters_applied=filters or FilterOptions()
             )
             
+        except InvalidPaginationError as e:
+            raise ValidationError(str(e), field=e.field)
         except RepositoryError as e:
             self._logger.error(f"Repository error listing simulations: {str(e)}")
             raise
@@ -659,7 +670,8 @@ class SimulationApplicationService:
 
     # Private helper methods
     
-    def _entity_to_dto(self, simulation: SimulationEntity) -> SimulationDto:
+    @staticmethod
+    def _entity_to_dto(simulation: SimulationEntity) -> SimulationDto:
         """Convert domain entity to DTO."""
         # Clean user attributes (filter out system-managed data)
         clean_attributes = {k: v for k, v in simulation.attrs.items() 
@@ -690,34 +702,22 @@ class SimulationApplicationService:
             workflows=simulation.snakemakes.copy()  # New format: renamed to workflows
         )
     
-    def _apply_filters(
-        self,
-        simulations: List[SimulationEntity],
-        filters: FilterOptions
-    ) -> List[SimulationEntity]:
-        """Apply filtering to simulation list."""
-        filtered = simulations
-        
-        if filters.search_term:
-            search_term = filters.search_term.lower()
-            filtered = [
-                sim for sim in filtered
-                if (search_term in sim.simulation_id.lower() or
-                    (sim.model_id and search_term in sim.model_id.lower()) or
-                    any(search_term in str(v).lower() for v in sim.attrs.values()))
-            ]
-        
-        if filters.tags:
-            # Assuming tags are stored as an attribute
-            filtered = [
-                sim for sim in filtered
-                if filters.tags.intersection(set(sim.attrs.get("tags", [])))
-            ]
-        
-        # Additional filtering by creation/modification dates would require
-        # extending the domain entity with timestamp fields
+    @staticmethod
+    def _to_repository_filters(
+        filters: Optional[FilterOptions]
+    ) -> Optional[SimulationFilters]:
+        """Translate filter options into repository query filters."""
+        if filters is None:
+            return None
         
-        return filtered
+        # Filtering by creation/modification dates would require
+        # extending the domain entity with timestamp fields
+        return SimulationFilters(
+            search_term=filters.search_term,
+            attributes=dict(filters.attributes),
+            location_names={filters.location} if filters.location else set(),
+            tags=set(filters.tags)
+        )
     
     def _validate_location_associations(
         self,
@@ -803,5 +803,118 @@ class SimulationApplicationService:
         
         self._logger.info(f"Retrieved {len(file_dtos)} files for simulation {simulation_id}")
         return file_dtos
-    
-    
+
+
+class AsyncSimulationApplicationService:
+    """
+    Native async variant of the simulation application service.
+
+    Awaits an async simulation repository (such as PostgresSimulationRepository)
+    instead of blocking on a sync wrapper, so async callers like the web API
+    do not tie up their event loop. Covers the read use cases; writes go
+    through SimulationApplicationService.
+    """
+
+    def __init__(self, simulation_repository, loop=None) -> None:
+        """
+        Initialize the async simulation service.
+
+        Args:
+            simulation_repository: Async repository with the methods of
+                ISimulationRepository returning awaitables
+            loop: Optional background event loop the repository's coroutines
+                run on; without one they are awaited on the caller's loop
+        """
+        self._simulation_repo = simulation_repository
+        self._loop = loop
+        self._logger = logger
+
+    async def _call(self, coro):
+        """Await a repository coroutine on the configured event loop."""
+        if self._loop is None:
+            return await coro
+        return await self._loop.submit(coro)
+
+    async def get_simulation(self, simulation_id: str) -> Optional[SimulationDto]:
+        """
+        Get a simulation by its ID.
+
+        Args:
+            simulation_id: The ID of the simulation to retrieve
+
+        Returns:
+            Simulation DTO, or None if not found
+        """
+        self._logger.debug(f"Retrieving simulation: {simulation_id}")
+
+        try:
+            simulation = await self._call(self._simulation_repo.get_by_id(simulation_id))
+        except SimulationNotFoundError:
+            return None
+        except RepositoryError as e:
+            self._logger.error(f"Repository error retrieving simulation: {str(e)}")
+            raise
+
+        if simulation is None:
+            return None
+        return SimulationApplicationService._entity_to_dto(simulation)
+
+    async def list_simulations(
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        filters: Optional[FilterOptions] = None,
+        cursor: Optional[str] = None,
+        order_by: str = "simulation_id"
+    ) -> SimulationListDto:
+        """
+        List simulations with pagination and filtering.
+
+        Args:
+            page: Page number (1-based), ignored when a cursor is given
+            page_size: Number of simulations per page
+            filters: Optional filtering criteria
+            cursor: Optional cursor from the previous page's pagination info
+            order_by: Field to order by, prefixed with "-" for descending order
+
+        Returns:
+            Paginated list of simulations
+
+        Raises:
+            ValidationError: If the cursor or ordering is invalid
+        """
+        self._logger.debug(f"Listing simulations (page {page}, size {page_size})")
+
+        try:
+            repository_filters = SimulationApplicationService._to_repository_filters(filters)
+            result = await self._call(self._simulation_repo.query(
+                filters=repository_filters,
+                offset=(page - 1) * page_size,
+                limit=page_size,
+                order_by=order_by,
+                cursor=cursor
+            ))
+            total_count = await self._call(
+                self._simulation_repo.count_matching(repository_filters)
+            )
+        except InvalidPaginationError as e:
+            raise ValidationError(str(e), field=e.field)
+        except RepositoryError as e:
+            self._logger.error(f"Repository error listing simulations: {str(e)}")
+            raise
+
+        pagination = PaginationInfo(
+            page=page,
+            page_size=page_size,
+            total_count=total_count,
+            has_next=result.next_cursor is not None,
+            has_previous=page > 1 or cursor is not None,
+            next_cursor=result.next_cursor
+        )
+
+        return SimulationListDto(
+            simulations=[SimulationApplicationService._entity_to_dto(sim)
+                         for sim in result.simulations],
+            pagination=pagination,
+            filters_applied=filters or FilterOptions()
+        )
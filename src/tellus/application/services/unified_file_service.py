@@ -7,7 +7,8 @@ providing a single interface for all file operations in the unified architecture
 
 import logging
 import time
-from typing import Dict, List, Optional, Set, Union
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
 
 from ...domain.entities.simulation_file import (FileContentType, FileImportance,
                                                 FileType, SimulationFile)
@@ -42,6 +43,58 @@ class UnifiedFileService:
     
     # === File Management Operations ===
     
+    @contextmanager
+    def batch(self) -> Iterator['UnifiedFileService']:
+        """
+        Persist all file changes made inside the block in one repository write.
+        
+        Yields:
+            The service itself
+        """
+        with self.file_repository.batch():
+            yield self
+    
+    def create_files_from_entities(self, files: Iterable[SimulationFile]) -> int:
+        """
+        Create files from existing SimulationFile entities in one write.
+        
+        Args:
+            files: The simulation file entities to save
+            
+        Returns:
+            Number of files saved
+        """
+        files = list(files)
+        self.file_repository.save_many(files)
+        self._logger.info(f"Created {len(files)} files from entities")
+        return len(files)
+    
+    def register_scanned_files(self, scan_result: 'FileScanResult', simulation_id: str,
+                               location_name: Optional[str] = None,
+                               paths: Optional[Iterable[str]] = None) -> int:
+        """
+        Persist the inventory produced by a FileScanner for a simulation.
+        
+        Args:
+            scan_result: Result of FileScanner.scan_directory or scan_file_list
+            simulation_id: Simulation the scanned files belong to
+            location_name: Optional location where the scanned files reside
+            paths: Optional relative paths to save instead of the whole inventory,
+                e.g. the new and modified files of an incremental scan
+            
+        Returns:
+            Number of files saved
+        """
+        if paths is None:
+            files = scan_result.inventory.list_files()
+        else:
+            files = [f for f in map(scan_result.inventory.get_file, paths) if f is not None]
+        for file_obj in files:
+            file_obj.attributes['simulation_id'] = simulation_id
+            if location_name:
+                file_obj.set_primary_location(location_name)
+        return self.create_files_from_entities(files)
+    
     def create_file_from_entity(self, file: SimulationFile) -> None:
         """
         Create a file from an existing SimulationFile entity.
@@ -114,42 +167,71 @@ class UnifiedFileService:
     
     def list_files(self, file_type: Optional[FileType] = None,
                    simulation_id: Optional[str] = None,
-                   location_name: Optional[str] = None) -> List[SimulationFile]:
+                   location_name: Optional[str] = None,
+                   content_type: Optional[FileContentType] = None,
+                   start_year: Optional[int] = None,
+                   end_year: Optional[int] = None,
+                   offset: int = 0,
+                   limit: Optional[int] = None) -> List[SimulationFile]:
         """
         List files with optional filtering.
         
+        Filtering and pagination are delegated to the repository, which
+        answers them from its indexes where it has them.
+        
         Args:
             file_type: Optional file type filter
             simulation_id: Optional simulation ID filter
             location_name: Optional location filter
+            content_type: Optional content type filter
+            start_year: Optional first simulation year (inclusive)
+            end_year: Optional last simulation year (inclusive)
+            offset: Number of matching files to skip
+            limit: Maximum number of files to return
             
         Returns:
             List of matching files
         """
-        if simulation_id:
-            files = self.file_repository.list_by_simulation(simulation_id)
-        elif location_name:
-            files = self.file_repository.list_by_location(location_name)
-        elif file_type:
-            files = self.file_repository.list_by_type(file_type)
-        else:
-            files = self.file_repository.list_all()
-        
-        # Apply additional filters
-        if file_type and not simulation_id and not location_name:
-            # Already filtered by type
-            pass
-        elif file_type:
-            files = [f for f in files if f.file_type == file_type]
-        
-        if location_name and not location_name:
-            # Already filtered by location
-            pass
-        elif location_name:
-            files = [f for f in files if f.is_available_at_location(location_name)]
-        
-        return files
-    
+        return self.file_repository.query(
+            simulation_id=simulation_id,
+            file_type=file_type,
+            content_type=content_type,
+            location_name=location_name,
+            start_year=start_year,
+            end_year=end_year,
+            offset=offset,
+            limit=limit,
+        )
+
+    def count_files(self, file_type: Optional[FileType] = None,
+                    simulation_id: Optional[str] = None,
+                    location_name: Optional[str] = None,
+                    content_type: Optional[FileContentType] = None,
+                    start_year: Optional[int] = None,
+                    end_year: Optional[int] = None) -> int:
+        """
+        Count the files matching the filters of list_files, across all pages.
+
+        Args:
+            file_type: Optional file type filter
+            simulation_id: Optional simulation ID filter
+            location_name: Optional location filter
+            content_type: Optional content type filter
+            start_year: Optional first simulation year (inclusive)
+            end_year: Optional last simulation year (inclusive)
+
+        Returns:
+            Number of matching files
+        """
+        return self.file_repository.count_matching(
+            simulation_id=simulation_id,
+            file_type=file_type,
+            content_type=content_type,
+            location_name=location_name,
+            start_year=start_year,
+            end_year=end_year,
+        )
+
     def delete_file(self, file_path_or_id: str) -> bool:
         """
         Delete a file.
@@ -292,8 +374,7 @@ class UnifiedFileService:
         parent_file.add_contained_file(file_path)
         
         # Save both files
-        self.file_repository.save(child_file)
-        self.file_repository.save(parent_file)
+        self.file_repository.save_many([child_file, parent_file])
         
         self._logger.info(f"Set parent relationship: {file_path} -> {parent_file_path}")
         return True
@@ -360,6 +441,7 @@ class UnifiedFileService:
             registered_count = 0
             updated_count = 0
             skipped_count = 0
+            to_save = []
             
             for file_obj in filtered_files:
                 # Check if already registered to this simulation
@@ -374,13 +456,16 @@ class UnifiedFileService:
                     continue
                 
                 file_obj.attributes['simulation_id'] = registration_dto.simulation_id
-                self.file_repository.save(file_obj)
+                to_save.append(file_obj)
                 
                 if current_sim_id:
                     updated_count += 1
                 else:
                     registered_count += 1
             
+            # Persist all registrations in a single repository write
+            self.file_repository.save_many(to_save)
+            
             return FileRegistrationResultDto(
                 archive_id=registration_dto.archive_id,
                 simulation_id=registration_dto.simulation_id,
@@ -0,0 +1,135 @@
+"""
+Archive domain entities and value objects.
+
+Archives are tarballs of simulation files, stored at a location and described
+by ArchiveMetadata. The archive creation, extraction and fragment assembly
+services work on this metadata; SimulationFile.from_archive_metadata() and
+SimulationFile.to_archive_metadata() convert it to and from the unified file
+model.
+"""
+
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional, Set
+
+# Checksum is shared with the unified file model; re-exported for the archive services
+from .simulation_file import Checksum, FileInventory
+
+# Thresholds of ArchiveMetadata.estimate_extraction_complexity()
+_MODERATE_FILE_COUNT = 1_000
+_COMPLEX_FILE_COUNT = 10_000
+_MODERATE_SIZE = 10 * 1024**3
+_COMPLEX_SIZE = 100 * 1024**3
+
+
+@dataclass(frozen=True)
+class ArchiveId:
+    """Value object identifying an archive."""
+    value: str
+
+    def __post_init__(self):
+        if not self.value or not isinstance(self.value, str):
+            raise ValueError("Archive ID must be a non-empty string")
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class ArchiveType(Enum):
+    """Physical layouts of archives."""
+    COMPRESSED = "compressed"          # Compressed tar archive (.tar.gz, .tar.zst, ...)
+    UNCOMPRESSED = "uncompressed"      # Plain tar archive (.tar)
+    DIRECTORY = "directory"            # Directory tree kept as is
+    SPLIT_TARBALL = "split-tarball"    # Several size-bounded tarballs, see archive_paths
+
+
+@dataclass
+class ArchiveMetadata:
+    """
+    Domain entity describing an archive of simulation files.
+
+    Attributes:
+        archive_id: Unique identifier of the archive
+        location: Name of the location holding the archive, or the path of the
+            archive file where a fragment is extracted from
+        archive_type: Physical layout of the archive
+        simulation_id: Simulation the archived files belong to
+        archive_paths: Paths of the archive files; the parts of a split archive
+        checksum: Checksum of the archive file
+        size: Size of the archive file(s) in bytes
+        created_time: When the archive was created (timestamp)
+        simulation_date: Simulation date the archive covers, ISO formatted
+        version: Version of the archived data
+        description: Free-text description
+        tags: Tags for finding the archive
+        path_prefix_to_strip: Path prefix removed from members when extracting
+        file_inventory: Files in the archive
+        fragment_info: Content types and date range of an archive holding
+            part of a simulation, used to assemble fragments
+    """
+
+    archive_id: ArchiveId
+    location: str
+    archive_type: ArchiveType = ArchiveType.COMPRESSED
+    simulation_id: Optional[str] = None
+    archive_paths: Set[str] = field(default_factory=set)
+    checksum: Optional[Checksum] = None
+    size: Optional[int] = None
+    created_time: float = field(default_factory=time.time)
+    simulation_date: Optional[str] = None
+    version: Optional[str] = None
+    description: Optional[str] = None
+    tags: Set[str] = field(default_factory=set)
+    path_prefix_to_strip: Optional[str] = None
+    file_inventory: Optional[FileInventory] = None
+    fragment_info: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self):
+        """Validate the archive metadata entity."""
+        if isinstance(self.archive_id, str):
+            self.archive_id = ArchiveId(self.archive_id)
+        if not isinstance(self.archive_id, ArchiveId):
+            raise ValueError("Archive ID must be an ArchiveId instance")
+
+        if not isinstance(self.location, str):
+            raise ValueError("Location must be a string")
+
+        if not isinstance(self.archive_type, ArchiveType):
+            raise ValueError("Archive type must be an ArchiveType enum")
+
+        if self.checksum is not None and not isinstance(self.checksum, Checksum):
+            raise ValueError("Checksum must be a Checksum instance")
+
+        if self.size is not None and (not isinstance(self.size, int) or self.size < 0):
+            raise ValueError("Archive size must be a non-negative integer")
+
+        if not isinstance(self.archive_paths, set):
+            raise ValueError("Archive paths must be a set")
+
+        if not isinstance(self.tags, set):
+            raise ValueError("Tags must be a set")
+
+        if self.file_inventory is not None and not isinstance(self.file_inventory, FileInventory):
+            raise ValueError("File inventory must be a FileInventory instance")
+
+    def is_split(self) -> bool:
+        """Check if the archive is split into several parts."""
+        return self.archive_type == ArchiveType.SPLIT_TARBALL
+
+    def estimate_extraction_complexity(self) -> str:
+        """
+        Rough effort of extracting the archive.
+
+        Returns:
+            "simple", "moderate" or "complex", from the number of files, the
+            archive size and whether it is split
+        """
+        file_count = self.file_inventory.file_count if self.file_inventory else 0
+        size = self.size or (self.file_inventory.total_size if self.file_inventory else 0)
+
+        if self.is_split() or file_count > _COMPLEX_FILE_COUNT or size > _COMPLEX_SIZE:
+            return "complex"
+        if file_count > _MODERATE_FILE_COUNT or size > _MODERATE_SIZE:
+            return "moderate"
+        return "simple"
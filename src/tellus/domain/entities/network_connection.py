@@ -2,6 +2,7 @@
 Network connection value objects for network topology management.
 """
 
+import math
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Dict, Optional
@@ -9,6 +10,10 @@ from typing import Dict, Optional
 from .network_metrics import BandwidthMetrics, LatencyMetrics, NetworkHealth
 
 
+# Data a single TCP stream keeps in flight; SSH channels default to 2 MiB windows
+DEFAULT_STREAM_WINDOW_BYTES = 2 * 1024 * 1024
+
+
 class ConnectionType(Enum):
     """Types of network connections between locations."""
     DIRECT = auto()  # Direct network connection
@@ -103,6 +108,29 @@ class NetworkConnection:
         
         return False
     
+    def recommended_parallel_streams(
+        self,
+        window_bytes: int = DEFAULT_STREAM_WINDOW_BYTES,
+        max_streams: int = 16
+    ) -> int:
+        """
+        Number of parallel streams needed to fill this connection.
+        
+        A stream moves at most one window per round trip, so filling the
+        connection takes its bandwidth-delay product divided by the window.
+        Lossy connections get one extra stream per percent of packet loss,
+        since loss keeps windows from growing. Without both bandwidth and
+        latency metrics a single stream is recommended.
+        """
+        if not self.bandwidth_metrics or not self.latency_metrics:
+            return 1
+        
+        bandwidth_bytes_per_second = self.effective_bandwidth_mbps * 1_000_000 / 8
+        round_trip_seconds = self.latency_metrics.avg_latency_ms / 1000
+        streams = math.ceil(bandwidth_bytes_per_second * round_trip_seconds / window_bytes)
+        streams += int(self.latency_metrics.packet_loss_percentage)
+        return max(1, min(max_streams, streams))
+    
     def update_bandwidth_metrics(self, new_metrics: BandwidthMetrics) -> None:
         """Update bandwidth metrics, merging with existing if available."""
         if not isinstance(new_metrics, BandwidthMetrics):
@@ -275,6 +275,13 @@ class NetworkTopology:
         path.append(source)
         path.reverse()
         
+        # Latency is the sum of segments
+        total_latency = 0.0
+        for i in range(len(path) - 1):
+            connection = self.get_connection(path[i], path[i + 1])
+            if connection and connection.latency_metrics:
+                total_latency += connection.latency_metrics.avg_latency_ms
+        
         # Build NetworkPath object
         return NetworkPath(
             source_location=source,
@@ -282,7 +289,7 @@ class NetworkTopology:
             intermediate_hops=path[1:-1],
             total_cost=len(path) - 1,  # Use hop count as cost
             estimated_bandwidth_mbps=bandwidths[destination],
-            estimated_latency_ms=0.0,  # Would need to calculate
+            estimated_latency_ms=total_latency,
             path_type="optimized"
         )
     
@@ -18,6 +18,10 @@ class Checksum:
     """File checksum with algorithm information."""
     value: str
     algorithm: str = "sha256"
+    
+    def __str__(self) -> str:
+        # Serialized form parsed back by SimulationFile.from_dict
+        return f"{self.algorithm}:{self.value}"
 
 
 class FileType(Enum):
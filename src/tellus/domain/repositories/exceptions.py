@@ -40,6 +40,14 @@ class LocationNotFoundError(RepositoryError):
         super().__init__(f"Location with name '{name}' not found")
 
 
+class InvalidPaginationError(RepositoryError):
+    """Raised when a pagination cursor or ordering cannot be used for a query."""
+    
+    def __init__(self, message: str, field: str):
+        self.field = field
+        super().__init__(message)
+
+
 class ValidationError(RepositoryError):
     """Raised when entity validation fails."""
     
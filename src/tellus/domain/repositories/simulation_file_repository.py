@@ -6,9 +6,10 @@ archives, directories, and symbolic links through a single interface.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Set
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Set
 
-from ..entities.simulation_file import FileType, SimulationFile
+from ..entities.simulation_file import FileContentType, FileType, SimulationFile
 
 
 class ISimulationFileRepository(ABC):
@@ -222,6 +223,137 @@ class ISimulationFileRepository(ABC):
         """
         pass
     
+    # Bulk Operations
+    
+    def save_many(self, files: Iterable[SimulationFile]) -> None:
+        """
+        Save several simulation file entities in one operation.
+        Backends should override this to persist all files in a single write.
+        
+        Args:
+            files: The simulation file entities to save
+            
+        Raises:
+            RepositoryError: If the save operation fails
+        """
+        with self.batch():
+            for file in files:
+                self.save(file)
+    
+    @contextmanager
+    def batch(self) -> Iterator['ISimulationFileRepository']:
+        """
+        Group several save/delete calls into one transactional write.
+        
+        Changes made inside the block are persisted together when the block
+        exits, and discarded if it raises. Blocks may be nested; only the
+        outermost one writes. The default implementation writes immediately.
+        
+        Yields:
+            The repository itself
+        """
+        yield self
+    
+    # Filtered Queries
+    
+    def query(self, simulation_id: Optional[str] = None,
+              file_type: Optional[FileType] = None,
+              content_type: Optional[FileContentType] = None,
+              location_name: Optional[str] = None,
+              parent_file_id: Optional[str] = None,
+              pattern: Optional[str] = None,
+              start_year: Optional[int] = None,
+              end_year: Optional[int] = None,
+              offset: int = 0,
+              limit: Optional[int] = None) -> List[SimulationFile]:
+        """
+        Retrieve files matching all given filters, one page at a time.
+
+        Results are ordered by simulation ID and relative path. The default
+        implementation filters in memory; database backends push the filters
+        and pagination down to the server.
+
+        Args:
+            simulation_id: Only files of this simulation
+            file_type: Only files of this type
+            content_type: Only files of this content type
+            location_name: Only files available at this location
+            parent_file_id: Only files with this parent file
+            pattern: Glob pattern the relative path must match
+            start_year: Only files whose simulation date is in or after this year
+            end_year: Only files whose simulation date is in or before this year
+            offset: Number of matching files to skip
+            limit: Maximum number of files to return (None for all)
+
+        Returns:
+            List of matching simulation files
+
+        Raises:
+            RepositoryError: If the query fails
+        """
+        if simulation_id is not None:
+            files = self.list_by_simulation(simulation_id)
+        elif parent_file_id is not None:
+            files = self.list_by_parent(parent_file_id)
+        elif location_name is not None:
+            files = self.list_by_location(location_name)
+        else:
+            files = self.list_all()
+
+        def matches(file: SimulationFile) -> bool:
+            if simulation_id is not None and file.attributes.get('simulation_id') != simulation_id:
+                return False
+            if file_type is not None and file.file_type != file_type:
+                return False
+            if content_type is not None and file.content_type != content_type:
+                return False
+            if location_name is not None and location_name not in file.available_locations:
+                return False
+            if parent_file_id is not None and file.parent_file_id != parent_file_id:
+                return False
+            if pattern is not None and not file.matches_pattern(pattern):
+                return False
+            if start_year is not None or end_year is not None:
+                if file.simulation_date is None:
+                    return False
+                if start_year is not None and file.simulation_date.year < start_year:
+                    return False
+                if end_year is not None and file.simulation_date.year > end_year:
+                    return False
+            return True
+
+        matching = sorted(
+            (f for f in files if matches(f)),
+            key=lambda f: (f.attributes.get('simulation_id') or '', f.relative_path)
+        )
+        end = None if limit is None else offset + limit
+        return matching[offset:end]
+
+    def count_matching(self, simulation_id: Optional[str] = None,
+                       file_type: Optional[FileType] = None,
+                       content_type: Optional[FileContentType] = None,
+                       location_name: Optional[str] = None,
+                       parent_file_id: Optional[str] = None,
+                       pattern: Optional[str] = None,
+                       start_year: Optional[int] = None,
+                       end_year: Optional[int] = None) -> int:
+        """
+        Get the number of files matching all given filters.
+
+        Accepts the same filters as query and counts across all pages.
+
+        Returns:
+            The number of matching simulation files
+
+        Raises:
+            RepositoryError: If the count operation fails
+        """
+        return len(self.query(
+            simulation_id=simulation_id, file_type=file_type, content_type=content_type,
+            location_name=location_name, parent_file_id=parent_file_id, pattern=pattern,
+            start_year=start_year, end_year=end_year,
+        ))
+
     # Archive-Specific Convenience Methods (for backward compatibility)
     
     def get_archive_by_id(self, archive_id: str) -> Optional[SimulationFile]:
@@ -263,7 +395,20 @@ class ISimulationFileRepository(ABC):
         return [f for f in all_files if f.is_archive()]
     
     # Regular File Convenience Methods
-    
+
+    def list_by_content_type(self, content_type: FileContentType) -> List[SimulationFile]:
+        """
+        Retrieve files by their content type.
+        Backends with a content type index should override this.
+
+        Args:
+            content_type: The content type of files to retrieve
+
+        Returns:
+            List of simulation files with the specified content type
+        """
+        return [f for f in self.list_all() if f.content_type == content_type]
+
     def list_regular_files(self) -> List[SimulationFile]:
         """
         List all regular files.
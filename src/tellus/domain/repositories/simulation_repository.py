@@ -2,10 +2,128 @@
 Repository interface for simulation persistence.
 """
 
+import base64
+import json
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ..entities.simulation import SimulationEntity
+from .exceptions import InvalidPaginationError
+
+# Fields simulations can be ordered by; prefix with "-" for descending order
+SIMULATION_ORDER_FIELDS = ("simulation_id", "model_id", "path")
+
+
+@dataclass
+class SimulationFilters:
+    """
+    Criteria for selecting simulations in ISimulationRepository.query().
+
+    All given criteria must match.
+
+    Attributes:
+        search_term: Case-insensitive substring of the simulation ID, the model
+            ID or one of the attribute values (keys are not searched)
+        attributes: Attribute values that must match exactly (compared as strings)
+        location_names: Locations the simulation must be associated with
+        tags: Simulations must carry at least one of these in attrs["tags"]
+    """
+    search_term: Optional[str] = None
+    attributes: Dict[str, str] = field(default_factory=dict)
+    location_names: Set[str] = field(default_factory=set)
+    tags: Set[str] = field(default_factory=set)
+
+    def matches(self, simulation: SimulationEntity) -> bool:
+        """Check whether a simulation satisfies all criteria."""
+        if self.search_term:
+            term = self.search_term.lower()
+            if not (term in simulation.simulation_id.lower() or
+                    (simulation.model_id and term in simulation.model_id.lower()) or
+                    any(term in str(v).lower() for v in simulation.attrs.values())):
+                return False
+
+        for key, value in self.attributes.items():
+            if key not in simulation.attrs or str(simulation.attrs[key]) != str(value):
+                return False
+
+        if not self.location_names <= set(simulation.associated_locations):
+            return False
+
+        if self.tags and not self.tags.intersection(set(simulation.attrs.get("tags", []))):
+            return False
+
+        return True
+
+
+@dataclass
+class SimulationPage:
+    """
+    One page of simulations returned by ISimulationRepository.query().
+
+    Attributes:
+        simulations: The simulations on this page
+        next_cursor: Opaque cursor for the following page, None on the last page
+    """
+    simulations: List[SimulationEntity]
+    next_cursor: Optional[str] = None
+
+
+def parse_order_by(order_by: str) -> Tuple[str, bool]:
+    """
+    Split an order specification into field name and direction.
+
+    Args:
+        order_by: Field name from SIMULATION_ORDER_FIELDS, optionally prefixed with "-"
+
+    Returns:
+        Tuple of (field name, descending)
+
+    Raises:
+        InvalidPaginationError: If the field cannot be ordered by
+    """
+    descending = order_by.startswith("-")
+    field_name = order_by.lstrip("-")
+    if field_name not in SIMULATION_ORDER_FIELDS:
+        raise InvalidPaginationError(
+            f"Cannot order simulations by '{field_name}'. "
+            f"Choose one of: {', '.join(SIMULATION_ORDER_FIELDS)}",
+            field="order_by"
+        )
+    return field_name, descending
+
+
+def sort_key(simulation: SimulationEntity, field_name: str) -> Tuple[str, str]:
+    """Keyset position of a simulation: (ordered value, simulation ID), missing values as ''."""
+    return (getattr(simulation, field_name) or "", simulation.simulation_id)
+
+
+def encode_cursor(simulation: SimulationEntity, order_by: str) -> str:
+    """Encode the keyset position after ``simulation`` as an opaque cursor."""
+    field_name, _ = parse_order_by(order_by)
+    payload = json.dumps([order_by, *sort_key(simulation, field_name)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, order_by: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Returns:
+        The keyset position (ordered value, simulation ID)
+
+    Raises:
+        InvalidPaginationError: If the cursor is malformed or was created for another ordering
+    """
+    try:
+        cursor_order, value, simulation_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise InvalidPaginationError(f"Invalid pagination cursor: {cursor}", field="cursor") from e
+    if cursor_order != order_by:
+        raise InvalidPaginationError(
+            f"Pagination cursor was created for ordering by '{cursor_order}'", field="cursor"
+        )
+    return value, simulation_id
 
 
 class ISimulationRepository(ABC):
@@ -102,4 +220,74 @@ class ISimulationRepository(ABC):
         Raises:
             RepositoryError: If the count operation fails
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def query(
+        self,
+        filters: Optional[SimulationFilters] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        order_by: str = "simulation_id",
+        cursor: Optional[str] = None,
+    ) -> SimulationPage:
+        """
+        Retrieve one page of simulations matching the filters.
+        
+        Pages can be addressed by offset, or by the cursor returned with the
+        previous page (keyset pagination), which stays cheap for deep pages.
+        The default implementation filters in memory; database backends
+        push filtering, ordering and pagination down to the server.
+        
+        Args:
+            filters: Optional filtering criteria
+            offset: Number of matching simulations to skip (ignored with a cursor)
+            limit: Maximum number of simulations to return (None for all)
+            order_by: Field from SIMULATION_ORDER_FIELDS, prefixed with "-" for descending
+            cursor: Cursor of the previous page
+            
+        Returns:
+            The requested page of simulations
+            
+        Raises:
+            InvalidPaginationError: If order_by or cursor is invalid
+            RepositoryError: If the query fails
+        """
+        field_name, descending = parse_order_by(order_by)
+        position = decode_cursor(cursor, order_by) if cursor else None
+        
+        simulations = self.list_all()
+        if filters:
+            simulations = [sim for sim in simulations if filters.matches(sim)]
+        simulations = sorted(simulations, key=lambda sim: sort_key(sim, field_name), reverse=descending)
+        
+        if position is not None:
+            if descending:
+                simulations = [sim for sim in simulations if sort_key(sim, field_name) < position]
+            else:
+                simulations = [sim for sim in simulations if sort_key(sim, field_name) > position]
+            offset = 0
+        
+        end = None if limit is None else offset + limit
+        page = simulations[offset:end]
+        has_more = end is not None and len(simulations) > end
+        return SimulationPage(
+            simulations=page,
+            next_cursor=encode_cursor(page[-1], order_by) if has_more and page else None,
+        )
+    
+    def count_matching(self, filters: Optional[SimulationFilters] = None) -> int:
+        """
+        Get the number of simulations matching the filters.
+        
+        Args:
+            filters: Optional filtering criteria
+            
+        Returns:
+            The number of matching simulations
+            
+        Raises:
+            RepositoryError: If the count operation fails
+        """
+        if not filters:
+            return self.count()
+        return sum(1 for sim in self.list_all() if filters.matches(sim))
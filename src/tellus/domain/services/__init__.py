@@ -2,7 +2,7 @@
 
 from .archive_creation import (ArchiveCreationConfig, ArchiveCreationFilter,
                                ArchiveCreationResult, ArchiveCreationService,
-                               CompressionLevel)
+                               CompressionCodec, CompressionLevel)
 from .archive_extraction import (ArchiveExtractionConfig,
                                  ArchiveExtractionFilter,
                                  ArchiveExtractionService, ConflictResolution,
@@ -24,6 +24,7 @@ __all__ = [
     'ArchiveCreationResult',
     'ArchiveCreationFilter',
     'ArchiveCreationConfig',
+    'CompressionCodec',
     'CompressionLevel',
     'ArchiveExtractionService',
     'ArchiveExtractionFilter',
@@ -0,0 +1,607 @@
+"""
+Compression backends for archive creation.
+
+Tarballs used to be written through tarfile's single-threaded gzip stream, so
+archiving large simulation output was bound to a single core. The writer in
+this module splits the uncompressed tar stream into fixed-size blocks,
+compresses the blocks on a thread pool and writes them out in order. zlib,
+lzma and zstandard all release the GIL while compressing, so the threads
+scale across cores.
+
+Supported codecs:
+
+- gzip: pigz-style output, a single gzip member whose deflate stream is the
+  concatenation of sync-flushed blocks, each primed with the preceding 32 KiB
+  as dictionary. Readable by gzip, pigz and Python's gzip/tarfile modules.
+  With ``independent_blocks`` every block is instead a complete gzip member,
+  as in BGZF, so it can be decompressed on its own.
+- xz: every block is a complete xz stream; concatenated streams are valid xz.
+- zstd: every block is a complete zstd frame. Requires the zstandard package.
+
+The writer records where each block starts in both the uncompressed and the
+compressed stream. For independent blocks, BlockIndexedReader uses that table
+to read any byte range of the uncompressed stream by decompressing only the
+blocks covering it.
+"""
+
+import bisect
+import bz2
+import gzip
+import lzma
+import os
+import struct
+import tarfile
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from enum import Enum
+from pathlib import Path
+from typing import (BinaryIO, Deque, Iterator, List, NamedTuple, Optional,
+                    Sequence, Tuple, Union)
+
+# Size of the deflate window, and of the dictionary carried between gzip blocks
+DEFLATE_WINDOW_SIZE = 32 * 1024
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+class CompressionLevel(Enum):
+    """Compression levels for archive creation."""
+    NONE = 0     # No compression (tar only)
+    FAST = 1     # Fast compression
+    BALANCED = 6 # Balanced speed/size
+    BEST = 9     # Best compression
+
+
+class CompressionCodec(Enum):
+    """Compression codecs for archive creation."""
+    GZIP = "gzip"
+    XZ = "xz"
+    ZSTD = "zstd"
+
+    @property
+    def suffix(self) -> str:
+        """File suffix appended to '.tar' for this codec."""
+        return _CODEC_SUFFIXES[self]
+
+    @property
+    def default_block_size(self) -> int:
+        """Uncompressed bytes per block when none is configured."""
+        return _DEFAULT_BLOCK_SIZES[self]
+
+    def level(self, compression_level: CompressionLevel) -> int:
+        """Translate a generic compression level into this codec's scale."""
+        if self is CompressionCodec.ZSTD:
+            return _ZSTD_LEVELS[compression_level]
+        return compression_level.value
+
+
+_CODEC_SUFFIXES = {
+    CompressionCodec.GZIP: '.gz',
+    CompressionCodec.XZ: '.xz',
+    CompressionCodec.ZSTD: '.zst',
+}
+
+# Larger blocks cost little for gzip's 32 KiB window, but xz and zstd lose
+# ratio on blocks much smaller than their match windows
+_DEFAULT_BLOCK_SIZES = {
+    CompressionCodec.GZIP: 1024 * 1024,
+    CompressionCodec.XZ: 8 * 1024 * 1024,
+    CompressionCodec.ZSTD: 4 * 1024 * 1024,
+}
+
+_ZSTD_LEVELS = {
+    CompressionLevel.NONE: 0,
+    CompressionLevel.FAST: 1,
+    CompressionLevel.BALANCED: 3,
+    CompressionLevel.BEST: 19,
+}
+
+
+class CompressedBlock(NamedTuple):
+    """Position of one compressed block in the uncompressed and compressed streams."""
+    offset: int
+    size: int
+    compressed_offset: int
+    compressed_size: int
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("The zstandard package is required for zstd compression")
+    return zstandard
+
+
+def _gzip_header(level: int) -> bytes:
+    extra_flags = 2 if level == 9 else 4 if level == 1 else 0
+    # No file name, zero mtime, OS unknown
+    return struct.pack('<BBBBIBB', 0x1f, 0x8b, 8, 0, 0, extra_flags, 255)
+
+
+class _GzipBlockCompressor:
+    """Deflate blocks forming one pigz-compatible gzip member."""
+
+    independent = False
+
+    def __init__(self, level: int):
+        self._level = level
+        self._crc = 0
+        self._size = 0
+
+    def header(self) -> bytes:
+        return _gzip_header(self._level)
+
+    def update(self, block: bytes) -> None:
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+
+    def compress(self, block: bytes, dictionary: bytes, last: bool) -> bytes:
+        options = {'zdict': dictionary} if dictionary else {}
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED, -zlib.MAX_WBITS, **options)
+        return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+    def trailer(self) -> bytes:
+        return struct.pack('<II', self._crc, self._size & 0xffffffff)
+
+
+class _GzipMemberCompressor:
+    """Independent gzip members, one per block."""
+
+    independent = True
+
+    def __init__(self, level: int):
+        self._level = level
+
+    def header(self) -> bytes:
+        return b''
+
+    def update(self, block: bytes) -> None:
+        pass
+
+    def compress(self, block: bytes, dictionary: bytes, last: bool) -> bytes:
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        return b''.join((
+            _gzip_header(self._level),
+            compressor.compress(block),
+            compressor.flush(),
+            struct.pack('<II', zlib.crc32(block), len(block) & 0xffffffff),
+        ))
+
+    def trailer(self) -> bytes:
+        return b''
+
+
+class _XzBlockCompressor:
+    """Independent xz streams, one per block."""
+
+    independent = True
+
+    def __init__(self, level: int):
+        self._level = level
+
+    def header(self) -> bytes:
+        return b''
+
+    def update(self, block: bytes) -> None:
+        pass
+
+    def compress(self, block: bytes, dictionary: bytes, last: bool) -> bytes:
+        return lzma.compress(block, format=lzma.FORMAT_XZ, preset=self._level)
+
+    def trailer(self) -> bytes:
+        return b''
+
+
+class _ZstdBlockCompressor:
+    """Independent zstd frames, one per block."""
+
+    independent = True
+
+    def __init__(self, level: int):
+        self._zstandard = _import_zstandard()
+        self._level = level
+        # ZstdCompressor instances are not thread-safe; keep one per worker
+        self._local = threading.local()
+
+    def header(self) -> bytes:
+        return b''
+
+    def update(self, block: bytes) -> None:
+        pass
+
+    def compress(self, block: bytes, dictionary: bytes, last: bool) -> bytes:
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None:
+            compressor = self._zstandard.ZstdCompressor(level=self._level)
+            self._local.compressor = compressor
+        return compressor.compress(block)
+
+    def trailer(self) -> bytes:
+        return b''
+
+
+_BLOCK_COMPRESSORS = {
+    CompressionCodec.GZIP: _GzipBlockCompressor,
+    CompressionCodec.XZ: _XzBlockCompressor,
+    CompressionCodec.ZSTD: _ZstdBlockCompressor,
+}
+
+
+def _decompress_gzip_member(data: bytes) -> bytes:
+    return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+
+def _decompress_zstd_frame(data: bytes) -> bytes:
+    return _import_zstandard().ZstdDecompressor().decompress(data)
+
+
+_BLOCK_DECOMPRESSORS = {
+    CompressionCodec.GZIP: _decompress_gzip_member,
+    CompressionCodec.XZ: lzma.decompress,
+    CompressionCodec.ZSTD: _decompress_zstd_frame,
+}
+
+
+class ParallelCompressionWriter:
+    """
+    Write-only file object compressing its input on a thread pool.
+
+    Data written is cut into blocks of ``block_size`` bytes. Each block is
+    compressed by a worker while the caller keeps writing, and compressed
+    blocks are written to the underlying file in submission order. At most
+    two blocks per worker are in flight, so memory use stays bounded however
+    fast the caller writes.
+
+    ``tell()`` reports the uncompressed position, so the writer can be handed
+    to ``tarfile.open(fileobj=..., mode='w')``. The underlying file is not
+    closed by this writer. ``blocks`` lists the position of every block
+    written so far.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        codec: CompressionCodec = CompressionCodec.GZIP,
+        level: CompressionLevel = CompressionLevel.BALANCED,
+        workers: Optional[int] = None,
+        block_size: Optional[int] = None,
+        independent_blocks: bool = False
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            fileobj: Binary file object receiving the compressed stream
+            codec: Compression codec
+            level: Compression level, must not be NONE
+            workers: Number of compression threads (defaults to CPU count)
+            block_size: Uncompressed bytes per block (defaults per codec)
+            independent_blocks: Make every block decompressible on its own.
+                Only changes gzip output; xz and zstd blocks always are.
+        """
+        if level == CompressionLevel.NONE:
+            raise ValueError("ParallelCompressionWriter requires a compression level other than NONE")
+
+        self.codec = codec
+        self._fileobj = fileobj
+        if codec is CompressionCodec.GZIP and independent_blocks:
+            self._compressor = _GzipMemberCompressor(codec.level(level))
+        else:
+            self._compressor = _BLOCK_COMPRESSORS[codec](codec.level(level))
+        self._block_size = block_size or codec.default_block_size
+        if self._block_size <= 0:
+            raise ValueError("Compression block size must be positive")
+
+        workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tellus-compress")
+        self._max_pending = 2 * workers
+        self._pending: Deque[Tuple[Future, int, int]] = deque()
+
+        self._buffer = bytearray()
+        self._dictionary = b''
+        self._position = 0
+        self._closed = False
+
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.blocks: List[CompressedBlock] = []
+
+        self._write_out(self._compressor.header())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def independent_blocks(self) -> bool:
+        """Whether every block can be decompressed on its own."""
+        return self._compressor.independent
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        """Number of uncompressed bytes written so far."""
+        return self._position
+
+    def write(self, data) -> int:
+        """Buffer data, submitting every complete block for compression."""
+        if self._closed:
+            raise ValueError("I/O operation on closed compression writer")
+
+        self._buffer += data
+        length = len(data) if isinstance(data, (bytes, bytearray)) else memoryview(data).nbytes
+        self._position += length
+
+        if len(self._buffer) >= self._block_size:
+            view = memoryview(self._buffer)
+            offset = 0
+            while len(self._buffer) - offset >= self._block_size:
+                self._submit(bytes(view[offset:offset + self._block_size]), last=False)
+                offset += self._block_size
+            view.release()
+            del self._buffer[:offset]
+
+        return length
+
+    def flush(self) -> None:
+        """Flush compressed blocks that are already finished."""
+        while self._pending and self._pending[0][0].done():
+            self._write_block(self._pending.popleft())
+        self._fileobj.flush()
+
+    def close(self) -> None:
+        """Compress the remaining data and finish the compressed stream."""
+        if self._closed:
+            return
+        try:
+            # Shared-window gzip always needs a final block to end the deflate
+            # stream; independent blocks only need one if nothing was written
+            nothing_written = not self.blocks and not self._pending
+            if self._buffer or nothing_written or not self.independent_blocks:
+                self._submit(bytes(self._buffer), last=True)
+            self._buffer.clear()
+            while self._pending:
+                self._write_block(self._pending.popleft())
+            self._write_out(self._compressor.trailer())
+            self._fileobj.flush()
+        finally:
+            self._closed = True
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def abort(self) -> None:
+        """Stop without finishing the stream, discarding pending blocks."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'ParallelCompressionWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _submit(self, block: bytes, last: bool) -> None:
+        self._compressor.update(block)
+        dictionary = self._dictionary
+        self._dictionary = block[-DEFLATE_WINDOW_SIZE:]
+        future = self._executor.submit(self._compressor.compress, block, dictionary, last)
+        self._pending.append((future, self.bytes_in, len(block)))
+        self.bytes_in += len(block)
+
+        while len(self._pending) >= self._max_pending:
+            self._write_block(self._pending.popleft())
+
+    def _write_block(self, pending: Tuple[Future, int, int]) -> None:
+        future, offset, size = pending
+        compressed = future.result()
+        self.blocks.append(CompressedBlock(offset, size, self.bytes_out, len(compressed)))
+        self._write_out(compressed)
+
+    def _write_out(self, data: bytes) -> None:
+        if data:
+            self._fileobj.write(data)
+            self.bytes_out += len(data)
+
+
+class BlockIndexedReader:
+    """
+    Seekable read-only view of the uncompressed stream of independent blocks.
+
+    Reads decompress only the blocks covering the requested range, using the
+    block table recorded by ParallelCompressionWriter. The most recently
+    decompressed block is cached, so sequential reads decompress each block
+    once. The underlying file is not closed by this reader.
+    """
+
+    def __init__(self, fileobj: BinaryIO, codec: CompressionCodec, blocks: Sequence[CompressedBlock]):
+        """
+        Initialize the reader.
+
+        Args:
+            fileobj: Seekable binary file object holding the compressed stream
+            codec: Codec the blocks were compressed with
+            blocks: Block table in stream order
+        """
+        self._fileobj = fileobj
+        self._decompress = _BLOCK_DECOMPRESSORS[codec]
+        self._blocks = [block for block in blocks if block.size > 0]
+        self._starts = [block.offset for block in self._blocks]
+        self._length = self._blocks[-1].offset + self._blocks[-1].size if self._blocks else 0
+        self._position = 0
+        self._cached_index: Optional[int] = None
+        self._cached_data = b''
+        self.blocks_decompressed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._length
+        if offset < 0:
+            raise ValueError("Negative seek position")
+        self._position = offset
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = max(self._length - self._position, 0)
+
+        chunks = []
+        while size > 0 and self._position < self._length:
+            index = bisect.bisect_right(self._starts, self._position) - 1
+            data = self._block_data(index)
+            start = self._position - self._blocks[index].offset
+            chunk = data[start:start + size]
+            chunks.append(chunk)
+            self._position += len(chunk)
+            size -= len(chunk)
+
+        return b''.join(chunks)
+
+    def close(self) -> None:
+        self._cached_data = b''
+
+    def _block_data(self, index: int) -> bytes:
+        if index != self._cached_index:
+            block = self._blocks[index]
+            self._fileobj.seek(block.compressed_offset)
+            self._cached_data = self._decompress(self._fileobj.read(block.compressed_size))
+            self._cached_index = index
+            self.blocks_decompressed += 1
+        return self._cached_data
+
+
+class ParallelBlockReader:
+    """
+    Sequential read-only view of independent blocks, decompressed ahead on a thread pool.
+
+    Reading an archive front to back, e.g. to verify it, is otherwise bound
+    by single-threaded decompression. Compressed blocks are read in order on
+    the calling thread and decompressed by up to ``workers`` threads, with at
+    most twice as many blocks in flight. The underlying file is not closed by
+    this reader.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        codec: CompressionCodec,
+        blocks: Sequence[CompressedBlock],
+        workers: Optional[int] = None
+    ):
+        """
+        Initialize the reader.
+
+        Args:
+            fileobj: Binary file object holding the compressed stream
+            codec: Codec the blocks were compressed with
+            blocks: Block table in stream order
+            workers: Number of decompression threads (defaults to CPU count)
+        """
+        self._fileobj = fileobj
+        self._decompress = _BLOCK_DECOMPRESSORS[codec]
+        self._blocks = deque(block for block in blocks if block.size > 0)
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tellus-decompress")
+        self._pending: Deque[Future] = deque()
+        self._data = b''
+        self._position = 0
+        self.blocks_decompressed = 0
+
+    def __enter__(self) -> 'ParallelBlockReader':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while size is None or size < 0 or size > 0:
+            if self._position >= len(self._data):
+                if not self._next_block():
+                    break
+            end = len(self._data) if size is None or size < 0 else self._position + size
+            chunk = self._data[self._position:end]
+            self._position += len(chunk)
+            if size is not None and size > 0:
+                size -= len(chunk)
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def close(self) -> None:
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=True)
+        self._data = b''
+
+    def _next_block(self) -> bool:
+        """Move on to the next decompressed block; False at the end of the stream."""
+        while self._blocks and len(self._pending) < 2 * self.workers:
+            block = self._blocks.popleft()
+            self._fileobj.seek(block.compressed_offset)
+            self._pending.append(
+                self._executor.submit(self._decompress, self._fileobj.read(block.compressed_size))
+            )
+        if not self._pending:
+            return False
+
+        self._data = self._pending.popleft().result()
+        self._position = 0
+        self.blocks_decompressed += 1
+        return True
+
+
+def _open_decompressed(raw_file: BinaryIO) -> BinaryIO:
+    """Wrap a raw file in a decompressor chosen by its magic bytes."""
+    magic = raw_file.read(6)
+    raw_file.seek(0)
+
+    # These readers all continue across concatenated members, streams and frames
+    if magic.startswith(ZSTD_MAGIC):
+        zstandard = _import_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(raw_file, read_across_frames=True, closefd=False)
+    if magic.startswith(b'\x1f\x8b'):
+        return gzip.GzipFile(fileobj=raw_file, mode='rb')
+    if magic.startswith(b'\xfd7zXZ\x00'):
+        return lzma.LZMAFile(raw_file, mode='rb')
+    if magic.startswith(b'BZh'):
+        return bz2.BZ2File(raw_file, mode='rb')
+    return nullcontext(raw_file)
+
+
+@contextmanager
+def open_tar_stream(archive: Union[Path, BinaryIO]) -> Iterator[tarfile.TarFile]:
+    """
+    Open a tarball for a single sequential pass over its members.
+
+    Handles uncompressed, gzip, bzip2, xz and zstd tarballs, including the
+    multi-block output of ParallelCompressionWriter. The archive is a path or
+    an open binary file, e.g. on a remote filesystem, which is not closed.
+    """
+    with (open(archive, 'rb') if isinstance(archive, Path) else nullcontext(archive)) as raw_file, \
+            _open_decompressed(raw_file) as stream, \
+            tarfile.open(fileobj=stream, mode='r|') as tar:
+        yield tar
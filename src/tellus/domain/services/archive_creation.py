@@ -7,37 +7,39 @@ It integrates with the domain model to provide rich archive creation capabilitie
 with progress tracking and robust error handling.
 """
 
-import hashlib
 import logging
 import os
 import tarfile
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Union
+from typing import Any, BinaryIO, Callable, ContextManager, Dict, List, Optional, Set, Union
 
 from ..entities.archive import (ArchiveId, ArchiveMetadata, ArchiveType,
-                                Checksum, LocationContext)
+                                Checksum)
 from ..entities.location import LocationEntity
 from ..entities.simulation_file import (FileContentType, FileImportance,
                                         FileInventory, SimulationFile)
+from .archive_compression import (CompressionCodec, CompressionLevel,
+                                  ParallelCompressionWriter)
+from .archive_index import ArchiveMemberIndex
+from .archive_splitting import (part_archive_id, part_archive_path,
+                                plan_archive_parts, split_sidecar_section)
+from .archive_target import (DEFAULT_UPLOAD_BLOCK_SIZE, ArchiveTarget,
+                             ChecksumWriter)
+from .archive_verification import (ArchiveVerifier, ManifestEntry,
+                                   VerificationLevel, VerificationReport)
+from .checksums import HashingReader, preferred_checksum_algorithm
 from .file_scanner import FileScanner, FileScanResult
 from .sidecar_metadata import SidecarMetadata
 
 logger = logging.getLogger(__name__)
 
 
-class CompressionLevel(Enum):
-    """Compression levels for archive creation."""
-    NONE = 0     # No compression (tar only)
-    FAST = 1     # Fast compression
-    BALANCED = 6 # Balanced speed/size
-    BEST = 9     # Best compression
-
-
 @dataclass
 class ArchiveCreationFilter:
     """Configuration for filtering files during archive creation."""
@@ -141,17 +143,37 @@ class ArchiveCreationConfig:
     
     # Archive settings
     compression_level: CompressionLevel = CompressionLevel.BALANCED
+    compression_codec: CompressionCodec = CompressionCodec.GZIP
+    compression_workers: Optional[int] = None  # Compression threads, defaults to CPU count
+    compression_block_size: Optional[int] = None  # Uncompressed bytes per block, defaults per codec
+    
+    # Write a member offset index with independently decompressible blocks,
+    # so single files can be extracted without decompressing the whole archive
+    create_member_index: bool = True
     preserve_permissions: bool = True
     preserve_timestamps: bool = True
     follow_symlinks: bool = False
     
     # Size and performance limits
     max_archive_size: Optional[int] = None  # Maximum archive size in bytes
+    # Split archives larger than max_archive_size into parts instead of failing;
+    # files are grouped by content type and simulation month before packing
+    split_archives: bool = True
+    split_by_content_type: bool = True
+    split_by_date: bool = True
+    split_workers: Optional[int] = None  # Parts created concurrently, defaults to CPU count
     chunk_size: int = 64 * 1024  # Read chunk size for streaming
     
     # Validation settings
-    compute_checksums: bool = True
+    compute_checksums: bool = True  # Archive and member checksums, computed while archiving
+    checksum_algorithm: Optional[str] = None  # Defaults to BLAKE3 or xxHash if installed, else sha256
     verify_after_creation: bool = True
+    # FAST checks the member index, SAMPLE also hashes a few members, FULL
+    # hashes every member in one pass; all compare against the checksums
+    # recorded while archiving
+    verification_level: VerificationLevel = VerificationLevel.SAMPLE
+    verification_sample_size: int = 10
+    verification_workers: Optional[int] = None  # Decompression threads, defaults to CPU count
     
     # Progress tracking
     progress_update_interval: int = 100  # Update progress every N files
@@ -160,6 +182,11 @@ class ArchiveCreationConfig:
     use_temp_file: bool = True
     temp_dir: Optional[Path] = None
     cleanup_temp_on_error: bool = True
+    
+    # Write the archive, sidecar and index straight into the filesystem of
+    # the archive's location instead of a local path
+    stream_to_location: bool = False
+    upload_block_size: int = DEFAULT_UPLOAD_BLOCK_SIZE  # Bytes buffered per upload request
 
 
 class ArchiveCreationResult:
@@ -169,8 +196,20 @@ class ArchiveCreationResult:
         self.success: bool = False
         self.archive_path: Optional[Path] = None
         self.sidecar_path: Optional[Path] = None
+        self.index_path: Optional[Path] = None
         self.archive_metadata: Optional[ArchiveMetadata] = None
         
+        # Size and checksum of the archive, computed while it was written
+        self.archive_size: Optional[int] = None
+        self.archive_checksum: Optional[Checksum] = None
+        # Size and checksum of every member's data, recorded while archiving
+        self.manifest: Dict[str, ManifestEntry] = {}
+        self.verification: Optional[VerificationReport] = None
+        
+        # Results and paths of the parts, if the archive was split
+        self.parts: List['ArchiveCreationResult'] = []
+        self.part_paths: List[Path] = []
+        
         # Statistics
         self.files_processed: int = 0
         self.files_included: int = 0
@@ -219,14 +258,21 @@ class ArchiveCreationService:
     archive creation capabilities with comprehensive error handling and progress tracking.
     """
     
-    def __init__(self, file_scanner: Optional[FileScanner] = None):
+    def __init__(
+        self,
+        file_scanner: Optional[FileScanner] = None,
+        filesystem_factory: Optional[Callable[[LocationEntity], Any]] = None
+    ):
         """
         Initialize the archive creation service.
         
         Args:
             file_scanner: Optional custom file scanner (creates default if None)
+            filesystem_factory: Optional factory creating the fsspec filesystem of a
+                location when streaming to it (uses the location's protocol if None)
         """
         self._file_scanner = file_scanner or FileScanner()
+        self._filesystem_factory = filesystem_factory
         self._logger = logger
     
     def create_archive(
@@ -270,13 +316,16 @@ class ArchiveCreationService:
         tags = tags or set()
         
         start_time = time.time()
+        target: Optional[ArchiveTarget] = None
         
         try:
+            target = self._archive_target(location, creation_config)
+            
             self._logger.info(f"Starting archive creation: {archive_id} from {source_directory}")
             
             # Validate inputs
             validation_errors = self._validate_inputs(
-                source_directory, archive_path, archive_id, location
+                source_directory, archive_path, archive_id, location, target
             )
             if validation_errors:
                 for error in validation_errors:
@@ -315,77 +364,48 @@ class ArchiveCreationService:
             result.files_included = filtered_inventory.file_count
             result.files_excluded = scan_result.inventory.file_count - filtered_inventory.file_count
             
-            # Step 3: Validate archive size limits
+            # Step 3: Validate archive size limits, splitting oversized archives
+            split = False
             if creation_config.max_archive_size:
                 if filtered_inventory.total_size > creation_config.max_archive_size:
-                    result.add_error(
-                        f"Filtered content size ({filtered_inventory.total_size} bytes) "
-                        f"exceeds maximum archive size ({creation_config.max_archive_size} bytes)"
-                    )
-                    return result
+                    if not creation_config.split_archives:
+                        result.add_error(
+                            f"Filtered content size ({filtered_inventory.total_size} bytes) "
+                            f"exceeds maximum archive size ({creation_config.max_archive_size} bytes)"
+                        )
+                        return result
+                    split = True
             
             # Step 4: Create archive metadata
-            archive_metadata = self._create_archive_metadata(
-                archive_id, location, simulation_id, simulation_date,
-                version, description, tags, filtered_inventory
-            )
-            
-            # Step 5: Create the actual tarball
-            if progress_callback:
-                progress_callback(30, 100, "Creating tarball")
-            
-            compress_start = time.time()
-            tarball_success = self._create_tarball(
-                source_directory, archive_path, filtered_inventory,
-                creation_config, progress_callback, result
-            )
-            result.compression_time = time.time() - compress_start
-            
-            if not tarball_success:
-                return result
-            
-            # Step 6: Compute final checksums and update metadata
-            if progress_callback:
-                progress_callback(80, 100, "Computing checksums")
-            
-            self._finalize_archive_metadata(archive_path, archive_metadata, creation_config)
-            
-            # Step 7: Verify archive integrity if requested
-            if creation_config.verify_after_creation:
-                if progress_callback:
-                    progress_callback(90, 100, "Verifying archive")
-                
-                verify_start = time.time()
-                verification_success = self._verify_archive_integrity(
-                    archive_path, filtered_inventory, result
+            def create_metadata(metadata_id: ArchiveId, inventory: FileInventory) -> ArchiveMetadata:
+                return self._create_archive_metadata(
+                    metadata_id, location, simulation_id, simulation_date,
+                    version, description, tags, inventory
                 )
-                result.verification_time = time.time() - verify_start
-                
-                if not verification_success:
-                    return result
             
-            # Step 8: Create sidecar metadata file
-            if progress_callback:
-                progress_callback(95, 100, "Creating metadata")
+            archive_metadata = create_metadata(archive_id, filtered_inventory)
             
-            metadata_start = time.time()
-            sidecar_path = self._create_sidecar_metadata(
-                archive_path, archive_metadata, result
-            )
-            result.metadata_time = time.time() - metadata_start
+            # Steps 5-8: Create the tarball, or its parts, with verification and sidecar
+            if split:
+                archive_success = self._create_split_archive(
+                    source_directory, archive_path, archive_metadata, filtered_inventory,
+                    create_metadata, creation_config, progress_callback, result, target
+                )
+            else:
+                archive_success = self._write_archive(
+                    source_directory, archive_path, archive_metadata, filtered_inventory,
+                    creation_config, progress_callback, result, target
+                )
+            if not archive_success:
+                return result
             
             # Finalize result
-            result.success = True
-            result.archive_path = archive_path
-            result.sidecar_path = sidecar_path
             result.archive_metadata = archive_metadata
             result.bytes_processed = filtered_inventory.total_size
             
             # Calculate compression ratio
-            if archive_path.exists():
-                archive_size = archive_path.stat().st_size
-                if filtered_inventory.total_size > 0:
-                    result.compression_ratio = archive_size / filtered_inventory.total_size
+            if result.archive_size is not None and filtered_inventory.total_size > 0:
+                result.compression_ratio = result.archive_size / filtered_inventory.total_size
             
             result.creation_time = time.time() - start_time
             
@@ -394,7 +414,7 @@ class ArchiveCreationService:
             
             self._logger.info(
                 f"Archive creation completed: {archive_id}, "
-                f"{result.files_included} files, "
+                f"{result.files_included} files in {max(len(result.parts), 1)} archive(s), "
                 f"{result.bytes_processed / (1024**2):.1f} MB in {result.creation_time:.1f}s"
             )
             
@@ -405,11 +425,167 @@ class ArchiveCreationService:
             self._logger.exception("Archive creation failed")
             
             # Cleanup on error if requested
-            if creation_config.cleanup_temp_on_error:
-                self._cleanup_on_error(archive_path, result)
+            if creation_config.cleanup_temp_on_error and target is not None:
+                self._cleanup_on_error(archive_path, result, target)
             
             return result
     
+    def _write_archive(
+        self,
+        source_directory: Path,
+        archive_path: Path,
+        archive_metadata: ArchiveMetadata,
+        inventory: FileInventory,
+        creation_config: ArchiveCreationConfig,
+        progress_callback: Optional[Callable[[int, int, str], None]],
+        result: ArchiveCreationResult,
+        target: ArchiveTarget,
+        split_info: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Create, verify and describe one tarball; returns whether it succeeded."""
+        # Step 5: Create the actual tarball
+        if progress_callback:
+            progress_callback(30, 100, "Creating tarball")
+        
+        compress_start = time.time()
+        tarball_success = self._create_tarball(
+            source_directory, archive_path, inventory,
+            creation_config, progress_callback, result, target
+        )
+        result.compression_time = time.time() - compress_start
+        
+        if not tarball_success:
+            return False
+        
+        # Step 6: Compute final checksums and update metadata
+        if progress_callback:
+            progress_callback(80, 100, "Computing checksums")
+        
+        self._finalize_archive_metadata(archive_metadata, result)
+        
+        # Step 7: Verify archive integrity if requested
+        if creation_config.verify_after_creation:
+            if progress_callback:
+                progress_callback(90, 100, "Verifying archive")
+            
+            verify_start = time.time()
+            verification_success = self._verify_archive_integrity(
+                archive_path, target, inventory, result, creation_config
+            )
+            result.verification_time = time.time() - verify_start
+            
+            if not verification_success:
+                return False
+        
+        # Step 8: Create sidecar metadata file
+        if progress_callback:
+            progress_callback(95, 100, "Creating metadata")
+        
+        metadata_start = time.time()
+        sidecar_path = self._create_sidecar_metadata(
+            archive_path, archive_metadata, result, target, split_info
+        )
+        result.metadata_time = time.time() - metadata_start
+        
+        result.success = True
+        result.archive_path = archive_path
+        result.sidecar_path = sidecar_path
+        result.archive_metadata = archive_metadata
+        result.bytes_processed = inventory.total_size
+        return True
+    
+    def _create_split_archive(
+        self,
+        source_directory: Path,
+        archive_path: Path,
+        archive_metadata: ArchiveMetadata,
+        inventory: FileInventory,
+        create_metadata: Callable[[ArchiveId, FileInventory], ArchiveMetadata],
+        creation_config: ArchiveCreationConfig,
+        progress_callback: Optional[Callable[[int, int, str], None]],
+        result: ArchiveCreationResult,
+        target: ArchiveTarget
+    ) -> bool:
+        """Create size-bounded parts of an archive concurrently; returns whether all succeeded."""
+        part_inventories = plan_archive_parts(
+            inventory,
+            creation_config.max_archive_size,
+            group_by_content_type=creation_config.split_by_content_type,
+            group_by_date=creation_config.split_by_date
+        )
+        part_count = len(part_inventories)
+        part_paths = [part_archive_path(archive_path, n) for n in range(1, part_count + 1)]
+        part_ids = [ArchiveId(part_archive_id(archive_metadata.archive_id, n)) for n in range(1, part_count + 1)]
+        
+        for part_path in part_paths:
+            if target.exists(part_path):
+                result.add_error(f"Archive path already exists: {target.describe(part_path)}")
+        if result.has_errors:
+            return False
+        
+        self._logger.info(
+            f"Splitting archive {archive_metadata.archive_id} of {inventory.total_size} bytes "
+            f"into {part_count} parts of at most {creation_config.max_archive_size} bytes"
+        )
+        if progress_callback:
+            progress_callback(30, 100, f"Creating {part_count} archive parts")
+        
+        result.parts = [ArchiveCreationResult() for _ in range(part_count)]
+        part_id_strings = [str(part_id) for part_id in part_ids]
+        
+        def create_part(i: int) -> bool:
+            result.parts[i].files_included = part_inventories[i].file_count
+            split_info = split_sidecar_section(archive_metadata.archive_id, i + 1, part_id_strings, part_paths)
+            return self._write_archive(
+                source_directory, part_paths[i], create_metadata(part_ids[i], part_inventories[i]),
+                part_inventories[i], creation_config, None, result.parts[i], target, split_info
+            )
+        
+        # Each part compresses on its own thread pool; running parts side by
+        # side overlaps reading, compressing and writing across parts
+        workers = creation_config.split_workers or min(part_count, os.cpu_count() or 1)
+        compress_start = time.time()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tellus-archive-part") as executor:
+            futures = {executor.submit(create_part, i): i for i in range(part_count)}
+            for completed, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    result.parts[i].add_error(f"Archive part creation failed with exception: {str(e)}")
+                if progress_callback:
+                    progress_callback(
+                        30 + int(65 * completed / part_count), 100,
+                        f"Created archive part {completed}/{part_count}"
+                    )
+        result.compression_time = time.time() - compress_start
+        
+        for part_path, part_result in zip(part_paths, result.parts):
+            for error in part_result.errors:
+                result.errors.append(f"{part_path.name}: {error}")
+            for warning in part_result.warnings:
+                result.warnings.append(f"{part_path.name}: {warning}")
+            result.manifest.update(part_result.manifest)
+            result.verification_time += part_result.verification_time
+            result.metadata_time += part_result.metadata_time
+        
+        if not all(part_result.success for part_result in result.parts):
+            if creation_config.cleanup_temp_on_error:
+                for part_path in part_paths:
+                    self._cleanup_on_error(part_path, result, target)
+            return False
+        
+        # The archive as a whole is described by its parts; converted to a
+        # SimulationFile, its archive paths become split_archive_parts
+        result.archive_size = sum(part_result.archive_size or 0 for part_result in result.parts)
+        archive_metadata.archive_type = ArchiveType.SPLIT_TARBALL
+        archive_metadata.archive_paths = {str(part_path) for part_path in part_paths}
+        archive_metadata.size = result.archive_size
+        
+        result.success = True
+        result.part_paths = part_paths
+        return True
+    
     def create_selective_archive(
         self,
         source_directory: Path,
@@ -450,13 +626,16 @@ class ArchiveCreationService:
         tags = tags or set()
         
         start_time = time.time()
+        target: Optional[ArchiveTarget] = None
         
         try:
+            target = self._archive_target(location, creation_config)
+            
             self._logger.info(f"Starting selective archive creation: {archive_id}")
             
             # Validate inputs
             validation_errors = self._validate_inputs(
-                source_directory, archive_path, archive_id, location
+                source_directory, archive_path, archive_id, location, target
             )
             if validation_errors:
                 for error in validation_errors:
@@ -475,7 +654,8 @@ class ArchiveCreationService:
             scan_result = self._file_scanner.scan_file_list(
                 source_directory, file_list, 
                 simulation_context={'simulation_id': simulation_id},
-                compute_checksums=creation_config.compute_checksums,
+                # Member checksums are computed while the files are archived
+                compute_checksums=False,
                 progress_callback=lambda current, total: progress_callback(
                     int(10 + (current / total) * 10), 100, "Scanning files"
                 ) if progress_callback else None
@@ -504,7 +684,7 @@ class ArchiveCreationService:
             compress_start = time.time()
             tarball_success = self._create_tarball(
                 source_directory, archive_path, scan_result.inventory,
-                creation_config, progress_callback, result
+                creation_config, progress_callback, result, target
             )
             result.compression_time = time.time() - compress_start
             
@@ -512,7 +692,7 @@ class ArchiveCreationService:
                 return result
             
             # Finalize the same way as regular archives
-            self._finalize_archive_metadata(archive_path, archive_metadata, creation_config)
+            self._finalize_archive_metadata(archive_metadata, result)
             
             if creation_config.verify_after_creation:
                 if progress_callback:
@@ -520,7 +700,7 @@ class ArchiveCreationService:
                 
                 verify_start = time.time()
                 verification_success = self._verify_archive_integrity(
-                    archive_path, scan_result.inventory, result
+                    archive_path, target, scan_result.inventory, result, creation_config
                 )
                 result.verification_time = time.time() - verify_start
                 
@@ -532,7 +712,7 @@ class ArchiveCreationService:
             
             metadata_start = time.time()
             sidecar_path = self._create_sidecar_metadata(
-                archive_path, archive_metadata, result
+                archive_path, archive_metadata, result, target
             )
             result.metadata_time = time.time() - metadata_start
             
@@ -544,10 +724,8 @@ class ArchiveCreationService:
             result.bytes_processed = scan_result.inventory.total_size
             result.creation_time = time.time() - start_time
             
-            if archive_path.exists():
-                archive_size = archive_path.stat().st_size
-                if scan_result.inventory.total_size > 0:
-                    result.compression_ratio = archive_size / scan_result.inventory.total_size
+            if result.archive_size is not None and scan_result.inventory.total_size > 0:
+                result.compression_ratio = result.archive_size / scan_result.inventory.total_size
             
             if progress_callback:
                 progress_callback(100, 100, "Complete")
@@ -559,8 +737,8 @@ class ArchiveCreationService:
             result.add_error(f"Selective archive creation failed: {str(e)}")
             self._logger.exception("Selective archive creation failed")
             
-            if creation_config.cleanup_temp_on_error:
-                self._cleanup_on_error(archive_path, result)
+            if creation_config.cleanup_temp_on_error and target is not None:
+                self._cleanup_on_error(archive_path, result, target)
             
             return result
     
@@ -633,7 +811,8 @@ class ArchiveCreationService:
         source_directory: Path,
         archive_path: Path,
         archive_id: ArchiveId,
-        location: LocationEntity
+        location: LocationEntity,
+        target: ArchiveTarget
     ) -> List[str]:
         """Validate input parameters for archive creation."""
         errors = []
@@ -643,13 +822,13 @@ class ArchiveCreationService:
         elif not source_directory.is_dir():
             errors.append(f"Source path is not a directory: {source_directory}")
         
-        if archive_path.exists():
-            errors.append(f"Archive path already exists: {archive_path}")
+        if target.exists(archive_path):
+            errors.append(f"Archive path already exists: {target.describe(archive_path)}")
         
         parent_dir = archive_path.parent
-        if not parent_dir.exists():
+        if not target.exists(parent_dir):
             try:
-                parent_dir.mkdir(parents=True)
+                target.makedirs(parent_dir)
             except Exception as e:
                 errors.append(f"Cannot create archive parent directory: {e}")
         
@@ -661,6 +840,21 @@ class ArchiveCreationService:
         
         return errors
     
+    def _archive_target(
+        self,
+        location: LocationEntity,
+        creation_config: ArchiveCreationConfig
+    ) -> ArchiveTarget:
+        """Get the filesystem the archive is written to."""
+        if not creation_config.stream_to_location:
+            return ArchiveTarget()
+        
+        return ArchiveTarget.for_location(
+            location,
+            filesystem_factory=self._filesystem_factory,
+            block_size=creation_config.upload_block_size
+        )
+    
     def _scan_source_directory(
         self,
         source_directory: Path,
@@ -673,7 +867,8 @@ class ArchiveCreationService:
             simulation_context=None,
             include_patterns=None,
             exclude_patterns=None,
-            compute_checksums=creation_config.compute_checksums,
+            # Member checksums are computed while the files are archived
+            compute_checksums=False,
             max_workers=4,
             progress_callback=lambda current, total: progress_callback(
                 int(5 + (current / total) * 15), 100, f"Scanning files ({current}/{total})"
@@ -729,20 +924,22 @@ class ArchiveCreationService:
         inventory: FileInventory,
         creation_config: ArchiveCreationConfig,
         progress_callback: Optional[Callable[[int, int, str], None]],
-        result: ArchiveCreationResult
+        result: ArchiveCreationResult,
+        target: ArchiveTarget
     ) -> bool:
         """Create the actual tarball file."""
         try:
-            # Determine compression mode
+            # Determine archive suffix
             if creation_config.compression_level == CompressionLevel.NONE:
-                mode = 'w'
                 temp_suffix = '.tar'
             else:
-                mode = f'w:gz'
-                temp_suffix = '.tar.gz'
+                temp_suffix = '.tar' + creation_config.compression_codec.suffix
             
-            # Use temporary file if requested
-            if creation_config.use_temp_file:
+            # Use temporary file if requested; when streaming it is written
+            # next to the archive, as there is no local copy to move
+            if creation_config.use_temp_file and target.is_remote:
+                working_path = target.partial_path(archive_path)
+            elif creation_config.use_temp_file:
                 temp_dir = creation_config.temp_dir or archive_path.parent
                 temp_fd, temp_path = tempfile.mkstemp(suffix=temp_suffix, dir=temp_dir)
                 os.close(temp_fd)  # Close the file descriptor
@@ -753,12 +950,19 @@ class ArchiveCreationService:
             try:
                 files_to_archive = inventory.list_files()
                 total_files = len(files_to_archive)
+                member_index = ArchiveMemberIndex() if creation_config.create_member_index else None
                 
-                with tarfile.open(working_path, mode) as tar:
-                    # Set compression level for gzip
-                    if hasattr(tar, 'compresslevel') and creation_config.compression_level != CompressionLevel.NONE:
-                        tar.compresslevel = creation_config.compression_level.value
-                    
+                # Tar headers and data are written in order by this thread
+                # while the compression writer compresses blocks on its pool.
+                # Member and archive checksums are computed from the bytes as
+                # they pass through, so no file is read twice.
+                checksum_algorithm = None
+                if creation_config.compute_checksums:
+                    checksum_algorithm = creation_config.checksum_algorithm or preferred_checksum_algorithm()
+                with target.open_write(working_path) as raw_file, \
+                        ChecksumWriter(raw_file, checksum_algorithm) as checksum_writer, \
+                        self._open_compression_stream(checksum_writer, creation_config) as stream, \
+                        tarfile.open(fileobj=stream, mode='w') as tar:
                     for i, sim_file in enumerate(files_to_archive):
                         try:
                             full_path = source_directory / sim_file.relative_path
@@ -784,22 +988,26 @@ class ArchiveCreationService:
                             # Handle symlinks
                             if tarinfo.islnk() or tarinfo.issym():
                                 if not creation_config.follow_symlinks:
-                                    tar.addfile(tarinfo)
+                                    self._add_tar_member(tar, tarinfo, None, member_index)
+                                    result.manifest[tarinfo.name] = ManifestEntry(None)
                                     continue
                                 else:
                                     # Follow the symlink
                                     if full_path.is_file():
-                                        with open(full_path, 'rb') as f:
-                                            tarinfo.size = full_path.stat().st_size
-                                            tar.addfile(tarinfo, f)
+                                        tarinfo.size = full_path.stat().st_size
+                                        result.manifest[tarinfo.name] = self._add_file_member(
+                                            tar, tarinfo, full_path, sim_file, member_index, checksum_algorithm
+                                        )
                                     continue
                             
                             # Add regular files
                             if tarinfo.isfile():
-                                with open(full_path, 'rb') as f:
-                                    tar.addfile(tarinfo, f)
+                                result.manifest[tarinfo.name] = self._add_file_member(
+                                    tar, tarinfo, full_path, sim_file, member_index, checksum_algorithm
+                                )
                             else:
-                                tar.addfile(tarinfo)
+                                self._add_tar_member(tar, tarinfo, None, member_index)
+                                result.manifest[tarinfo.name] = ManifestEntry(None)
                             
                             # Update progress
                             if progress_callback and (i + 1) % creation_config.progress_update_interval == 0:
@@ -812,119 +1020,215 @@ class ArchiveCreationService:
                         except Exception as e:
                             result.add_error(f"Failed to archive file {sim_file.relative_path}: {str(e)}")
                 
+                result.archive_size = checksum_writer.bytes_written
+                if checksum_algorithm:
+                    result.archive_checksum = Checksum(
+                        value=checksum_writer.hexdigest(), algorithm=checksum_algorithm
+                    )
+                
                 # Move temp file to final location if using temp file
                 if creation_config.use_temp_file:
-                    working_path.rename(archive_path)
+                    target.replace(working_path, archive_path)
+                
+                if member_index is not None:
+                    self._write_member_index(archive_path, member_index, stream, result, target)
                 
                 return True
                 
             except Exception as e:
                 # Clean up temp file on error
-                if creation_config.use_temp_file and working_path.exists():
-                    working_path.unlink()
+                if creation_config.use_temp_file:
+                    target.remove(working_path)
                 raise e
                 
         except Exception as e:
             result.add_error(f"Failed to create tarball: {str(e)}")
             return False
     
-    def _finalize_archive_metadata(
+    def _open_compression_stream(
+        self,
+        raw_file: BinaryIO,
+        creation_config: ArchiveCreationConfig
+    ) -> ContextManager[BinaryIO]:
+        """Wrap the archive file in the configured compression writer."""
+        if creation_config.compression_level == CompressionLevel.NONE:
+            return nullcontext(raw_file)
+        
+        return ParallelCompressionWriter(
+            raw_file,
+            codec=creation_config.compression_codec,
+            level=creation_config.compression_level,
+            workers=creation_config.compression_workers,
+            block_size=creation_config.compression_block_size,
+            independent_blocks=creation_config.create_member_index
+        )
+    
+    def _add_tar_member(
+        self,
+        tar: tarfile.TarFile,
+        tarinfo: tarfile.TarInfo,
+        fileobj: Optional[BinaryIO],
+        member_index: Optional[ArchiveMemberIndex]
+    ) -> None:
+        """Add a member to the tarball, recording its offsets in the index."""
+        header_offset = tar.offset
+        tar.addfile(tarinfo, fileobj)
+        if member_index is not None:
+            member_index.add_member(tarinfo, header_offset, tar.offset, has_data=fileobj is not None)
+    
+    def _add_file_member(
+        self,
+        tar: tarfile.TarFile,
+        tarinfo: tarfile.TarInfo,
+        full_path: Path,
+        sim_file: SimulationFile,
+        member_index: Optional[ArchiveMemberIndex],
+        checksum_algorithm: Optional[str]
+    ) -> ManifestEntry:
+        """Add a file to the tarball, returning the size and checksum of its archived data."""
+        with open(full_path, 'rb') as f:
+            if checksum_algorithm is None:
+                self._add_tar_member(tar, tarinfo, f, member_index)
+                return ManifestEntry(tarinfo.size)
+            
+            reader = HashingReader(f, checksum_algorithm)
+            self._add_tar_member(tar, tarinfo, reader, member_index)
+            sim_file.checksum = Checksum(value=reader.hexdigest(), algorithm=checksum_algorithm)
+            return ManifestEntry(tarinfo.size, reader.hexdigest(), checksum_algorithm)
+    
+    def _write_member_index(
         self,
         archive_path: Path,
+        member_index: ArchiveMemberIndex,
+        stream: BinaryIO,
+        result: ArchiveCreationResult,
+        target: ArchiveTarget
+    ) -> None:
+        """Write the member offset index next to the finished archive."""
+        if isinstance(stream, ParallelCompressionWriter):
+            member_index.codec = stream.codec
+            member_index.blocks = stream.blocks
+        
+        try:
+            if target.is_remote:
+                member_index.archive_size = result.archive_size
+                result.index_path = target.write_json(
+                    ArchiveMemberIndex.index_path(archive_path), member_index.to_dict()
+                )
+            else:
+                result.index_path = member_index.write(archive_path)
+        except Exception as e:
+            # Extraction falls back to scanning the archive without an index
+            result.add_warning(f"Failed to write archive index: {str(e)}")
+    
+    def _finalize_archive_metadata(
+        self,
         metadata: ArchiveMetadata,
-        creation_config: ArchiveCreationConfig
+        result: ArchiveCreationResult
     ) -> None:
-        """Finalize archive metadata with size and checksum information."""
-        if archive_path.exists():
-            stat_info = archive_path.stat()
-            metadata.size = stat_info.st_size
-            
-            # Compute archive checksum if requested
-            if creation_config.compute_checksums:
-                checksum = self._compute_file_checksum(archive_path)
-                metadata.checksum = checksum
+        """Finalize archive metadata with the size and checksum computed while writing."""
+        if result.archive_size is not None:
+            metadata.size = result.archive_size
+        if result.archive_checksum is not None:
+            metadata.checksum = result.archive_checksum
     
     def _verify_archive_integrity(
         self,
         archive_path: Path,
+        target: ArchiveTarget,
         inventory: FileInventory,
-        result: ArchiveCreationResult
+        result: ArchiveCreationResult,
+        creation_config: ArchiveCreationConfig
     ) -> bool:
-        """Verify the integrity of the created archive."""
+        """Verify the created archive against the manifest recorded while creating it."""
         try:
-            with tarfile.open(archive_path, 'r:*') as tar:
-                # Get list of files in archive
-                archive_members = set(tar.getnames())
-                inventory_files = set(f.relative_path for f in inventory.list_files())
-                
-                # Check that all expected files are present
-                missing_files = inventory_files - archive_members
-                if missing_files:
-                    for missing in missing_files:
-                        result.add_error(f"File missing from archive: {missing}")
-                    return False
-                
-                # Check for unexpected files (shouldn't happen, but good to verify)
-                unexpected_files = archive_members - inventory_files
-                if unexpected_files:
-                    for unexpected in unexpected_files:
-                        result.add_warning(f"Unexpected file in archive: {unexpected}")
-                
-                # Try to read a few random files to verify they're not corrupted
-                import random
-                sample_size = min(10, len(archive_members))
-                sample_files = random.sample(list(archive_members), sample_size)
-                
-                for member_name in sample_files:
-                    try:
-                        member = tar.getmember(member_name)
-                        if member.isfile():
-                            # Try to read the file
-                            f = tar.extractfile(member)
-                            if f:
-                                f.read(1024)  # Read first 1KB
-                                f.close()
-                    except Exception as e:
-                        result.add_error(f"Archive verification failed for {member_name}: {str(e)}")
-                        return False
-            
-            return True
+            inventory_files = set(f.relative_path for f in inventory.list_files())
+            if not self._check_archive_members(inventory_files, set(result.manifest), result):
+                return False
+            
+            # The index is read back as written, so a damaged index fails here
+            # rather than when extracting from the archive
+            member_index = None
+            if result.index_path is not None:
+                if target.is_remote:
+                    member_index = ArchiveMemberIndex.from_dict(target.read_json(result.index_path))
+                else:
+                    member_index = ArchiveMemberIndex.load(archive_path)
+            
+            level = creation_config.verification_level
+            if level is VerificationLevel.SAMPLE and target.is_remote and member_index is None:
+                # Hashing a sample would download the whole streamed archive again
+                level = VerificationLevel.FAST
+            
+            verifier = ArchiveVerifier(
+                level,
+                sample_size=creation_config.verification_sample_size,
+                workers=creation_config.verification_workers
+            )
+            report = verifier.verify(result.manifest, lambda: target.open_read(archive_path), member_index)
+            result.verification = report
+            
+            for missing in report.missing:
+                result.add_error(f"File missing from archive: {missing}")
+            for mismatch in report.mismatched:
+                result.add_error(f"Archive verification failed for {mismatch}")
+            for unexpected in report.unexpected:
+                result.add_warning(f"Unexpected file in archive: {unexpected}")
+            
+            self._logger.info(
+                f"Verified {report.members_checked} members of {target.describe(archive_path)} "
+                f"({report.level.value}, {report.bytes_hashed} bytes hashed in {report.elapsed:.2f}s)"
+            )
+            return report.success
             
         except Exception as e:
             result.add_error(f"Archive verification failed: {str(e)}")
             return False
     
+    def _check_archive_members(
+        self,
+        inventory_files: Set[str],
+        archive_members: Set[str],
+        result: ArchiveCreationResult
+    ) -> bool:
+        """Check that the archive holds exactly the inventory's files."""
+        # Check that all expected files are present
+        missing_files = inventory_files - archive_members
+        if missing_files:
+            for missing in missing_files:
+                result.add_error(f"File missing from archive: {missing}")
+            return False
+        
+        # Check for unexpected files (shouldn't happen, but good to verify)
+        unexpected_files = archive_members - inventory_files
+        if unexpected_files:
+            for unexpected in unexpected_files:
+                result.add_warning(f"Unexpected file in archive: {unexpected}")
+        
+        return True
+    
     def _create_sidecar_metadata(
         self,
         archive_path: Path,
         archive_metadata: ArchiveMetadata,
-        result: ArchiveCreationResult
+        result: ArchiveCreationResult,
+        target: ArchiveTarget,
+        split_info: Optional[Dict[str, Any]] = None
     ) -> Optional[Path]:
         """Create sidecar metadata file."""
         try:
-            sidecar_path = SidecarMetadata.write_sidecar_file(archive_path, archive_metadata)
+            if target.is_remote:
+                return target.write_json(
+                    SidecarMetadata.create_sidecar_path(archive_path),
+                    SidecarMetadata.generate_metadata_dict(archive_metadata, split_info)
+                )
+            sidecar_path = SidecarMetadata.write_sidecar_file(archive_path, archive_metadata, split_info)
             return sidecar_path
             
         except Exception as e:
             result.add_error(f"Failed to create sidecar metadata: {str(e)}")
             return None
     
-    def _compute_file_checksum(self, file_path: Path, algorithm: str = 'md5') -> Optional[Checksum]:
-        """Compute checksum for a file."""
-        try:
-            hash_obj = hashlib.new(algorithm)
-            
-            with open(file_path, 'rb') as f:
-                # Read file in chunks to handle large files efficiently
-                for chunk in iter(lambda: f.read(64 * 1024), b''):
-                    hash_obj.update(chunk)
-            
-            return Checksum(value=hash_obj.hexdigest(), algorithm=algorithm)
-            
-        except Exception as e:
-            self._logger.error(f"Error computing checksum for {file_path}: {str(e)}")
-            return None
-    
     def _estimate_compression_ratio(
         self,
         inventory: FileInventory,
@@ -969,18 +1273,25 @@ class ArchiveCreationService:
         
         return min(weighted_ratio / total_size, 1.0)  # Cap at 1.0 (no expansion)
     
-    def _cleanup_on_error(self, archive_path: Path, result: ArchiveCreationResult) -> None:
+    def _cleanup_on_error(
+        self,
+        archive_path: Path,
+        result: ArchiveCreationResult,
+        target: ArchiveTarget
+    ) -> None:
         """Clean up files on error if requested."""
         try:
-            if archive_path.exists():
-                archive_path.unlink()
-                self._logger.info(f"Cleaned up failed archive: {archive_path}")
+            if target.remove(archive_path):
+                self._logger.info(f"Cleaned up failed archive: {target.describe(archive_path)}")
             
             # Also clean up sidecar if it exists
             sidecar_path = SidecarMetadata.create_sidecar_path(archive_path)
-            if sidecar_path.exists():
-                sidecar_path.unlink()
-                self._logger.info(f"Cleaned up sidecar metadata: {sidecar_path}")
+            if target.remove(sidecar_path):
+                self._logger.info(f"Cleaned up sidecar metadata: {target.describe(sidecar_path)}")
+            
+            index_path = ArchiveMemberIndex.index_path(archive_path)
+            if target.remove(index_path):
+                self._logger.info(f"Cleaned up archive index: {target.describe(index_path)}")
                 
         except Exception as e:
             result.add_warning(f"Failed to cleanup files on error: {str(e)}")
\ No newline at end of file
@@ -7,22 +7,33 @@ domain model to provide intelligent extraction based on sidecar metadata and sup
 fragment assembly for multi-archive simulations.
 """
 
+import copy
 import logging
 import os
 import re
+import shutil
 import tarfile
 import tempfile
 import time
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from typing import (Any, BinaryIO, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Set, Tuple, Union)
 
 from ..entities.archive import ArchiveId, ArchiveMetadata, ArchiveType
 from ..entities.location import LocationEntity
 from ..entities.simulation_file import (FileContentType, FileImportance,
                                         FileInventory, SimulationFile)
+from .archive_compression import open_tar_stream
+from .archive_index import ArchiveMemberIndex
+from .archive_target import (DEFAULT_DOWNLOAD_BLOCK_SIZE,
+                             DEFAULT_UPLOAD_BLOCK_SIZE, ArchiveTarget)
+from .extraction_pipeline import (DEFAULT_MAX_BUFFERED_BYTES, DirectoryCache,
+                                  ParallelMemberWriter)
+from .fragment_graph import FragmentDependencyGraph, create_fragment_executor
 from .sidecar_metadata import SidecarMetadata
 
 logger = logging.getLogger(__name__)
@@ -291,7 +302,12 @@ class ArchiveExtractionConfig:
     
     # Performance settings
     chunk_size: int = 64 * 1024
-    max_concurrent_extractions: int = 4
+    max_concurrent_extractions: int = 4  # Writer threads for atomic extraction
+    max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES  # Read but not yet written
+    max_concurrent_archives: int = 4  # Archives extracted at once by extract_multiple_archives
+    use_process_pool: bool = True  # Extract concurrent archives in processes rather than threads
+    download_block_size: int = DEFAULT_DOWNLOAD_BLOCK_SIZE  # Bytes fetched per read from remote archives
+    upload_block_size: int = DEFAULT_UPLOAD_BLOCK_SIZE  # Bytes buffered per write to remote targets
     
     # Safety settings
     use_atomic_extraction: bool = True
@@ -319,9 +335,12 @@ class ExtractionResult:
         
         # Statistics
         self.files_processed: int = 0
+        self.files_selected: int = 0  # Members passing the extraction filter
         self.files_extracted: int = 0
         self.bytes_extracted: int = 0
         self.extraction_time: float = 0.0
+        self.extraction_workers: int = 1
+        self.used_member_index: bool = False
         
         # Error tracking
         self.errors: List[str] = []
@@ -340,6 +359,20 @@ class ExtractionResult:
         """Check if extraction had warnings."""
         return len(self.warnings) > 0
     
+    @property
+    def bytes_per_second(self) -> float:
+        """Average extraction throughput in bytes per second."""
+        if self.extraction_time <= 0:
+            return 0.0
+        return self.bytes_extracted / self.extraction_time
+    
+    @property
+    def files_per_second(self) -> float:
+        """Average extraction rate in files per second."""
+        if self.extraction_time <= 0:
+            return 0.0
+        return self.files_extracted / self.extraction_time
+    
     def add_error(self, message: str) -> None:
         """Add an error message."""
         self.errors.append(message)
@@ -360,6 +393,9 @@ class ExtractionResult:
             'conflicts_resolved': len(self.conflicts_resolved),
             'bytes_extracted': self.bytes_extracted,
             'extraction_time': self.extraction_time,
+            'bytes_per_second': self.bytes_per_second,
+            'files_per_second': self.files_per_second,
+            'extraction_workers': self.extraction_workers,
             'has_errors': self.has_errors,
             'has_warnings': self.has_warnings
         }
@@ -374,8 +410,15 @@ class ArchiveExtractionService:
     assembly for multi-archive simulations.
     """
     
-    def __init__(self):
-        """Initialize the archive extraction service."""
+    def __init__(self, filesystem_factory: Optional[Callable[[LocationEntity], Any]] = None):
+        """
+        Initialize the archive extraction service.
+        
+        Args:
+            filesystem_factory: Optional factory creating the fsspec filesystem of a
+                remote location (uses the location's protocol if None)
+        """
+        self._filesystem_factory = filesystem_factory
         self._logger = logger
     
     def extract_archive(
@@ -385,11 +428,17 @@ class ArchiveExtractionService:
         target_path: Optional[str] = None,
         extraction_filter: Optional[ArchiveExtractionFilter] = None,
         extraction_config: Optional[ArchiveExtractionConfig] = None,
-        progress_callback: Optional[Callable[[int, int, str], None]] = None
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        archive_location: Optional[LocationEntity] = None
     ) -> ExtractionResult:
         """
         Extract an archive to a target location with optional filtering.
         
+        Archives on a location are streamed from its filesystem without
+        staging them locally; with a member index, only the parts of the
+        archive holding selected members are read. Targets on remote
+        locations are written through their filesystem.
+        
         Args:
             archive_path: Path to the archive file to extract
             target_location: Location entity where files should be extracted
@@ -397,6 +446,8 @@ class ArchiveExtractionService:
             extraction_filter: Optional filtering configuration
             extraction_config: Optional extraction configuration
             progress_callback: Optional callback for progress updates (current, total, step)
+            archive_location: Optional location holding the archive, relative to
+                whose base path archive_path is read (local file if None)
             
         Returns:
             ExtractionResult with extraction details and statistics
@@ -410,9 +461,12 @@ class ArchiveExtractionService:
         try:
             self._logger.info(f"Starting archive extraction: {archive_path}")
             
+            source = self._archive_source(archive_location, extraction_config)
+            target = self._extraction_target(target_location, extraction_config)
+            
             # Validate inputs
             validation_errors = self._validate_extraction_inputs(
-                archive_path, target_location, target_path
+                archive_path, target_location, target_path, source
             )
             if validation_errors:
                 for error in validation_errors:
@@ -423,7 +477,7 @@ class ArchiveExtractionService:
             if progress_callback:
                 progress_callback(0, 100, "Reading metadata")
             
-            sidecar_metadata = self._read_sidecar_metadata(archive_path)
+            sidecar_metadata = self._read_sidecar_metadata(archive_path, source)
             
             # Enhance filter with sidecar information
             self._enhance_filter_with_metadata(extraction_filter, sidecar_metadata)
@@ -432,29 +486,45 @@ class ArchiveExtractionService:
             if progress_callback:
                 progress_callback(10, 100, "Analyzing archive")
             
-            with tarfile.open(archive_path, 'r:*') as tar:
-                members = tar.getmembers()
-                result.files_processed = len(members)
-                
-                # Apply filtering to determine which files to extract
-                if progress_callback:
-                    progress_callback(20, 100, "Filtering files")
-                
-                files_to_extract = self._filter_archive_members(
-                    members, extraction_filter, sidecar_metadata, result
-                )
-                
-                if not files_to_extract:
-                    result.add_warning("No files passed filtering criteria")
-                    result.success = True
-                    return result
+            member_index = self._load_member_index(archive_path, source)
+            result.used_member_index = member_index is not None
+            
+            with self._open_archive(archive_path, member_index, source) as tar:
+                if member_index:
+                    # With an index, members are listed without reading the archive
+                    members = member_index.list_members()
+                    result.files_processed = len(members)
+                    
+                    # Apply filtering to determine which files to extract
+                    if progress_callback:
+                        progress_callback(20, 100, "Filtering files")
+                    
+                    files_to_extract = self._filter_archive_members(
+                        members, extraction_filter, sidecar_metadata, result
+                    )
+                    
+                    if not files_to_extract:
+                        result.add_warning("No files passed filtering criteria")
+                        result.success = True
+                        return result
+                    
+                    # Read full headers (mode, mtime, links) of the selected members
+                    # only; the blocks of all other members are never read
+                    files_to_extract = [member_index.read_member(tar, member) for member in files_to_extract]
+                else:
+                    # Members are filtered and extracted during a single pass
+                    # over the archive stream, so it is read exactly once
+                    files_to_extract = self._iter_filtered_members(
+                        self._iter_stream_members(tar, result),
+                        extraction_filter, sidecar_metadata, result
+                    )
                 
                 # Prepare target directory
                 if progress_callback:
                     progress_callback(30, 100, "Preparing target")
                 
                 target_dir = self._prepare_target_directory(
-                    target_location, target_path, extraction_config, result
+                    target_location, target_path, extraction_config, result, target
                 )
                 if not target_dir:
                     return result
@@ -465,18 +535,23 @@ class ArchiveExtractionService:
                 
                 extraction_success = self._extract_files(
                     tar, files_to_extract, target_dir, extraction_config,
-                    progress_callback, result
+                    progress_callback, result, target
                 )
                 
                 if not extraction_success and result.has_errors:
                     return result
             
+            if not result.files_selected:
+                result.add_warning("No files passed filtering criteria")
+                result.success = True
+                return result
+            
             # Post-extraction verification
             if extraction_config.verify_after_extraction:
                 if progress_callback:
                     progress_callback(90, 100, "Verifying extraction")
                 
-                self._verify_extraction(target_dir, result.extracted_files, result)
+                self._verify_extraction(target_dir, result.extracted_files, result, target)
             
             # Update fragment tracking
             if extraction_config.enable_fragment_tracking:
@@ -484,7 +559,7 @@ class ArchiveExtractionService:
                     progress_callback(95, 100, "Updating fragments")
                 
                 self._update_fragment_tracking(
-                    target_dir, archive_path, sidecar_metadata, extraction_config, result
+                    target_dir, archive_path, sidecar_metadata, extraction_config, result, target
                 )
             
             # Finalize result
@@ -496,7 +571,9 @@ class ArchiveExtractionService:
             
             self._logger.info(
                 f"Archive extraction completed: {result.files_extracted} files extracted "
-                f"in {result.extraction_time:.1f}s"
+                f"in {result.extraction_time:.1f}s "
+                f"({result.bytes_per_second / (1024 * 1024):.1f} MB/s, "
+                f"{result.extraction_workers} writer threads)"
             )
             
             return result
@@ -513,11 +590,17 @@ class ArchiveExtractionService:
         target_path: Optional[str] = None,
         extraction_filter: Optional[ArchiveExtractionFilter] = None,
         extraction_config: Optional[ArchiveExtractionConfig] = None,
-        progress_callback: Optional[Callable[[int, int, str], None]] = None
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        archive_location: Optional[LocationEntity] = None
     ) -> Dict[Path, ExtractionResult]:
         """
         Extract multiple archives to the same target location with fragment assembly.
         
+        Archives that share no files, according to their member index or
+        sidecar inventory, are extracted concurrently, up to
+        ``max_concurrent_archives`` at a time. Archives that may write the
+        same files are extracted in the given order.
+        
         Args:
             archive_paths: List of archive files to extract
             target_location: Location entity where files should be extracted
@@ -525,6 +608,7 @@ class ArchiveExtractionService:
             extraction_filter: Optional filtering configuration
             extraction_config: Optional extraction configuration
             progress_callback: Optional callback for progress updates
+            archive_location: Optional location holding the archives (local files if None)
             
         Returns:
             Dictionary mapping archive paths to their extraction results
@@ -535,37 +619,92 @@ class ArchiveExtractionService:
         # Enable fragment tracking for multi-archive extraction
         extraction_config.enable_fragment_tracking = True
         
-        total_archives = len(archive_paths)
+        # Fragment tracking is recorded here, one archive at a time, as the
+        # tracking file is shared by all extractions into the target
+        archive_config = replace(extraction_config, enable_fragment_tracking=False)
         
-        for i, archive_path in enumerate(archive_paths):
-            self._logger.info(f"Extracting archive {i+1}/{total_archives}: {archive_path}")
-            
-            # Update progress for this archive
-            archive_progress_callback = None
-            if progress_callback:
-                def archive_progress_callback(current, total, step):
-                    # Map to overall progress
-                    archive_progress = (current / total) * (100 / total_archives)
-                    overall_progress = int((i / total_archives) * 100 + archive_progress)
-                    progress_callback(overall_progress, 100, f"Archive {i+1}/{total_archives}: {step}")
-            
-            # Extract this archive
-            result = self.extract_archive(
-                archive_path, target_location, target_path,
-                extraction_filter, extraction_config, archive_progress_callback
+        source = self._archive_source(archive_location, extraction_config)
+        paths = {str(archive_path): archive_path for archive_path in archive_paths}
+        graph = FragmentDependencyGraph.from_file_sets(
+            list(paths), {key: self._list_archive_files(path, source) for key, path in paths.items()}
+        )
+        total_archives = len(graph.order)
+        workers = max(1, min(extraction_config.max_concurrent_archives, graph.max_parallelism))
+        
+        self._logger.info(
+            f"Extracting {total_archives} archives in {len(graph.stages())} stages "
+            f"with up to {workers} in parallel"
+        )
+        
+        def submit(executor, key):
+            return executor.submit(
+                extract_archive_task, self, paths[key], target_location, target_path,
+                extraction_filter, archive_config, archive_location
             )
+        
+        def on_complete(key, future):
+            archive_path = paths[key]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = ExtractionResult()
+                result.add_error(f"Archive extraction failed with exception: {str(e)}")
             
+            if result.success:
+                self.record_fragment_extraction(
+                    archive_path, target_location, target_path, extraction_config, result,
+                    archive_location
+                )
             results[archive_path] = result
             
+            if progress_callback:
+                progress_callback(
+                    int(len(results) / total_archives * 100), 100,
+                    f"Archive {len(results)}/{total_archives} extracted: {archive_path.name}"
+                )
+            
             # Stop on critical errors unless configured otherwise
-            if result.has_errors and extraction_config.conflict_resolution == ConflictResolution.FAIL:
-                break
+            return not (result.has_errors and extraction_config.conflict_resolution == ConflictResolution.FAIL)
+        
+        # Custom filter functions and filesystem factories are usually
+        # lambdas that cannot be sent to other processes
+        use_processes = extraction_config.use_process_pool and not (
+            extraction_filter and extraction_filter.custom_filter
+        ) and self._filesystem_factory is None
+        with create_fragment_executor(workers, use_processes) as executor:
+            graph.execute(executor, submit, on_complete, max_in_flight=workers)
         
         if progress_callback:
             progress_callback(100, 100, "All extractions complete")
         
         return results
     
+    def record_fragment_extraction(
+        self,
+        archive_path: Path,
+        target_location: LocationEntity,
+        target_path: Optional[str],
+        extraction_config: ArchiveExtractionConfig,
+        result: ExtractionResult,
+        archive_location: Optional[LocationEntity] = None
+    ) -> None:
+        """
+        Record an archive extracted without fragment tracking in the target's fragment file.
+        
+        Used when several archives are extracted into the same target
+        concurrently, so that the shared fragment file is only updated from
+        one thread.
+        """
+        if not extraction_config.enable_fragment_tracking:
+            return
+        
+        source = self._archive_source(archive_location, extraction_config)
+        target = self._extraction_target(target_location, extraction_config)
+        self._update_fragment_tracking(
+            self._target_directory(target_location, target_path, target), archive_path,
+            self._read_sidecar_metadata(archive_path, source), extraction_config, result, target
+        )
+    
     def extract_by_date_range(
         self,
         archive_path: Path,
@@ -636,35 +775,146 @@ class ArchiveExtractionService:
             extraction_filter, extraction_config, progress_callback
         )
     
+    def _archive_source(
+        self,
+        archive_location: Optional[LocationEntity],
+        extraction_config: ArchiveExtractionConfig
+    ) -> ArchiveTarget:
+        """Get the filesystem archives are read from."""
+        if archive_location is None:
+            return ArchiveTarget()
+        
+        return ArchiveTarget.for_location(
+            archive_location,
+            filesystem_factory=self._filesystem_factory,
+            block_size=extraction_config.download_block_size
+        )
+    
+    def _extraction_target(
+        self,
+        target_location: LocationEntity,
+        extraction_config: ArchiveExtractionConfig
+    ) -> ArchiveTarget:
+        """Get the filesystem files are extracted to."""
+        if target_location.get_protocol() == 'file':
+            return ArchiveTarget()
+        
+        return ArchiveTarget.for_location(
+            target_location,
+            filesystem_factory=self._filesystem_factory,
+            block_size=extraction_config.upload_block_size
+        )
+    
     def _validate_extraction_inputs(
         self,
         archive_path: Path,
         target_location: LocationEntity,
-        target_path: Optional[str]
+        target_path: Optional[str],
+        source: ArchiveTarget
     ) -> List[str]:
         """Validate input parameters for extraction."""
         errors = []
         
-        if not archive_path.exists():
-            errors.append(f"Archive file does not exist: {archive_path}")
-        elif not archive_path.is_file():
-            errors.append(f"Archive path is not a file: {archive_path}")
+        if not source.exists(archive_path):
+            errors.append(f"Archive file does not exist: {source.describe(archive_path)}")
+        elif not source.isfile(archive_path):
+            errors.append(f"Archive path is not a file: {source.describe(archive_path)}")
         
         if not isinstance(target_location, LocationEntity):
             errors.append("Target location must be a LocationEntity instance")
         
-        # Try to open archive to validate format
+        # Try to open archive to validate format; remote archives are not
+        # opened twice, as that may mean another recall from tape
+        if not source.is_remote:
+            try:
+                with open_tar_stream(archive_path):
+                    pass  # Just test that we can open it
+            except Exception as e:
+                errors.append(f"Cannot open archive file: {str(e)}")
+        
+        return errors
+    
+    def _load_member_index(
+        self,
+        archive_path: Path,
+        source: ArchiveTarget
+    ) -> Optional[ArchiveMemberIndex]:
+        """Load the archive's member offset index, if it has a valid one."""
         try:
-            with tarfile.open(archive_path, 'r:*') as tar:
-                pass  # Just test that we can open it
+            if not source.is_remote:
+                return ArchiveMemberIndex.load(archive_path)
+            
+            index_path = ArchiveMemberIndex.index_path(archive_path)
+            if not source.exists(index_path):
+                return None
+            member_index = ArchiveMemberIndex.from_dict(source.read_json(index_path))
+            if member_index.archive_size != source.file_info(archive_path)[0]:
+                return None
+            return member_index
         except Exception as e:
-            errors.append(f"Cannot open archive file: {str(e)}")
+            self._logger.warning(f"Could not read archive index: {str(e)}")
+            return None
+    
+    @contextmanager
+    def _open_archive(
+        self,
+        archive_path: Path,
+        member_index: Optional[ArchiveMemberIndex],
+        source: ArchiveTarget
+    ) -> Iterator[tarfile.TarFile]:
+        """
+        Open an archive, for random access to members if it is indexed.
         
-        return errors
+        Archives without an index are opened as a stream for a single pass.
+        """
+        with source.open_read(archive_path) as raw_file:
+            if member_index:
+                with member_index.open_archive(raw_file) as tar:
+                    yield tar
+            else:
+                with open_tar_stream(raw_file) as tar:
+                    yield tar
     
-    def _read_sidecar_metadata(self, archive_path: Path) -> Optional[Dict[str, Any]]:
+    def _list_archive_files(self, archive_path: Path, source: ArchiveTarget) -> Optional[Set[str]]:
+        """
+        List the files in an archive without reading it.
+        
+        Returns:
+            Member names from the member index or sidecar inventory, or None if
+            neither is available
+        """
+        member_index = self._load_member_index(archive_path, source)
+        if member_index:
+            return {member.name for member in member_index.members}
+        
+        sidecar_metadata = self._read_sidecar_metadata(archive_path, source)
+        if sidecar_metadata:
+            try:
+                archive_metadata = SidecarMetadata.reconstruct_archive_metadata(sidecar_metadata)
+                if archive_metadata.file_inventory:
+                    return {f.relative_path for f in archive_metadata.file_inventory.list_files()}
+            except Exception as e:
+                self._logger.warning(f"Could not reconstruct file inventory: {str(e)}")
+        
+        return None
+    
+    def _read_sidecar_metadata(
+        self,
+        archive_path: Path,
+        source: ArchiveTarget
+    ) -> Optional[Dict[str, Any]]:
         """Read sidecar metadata if available."""
         try:
+            if source.is_remote:
+                sidecar_path = SidecarMetadata.create_sidecar_path(archive_path)
+                if source.exists(sidecar_path):
+                    metadata = source.read_json(sidecar_path)
+                    version = metadata.get('metadata_version')
+                    if version != SidecarMetadata.METADATA_VERSION:
+                        raise ValueError(f"Unsupported metadata version: {version}")
+                    return metadata
+                return None
+            
             sidecar_path = SidecarMetadata.find_sidecar_for_archive(archive_path)
             if sidecar_path:
                 return SidecarMetadata.read_sidecar_file(sidecar_path)
@@ -696,8 +946,26 @@ class ArchiveExtractionService:
         result: ExtractionResult
     ) -> List[tarfile.TarInfo]:
         """Filter archive members based on extraction criteria."""
-        files_to_extract = []
-        
+        return list(self._iter_filtered_members(members, extraction_filter, sidecar_metadata, result))
+    
+    def _iter_stream_members(
+        self,
+        tar: tarfile.TarFile,
+        result: ExtractionResult
+    ) -> Iterator[tarfile.TarInfo]:
+        """Yield the members of an archive opened as a stream, counting them."""
+        for member in tar:
+            result.files_processed += 1
+            yield member
+    
+    def _iter_filtered_members(
+        self,
+        members: Iterable[tarfile.TarInfo],
+        extraction_filter: ArchiveExtractionFilter,
+        sidecar_metadata: Optional[Dict[str, Any]],
+        result: ExtractionResult
+    ) -> Iterator[tarfile.TarInfo]:
+        """Yield the archive members passing the extraction criteria, lazily."""
         # Build file inventory from sidecar metadata if available
         file_lookup = {}
         if sidecar_metadata:
@@ -718,18 +986,16 @@ class ArchiveExtractionService:
             sim_file = file_lookup.get(member.name)
             if sim_file:
                 # Use metadata-based filtering
-                if extraction_filter.apply_filter(sim_file, member.name):
-                    files_to_extract.append(member)
-                else:
-                    result.skipped_files.append(member.name)
+                selected = extraction_filter.apply_filter(sim_file, member.name)
             else:
                 # Fallback to basic pattern-based filtering
-                if self._basic_member_filter(member, extraction_filter):
-                    files_to_extract.append(member)
-                else:
-                    result.skipped_files.append(member.name)
-        
-        return files_to_extract
+                selected = self._basic_member_filter(member, extraction_filter)
+            
+            if selected:
+                result.files_selected += 1
+                yield member
+            else:
+                result.skipped_files.append(member.name)
     
     def _basic_member_filter(
         self,
@@ -777,27 +1043,18 @@ class ArchiveExtractionService:
         target_location: LocationEntity,
         target_path: Optional[str],
         extraction_config: ArchiveExtractionConfig,
-        result: ExtractionResult
+        result: ExtractionResult,
+        target: ArchiveTarget
     ) -> Optional[Path]:
         """Prepare the target directory for extraction."""
         try:
-            # For now, support local filesystem extraction
-            # TODO: Integrate with Location abstraction layer for remote storage
-            if target_location.get_protocol() != 'file':
-                result.add_error(f"Remote extraction not yet implemented for protocol: {target_location.get_protocol()}")
-                return None
-            
-            base_path = Path(target_location.config.get('path', '.'))
-            if target_path:
-                target_dir = base_path / target_path
-            else:
-                target_dir = base_path
+            target_dir = self._target_directory(target_location, target_path, target)
             
             if extraction_config.create_directories:
-                target_dir.mkdir(parents=True, exist_ok=True)
+                target.makedirs(target_dir)
             
-            if not target_dir.exists():
-                result.add_error(f"Target directory does not exist: {target_dir}")
+            if not target.exists(target_dir):
+                result.add_error(f"Target directory does not exist: {target.describe(target_dir)}")
                 return None
             
             return target_dir
@@ -806,73 +1063,126 @@ class ArchiveExtractionService:
             result.add_error(f"Failed to prepare target directory: {str(e)}")
             return None
     
+    def _target_directory(
+        self,
+        target_location: LocationEntity,
+        target_path: Optional[str],
+        target: ArchiveTarget
+    ) -> Path:
+        """Directory files are extracted to within the target location."""
+        if target.is_remote:
+            # Relative to the location's base path, which the target resolves
+            base_path = Path('.')
+        else:
+            base_path = Path(target_location.config.get('path', '.'))
+        
+        return base_path / target_path if target_path else base_path
+    
     def _extract_files(
         self,
         tar: tarfile.TarFile,
-        files_to_extract: List[tarfile.TarInfo],
+        files_to_extract: Iterable[tarfile.TarInfo],
         target_dir: Path,
         extraction_config: ArchiveExtractionConfig,
         progress_callback: Optional[Callable[[int, int, str], None]],
-        result: ExtractionResult
+        result: ExtractionResult,
+        target: ArchiveTarget
     ) -> bool:
-        """Extract the filtered files to the target directory."""
-        total_files = len(files_to_extract)
-        extracted_count = 0
+        """
+        Extract the filtered files to the target directory.
         
-        for i, member in enumerate(files_to_extract):
-            try:
-                target_file_path = target_dir / member.name
-                
-                # Check for conflicts
-                if target_file_path.exists():
-                    if not self._handle_file_conflict(
-                        member, target_file_path, extraction_config, result
-                    ):
-                        result.skipped_files.append(member.name)
-                        continue
-                
-                # Create parent directories
-                target_file_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Extract the file
-                if extraction_config.use_atomic_extraction:
-                    self._extract_file_atomically(
-                        tar, member, target_file_path, extraction_config, result
-                    )
-                else:
-                    tar.extract(member, target_dir)
-                    
-                    # Apply permission and timestamp settings
-                    self._apply_file_attributes(
-                        target_file_path, member, extraction_config
-                    )
-                
-                result.extracted_files.append(member.name)
-                result.bytes_extracted += member.size
-                extracted_count += 1
-                
-                # Update progress
-                if progress_callback and (i + 1) % extraction_config.progress_update_interval == 0:
-                    progress_percent = int(40 + ((i + 1) / total_files) * 40)
+        With atomic extraction, this thread reads members from the archive
+        while up to ``max_concurrent_extractions`` threads write them out.
+        Members may be a lazy iterable over an archive opened as a stream.
+        """
+        total_files = len(files_to_extract) if isinstance(files_to_extract, list) else None
+        directories = DirectoryCache(target.makedirs)
+        members_to_write = self._members_to_write(
+            files_to_extract, target_dir, extraction_config, result, target
+        )
+        
+        if extraction_config.use_atomic_extraction or target.is_remote:
+            workers = max(1, extraction_config.max_concurrent_extractions)
+            result.extraction_workers = workers
+            writer = ParallelMemberWriter(
+                lambda member, target_path, source: self._write_file_atomically(
+                    source, member, target_path, extraction_config, directories, target
+                ),
+                workers=workers,
+                max_buffered_bytes=extraction_config.max_buffered_bytes
+            )
+            outcomes = writer.extract(tar, members_to_write)
+        else:
+            outcomes = (
+                (member, target_path, self._extract_file_directly(
+                    tar, member, target_path, target_dir, extraction_config, directories
+                ))
+                for member, target_path in members_to_write
+            )
+        
+        extracted_count = 0
+        for member, target_path, error in outcomes:
+            if error is not None:
+                error_msg = f"Failed to extract {member.name}: {str(error)}"
+                result.add_error(error_msg)
+                result.failed_files.append(member.name)
+                continue
+            
+            result.extracted_files.append(member.name)
+            result.bytes_extracted += member.size
+            extracted_count += 1
+            
+            # Update progress
+            if progress_callback and extracted_count % extraction_config.progress_update_interval == 0:
+                if total_files:
+                    progress_percent = int(40 + (extracted_count / total_files) * 40)
                     progress_callback(
                         progress_percent, 100,
                         f"Extracted {extracted_count}/{total_files} files"
                     )
-                
-            except Exception as e:
-                error_msg = f"Failed to extract {member.name}: {str(e)}"
-                result.add_error(error_msg)
-                result.failed_files.append(member.name)
+                else:
+                    progress_callback(40, 100, f"Extracted {extracted_count} files")
         
         result.files_extracted = extracted_count
         return True
     
+    def _members_to_write(
+        self,
+        files_to_extract: Iterable[tarfile.TarInfo],
+        target_dir: Path,
+        extraction_config: ArchiveExtractionConfig,
+        result: ExtractionResult,
+        target: ArchiveTarget
+    ) -> Iterator[Tuple[tarfile.TarInfo, Path]]:
+        """Yield members with their target paths, resolving conflicts on the way."""
+        # Remote targets are listed once instead of queried for every member
+        existing_files = target.list_files(target_dir) if target.is_remote else None
+        
+        for member in files_to_extract:
+            target_file_path = target_dir / member.name
+            
+            # Check for conflicts
+            if existing_files is not None:
+                exists = member.name in existing_files
+            else:
+                exists = target_file_path.exists()
+            
+            if exists:
+                if not self._handle_file_conflict(
+                    member, target_file_path, extraction_config, result, target
+                ):
+                    result.skipped_files.append(member.name)
+                    continue
+            
+            yield member, target_file_path
+    
     def _handle_file_conflict(
         self,
         member: tarfile.TarInfo,
         target_path: Path,
         extraction_config: ArchiveExtractionConfig,
-        result: ExtractionResult
+        result: ExtractionResult,
+        target: ArchiveTarget
     ) -> bool:
         """
         Handle file conflicts based on conflict resolution strategy.
@@ -892,7 +1202,7 @@ class ArchiveExtractionService:
         elif strategy == ConflictResolution.NEWEST:
             # Compare timestamps
             try:
-                existing_mtime = target_path.stat().st_mtime
+                existing_mtime = target.file_info(target_path)[1]
                 archive_mtime = member.mtime
                 should_overwrite = archive_mtime > existing_mtime
                 if should_overwrite:
@@ -903,7 +1213,7 @@ class ArchiveExtractionService:
         elif strategy == ConflictResolution.LARGEST:
             # Compare file sizes
             try:
-                existing_size = target_path.stat().st_size
+                existing_size = target.file_info(target_path)[0]
                 archive_size = member.size
                 should_overwrite = archive_size > existing_size
                 if should_overwrite:
@@ -914,15 +1224,25 @@ class ArchiveExtractionService:
         
         return True  # Default behavior
     
-    def _extract_file_atomically(
+    def _write_file_atomically(
         self,
-        tar: tarfile.TarFile,
+        source: BinaryIO,
         member: tarfile.TarInfo,
         target_path: Path,
         extraction_config: ArchiveExtractionConfig,
-        result: ExtractionResult
+        directories: DirectoryCache,
+        target: ArchiveTarget
     ) -> None:
-        """Extract a file atomically using a temporary file."""
+        """
+        Write a member's data to its target path using a temporary file.
+        
+        Runs on extraction worker threads, so it only touches the file system.
+        """
+        if target.is_remote:
+            self._write_file_to_target(source, target_path, extraction_config, directories, target)
+            return
+        
+        directories.ensure(target_path.parent)
         temp_dir = extraction_config.temp_dir or target_path.parent
         
         with tempfile.NamedTemporaryFile(
@@ -933,16 +1253,15 @@ class ArchiveExtractionService:
             temp_path = Path(temp_file.name)
             
             try:
-                # Extract to temporary file
-                extracted_file = tar.extractfile(member)
-                if extracted_file:
-                    # Copy in chunks for memory efficiency
-                    while True:
-                        chunk = extracted_file.read(extraction_config.chunk_size)
-                        if not chunk:
-                            break
-                        temp_file.write(chunk)
-                    extracted_file.close()
+                # Copy in chunks for memory efficiency
+                while True:
+                    chunk = source.read(extraction_config.chunk_size)
+                    if not chunk:
+                        break
+                    temp_file.write(chunk)
+                
+                # Flush first, a later write on close would reset the mtime
+                temp_file.flush()
                 
                 # Apply file attributes
                 self._apply_file_attributes(temp_path, member, extraction_config)
@@ -956,6 +1275,59 @@ class ArchiveExtractionService:
                     temp_path.unlink()
                 raise e
     
+    def _write_file_to_target(
+        self,
+        source: BinaryIO,
+        target_path: Path,
+        extraction_config: ArchiveExtractionConfig,
+        directories: DirectoryCache,
+        target: ArchiveTarget
+    ) -> None:
+        """
+        Write a member's data to a remote target, via a partial file if extraction is atomic.
+        
+        Permissions and timestamps are not applied, as fsspec filesystems
+        have no common interface for them.
+        """
+        directories.ensure(target_path.parent)
+        if extraction_config.use_atomic_extraction:
+            working_path = target.partial_path(target_path)
+        else:
+            working_path = target_path
+        
+        try:
+            with target.open_write(working_path) as f:
+                shutil.copyfileobj(source, f, extraction_config.chunk_size)
+            if working_path != target_path:
+                target.replace(working_path, target_path)
+        except Exception as e:
+            # Clean up partial file on error
+            try:
+                target.remove(working_path)
+            except Exception:
+                pass
+            raise e
+    
+    def _extract_file_directly(
+        self,
+        tar: tarfile.TarFile,
+        member: tarfile.TarInfo,
+        target_path: Path,
+        target_dir: Path,
+        extraction_config: ArchiveExtractionConfig,
+        directories: DirectoryCache
+    ) -> Optional[Exception]:
+        """Extract a member in place with tarfile, returning the error if it fails."""
+        try:
+            directories.ensure(target_path.parent)
+            tar.extract(member, target_dir)
+            
+            # Apply permission and timestamp settings
+            self._apply_file_attributes(target_path, member, extraction_config)
+            return None
+        except Exception as e:
+            return e
+    
     def _apply_file_attributes(
         self,
         file_path: Path,
@@ -977,11 +1349,21 @@ class ArchiveExtractionService:
         self,
         target_dir: Path,
         extracted_files: List[str],
-        result: ExtractionResult
+        result: ExtractionResult,
+        target: ArchiveTarget
     ) -> None:
         """Verify that extracted files exist and have correct properties."""
         verification_errors = []
         
+        if target.is_remote:
+            # A single listing instead of a round trip per file
+            existing_files = target.list_files(target_dir)
+            verification_errors = [
+                f"Extracted file not found: {file_path}"
+                for file_path in extracted_files if file_path not in existing_files
+            ]
+            extracted_files = []
+        
         for file_path in extracted_files:
             full_path = target_dir / file_path
             if not full_path.exists():
@@ -999,7 +1381,8 @@ class ArchiveExtractionService:
         archive_path: Path,
         sidecar_metadata: Optional[Dict[str, Any]],
         extraction_config: ArchiveExtractionConfig,
-        result: ExtractionResult
+        result: ExtractionResult,
+        target: ArchiveTarget
     ) -> None:
         """Update fragment tracking metadata for multi-archive assembly."""
         try:
@@ -1007,10 +1390,8 @@ class ArchiveExtractionService:
             
             # Load existing fragment data
             fragment_data = {}
-            if fragment_file.exists():
-                import json
-                with open(fragment_file, 'r') as f:
-                    fragment_data = json.load(f)
+            if target.exists(fragment_file):
+                fragment_data = target.read_json(fragment_file)
             
             # Add this archive's information
             archive_info = {
@@ -1024,9 +1405,29 @@ class ArchiveExtractionService:
             result.fragment_info = fragment_data
             
             # Write updated fragment data
-            with open(fragment_file, 'w') as f:
-                import json
-                json.dump(fragment_data, f, indent=2, default=str)
+            target.write_json(fragment_file, fragment_data)
                 
         except Exception as e:
-            result.add_warning(f"Could not update fragment tracking: {str(e)}")
\ No newline at end of file
+            result.add_warning(f"Could not update fragment tracking: {str(e)}")
+
+
+def extract_archive_task(
+    extraction_service: ArchiveExtractionService,
+    archive_path: Path,
+    target_location: LocationEntity,
+    target_path: Optional[str],
+    extraction_filter: Optional[ArchiveExtractionFilter],
+    extraction_config: ArchiveExtractionConfig,
+    archive_location: Optional[LocationEntity] = None
+) -> ExtractionResult:
+    """
+    Extract one archive as a task for a thread or process pool.
+    
+    Defined at module level so that it can be pickled. The filter is copied
+    because extract_archive fills in date patterns from each archive's sidecar.
+    """
+    return extraction_service.extract_archive(
+        archive_path, target_location, target_path,
+        copy.copy(extraction_filter) if extraction_filter else None,
+        extraction_config, archive_location=archive_location
+    )
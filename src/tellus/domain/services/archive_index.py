@@ -0,0 +1,210 @@
+"""
+Member offset index for random-access extraction from tarballs.
+
+Listing a compressed tarball with ``tar.getmembers()`` decompresses the whole
+archive, even when only one restart file is wanted. Archives created by
+ArchiveCreationService with independently decompressible blocks are
+accompanied by an index file recording, for every member, where its header
+and data start in the uncompressed tar stream, and, for every compressed
+block, where it starts in both streams. Extraction of a subset then seeks to
+the selected members and decompresses only the blocks holding them.
+
+Format: archive_name.idx (JSON, next to the archive)
+"""
+
+import json
+import tarfile
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from .archive_compression import (BlockIndexedReader, CompressedBlock,
+                                  CompressionCodec)
+
+
+@dataclass
+class IndexedMember:
+    """Position of a tar member in the uncompressed tar stream."""
+    name: str
+    offset: int       # Start of the member's header blocks
+    offset_data: int  # Start of the member's data
+    size: int
+    type: str         # Tar type flag, e.g. '0' for regular files
+
+    def to_tarinfo(self) -> tarfile.TarInfo:
+        """Lightweight TarInfo for filtering; headers are read on extraction."""
+        tarinfo = tarfile.TarInfo(self.name)
+        tarinfo.size = self.size
+        tarinfo.type = self.type.encode('ascii')
+        tarinfo.offset = self.offset
+        tarinfo.offset_data = self.offset_data
+        return tarinfo
+
+
+class ArchiveMemberIndex:
+    """
+    Index of tar member and compressed block offsets for one archive.
+
+    An index is only valid for the exact archive file it was written for; the
+    archive size is recorded and an index whose archive has changed is
+    ignored on load.
+    """
+
+    INDEX_VERSION = 1
+    INDEX_EXTENSION = ".idx"
+
+    def __init__(
+        self,
+        codec: Optional[CompressionCodec] = None,
+        blocks: Optional[List[CompressedBlock]] = None,
+        members: Optional[List[IndexedMember]] = None,
+        archive_size: Optional[int] = None
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            codec: Codec of the compressed blocks, None for an uncompressed tar
+            blocks: Compressed block table, in stream order
+            members: Indexed members, in archive order
+            archive_size: Size of the archive file in bytes
+        """
+        self.codec = codec
+        self.blocks = blocks or []
+        self.members = members or []
+        self.archive_size = archive_size
+
+    @classmethod
+    def index_path(cls, archive_path: Path) -> Path:
+        """Path of the index file for an archive."""
+        return archive_path.parent / f"{archive_path.name}{cls.INDEX_EXTENSION}"
+
+    def add_member(self, tarinfo: tarfile.TarInfo, header_offset: int, end_offset: int, has_data: bool) -> None:
+        """
+        Record a member just added to a tar stream.
+
+        Args:
+            tarinfo: The member's TarInfo
+            header_offset: Stream position before the member was added
+            end_offset: Stream position after the member and its padding
+            has_data: Whether data followed the header
+        """
+        padded_size = -(-tarinfo.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE if has_data else 0
+        self.members.append(IndexedMember(
+            name=tarinfo.name,
+            offset=header_offset,
+            offset_data=end_offset - padded_size,
+            size=tarinfo.size if has_data else 0,
+            type=tarinfo.type.decode('ascii')
+        ))
+
+    def list_members(self) -> List[tarfile.TarInfo]:
+        """Lightweight TarInfo objects for all indexed members."""
+        return [member.to_tarinfo() for member in self.members]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the index to a JSON-serializable dictionary."""
+        return {
+            "index_version": self.INDEX_VERSION,
+            "archive_size": self.archive_size,
+            "codec": self.codec.value if self.codec else None,
+            "blocks": [list(block) for block in self.blocks],
+            "members": [
+                [member.name, member.offset, member.offset_data, member.size, member.type]
+                for member in self.members
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ArchiveMemberIndex':
+        """Create an index from its dictionary representation."""
+        version = data.get("index_version")
+        if version != cls.INDEX_VERSION:
+            raise ValueError(f"Unsupported archive index version: {version}")
+
+        return cls(
+            codec=CompressionCodec(data["codec"]) if data.get("codec") else None,
+            blocks=[CompressedBlock(*block) for block in data.get("blocks", [])],
+            members=[IndexedMember(*member) for member in data.get("members", [])],
+            archive_size=data.get("archive_size")
+        )
+
+    def write(self, archive_path: Path) -> Path:
+        """
+        Write the index next to its archive, recording the archive's size.
+
+        Args:
+            archive_path: Path to the indexed archive
+
+        Returns:
+            Path to the written index file
+
+        Raises:
+            IOError: If writing fails
+        """
+        index_path = self.index_path(archive_path)
+        temp_path = index_path.with_suffix(index_path.suffix + '.tmp')
+        self.archive_size = archive_path.stat().st_size
+
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, separators=(',', ':'))
+            temp_path.replace(index_path)
+            return index_path
+        except Exception as e:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise IOError(f"Failed to write archive index: {e}")
+
+    @classmethod
+    def load(cls, archive_path: Path) -> Optional['ArchiveMemberIndex']:
+        """
+        Load the index for an archive.
+
+        Returns:
+            The index, or None if there is none or it does not match the archive
+
+        Raises:
+            ValueError: If the index file is invalid
+        """
+        index_path = cls.index_path(archive_path)
+        if not index_path.exists():
+            return None
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = cls.from_dict(json.load(f))
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid archive index {index_path}: {e}")
+
+        if index.archive_size != archive_path.stat().st_size:
+            return None
+        return index
+
+    @contextmanager
+    def open_archive(self, archive: Union[Path, BinaryIO]) -> Iterator[tarfile.TarFile]:
+        """
+        Open the archive for random access to indexed members.
+
+        The archive is a path or an open seekable binary file, which is not
+        closed. Use ``read_member()`` to get the full TarInfo of a member
+        before passing it to ``extractfile()``; ``getmembers()`` would still
+        scan the whole archive.
+        """
+        with (open(archive, 'rb') if isinstance(archive, Path) else nullcontext(archive)) as raw_file:
+            if self.codec is None:
+                stream = raw_file
+            else:
+                stream = BlockIndexedReader(raw_file, self.codec, self.blocks)
+            with tarfile.open(fileobj=stream, mode='r:') as tar:
+                yield tar
+
+    def read_member(self, tar: tarfile.TarFile, member: tarfile.TarInfo) -> tarfile.TarInfo:
+        """Read the full header of an indexed member from an archive opened by open_archive()."""
+        tar.fileobj.seek(member.offset)
+        tarinfo = tar.tarinfo.fromtarfile(tar)
+        if tarinfo.name != member.name:
+            raise ValueError(f"Archive index out of date: expected {member.name} at offset "
+                             f"{member.offset}, found {tarinfo.name}")
+        return tarinfo
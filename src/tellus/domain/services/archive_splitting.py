@@ -0,0 +1,164 @@
+"""
+Splitting archives into size-bounded parts.
+
+Tape and HSM systems handle objects of a bounded size best, so a simulation
+whose files exceed ArchiveCreationConfig.max_archive_size is archived as
+several parts. Each part is a self-contained tarball with its own sidecar,
+which lists the part's files and links the sibling parts, so staging and
+extraction only need to fetch the parts holding the requested files.
+
+Files are grouped by content type and simulation month before being packed,
+so that e.g. all restart files of one year tend to end up in the same part.
+Part sizes are bounded by the uncompressed size of their files.
+"""
+
+import fnmatch
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from ..entities.simulation_file import FileInventory, SimulationFile
+
+# Archive suffixes kept at the end of part file names
+_ARCHIVE_SUFFIXES = ('.tar.gz', '.tar.bz2', '.tar.xz', '.tar.zst', '.tgz', '.tar')
+
+
+def _group_key(file: SimulationFile, group_by_content_type: bool, group_by_date: bool) -> Tuple[str, str]:
+    content_type = file.content_type.value if group_by_content_type else ''
+    date = file.simulation_date.strftime('%Y-%m') if group_by_date and file.simulation_date else ''
+    return content_type, date
+
+
+def _file_size(file: SimulationFile) -> int:
+    return file.size or 0
+
+
+def plan_archive_parts(
+    inventory: FileInventory,
+    max_part_size: int,
+    group_by_content_type: bool = True,
+    group_by_date: bool = True
+) -> List[FileInventory]:
+    """
+    Pack the files of an inventory into parts of at most ``max_part_size`` bytes.
+
+    Files of a group (content type and simulation month) are kept together
+    where the group fits into one part; larger groups are cut into runs of
+    consecutive paths. Groups and runs are then packed first-fit decreasing.
+    A single file larger than the limit gets a part of its own.
+
+    Args:
+        inventory: Files to archive
+        max_part_size: Maximum total file size per part in bytes
+        group_by_content_type: Keep files of the same content type together
+        group_by_date: Keep files of the same simulation month together
+
+    Returns:
+        Inventories of the parts, ordered by their first file
+    """
+    if max_part_size <= 0:
+        raise ValueError("Maximum part size must be positive")
+
+    groups: Dict[Tuple[str, str], List[SimulationFile]] = defaultdict(list)
+    for file in inventory.list_files():
+        groups[_group_key(file, group_by_content_type, group_by_date)].append(file)
+
+    # Cut groups into runs no larger than a part
+    runs: List[Tuple[int, List[SimulationFile]]] = []
+    for key in sorted(groups):
+        run: List[SimulationFile] = []
+        run_size = 0
+        for file in sorted(groups[key], key=lambda f: f.relative_path):
+            if run and run_size + _file_size(file) > max_part_size:
+                runs.append((run_size, run))
+                run, run_size = [], 0
+            run.append(file)
+            run_size += _file_size(file)
+        if run:
+            runs.append((run_size, run))
+
+    # First-fit decreasing; the sort is stable, so equal runs stay in group order
+    parts: List[List[SimulationFile]] = []
+    part_sizes: List[int] = []
+    for run_size, run in sorted(runs, key=lambda r: r[0], reverse=True):
+        for i, part_size in enumerate(part_sizes):
+            if part_size + run_size <= max_part_size:
+                parts[i].extend(run)
+                part_sizes[i] += run_size
+                break
+        else:
+            parts.append(list(run))
+            part_sizes.append(run_size)
+
+    inventories = []
+    for files in sorted(parts, key=lambda p: min(f.relative_path for f in p)):
+        part_inventory = FileInventory()
+        for file in sorted(files, key=lambda f: f.relative_path):
+            part_inventory.add_file(file)
+        inventories.append(part_inventory)
+    return inventories
+
+
+def part_archive_path(archive_path: Path, part_number: int) -> Path:
+    """Path of a part, e.g. ``run.part002.tar.gz`` for ``run.tar.gz``."""
+    name = archive_path.name
+    for suffix in _ARCHIVE_SUFFIXES:
+        if name.endswith(suffix):
+            return archive_path.parent / f"{name[:-len(suffix)]}.part{part_number:03d}{suffix}"
+    return archive_path.parent / f"{name}.part{part_number:03d}"
+
+
+def part_archive_id(archive_id: Any, part_number: int) -> str:
+    """Archive ID of a part."""
+    return f"{archive_id}_part{part_number:03d}"
+
+
+def split_sidecar_section(
+    archive_id: Any,
+    part_number: int,
+    part_ids: List[str],
+    part_paths: List[Path]
+) -> Dict[str, Any]:
+    """
+    Split section of a part's sidecar, linking it to its archive and sibling parts.
+
+    ``split_archive_parts`` names the other parts, as on SimulationFile.
+    """
+    part_id = part_ids[part_number - 1]
+    return {
+        "archive_id": str(archive_id),
+        "part_number": part_number,
+        "part_count": len(part_ids),
+        "part_path": part_paths[part_number - 1].name,
+        "parts": [
+            {"archive_id": pid, "path": path.name} for pid, path in zip(part_ids, part_paths)
+        ],
+        "split_archive_parts": [pid for pid in part_ids if pid != part_id],
+    }
+
+
+def select_split_parts(
+    part_sidecars: Mapping[str, Dict[str, Any]],
+    requested: Iterable[str]
+) -> List[str]:
+    """
+    Select the parts holding requested files.
+
+    Args:
+        part_sidecars: Parsed sidecar of each part, by part archive ID
+        requested: Relative paths or glob patterns of the files wanted
+
+    Returns:
+        IDs of the parts to fetch, in part order
+    """
+    requested = list(requested)
+    patterns = [pattern for pattern in requested if any(c in pattern for c in '*?[')]
+    paths = set(requested) - set(patterns)
+
+    selected = []
+    for part_id, sidecar in part_sidecars.items():
+        files = (sidecar.get('inventory') or {}).get('files', [])
+        if any(f['path'] in paths or any(fnmatch.fnmatch(f['path'], p) for p in patterns) for f in files):
+            selected.append(part_id)
+
+    return sorted(selected, key=lambda pid: (part_sidecars[pid].get('split') or {}).get('part_number', 0))
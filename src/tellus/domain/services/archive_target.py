@@ -0,0 +1,262 @@
+"""
+Local and remote filesystems for archive creation and extraction.
+
+Archives used to be written to a local path only and copied to tape or HSM
+afterwards, which needs local scratch space as large as the archive and
+doubles the I/O; extraction likewise needed the archive staged locally.
+ArchiveTarget abstracts where an archive, its sidecar files and extracted
+files are read and written: the local filesystem, or the fsspec filesystem
+of a LocationEntity (sftp, scoutfs, file), which archives are streamed into
+and out of in upload- and download-sized chunks.
+
+ChecksumWriter computes the archive checksum and size while the archive is
+written, so the archive never has to be read back to describe it.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Optional, Set, Tuple
+
+from ..entities.location import LocationEntity
+from .checksums import new_hash
+
+# Bytes buffered per write request to a remote filesystem
+DEFAULT_UPLOAD_BLOCK_SIZE = 64 * 1024 * 1024
+
+# Bytes fetched per read request from a remote filesystem
+DEFAULT_DOWNLOAD_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+class ChecksumWriter:
+    """
+    Write-through file object hashing and counting everything written.
+
+    The underlying file is not closed by this writer.
+    """
+
+    def __init__(self, fileobj: BinaryIO, algorithm: Optional[str] = 'md5'):
+        """
+        Initialize the writer.
+
+        Args:
+            fileobj: Binary file object receiving the data
+            algorithm: Checksum algorithm (see checksums.new_hash), or None to only count bytes
+        """
+        self._fileobj = fileobj
+        self.algorithm = algorithm
+        self._hash = new_hash(algorithm) if algorithm else None
+        self.bytes_written = 0
+        self.closed = False
+
+    def __enter__(self) -> 'ChecksumWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self._hash is not None:
+            self._hash.update(data)
+        length = len(data) if isinstance(data, (bytes, bytearray)) else memoryview(data).nbytes
+        self.bytes_written += length
+        self._fileobj.write(data)
+        return length
+
+    def tell(self) -> int:
+        """Number of bytes written so far."""
+        return self.bytes_written
+
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+    def close(self) -> None:
+        self.closed = True
+
+    def hexdigest(self) -> Optional[str]:
+        """Digest of everything written so far, None without an algorithm."""
+        return self._hash.hexdigest() if self._hash is not None else None
+
+
+def location_filesystem(location: LocationEntity):
+    """
+    Create an fsspec filesystem for a location from its protocol and storage options.
+
+    Protocols provided by plugins (e.g. scoutfs) must have been registered
+    with fsspec beforehand.
+    """
+    import fsspec
+
+    protocol = location.get_protocol()
+    storage_options = location.get_storage_options().copy()
+
+    # Add location name as host if not specified
+    if "host" not in storage_options and protocol in ("sftp", "ssh", "scoutfs"):
+        storage_options["host"] = location.name
+
+    return fsspec.filesystem(protocol, **storage_options)
+
+
+class ArchiveTarget:
+    """
+    Filesystem archives, their sidecar files and extracted files live on.
+
+    Without a filesystem, paths are local and written with the standard
+    library, as before. With one, paths are on the filesystem, resolved
+    relative to the location's base path.
+    """
+
+    def __init__(
+        self,
+        filesystem: Any = None,
+        base_path: str = "",
+        block_size: int = DEFAULT_UPLOAD_BLOCK_SIZE
+    ):
+        """
+        Initialize the target.
+
+        Args:
+            filesystem: fsspec filesystem, None for the local filesystem
+            base_path: Base path that relative archive paths are resolved against
+            block_size: Bytes buffered per read or write request to the filesystem
+        """
+        self.filesystem = filesystem
+        self.base_path = base_path
+        self.block_size = block_size
+
+    @classmethod
+    def for_location(
+        cls,
+        location: LocationEntity,
+        filesystem_factory: Optional[Callable[[LocationEntity], Any]] = None,
+        block_size: int = DEFAULT_UPLOAD_BLOCK_SIZE
+    ) -> 'ArchiveTarget':
+        """Create a target writing into a location's filesystem."""
+        filesystem = (filesystem_factory or location_filesystem)(location)
+        return cls(filesystem, location.get_base_path(), block_size)
+
+    @property
+    def is_remote(self) -> bool:
+        """Whether archives are written through an fsspec filesystem."""
+        return self.filesystem is not None
+
+    def resolve(self, path: Path) -> Path:
+        """Resolve an archive path on the target filesystem."""
+        if self.is_remote and self.base_path and not path.is_absolute():
+            return Path(self.base_path) / path
+        return path
+
+    def describe(self, path: Path) -> str:
+        """Human-readable location of a path, for messages."""
+        if self.is_remote:
+            protocol = self.filesystem.protocol
+            protocol = protocol[0] if isinstance(protocol, (tuple, list)) else protocol
+            return f"{protocol}://{self.resolve(path)}"
+        return str(path)
+
+    def exists(self, path: Path) -> bool:
+        if self.is_remote:
+            return self.filesystem.exists(str(self.resolve(path)))
+        return path.exists()
+
+    def isfile(self, path: Path) -> bool:
+        if self.is_remote:
+            return self.filesystem.isfile(str(self.resolve(path)))
+        return path.is_file()
+
+    def file_info(self, path: Path) -> Tuple[int, Optional[float]]:
+        """Size and modification time of a file; the time is None if the filesystem has none."""
+        if not self.is_remote:
+            stat_info = path.stat()
+            return stat_info.st_size, stat_info.st_mtime
+
+        info = self.filesystem.info(str(self.resolve(path)))
+        mtime = info.get('mtime', info.get('created'))
+        if isinstance(mtime, datetime):
+            mtime = mtime.timestamp()
+        return info['size'], mtime
+
+    def list_files(self, directory: Path) -> Set[str]:
+        """Relative paths of all files below a directory, in a single listing."""
+        if self.is_remote:
+            root = self.filesystem._strip_protocol(str(self.resolve(directory))).rstrip('/')
+            if not self.filesystem.isdir(root):
+                return set()
+            return {path[len(root) + 1:] for path in self.filesystem.find(root)}
+
+        if not directory.is_dir():
+            return set()
+        return {
+            str(path.relative_to(directory)) for path in directory.rglob('*')
+            if not path.is_dir()
+        }
+
+    def makedirs(self, directory: Path) -> None:
+        if self.is_remote:
+            self.filesystem.makedirs(str(self.resolve(directory)), exist_ok=True)
+        else:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def open_write(self, path: Path) -> BinaryIO:
+        """Open a file for writing; remote writes are buffered per upload block."""
+        if self.is_remote:
+            return self.filesystem.open(str(self.resolve(path)), 'wb', block_size=self.block_size)
+        return open(path, 'wb')
+
+    def open_read(self, path: Path) -> BinaryIO:
+        """Open a file for reading; remote reads are fetched per download block."""
+        if self.is_remote:
+            return self.filesystem.open(str(self.resolve(path)), 'rb', block_size=self.block_size)
+        return open(path, 'rb')
+
+    def read_json(self, path: Path) -> Any:
+        """Read a JSON document."""
+        with self.open_read(path) as f:
+            return json.loads(f.read().decode('utf-8'))
+
+    def partial_path(self, archive_path: Path) -> Path:
+        """Unique name next to the archive to write it under until it is complete."""
+        return archive_path.parent / f".{archive_path.name}.{uuid.uuid4().hex[:8]}.partial"
+
+    def replace(self, source: Path, destination: Path) -> None:
+        """Move a completed file to its final name."""
+        if self.is_remote:
+            self.filesystem.mv(str(self.resolve(source)), str(self.resolve(destination)))
+        else:
+            os.replace(source, destination)
+
+    def remove(self, path: Path) -> bool:
+        """Remove a file if it exists; returns whether it existed."""
+        if not self.exists(path):
+            return False
+        if self.is_remote:
+            self.filesystem.rm(str(self.resolve(path)))
+        else:
+            path.unlink()
+        return True
+
+    def write_json(self, path: Path, data: Dict[str, Any]) -> Path:
+        """
+        Write a JSON document atomically.
+
+        Raises:
+            IOError: If writing fails
+        """
+        temp_path = self.partial_path(path)
+        try:
+            content = json.dumps(data, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+            with self.open_write(temp_path) as f:
+                f.write(content)
+            self.replace(temp_path, path)
+            return path
+        except Exception as e:
+            try:
+                self.remove(temp_path)
+            except Exception:
+                pass
+            raise IOError(f"Failed to write {self.describe(path)}: {e}")
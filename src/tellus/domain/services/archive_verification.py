@@ -0,0 +1,256 @@
+"""
+Verification of created archives against their creation-time manifest.
+
+While an archive is created, the size and checksum of every member's data
+is recorded in a manifest. ArchiveVerifier checks an archive against it at
+one of three levels:
+
+- FAST compares the names and sizes in the archive's member index, if it
+  has one, without reading the archive.
+- SAMPLE additionally hashes a random sample of members. With a member
+  index only the blocks holding them are decompressed.
+- FULL hashes every member in a single streaming pass. Archives with
+  independently compressed blocks are decompressed in parallel.
+"""
+
+import random
+import tarfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import (Any, BinaryIO, Callable, ContextManager, Dict, Iterator,
+                    List, NamedTuple, Optional, Set)
+
+from .archive_compression import ParallelBlockReader, open_tar_stream
+from .archive_index import ArchiveMemberIndex
+from .checksums import new_hash
+
+# Bytes hashed per read from an archive member
+VERIFY_CHUNK_SIZE = 1024 * 1024
+
+
+class VerificationLevel(Enum):
+    """How thoroughly a created archive is verified."""
+    FAST = "fast"      # Member names and indexed sizes, without reading the archive
+    SAMPLE = "sample"  # Also hash a random sample of members
+    FULL = "full"      # Hash every member in one streaming pass
+
+
+class ManifestEntry(NamedTuple):
+    """Size and checksum of a member's data as archived."""
+    size: Optional[int]              # Data size of regular files, None for other members
+    checksum: Optional[str] = None
+    algorithm: Optional[str] = None
+
+
+@dataclass
+class VerificationReport:
+    """Outcome and cost of verifying an archive."""
+    level: VerificationLevel
+    members_checked: int = 0
+    members_hashed: int = 0
+    bytes_hashed: int = 0
+    elapsed: float = 0.0
+    workers: int = 1
+    missing: List[str] = field(default_factory=list)
+    unexpected: List[str] = field(default_factory=list)
+    mismatched: List[str] = field(default_factory=list)  # Descriptions of size or checksum mismatches
+
+    @property
+    def success(self) -> bool:
+        """Whether all manifest members are present and match."""
+        return not self.missing and not self.mismatched
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Hashing throughput in bytes per second."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.bytes_hashed / self.elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'level': self.level.value,
+            'success': self.success,
+            'members_checked': self.members_checked,
+            'members_hashed': self.members_hashed,
+            'bytes_hashed': self.bytes_hashed,
+            'elapsed': self.elapsed,
+            'bytes_per_second': self.bytes_per_second,
+            'workers': self.workers,
+            'missing': len(self.missing),
+            'unexpected': len(self.unexpected),
+            'mismatched': len(self.mismatched),
+        }
+
+
+class ArchiveVerifier:
+    """Verify archives against a creation-time manifest."""
+
+    def __init__(
+        self,
+        level: VerificationLevel = VerificationLevel.SAMPLE,
+        sample_size: int = 10,
+        workers: Optional[int] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Initialize the verifier.
+
+        Args:
+            level: Verification level
+            sample_size: Members hashed at the SAMPLE level
+            workers: Decompression threads for block-compressed archives at
+                the FULL level (defaults to CPU count)
+            rng: Random number generator choosing the sample
+        """
+        self.level = level
+        self.sample_size = sample_size
+        self.workers = workers
+        self._rng = rng or random.Random()
+
+    def verify(
+        self,
+        manifest: Dict[str, ManifestEntry],
+        open_archive: Callable[[], ContextManager[BinaryIO]],
+        member_index: Optional[ArchiveMemberIndex] = None
+    ) -> VerificationReport:
+        """
+        Verify an archive.
+
+        Args:
+            manifest: Expected members by name
+            open_archive: Opens the archive file for binary reading
+            member_index: Index of the archive, if it has one; without one,
+                the FAST level checks nothing that was not known when creating it
+
+        Returns:
+            Report of the members that are missing, unexpected or mismatched
+        """
+        report = VerificationReport(level=self.level)
+        start = time.perf_counter()
+
+        if self.level is VerificationLevel.FULL:
+            self._verify_stream(manifest, open_archive, member_index, set(manifest), report)
+        elif member_index is not None:
+            self._verify_index(manifest, member_index, report)
+            if self.level is VerificationLevel.SAMPLE:
+                self._verify_indexed_sample(manifest, open_archive, member_index, report)
+        elif self.level is VerificationLevel.SAMPLE:
+            self._verify_stream(manifest, open_archive, None, self._sample(manifest), report)
+        else:
+            report.members_checked = len(manifest)
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _sample(self, manifest: Dict[str, ManifestEntry]) -> Set[str]:
+        """Random sample of the members with data and a checksum."""
+        candidates = sorted(name for name, entry in manifest.items() if entry.checksum and entry.size)
+        return set(self._rng.sample(candidates, min(self.sample_size, len(candidates))))
+
+    def _compare_names(self, manifest: Dict[str, ManifestEntry], names: Set[str], report: VerificationReport) -> None:
+        report.members_checked = len(names & manifest.keys())
+        report.missing.extend(sorted(manifest.keys() - names))
+        report.unexpected.extend(sorted(names - manifest.keys()))
+
+    def _check_size(self, name: str, size: int, entry: ManifestEntry, report: VerificationReport) -> None:
+        if entry.size is not None and size != entry.size:
+            report.mismatched.append(f"{name}: size {size} differs from {entry.size} archived")
+
+    def _verify_index(
+        self,
+        manifest: Dict[str, ManifestEntry],
+        member_index: ArchiveMemberIndex,
+        report: VerificationReport
+    ) -> None:
+        """Compare names and sizes recorded in the member index."""
+        indexed = {member.name: member for member in member_index.members}
+        self._compare_names(manifest, set(indexed), report)
+        for name, member in indexed.items():
+            entry = manifest.get(name)
+            if entry is not None and member.type in ('0', '\0'):
+                self._check_size(name, member.size, entry, report)
+
+    def _verify_indexed_sample(
+        self,
+        manifest: Dict[str, ManifestEntry],
+        open_archive: Callable[[], ContextManager[BinaryIO]],
+        member_index: ArchiveMemberIndex,
+        report: VerificationReport
+    ) -> None:
+        """Hash sampled members, decompressing only the blocks holding them."""
+        members = {member.name: member for member in member_index.list_members()}
+        sample = [name for name in sorted(self._sample(manifest)) if name in members]
+
+        with open_archive() as raw_file, member_index.open_archive(raw_file) as tar:
+            for name in sample:
+                tarinfo = member_index.read_member(tar, members[name])
+                self._check_data(tar, tarinfo, manifest[name], report)
+
+    def _verify_stream(
+        self,
+        manifest: Dict[str, ManifestEntry],
+        open_archive: Callable[[], ContextManager[BinaryIO]],
+        member_index: Optional[ArchiveMemberIndex],
+        to_hash: Set[str],
+        report: VerificationReport
+    ) -> None:
+        """Check every member and hash the selected ones in a single pass."""
+        seen = set()
+        with open_archive() as raw_file, self._open_stream(raw_file, member_index, report) as tar:
+            for tarinfo in tar:
+                entry = manifest.get(tarinfo.name)
+                if entry is None:
+                    report.unexpected.append(tarinfo.name)
+                    continue
+                seen.add(tarinfo.name)
+                report.members_checked += 1
+
+                if tarinfo.isfile():
+                    self._check_size(tarinfo.name, tarinfo.size, entry, report)
+                    if tarinfo.name in to_hash:
+                        self._check_data(tar, tarinfo, entry, report)
+
+        report.missing.extend(sorted(manifest.keys() - seen))
+
+    @contextmanager
+    def _open_stream(
+        self,
+        raw_file: BinaryIO,
+        member_index: Optional[ArchiveMemberIndex],
+        report: VerificationReport
+    ) -> Iterator[tarfile.TarFile]:
+        """Open the archive for one pass, decompressing independent blocks in parallel."""
+        if member_index is None or member_index.codec is None or not member_index.blocks:
+            with open_tar_stream(raw_file) as tar:
+                yield tar
+            return
+
+        with ParallelBlockReader(raw_file, member_index.codec, member_index.blocks, self.workers) as reader, \
+                tarfile.open(fileobj=reader, mode='r|') as tar:
+            report.workers = reader.workers
+            yield tar
+
+    def _check_data(
+        self,
+        tar: tarfile.TarFile,
+        tarinfo: tarfile.TarInfo,
+        entry: ManifestEntry,
+        report: VerificationReport
+    ) -> None:
+        """Hash a member's data and compare it with the manifest."""
+        if not entry.checksum or not entry.algorithm:
+            return
+
+        hasher = new_hash(entry.algorithm)
+        extracted_file = tar.extractfile(tarinfo)
+        with extracted_file:
+            for chunk in iter(lambda: extracted_file.read(VERIFY_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+                report.bytes_hashed += len(chunk)
+        report.members_hashed += 1
+
+        if hasher.hexdigest() != entry.checksum:
+            report.mismatched.append(f"{tarinfo.name}: {entry.algorithm} checksum differs from archived data")
@@ -0,0 +1,102 @@
+"""
+Checksum algorithms for archives and their members.
+
+Archive and member checksums are computed from the bytes as they are
+written into the archive, so the hash function bounds archiving throughput.
+BLAKE3 and XXH3 are several times faster than MD5 or SHA-256 and are used
+when the blake3 or xxhash packages are installed; SHA-256 from the standard
+library otherwise.
+"""
+
+import hashlib
+from typing import Any, BinaryIO, Optional
+
+BLAKE3 = 'blake3'
+XXH3_128 = 'xxh3_128'
+DEFAULT_CHECKSUM_ALGORITHM = 'sha256'
+
+
+def _import_blake3():
+    try:
+        import blake3
+    except ImportError:
+        raise ImportError("The blake3 package is required for BLAKE3 checksums")
+    return blake3
+
+
+def _import_xxhash():
+    try:
+        import xxhash
+    except ImportError:
+        raise ImportError("The xxhash package is required for xxHash checksums")
+    return xxhash
+
+
+def preferred_checksum_algorithm() -> str:
+    """Fastest available checksum algorithm: BLAKE3, then XXH3, then SHA-256."""
+    for algorithm, import_module in ((BLAKE3, _import_blake3), (XXH3_128, _import_xxhash)):
+        try:
+            import_module()
+            return algorithm
+        except ImportError:
+            continue
+    return DEFAULT_CHECKSUM_ALGORITHM
+
+
+def new_hash(algorithm: str) -> Any:
+    """
+    Create a hash object with ``update()`` and ``hexdigest()``.
+
+    Args:
+        algorithm: 'blake3', 'xxh3_128' or any hashlib algorithm name
+
+    Raises:
+        ImportError: If the package providing the algorithm is not installed
+        ValueError: If the algorithm is unknown
+    """
+    if algorithm == BLAKE3:
+        blake3 = _import_blake3()
+        # Large updates are hashed on all cores
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    if algorithm == XXH3_128:
+        return _import_xxhash().xxh3_128()
+    try:
+        return hashlib.new(algorithm)
+    except ValueError:
+        raise ValueError(f"Unsupported checksum algorithm: {algorithm}")
+
+
+class HashingReader:
+    """
+    Read-through file object hashing everything read from it.
+
+    Passed to ``tarfile.addfile()`` so that a member's checksum is computed
+    while its data is copied into the archive. The underlying file is not
+    closed by this reader.
+    """
+
+    def __init__(self, fileobj: BinaryIO, algorithm: str):
+        """
+        Initialize the reader.
+
+        Args:
+            fileobj: Binary file object to read from
+            algorithm: Checksum algorithm, see ``new_hash()``
+        """
+        self._fileobj = fileobj
+        self.algorithm = algorithm
+        self._hash = new_hash(algorithm)
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        data = self._fileobj.read(size)
+        self._hash.update(data)
+        self.bytes_read += len(data)
+        return data
+
+    def hexdigest(self) -> str:
+        """Digest of everything read so far."""
+        return self._hash.hexdigest()
@@ -0,0 +1,176 @@
+"""
+Pipelined writing of extracted tar members.
+
+Decompressing a tar stream is inherently sequential, but writing the
+extracted files is not. On parallel filesystems most of the time per file
+goes to creating, writing and renaming it, and a single thread doing both
+leaves most of the I/O bandwidth idle. ParallelMemberWriter keeps reading
+on the calling thread: it reads each member's data from the tar stream and
+hands the buffered member to a thread pool that writes it. Memory held by
+buffered members is bounded; members too large to buffer are written
+directly from the stream on the calling thread.
+"""
+
+import io
+import tarfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import (BinaryIO, Callable, Deque, Iterable, Iterator, Optional,
+                    Set, Tuple)
+
+# Upper bound on member data read but not yet written
+DEFAULT_MAX_BUFFERED_BYTES = 256 * 1024 * 1024
+
+MemberWriter = Callable[[tarfile.TarInfo, Path, BinaryIO], None]
+MemberOutcome = Tuple[tarfile.TarInfo, Path, Optional[Exception]]
+
+
+class DirectoryCache:
+    """
+    Create directories at most once per extraction.
+
+    Extracting thousands of files into a handful of directories used to call
+    ``mkdir(parents=True)`` for every file, which costs a metadata round trip
+    on parallel and network filesystems even when the directory exists.
+    """
+
+    def __init__(self, makedirs: Optional[Callable[[Path], None]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            makedirs: Creates a directory and its parents, tolerating existing
+                ones (creates local directories if None)
+        """
+        self._makedirs = makedirs or (lambda directory: directory.mkdir(parents=True, exist_ok=True))
+        self._created: Set[Path] = set()
+        self._lock = threading.Lock()
+
+    def ensure(self, directory: Path) -> None:
+        """Create a directory and its parents unless already done."""
+        if directory in self._created:
+            return
+        # Creating with exist_ok is idempotent, so racing threads are harmless
+        self._makedirs(directory)
+        with self._lock:
+            self._created.add(directory)
+            self._created.update(directory.parents)
+
+    def __contains__(self, directory: Path) -> bool:
+        return directory in self._created
+
+
+class ParallelMemberWriter:
+    """
+    Read tar members sequentially and write them on a thread pool.
+
+    ``write_member(member, target_path, source)`` is called with a file
+    object over the member's data. It runs on a worker thread for buffered
+    members and on the calling thread for members larger than
+    ``max_buffered_bytes``, so it must not touch state shared with the
+    caller.
+    """
+
+    def __init__(
+        self,
+        write_member: MemberWriter,
+        workers: int = 4,
+        max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            write_member: Callable writing one member to its target path
+            workers: Number of writer threads
+            max_buffered_bytes: Upper bound on member data read but not yet written
+        """
+        if workers < 1:
+            raise ValueError("ParallelMemberWriter requires at least one worker")
+
+        self._write_member = write_member
+        self._workers = workers
+        self._max_pending = 2 * workers
+        self._max_buffered_bytes = max_buffered_bytes
+
+    def extract(
+        self,
+        tar: tarfile.TarFile,
+        members: Iterable[Tuple[tarfile.TarInfo, Path]]
+    ) -> Iterator[MemberOutcome]:
+        """
+        Extract members, yielding ``(member, target_path, error)`` per member.
+
+        Outcomes are yielded in the order of ``members``, with ``error`` None
+        for members written successfully. ``members`` is consumed lazily on
+        the calling thread, interleaved with the outcomes, so it may itself
+        decide per member whether to extract it. Members should be in
+        archive order to avoid seeking back in the tar stream.
+        """
+        pending: Deque[Tuple[Future, tarfile.TarInfo, Path, int]] = deque()
+        buffered_bytes = 0
+
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="tellus-extract") as executor:
+            try:
+                for member, target_path in members:
+                    if member.size > self._max_buffered_bytes:
+                        # Too large to buffer: write from the stream once earlier members are done
+                        while pending:
+                            buffered_bytes -= pending[0][3]
+                            yield self._outcome(pending.popleft())
+                        yield member, target_path, self._write_from_stream(tar, member, target_path)
+                        continue
+
+                    while pending and (len(pending) >= self._max_pending or
+                                       buffered_bytes + member.size > self._max_buffered_bytes):
+                        buffered_bytes -= pending[0][3]
+                        yield self._outcome(pending.popleft())
+
+                    try:
+                        data = self._read_member(tar, member)
+                    except Exception as e:
+                        yield member, target_path, e
+                        continue
+
+                    future = executor.submit(self._write_member, member, target_path, io.BytesIO(data))
+                    pending.append((future, member, target_path, len(data)))
+                    buffered_bytes += len(data)
+
+                while pending:
+                    yield self._outcome(pending.popleft())
+            finally:
+                for future, _, _, _ in pending:
+                    future.cancel()
+
+    def _read_member(self, tar: tarfile.TarFile, member: tarfile.TarInfo) -> bytes:
+        """Read a member's data into memory; members without data read as empty."""
+        extracted_file = tar.extractfile(member)
+        if extracted_file is None:
+            return b''
+        with extracted_file:
+            return extracted_file.read()
+
+    def _write_from_stream(
+        self,
+        tar: tarfile.TarFile,
+        member: tarfile.TarInfo,
+        target_path: Path
+    ) -> Optional[Exception]:
+        """Write a member straight from the tar stream on the calling thread."""
+        try:
+            extracted_file = tar.extractfile(member)
+            if extracted_file is None:
+                self._write_member(member, target_path, io.BytesIO())
+            else:
+                with extracted_file:
+                    self._write_member(member, target_path, extracted_file)
+            return None
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def _outcome(item: Tuple[Future, tarfile.TarInfo, Path, int]) -> MemberOutcome:
+        future, member, target_path, _ = item
+        return member, target_path, future.exception()
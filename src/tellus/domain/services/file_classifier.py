@@ -5,13 +5,89 @@ This service automatically classifies simulation files based on patterns,
 content analysis, and Earth science domain knowledge.
 """
 
+import fnmatch
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from ..entities.simulation_file import (FileContentType, FileImportance,
                                         FilePattern, SimulationFile)
 
+# Characters that make a glob pattern more than a literal string
+_GLOB_MAGIC = re.compile(r'[*?[]')
+
+# Common role patterns in Earth science, checked in order against the file stem
+_ROLE_PATTERNS = tuple((role, re.compile(regex_pattern)) for role, regex_pattern in (
+    ('parameters', r'param|config|setting|namelist'),
+    ('restart', r'restart|checkpoint|resume|init'),
+    ('diagnostic', r'diag|analysis|stat|summary'),
+    ('log', r'log|output|stdout|stderr|debug'),
+    ('metadata', r'meta|catalog|index|manifest'),
+    ('forcing', r'forcing|boundary|driver|input'),
+    ('output', r'output|result|data'),
+))
+
+# Temporal tags suggested by the file stem, first match wins
+_TEMPORAL_PATTERNS = tuple((re.compile(pattern), tag) for pattern, tag in (
+    (r'\b(\d{4})\b', 'year'),
+    (r'\b(\d{4})-(\d{2})\b', 'monthly'),
+    (r'\b(\d{4})-(\d{2})-(\d{2})\b', 'daily'),
+    (r'\b(\d{8})\b', 'daily'),
+    (r'\b(\d{10})\b', 'hourly'),
+))
+
+
+class CompiledPatternTable:
+    """
+    An ordered list of FilePatterns compiled for fast first-match lookup.
+
+    Matching is equivalent to trying ``fnmatch`` against the lower-cased path
+    for each pattern in turn, but avoids the per-pattern Python loop: literal
+    patterns and plain ``*.ext`` patterns are looked up in dicts, and all
+    remaining patterns are combined into one regex whose alternatives keep
+    the table order. The pattern with the lowest table index wins.
+    """
+
+    def __init__(self, patterns: Iterable[FilePattern]):
+        self.patterns = list(patterns)
+        self._exact: Dict[str, int] = {}
+        self._suffixes: Dict[str, int] = {}
+        self._regex_indices: List[int] = []
+
+        alternatives = []
+        for index, pattern in enumerate(self.patterns):
+            glob = pattern.glob_pattern.lower()
+            if not _GLOB_MAGIC.search(glob):
+                self._exact.setdefault(glob, index)
+            elif glob.startswith('*.') and not _GLOB_MAGIC.search(glob, 1) and '.' not in glob[2:]:
+                self._suffixes.setdefault(glob[1:], index)
+            else:
+                # One capturing group per pattern; translate() adds none itself
+                alternatives.append(f"({fnmatch.translate(glob)})")
+                self._regex_indices.append(index)
+
+        self._regex = re.compile('|'.join(alternatives)) if alternatives else None
+
+    def match(self, file_path: str) -> Optional[FilePattern]:
+        """Return the first pattern matching the path, or None."""
+        path = file_path.lower()
+        best = self._exact.get(path)
+
+        dot = path.rfind('.')
+        if dot >= 0:
+            index = self._suffixes.get(path[dot:])
+            if index is not None and (best is None or index < best):
+                best = index
+
+        if self._regex is not None and (best is None or best > self._regex_indices[0]):
+            match = self._regex.match(path)
+            if match:
+                index = self._regex_indices[match.lastindex - 1]
+                if best is None or index < best:
+                    best = index
+
+        return None if best is None else self.patterns[best]
+
 
 class FileClassifier:
     """
@@ -25,6 +101,13 @@ class FileClassifier:
         """Initialize the classifier with Earth science file patterns."""
         self._patterns = self._build_classification_patterns()
         self._model_specific_patterns = self._build_model_specific_patterns()
+        
+        # Compile the pattern tables once; matching runs for every scanned file
+        self._compiled_patterns = CompiledPatternTable(self._patterns)
+        self._compiled_model_patterns = {
+            model: CompiledPatternTable(patterns)
+            for model, patterns in self._model_specific_patterns.items()
+        }
     
     def classify_file(self, file_path: str, simulation_context: Optional[Dict] = None) -> Tuple[FileContentType, FileImportance, Optional[str]]:
         """
@@ -37,25 +120,23 @@ class FileClassifier:
         Returns:
             Tuple of (content_type, importance, file_role)
         """
-        path = Path(file_path)
-        filename = path.name.lower()
-        directory = str(path.parent).lower()
-        extension = path.suffix.lower()
-        
         # Check model-specific patterns first
         if simulation_context:
             model_type = simulation_context.get('model_id', '').lower()
-            if model_type in self._model_specific_patterns:
-                result = self._match_patterns(file_path, self._model_specific_patterns[model_type])
+            if model_type in self._compiled_model_patterns:
+                result = self._match_patterns(file_path, self._compiled_model_patterns[model_type])
                 if result:
                     return result
         
         # Check general patterns
-        result = self._match_patterns(file_path, self._patterns)
+        result = self._match_patterns(file_path, self._compiled_patterns)
         if result:
             return result
         
         # Fallback classification based on location and extension
+        path = Path(file_path)
+        directory = str(path.parent).lower()
+        extension = path.suffix.lower()
         return self._fallback_classification(file_path, directory, extension)
     
     def classify_files(self, file_paths: List[str], simulation_context: Optional[Dict] = None) -> Dict[str, Tuple[FileContentType, FileImportance, Optional[str]]]:
@@ -97,33 +178,20 @@ class FileClassifier:
             **kwargs
         )
     
-    def _match_patterns(self, file_path: str, patterns: List[FilePattern]) -> Optional[Tuple[FileContentType, FileImportance, Optional[str]]]:
-        """Match file path against a list of patterns."""
-        from fnmatch import fnmatch
-        
-        for pattern in patterns:
-            if fnmatch(file_path.lower(), pattern.glob_pattern.lower()):
-                role = self._extract_file_role(file_path, pattern)
-                return (pattern.content_type, pattern.importance, role)
-        return None
+    def _match_patterns(self, file_path: str, patterns: CompiledPatternTable) -> Optional[Tuple[FileContentType, FileImportance, Optional[str]]]:
+        """Match file path against a compiled pattern table."""
+        pattern = patterns.match(file_path)
+        if pattern is None:
+            return None
+        role = self._extract_file_role(file_path, pattern)
+        return (pattern.content_type, pattern.importance, role)
     
     def _extract_file_role(self, file_path: str, pattern: FilePattern) -> Optional[str]:
         """Extract specific file role from path based on pattern context."""
         filename = Path(file_path).stem.lower()
         
-        # Common role patterns in Earth science
-        role_patterns = {
-            'parameters': r'param|config|setting|namelist',
-            'restart': r'restart|checkpoint|resume|init',
-            'diagnostic': r'diag|analysis|stat|summary',
-            'log': r'log|output|stdout|stderr|debug',
-            'metadata': r'meta|catalog|index|manifest',
-            'forcing': r'forcing|boundary|driver|input',
-            'output': r'output|result|data'
-        }
-        
-        for role, regex_pattern in role_patterns.items():
-            if re.search(regex_pattern, filename):
+        for role, regex in _ROLE_PATTERNS:
+            if regex.search(filename):
                 return role
         
         return None
@@ -142,17 +210,17 @@ class FileClassifier:
             FilePattern("*.json", FileContentType.CONFIG, FileImportance.IMPORTANT, "JSON configuration"),
             
             # NetCDF Data Files (primary Earth science format)
-            FilePattern("*.nc", FileContentType.OUTPUT, FileImportance.IMPORTANT, "NetCDF data files"),
-            FilePattern("*.nc4", FileContentType.OUTPUT, FileImportance.IMPORTANT, "NetCDF4 data files"),
-            FilePattern("*.cdf", FileContentType.OUTPUT, FileImportance.IMPORTANT, "NetCDF data files"),
+            FilePattern("*.nc", FileContentType.OUTDATA, FileImportance.IMPORTANT, "NetCDF data files"),
+            FilePattern("*.nc4", FileContentType.OUTDATA, FileImportance.IMPORTANT, "NetCDF4 data files"),
+            FilePattern("*.cdf", FileContentType.OUTDATA, FileImportance.IMPORTANT, "NetCDF data files"),
             
             # Other Data Formats
-            FilePattern("*.hdf", FileContentType.OUTPUT, FileImportance.IMPORTANT, "HDF data files"),
-            FilePattern("*.hdf5", FileContentType.OUTPUT, FileImportance.IMPORTANT, "HDF5 data files"),
-            FilePattern("*.h5", FileContentType.OUTPUT, FileImportance.IMPORTANT, "HDF5 data files"),
-            FilePattern("*.grib", FileContentType.OUTPUT, FileImportance.IMPORTANT, "GRIB meteorological data"),
-            FilePattern("*.grib2", FileContentType.OUTPUT, FileImportance.IMPORTANT, "GRIB2 meteorological data"),
-            FilePattern("*.grb", FileContentType.OUTPUT, FileImportance.IMPORTANT, "GRIB meteorological data"),
+            FilePattern("*.hdf", FileContentType.OUTDATA, FileImportance.IMPORTANT, "HDF data files"),
+            FilePattern("*.hdf5", FileContentType.OUTDATA, FileImportance.IMPORTANT, "HDF5 data files"),
+            FilePattern("*.h5", FileContentType.OUTDATA, FileImportance.IMPORTANT, "HDF5 data files"),
+            FilePattern("*.grib", FileContentType.OUTDATA, FileImportance.IMPORTANT, "GRIB meteorological data"),
+            FilePattern("*.grib2", FileContentType.OUTDATA, FileImportance.IMPORTANT, "GRIB2 meteorological data"),
+            FilePattern("*.grb", FileContentType.OUTDATA, FileImportance.IMPORTANT, "GRIB meteorological data"),
             
             # Log and Output Files
             FilePattern("*.log", FileContentType.LOG, FileImportance.OPTIONAL, "Log files"),
@@ -163,16 +231,16 @@ class FileClassifier:
             FilePattern("slurm-*.out", FileContentType.LOG, FileImportance.OPTIONAL, "SLURM job output"),
             
             # Restart and Checkpoint Files
-            FilePattern("*restart*", FileContentType.INTERMEDIATE, FileImportance.CRITICAL, "Restart files"),
-            FilePattern("*checkpoint*", FileContentType.INTERMEDIATE, FileImportance.CRITICAL, "Checkpoint files"),
-            FilePattern("*.res", FileContentType.INTERMEDIATE, FileImportance.CRITICAL, "Restart files"),
-            FilePattern("*.rst", FileContentType.INTERMEDIATE, FileImportance.CRITICAL, "Restart files"),
+            FilePattern("*restart*", FileContentType.RESTART, FileImportance.CRITICAL, "Restart files"),
+            FilePattern("*checkpoint*", FileContentType.RESTART, FileImportance.CRITICAL, "Checkpoint files"),
+            FilePattern("*.res", FileContentType.RESTART, FileImportance.CRITICAL, "Restart files"),
+            FilePattern("*.rst", FileContentType.RESTART, FileImportance.CRITICAL, "Restart files"),
             
             # Analysis and Diagnostic Files
-            FilePattern("*diag*", FileContentType.DIAGNOSTIC, FileImportance.IMPORTANT, "Diagnostic output"),
-            FilePattern("*analysis*", FileContentType.DIAGNOSTIC, FileImportance.IMPORTANT, "Analysis output"),
-            FilePattern("*stat*", FileContentType.DIAGNOSTIC, FileImportance.IMPORTANT, "Statistical output"),
-            FilePattern("*summary*", FileContentType.DIAGNOSTIC, FileImportance.IMPORTANT, "Summary output"),
+            FilePattern("*diag*", FileContentType.ANALYSIS, FileImportance.IMPORTANT, "Diagnostic output"),
+            FilePattern("*analysis*", FileContentType.ANALYSIS, FileImportance.IMPORTANT, "Analysis output"),
+            FilePattern("*stat*", FileContentType.ANALYSIS, FileImportance.IMPORTANT, "Statistical output"),
+            FilePattern("*summary*", FileContentType.ANALYSIS, FileImportance.IMPORTANT, "Summary output"),
             
             # Input Data and Forcing
             FilePattern("input/*", FileContentType.INPUT, FileImportance.IMPORTANT, "Input data files"),
@@ -188,59 +256,59 @@ class FileClassifier:
             FilePattern("*.m", FileContentType.CONFIG, FileImportance.IMPORTANT, "MATLAB scripts"),
             
             # Metadata and Documentation
-            FilePattern("*.txt", FileContentType.METADATA, FileImportance.OPTIONAL, "Text documentation"),
-            FilePattern("*.md", FileContentType.METADATA, FileImportance.OPTIONAL, "Markdown documentation"),
-            FilePattern("README*", FileContentType.METADATA, FileImportance.IMPORTANT, "README files"),
-            FilePattern("*metadata*", FileContentType.METADATA, FileImportance.IMPORTANT, "Metadata files"),
-            FilePattern("*catalog*", FileContentType.METADATA, FileImportance.IMPORTANT, "Data catalog files"),
+            FilePattern("*.txt", FileContentType.AUXILIARY, FileImportance.OPTIONAL, "Text documentation"),
+            FilePattern("*.md", FileContentType.AUXILIARY, FileImportance.OPTIONAL, "Markdown documentation"),
+            FilePattern("README*", FileContentType.AUXILIARY, FileImportance.IMPORTANT, "README files"),
+            FilePattern("*metadata*", FileContentType.AUXILIARY, FileImportance.IMPORTANT, "Metadata files"),
+            FilePattern("*catalog*", FileContentType.AUXILIARY, FileImportance.IMPORTANT, "Data catalog files"),
             
             # Temporary and System Files
-            FilePattern("*.tmp", FileContentType.INTERMEDIATE, FileImportance.TEMPORARY, "Temporary files"),
-            FilePattern("*.temp", FileContentType.INTERMEDIATE, FileImportance.TEMPORARY, "Temporary files"),
-            FilePattern("*.swp", FileContentType.INTERMEDIATE, FileImportance.TEMPORARY, "Vim swap files"),
-            FilePattern("*.bak", FileContentType.INTERMEDIATE, FileImportance.TEMPORARY, "Backup files"),
-            FilePattern(".*", FileContentType.INTERMEDIATE, FileImportance.TEMPORARY, "Hidden system files"),
-            FilePattern("core.*", FileContentType.INTERMEDIATE, FileImportance.TEMPORARY, "Core dump files"),
+            FilePattern("*.tmp", FileContentType.AUXILIARY, FileImportance.TEMPORARY, "Temporary files"),
+            FilePattern("*.temp", FileContentType.AUXILIARY, FileImportance.TEMPORARY, "Temporary files"),
+            FilePattern("*.swp", FileContentType.AUXILIARY, FileImportance.TEMPORARY, "Vim swap files"),
+            FilePattern("*.bak", FileContentType.AUXILIARY, FileImportance.TEMPORARY, "Backup files"),
+            FilePattern(".*", FileContentType.AUXILIARY, FileImportance.TEMPORARY, "Hidden system files"),
+            FilePattern("core.*", FileContentType.AUXILIARY, FileImportance.TEMPORARY, "Core dump files"),
             
             # Archive Files
-            FilePattern("*.tar", FileContentType.INTERMEDIATE, FileImportance.OPTIONAL, "Archive files"),
-            FilePattern("*.gz", FileContentType.INTERMEDIATE, FileImportance.OPTIONAL, "Compressed files"),
-            FilePattern("*.zip", FileContentType.INTERMEDIATE, FileImportance.OPTIONAL, "ZIP archives"),
-            FilePattern("*.tar.gz", FileContentType.INTERMEDIATE, FileImportance.OPTIONAL, "Compressed archives"),
-            FilePattern("*.tgz", FileContentType.INTERMEDIATE, FileImportance.OPTIONAL, "Compressed archives"),
+            FilePattern("*.tar", FileContentType.AUXILIARY, FileImportance.OPTIONAL, "Archive files"),
+            FilePattern("*.gz", FileContentType.AUXILIARY, FileImportance.OPTIONAL, "Compressed files"),
+            FilePattern("*.zip", FileContentType.AUXILIARY, FileImportance.OPTIONAL, "ZIP archives"),
+            FilePattern("*.tar.gz", FileContentType.AUXILIARY, FileImportance.OPTIONAL, "Compressed archives"),
+            FilePattern("*.tgz", FileContentType.AUXILIARY, FileImportance.OPTIONAL, "Compressed archives"),
         ]
     
     def _build_model_specific_patterns(self) -> Dict[str, List[FilePattern]]:
         """Build model-specific classification patterns."""
         return {
             'cesm': [
-                FilePattern("*cam*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "CAM atmospheric model output"),
-                FilePattern("*clm*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "CLM land model output"),
-                FilePattern("*pop*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "POP ocean model output"),
-                FilePattern("*cice*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "CICE sea ice model output"),
+                FilePattern("*cam*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "CAM atmospheric model output"),
+                FilePattern("*clm*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "CLM land model output"),
+                FilePattern("*pop*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "POP ocean model output"),
+                FilePattern("*cice*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "CICE sea ice model output"),
                 FilePattern("user_nl_*", FileContentType.INPUT, FileImportance.CRITICAL, "User namelist files"),
                 FilePattern("env_*.xml", FileContentType.CONFIG, FileImportance.CRITICAL, "Environment configuration"),
             ],
             'echam': [
-                FilePattern("*BOT*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "ECHAM surface output"),
-                FilePattern("*ATM*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "ECHAM atmosphere output"),
+                FilePattern("*BOT*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "ECHAM surface output"),
+                FilePattern("*ATM*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "ECHAM atmosphere output"),
                 FilePattern("*LOG*", FileContentType.LOG, FileImportance.OPTIONAL, "ECHAM log output"),
                 FilePattern("namelist.echam", FileContentType.INPUT, FileImportance.CRITICAL, "ECHAM namelist"),
             ],
             'icon': [
-                FilePattern("*atm_*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "ICON atmosphere output"),
-                FilePattern("*oce_*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "ICON ocean output"),
-                FilePattern("*lnd_*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "ICON land output"),
+                FilePattern("*atm_*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "ICON atmosphere output"),
+                FilePattern("*oce_*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "ICON ocean output"),
+                FilePattern("*lnd_*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "ICON land output"),
                 FilePattern("icon_master.namelist", FileContentType.INPUT, FileImportance.CRITICAL, "ICON master namelist"),
             ],
             'wrf': [
-                FilePattern("wrfout_*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "WRF model output"),
-                FilePattern("wrfrst_*", FileContentType.INTERMEDIATE, FileImportance.CRITICAL, "WRF restart files"),
+                FilePattern("wrfout_*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "WRF model output"),
+                FilePattern("wrfrst_*", FileContentType.RESTART, FileImportance.CRITICAL, "WRF restart files"),
                 FilePattern("wrfbdy_*", FileContentType.INPUT, FileImportance.IMPORTANT, "WRF boundary files"),
                 FilePattern("namelist.input", FileContentType.INPUT, FileImportance.CRITICAL, "WRF namelist"),
             ],
             'fesom': [
-                FilePattern("*.fesom.*", FileContentType.OUTPUT, FileImportance.IMPORTANT, "FESOM ocean model output"),
+                FilePattern("*.fesom.*", FileContentType.OUTDATA, FileImportance.IMPORTANT, "FESOM ocean model output"),
                 FilePattern("namelist.config", FileContentType.INPUT, FileImportance.CRITICAL, "FESOM configuration"),
                 FilePattern("forcing/*", FileContentType.INPUT, FileImportance.IMPORTANT, "FESOM forcing data"),
             ]
@@ -255,7 +323,7 @@ class FileClassifier:
             return (FileContentType.INPUT, FileImportance.IMPORTANT, 'input_data')
         
         if any(dir_part in directory for dir_part in ['output', 'results', 'data']):
-            return (FileContentType.OUTPUT, FileImportance.IMPORTANT, 'model_output')
+            return (FileContentType.OUTDATA, FileImportance.IMPORTANT, 'model_output')
         
         if any(dir_part in directory for dir_part in ['log', 'logs']):
             return (FileContentType.LOG, FileImportance.OPTIONAL, 'general_log')
@@ -264,20 +332,20 @@ class FileClassifier:
             return (FileContentType.CONFIG, FileImportance.IMPORTANT, 'configuration')
         
         if any(dir_part in directory for dir_part in ['restart', 'checkpoint']):
-            return (FileContentType.INTERMEDIATE, FileImportance.CRITICAL, 'restart_data')
+            return (FileContentType.RESTART, FileImportance.CRITICAL, 'restart_data')
         
         # Classification by file extension
         if extension in ['.dat', '.txt', '.csv']:
-            return (FileContentType.OUTPUT, FileImportance.OPTIONAL, 'text_data')
+            return (FileContentType.OUTDATA, FileImportance.OPTIONAL, 'text_data')
         
         if extension in ['.png', '.jpg', '.jpeg', '.pdf', '.eps']:
-            return (FileContentType.DIAGNOSTIC, FileImportance.OPTIONAL, 'visualization')
+            return (FileContentType.VIZ, FileImportance.OPTIONAL, 'visualization')
         
         if extension in ['.exe', '.x']:
             return (FileContentType.CONFIG, FileImportance.IMPORTANT, 'executable')
         
         # Default fallback
-        return (FileContentType.OUTPUT, FileImportance.OPTIONAL, 'unknown')
+        return (FileContentType.OUTDATA, FileImportance.OPTIONAL, 'unknown')
     
     def _generate_automatic_tags(self, file_path: str, content_type: FileContentType, importance: FileImportance) -> Set[str]:
         """Generate automatic tags based on file classification."""
@@ -302,16 +370,8 @@ class FileClassifier:
         
         # Add temporal tags if filename suggests temporal data
         filename = Path(file_path).stem.lower()
-        temporal_patterns = {
-            r'\b(\d{4})\b': 'year',
-            r'\b(\d{4})-(\d{2})\b': 'monthly',
-            r'\b(\d{4})-(\d{2})-(\d{2})\b': 'daily',
-            r'\b(\d{8})\b': 'daily',
-            r'\b(\d{10})\b': 'hourly'
-        }
-        
-        for pattern, tag in temporal_patterns.items():
-            if re.search(pattern, filename):
+        for regex, tag in _TEMPORAL_PATTERNS:
+            if regex.search(filename):
                 tags.add(tag)
                 break
         
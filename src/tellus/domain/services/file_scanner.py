@@ -5,12 +5,18 @@ This service recursively scans simulation directories, classifies files,
 and builds file inventories for archive operations.
 """
 
+import fnmatch
 import hashlib
+import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import re
+from concurrent.futures import (ALL_COMPLETED, FIRST_COMPLETED, Future,
+                                ThreadPoolExecutor, wait)
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Pattern, Set, Tuple)
 
 from ..entities.simulation_file import Checksum, FileInventory, SimulationFile
 from .file_classifier import FileClassifier
@@ -29,6 +35,11 @@ class FileScanResult:
         self.files_processed: int = 0
         self.bytes_processed: int = 0
         self.skipped_files: int = 0
+        # Incremental scans only: what changed since the cached scan
+        self.new_files: List[str] = []
+        self.modified_files: List[str] = []
+        self.deleted_files: List[str] = []
+        self.unchanged_files: int = 0
     
     @property
     def success(self) -> bool:
@@ -51,6 +62,112 @@ class FileScanResult:
         logger.warning(f"File scan warning: {message}")
 
 
+class FileScanCache:
+    """
+    Persistent stat cache for incremental directory scans.
+    
+    Remembers the size, modification time and inode each file had when it was
+    last scanned, together with the SimulationFile built from it. Files whose
+    stat signature is unchanged are reused from the cache instead of being
+    re-classified and re-checksummed.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, cache_path: Path):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_path: JSON file the cache is stored in
+        """
+        self.cache_path = Path(cache_path)
+        self._fingerprint: Optional[str] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+    
+    @staticmethod
+    def _signature(stat_info: os.stat_result) -> List[int]:
+        return [stat_info.st_size, stat_info.st_mtime_ns, stat_info.st_ino]
+    
+    def load(self, fingerprint: str) -> None:
+        """
+        Load the cache from disk.
+        
+        The cache is discarded if it is unreadable, from another cache version,
+        or was built with a different fingerprint (e.g. simulation context),
+        since its classifications would no longer apply.
+        
+        Args:
+            fingerprint: Fingerprint of the settings the scan classifies with
+        """
+        self._fingerprint = fingerprint
+        self._entries = {}
+        
+        if not self.cache_path.exists():
+            return
+        
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scan cache {self.cache_path}: {e}")
+            return
+        
+        if data.get('version') == self.VERSION and data.get('fingerprint') == fingerprint:
+            self._entries = data.get('entries', {})
+    
+    def save(self) -> None:
+        """Write the cache to disk atomically."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'version': self.VERSION,
+                'fingerprint': self._fingerprint,
+                'entries': self._entries,
+            }, f)
+        os.replace(temp_path, self.cache_path)
+    
+    def lookup(self, rel_path: str, stat_info: os.stat_result,
+               require_checksum: bool = False) -> Optional[SimulationFile]:
+        """
+        Get the cached file for a path if it is unchanged on disk.
+        
+        Args:
+            rel_path: Path relative to the scanned directory
+            stat_info: Current stat result of the file
+            require_checksum: Treat cached files without a checksum as stale
+            
+        Returns:
+            The cached SimulationFile, or None if the file must be rescanned
+        """
+        entry = self._entries.get(rel_path)
+        if entry is None or entry['stat'] != self._signature(stat_info):
+            return None
+        if require_checksum and not entry['file'].get('checksum'):
+            return None
+        return SimulationFile.from_dict(entry['file'])
+    
+    def update(self, rel_path: str, stat_info: os.stat_result,
+               simulation_file: SimulationFile) -> None:
+        """Record the scan of a file."""
+        self._entries[rel_path] = {
+            'stat': self._signature(stat_info),
+            'file': simulation_file.to_dict(),
+        }
+    
+    def remove(self, rel_path: str) -> None:
+        """Forget a file."""
+        self._entries.pop(rel_path, None)
+    
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self._entries
+    
+    def paths(self) -> Set[str]:
+        """All cached relative paths."""
+        return set(self._entries)
+
+
 class FileScanner:
     """
     Domain service for scanning simulation directories and building file inventories.
@@ -78,11 +195,17 @@ class FileScanner:
         exclude_patterns: Optional[List[str]] = None,
         compute_checksums: bool = False,
         max_workers: int = 4,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cache_path: Optional[Path] = None
     ) -> FileScanResult:
         """
         Scan a simulation directory and build a file inventory.
         
+        With a cache path the scan is incremental: files whose size,
+        modification time and inode match the cache are taken from it, only
+        new or changed files are classified and checksummed, and cached files
+        that no longer exist are reported in the result's deleted_files.
+        
         Args:
             base_path: Base directory to scan
             simulation_context: Context information about the simulation
@@ -91,6 +214,7 @@ class FileScanner:
             compute_checksums: Whether to compute file checksums
             max_workers: Number of worker threads for parallel processing
             progress_callback: Optional callback for progress updates (processed, total)
+            cache_path: Optional scan cache file enabling incremental scanning
             
         Returns:
             FileScanResult with inventory and scan metadata
@@ -109,29 +233,43 @@ class FileScanner:
                 result.add_error(f"Path is not a directory: {base_path}")
                 return result
             
-            # Find all files to process
-            file_paths = self._find_files(
+            # Stream files from the walk straight into processing
+            entries = self._walk_files(
                 base_path, include_patterns, exclude_patterns, result
             )
             
-            if not file_paths:
-                result.add_warning("No files found to scan")
-                return result
-            
-            self._logger.info(f"Found {len(file_paths)} files to process")
+            cache = None
+            stats: Dict[str, os.stat_result] = {}
+            if cache_path is not None:
+                cache = FileScanCache(cache_path)
+                cache.load(self._cache_fingerprint(simulation_context))
+                entries = self._skip_cached_files(
+                    base_path, entries, cache, compute_checksums, stats, result
+                )
             
             # Process files with parallel workers
             if max_workers > 1:
-                self._process_files_parallel(
-                    base_path, file_paths, simulation_context, compute_checksums,
+                scanned = self._process_files_parallel(
+                    base_path, entries, simulation_context, compute_checksums,
                     max_workers, progress_callback, result
                 )
             else:
-                self._process_files_sequential(
-                    base_path, file_paths, simulation_context, compute_checksums,
+                scanned = self._process_files_sequential(
+                    base_path, entries, simulation_context, compute_checksums,
                     progress_callback, result
                 )
             
+            if not scanned and not result.inventory.files:
+                result.add_warning("No files found to scan")
+            
+            if cache is not None:
+                # Failed files are left out of the cache so the next scan retries them
+                for rel_path, stat_info in stats.items():
+                    simulation_file = result.inventory.get_file(rel_path)
+                    if simulation_file is not None:
+                        cache.update(rel_path, stat_info, simulation_file)
+                cache.save()
+            
             # Finalize result
             end_time = datetime.now()
             result.scan_time = (end_time - start_time).total_seconds()
@@ -193,8 +331,9 @@ class FileScanner:
             
             # Process files sequentially (file lists are typically smaller)
             self._process_files_sequential(
-                base_path, existing_files, simulation_context, compute_checksums,
-                progress_callback, result
+                base_path, ((path, None) for path in existing_files),
+                simulation_context, compute_checksums, progress_callback, result,
+                total_files=len(existing_files)
             )
             
             # Finalize result
@@ -212,68 +351,147 @@ class FileScanner:
             self._logger.exception("File list scan failed")
             return result
     
-    def _find_files(
+    @staticmethod
+    def _compile_patterns(patterns: Optional[List[str]]) -> Optional[Pattern[str]]:
+        """Compile glob patterns into one regex with fnmatch semantics."""
+        if not patterns:
+            return None
+        return re.compile('|'.join(
+            f'(?:{fnmatch.translate(os.path.normcase(pattern))})' for pattern in patterns
+        ))
+    
+    def _walk_files(
         self,
         base_path: Path,
         include_patterns: Optional[List[str]],
         exclude_patterns: Optional[List[str]],
         result: FileScanResult
-    ) -> List[str]:
-        """Find all files to process based on patterns."""
-        from fnmatch import fnmatch
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        Lazily walk the directory tree, yielding files to process.
         
-        files = []
+        Uses os.scandir so each file costs a single stat call, whose result
+        is passed on to processing. Directories whose whole content would be
+        excluded are not descended into. Symlinked directories are not
+        followed; symlinked files are.
         
-        try:
-            # Recursively find all files
-            for path in base_path.rglob('*'):
-                if not path.is_file():
-                    continue
-                
-                # Get relative path
+        Yields:
+            Tuples of (relative path, stat result)
+        """
+        include = self._compile_patterns(include_patterns)
+        exclude = self._compile_patterns(exclude_patterns)
+        
+        # An exclude pattern ending in '*' that matches "dir/" matches every
+        # path below dir, so the directory can be pruned
+        prune = self._compile_patterns(
+            [pattern for pattern in exclude_patterns or [] if pattern.endswith('*')]
+        )
+        
+        stack = [('', os.fspath(base_path))]
+        while stack:
+            rel_dir, abs_dir = stack.pop()
+            try:
+                with os.scandir(abs_dir) as it:
+                    entries = list(it)
+            except OSError as e:
+                result.add_warning(f"Cannot read directory {abs_dir}: {e}")
+                continue
+            
+            for entry in entries:
+                rel_path = rel_dir + entry.name
                 try:
-                    rel_path = str(path.relative_to(base_path))
-                except ValueError:
-                    # Skip files outside base path
-                    continue
-                
-                # Apply include patterns
-                if include_patterns:
-                    included = any(fnmatch(rel_path, pattern) for pattern in include_patterns)
-                    if not included:
-                        result.skipped_files += 1
+                    if entry.is_dir(follow_symlinks=False):
+                        if prune is None or not prune.match(os.path.normcase(rel_path + os.sep)):
+                            stack.append((rel_path + os.sep, entry.path))
                         continue
-                
-                # Apply exclude patterns
-                if exclude_patterns:
-                    excluded = any(fnmatch(rel_path, pattern) for pattern in exclude_patterns)
-                    if excluded:
-                        result.skipped_files += 1
+                    if not entry.is_file():
                         continue
+                    stat_info = entry.stat()
+                except OSError:
+                    # Vanished or broken entry
+                    continue
                 
-                files.append(rel_path)
+                match_path = os.path.normcase(rel_path)
+                if include is not None and not include.match(match_path):
+                    result.skipped_files += 1
+                    continue
+                if exclude is not None and exclude.match(match_path):
+                    result.skipped_files += 1
+                    continue
+                
+                yield rel_path, stat_info
+    
+    def _cache_fingerprint(self, simulation_context: Optional[Dict]) -> str:
+        """Fingerprint of the settings cached classifications depend on."""
+        context = json.dumps(simulation_context or {}, sort_keys=True, default=str)
+        return hashlib.sha256(context.encode()).hexdigest()
+    
+    def _skip_cached_files(
+        self,
+        base_path: Path,
+        entries: Iterable[Tuple[str, os.stat_result]],
+        cache: FileScanCache,
+        compute_checksums: bool,
+        stats: Dict[str, os.stat_result],
+        result: FileScanResult
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        Take unchanged files from the scan cache and report deletions.
         
-        except Exception as e:
-            result.add_error(f"Error finding files: {str(e)}")
+        Yields:
+            The new or changed entries that must be scanned
+        """
+        seen = set()
         
-        return files
+        for rel_path, stat_info in entries:
+            seen.add(rel_path)
+            cached = cache.lookup(rel_path, stat_info, require_checksum=compute_checksums)
+            if cached is not None:
+                result.inventory.add_file(cached)
+                result.unchanged_files += 1
+                continue
+            
+            if rel_path in cache:
+                result.modified_files.append(rel_path)
+            else:
+                result.new_files.append(rel_path)
+            stats[rel_path] = stat_info
+            yield rel_path, stat_info
+        
+        # Cached files that were not found may just be filtered out this time
+        for rel_path in sorted(cache.paths() - seen):
+            if not (base_path / rel_path).exists():
+                result.deleted_files.append(rel_path)
+                cache.remove(rel_path)
+        
+        self._logger.info(
+            f"Scan cache: {result.unchanged_files} unchanged, {len(result.new_files)} new, "
+            f"{len(result.modified_files)} modified, {len(result.deleted_files)} deleted"
+        )
     
     def _process_files_sequential(
         self,
         base_path: Path,
-        file_paths: List[str],
+        entries: Iterable[Tuple[str, Optional[os.stat_result]]],
         simulation_context: Optional[Dict],
         compute_checksums: bool,
         progress_callback: Optional[Callable[[int, int], None]],
-        result: FileScanResult
-    ) -> None:
-        """Process files sequentially."""
-        total_files = len(file_paths)
+        result: FileScanResult,
+        total_files: Optional[int] = None
+    ) -> int:
+        """
+        Process files sequentially.
+        
+        Returns:
+            Number of files processed
+        """
+        processed = 0
         
-        for i, rel_path in enumerate(file_paths):
+        for rel_path, stat_info in entries:
+            processed += 1
             try:
                 simulation_file = self._process_single_file(
-                    base_path, rel_path, simulation_context, compute_checksums
+                    base_path, rel_path, simulation_context, compute_checksums, stat_info
                 )
                 
                 if simulation_file:
@@ -281,44 +499,49 @@ class FileScanner:
                 else:
                     result.skipped_files += 1
                 
-                # Report progress
-                if progress_callback and (i + 1) % 10 == 0:
-                    progress_callback(i + 1, total_files)
+                # Report progress (the total is not known while walking)
+                if progress_callback and processed % 10 == 0:
+                    progress_callback(processed, total_files or processed)
                     
             except Exception as e:
                 result.add_error(f"Error processing file {rel_path}: {str(e)}")
         
         # Final progress update
         if progress_callback:
-            progress_callback(total_files, total_files)
+            progress_callback(processed, processed)
+        
+        return processed
     
     def _process_files_parallel(
         self,
         base_path: Path,
-        file_paths: List[str],
+        entries: Iterable[Tuple[str, Optional[os.stat_result]]],
         simulation_context: Optional[Dict],
         compute_checksums: bool,
         max_workers: int,
         progress_callback: Optional[Callable[[int, int], None]],
         result: FileScanResult
-    ) -> None:
-        """Process files in parallel using thread pool."""
-        total_files = len(file_paths)
+    ) -> int:
+        """
+        Process files in parallel using thread pool.
+        
+        Files are submitted as the walk yields them, with a bounded number in
+        flight, so processing starts before the walk finishes and memory does
+        not grow with the number of files.
+        
+        Returns:
+            Number of files processed
+        """
+        max_in_flight = max_workers * 4
+        in_flight: Dict[Future, str] = {}
+        submitted = 0
         completed = 0
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_path = {
-                executor.submit(
-                    self._process_single_file,
-                    base_path, rel_path, simulation_context, compute_checksums
-                ): rel_path
-                for rel_path in file_paths
-            }
-            
-            # Process completed tasks
-            for future in as_completed(future_to_path):
-                rel_path = future_to_path[future]
+        def collect(return_when: str) -> None:
+            nonlocal completed
+            done, _ = wait(in_flight, return_when=return_when)
+            for future in done:
+                rel_path = in_flight.pop(future)
                 completed += 1
                 
                 try:
@@ -331,30 +554,54 @@ class FileScanner:
                 except Exception as e:
                     result.add_error(f"Error processing file {rel_path}: {str(e)}")
                 
-                # Report progress
+                # Report progress against the files found so far
                 if progress_callback and completed % 10 == 0:
-                    progress_callback(completed, total_files)
+                    progress_callback(completed, submitted)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for rel_path, stat_info in entries:
+                if len(in_flight) >= max_in_flight:
+                    collect(FIRST_COMPLETED)
+                future = executor.submit(
+                    self._process_single_file,
+                    base_path, rel_path, simulation_context, compute_checksums, stat_info
+                )
+                in_flight[future] = rel_path
+                submitted += 1
             
-            # Final progress update
-            if progress_callback:
-                progress_callback(total_files, total_files)
+            if in_flight:
+                collect(ALL_COMPLETED)
+        
+        # Final progress update
+        if progress_callback:
+            progress_callback(submitted, submitted)
+        
+        return submitted
     
     def _process_single_file(
         self,
         base_path: Path,
         rel_path: str,
         simulation_context: Optional[Dict],
-        compute_checksums: bool
+        compute_checksums: bool,
+        stat_info: Optional[os.stat_result] = None
     ) -> Optional[SimulationFile]:
-        """Process a single file and return SimulationFile entity."""
+        """
+        Process a single file and return SimulationFile entity.
+        
+        Args:
+            stat_info: Stat result from the directory walk, if available,
+                to avoid stat-ing the file again
+        """
         try:
             full_path = base_path / rel_path
             
-            if not full_path.exists() or not full_path.is_file():
-                return None
+            if stat_info is None:
+                if not full_path.is_file():
+                    return None
+                stat_info = full_path.stat()
             
             # Get basic file information
-            stat_info = full_path.stat()
             size = stat_info.st_size
             created_time = stat_info.st_ctime
             modified_time = stat_info.st_mtime
@@ -10,7 +10,7 @@ and provides comprehensive planning and validation capabilities.
 import json
 import logging
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
@@ -23,7 +23,10 @@ from ..entities.simulation_file import (FileContentType, FileImportance,
 from .archive_extraction import (ArchiveExtractionConfig,
                                  ArchiveExtractionFilter,
                                  ArchiveExtractionService, ConflictResolution,
-                                 DateRange, ExtractionResult)
+                                 DateRange, ExtractionResult,
+                                 extract_archive_task)
+from .fragment_graph import FragmentDependencyGraph, create_fragment_executor
+from .fragment_overlaps import find_overlapping_intervals, find_shared_files
 from .sidecar_metadata import SidecarMetadata
 
 logger = logging.getLogger(__name__)
@@ -57,6 +60,17 @@ class AssemblyComplexity(Enum):
     VERY_COMPLEX = "very_complex"  # Many fragments, complex overlaps
 
 
+# Rough per-file extraction cost used for duration estimates
+SECONDS_PER_FILE = 0.01
+
+COMPLEXITY_DURATION_MULTIPLIERS = {
+    AssemblyComplexity.SIMPLE: 1.0,
+    AssemblyComplexity.MODERATE: 1.5,
+    AssemblyComplexity.COMPLEX: 2.5,
+    AssemblyComplexity.VERY_COMPLEX: 4.0
+}
+
+
 @dataclass
 class FragmentOverlap:
     """Information about overlapping content between fragments."""
@@ -103,6 +117,7 @@ class AssemblyPlan:
         
         # Dependencies
         self.fragment_dependencies: Dict[str, List[str]] = {}
+        self.dependency_graph: Optional[FragmentDependencyGraph] = None
         
     def add_fragment(self, fragment: ArchiveMetadata) -> None:
         """Add a fragment to the assembly plan."""
@@ -130,6 +145,33 @@ class AssemblyPlan:
         """Get overlaps with high conflict potential."""
         return [o for o in self.overlaps if o.conflict_potential == 'high']
     
+    def build_dependency_graph(self, order: Optional[List[str]] = None) -> FragmentDependencyGraph:
+        """
+        Build the graph of which fragments must be extracted after which.
+        
+        Overlapping fragments are ordered as in ``order`` (the plan's
+        extraction order by default); fragments without a file inventory may
+        overlap with anything and are serialised against all others.
+        
+        Args:
+            order: Fragment IDs in sequential extraction order
+        """
+        order = self.extraction_order if order is None else order
+        conflicts = [(o.fragment1_id, o.fragment2_id) for o in self.overlaps]
+        unknown = [str(f.archive_id) for f in self.fragments if not f.file_inventory]
+        return FragmentDependencyGraph(order, conflicts, unknown)
+    
+    def get_fragment_durations(self) -> Dict[str, float]:
+        """Estimated extraction time of each fragment in seconds."""
+        multiplier = COMPLEXITY_DURATION_MULTIPLIERS.get(self.estimated_complexity, 1.0)
+        return {
+            str(fragment.archive_id): (
+                fragment.file_inventory.file_count * SECONDS_PER_FILE * multiplier
+                if fragment.file_inventory else 0.0
+            )
+            for fragment in self.fragments
+        }
+    
     def _update_estimates(self) -> None:
         """Update size and file count estimates."""
         total_files = 0
@@ -145,17 +187,8 @@ class AssemblyPlan:
         self.estimated_files = int(total_files * (1 - overlap_reduction))
         self.estimated_size = int(total_size * (1 - overlap_reduction))
         
-        # Estimate duration based on complexity
-        base_duration = total_files * 0.01  # 0.01 seconds per file
-        complexity_multiplier = {
-            AssemblyComplexity.SIMPLE: 1.0,
-            AssemblyComplexity.MODERATE: 1.5,
-            AssemblyComplexity.COMPLEX: 2.5,
-            AssemblyComplexity.VERY_COMPLEX: 4.0
-        }
-        self.estimated_duration = base_duration * complexity_multiplier.get(
-            self.estimated_complexity, 1.0
-        )
+        # Estimate sequential duration based on complexity
+        self.estimated_duration = sum(self.get_fragment_durations().values())
 
 
 @dataclass
@@ -278,10 +311,25 @@ class FragmentAssemblyService:
     sophisticated conflict resolution strategies.
     """
     
-    def __init__(self, extraction_service: Optional[ArchiveExtractionService] = None):
-        """Initialize the fragment assembly service."""
+    def __init__(
+        self,
+        extraction_service: Optional[ArchiveExtractionService] = None,
+        max_concurrent_fragments: int = 4,
+        use_process_pool: bool = True
+    ):
+        """
+        Initialize the fragment assembly service.
+        
+        Args:
+            extraction_service: Service used to extract individual fragments
+            max_concurrent_fragments: Upper bound on fragments extracted at once
+            use_process_pool: Extract concurrent fragments in processes rather
+                than threads; the extraction service must then be picklable
+        """
         self._logger = logger
         self._extraction_service = extraction_service or ArchiveExtractionService()
+        self._max_concurrent_fragments = max(1, max_concurrent_fragments)
+        self._use_process_pool = use_process_pool
     
     def create_assembly_plan(
         self,
@@ -328,9 +376,11 @@ class FragmentAssemblyService:
         
         # Resolve dependencies
         self._resolve_dependencies(plan)
+        plan.dependency_graph = plan.build_dependency_graph()
         
         # Estimate complexity
         self._estimate_assembly_complexity(plan)
+        plan.estimated_duration = sum(plan.get_fragment_durations().values())
         
         # Validate the plan
         self._validate_assembly_plan(plan)
@@ -586,17 +636,29 @@ class FragmentAssemblyService:
         
         return len(errors) == 0, errors, warnings
     
-    def estimate_assembly_time(self, assembly_plan: AssemblyPlan) -> float:
+    def estimate_assembly_time(
+        self,
+        assembly_plan: AssemblyPlan,
+        max_concurrent_fragments: Optional[int] = None
+    ) -> float:
         """
         Estimate the time required to complete the assembly.
         
+        Fragments the plan's dependency graph allows to run together are
+        assumed to run in parallel, so the estimate is bounded below by the
+        longest chain of overlapping fragments and by the total work spread
+        over the available workers.
+        
         Args:
             assembly_plan: The assembly plan to estimate
+            max_concurrent_fragments: Workers to assume (defaults to the service's)
             
         Returns:
             Estimated time in seconds
         """
-        return assembly_plan.estimated_duration
+        graph = assembly_plan.dependency_graph or assembly_plan.build_dependency_graph()
+        workers = max_concurrent_fragments or self._max_concurrent_fragments
+        return graph.estimate_duration(assembly_plan.get_fragment_durations(), workers)
     
     def _analyze_fragment_compatibility(self, plan: AssemblyPlan) -> None:
         """Analyze compatibility of fragments in the plan."""
@@ -609,71 +671,91 @@ class FragmentAssemblyService:
             plan.is_valid = False
     
     def _detect_overlaps(self, plan: AssemblyPlan) -> None:
-        """Detect overlapping content between fragments."""
+        """
+        Detect overlapping content between fragments.
+        
+        Each fragment's inventory and date range is read once. Shared files
+        come from a path-to-fragments inverted index and temporal overlaps
+        from an interval tree, so no pair of fragments is compared directly.
+        Fragments sharing files are reported as file overlaps; otherwise
+        overlapping date ranges are reported as temporal overlaps.
+        """
         fragments = plan.fragments
         
-        for i, fragment1 in enumerate(fragments):
-            for j, fragment2 in enumerate(fragments[i + 1:], i + 1):
-                overlap = self._analyze_fragment_overlap(fragment1, fragment2)
-                if overlap:
-                    plan.add_overlap(overlap)
+        file_sets = [
+            [f.relative_path for f in fragment.file_inventory.list_files()]
+            if fragment.file_inventory else None
+            for fragment in fragments
+        ]
+        date_ranges = [self._fragment_date_range(fragment) for fragment in fragments]
+        
+        shared_files = find_shared_files(file_sets)
+        temporal_pairs = find_overlapping_intervals([
+            (date_range.start_date, date_range.end_date) if date_range else None
+            for date_range in date_ranges
+        ])
+        
+        for i, j in sorted(set(shared_files).union(temporal_pairs)):
+            overlapping_files = shared_files.get((i, j))
+            if overlapping_files:
+                overlap = self._file_overlap(fragments[i], fragments[j], overlapping_files)
+            else:
+                overlap = self._temporal_overlap(fragments[i], fragments[j])
+            plan.add_overlap(overlap)
     
-    def _analyze_fragment_overlap(
-        self, 
-        fragment1: ArchiveMetadata, 
+    def _fragment_date_range(self, fragment: ArchiveMetadata) -> Optional[DateRange]:
+        """Parse a fragment's date range, if it has a complete one."""
+        if not fragment.fragment_info or 'date_range' not in fragment.fragment_info:
+            return None
+        try:
+            date_range = DateRange.from_string(fragment.fragment_info['date_range'])
+        except Exception:
+            # Invalid date ranges
+            return None
+        if not date_range.start_date or not date_range.end_date:
+            return None
+        return date_range
+    
+    def _file_overlap(
+        self,
+        fragment1: ArchiveMetadata,
+        fragment2: ArchiveMetadata,
+        overlapping_files: List[str]
+    ) -> FragmentOverlap:
+        """Describe fragments containing the same files."""
+        # Determine conflict potential
+        conflict_potential = "low"
+        if len(overlapping_files) > 10:
+            conflict_potential = "medium"
+        if len(overlapping_files) > 50:
+            conflict_potential = "high"
+        
+        # Suggest resolution strategy
+        resolution = self._suggest_overlap_resolution(fragment1, fragment2, overlapping_files)
+        
+        return FragmentOverlap(
+            fragment1_id=str(fragment1.archive_id),
+            fragment2_id=str(fragment2.archive_id),
+            overlapping_files=overlapping_files,
+            overlap_type="file",
+            conflict_potential=conflict_potential,
+            resolution_suggestion=resolution
+        )
+    
+    def _temporal_overlap(
+        self,
+        fragment1: ArchiveMetadata,
         fragment2: ArchiveMetadata
-    ) -> Optional[FragmentOverlap]:
-        """Analyze overlap between two fragments."""
-        # Check for file-level overlaps using file inventories
-        if fragment1.file_inventory and fragment2.file_inventory:
-            files1 = set(f.relative_path for f in fragment1.file_inventory.list_files())
-            files2 = set(f.relative_path for f in fragment2.file_inventory.list_files())
-            
-            overlapping_files = list(files1.intersection(files2))
-            
-            if overlapping_files:
-                # Determine conflict potential
-                conflict_potential = "low"
-                if len(overlapping_files) > 10:
-                    conflict_potential = "medium"
-                if len(overlapping_files) > 50:
-                    conflict_potential = "high"
-                
-                # Suggest resolution strategy
-                resolution = self._suggest_overlap_resolution(fragment1, fragment2, overlapping_files)
-                
-                return FragmentOverlap(
-                    fragment1_id=str(fragment1.archive_id),
-                    fragment2_id=str(fragment2.archive_id),
-                    overlapping_files=overlapping_files,
-                    overlap_type="file",
-                    conflict_potential=conflict_potential,
-                    resolution_suggestion=resolution
-                )
-        
-        # Check for temporal overlaps
-        if (fragment1.fragment_info and fragment2.fragment_info and
-            'date_range' in fragment1.fragment_info and 'date_range' in fragment2.fragment_info):
-            
-            try:
-                range1 = DateRange.from_string(fragment1.fragment_info['date_range'])
-                range2 = DateRange.from_string(fragment2.fragment_info['date_range'])
-                
-                # Check if ranges overlap
-                if self._date_ranges_overlap(range1, range2):
-                    return FragmentOverlap(
-                        fragment1_id=str(fragment1.archive_id),
-                        fragment2_id=str(fragment2.archive_id),
-                        overlapping_files=[],  # Will be determined during extraction
-                        overlap_type="temporal",
-                        conflict_potential="medium",
-                        resolution_suggestion="Use newest_wins conflict resolution"
-                    )
-            except Exception:
-                # Invalid date ranges
-                pass
-        
-        return None
+    ) -> FragmentOverlap:
+        """Describe fragments covering overlapping date ranges."""
+        return FragmentOverlap(
+            fragment1_id=str(fragment1.archive_id),
+            fragment2_id=str(fragment2.archive_id),
+            overlapping_files=[],  # Will be determined during extraction
+            overlap_type="temporal",
+            conflict_potential="medium",
+            resolution_suggestion="Use newest_wins conflict resolution"
+        )
     
     def _suggest_overlap_resolution(
         self, 
@@ -696,13 +778,6 @@ class FragmentAssemblyService:
         # Default suggestion
         return "newest_wins"
     
-    def _date_ranges_overlap(self, range1: DateRange, range2: DateRange) -> bool:
-        """Check if two date ranges overlap."""
-        if not range1.start_date or not range1.end_date or not range2.start_date or not range2.end_date:
-            return False
-        
-        return (range1.start_date <= range2.end_date and range2.start_date <= range1.end_date)
-    
     def _determine_extraction_order(self, plan: AssemblyPlan) -> None:
         """Determine optimal order for extracting fragments."""
         fragments = plan.fragments
@@ -859,45 +934,17 @@ class FragmentAssemblyService:
         result: AssemblyResult
     ) -> bool:
         """Assemble all fragments completely."""
-        total_fragments = len(plan.extraction_order)
-        
-        for i, fragment_id in enumerate(plan.extraction_order):
+        fragment_steps = []
+        for fragment_id in plan.extraction_order:
             fragment = plan.get_fragment_by_id(fragment_id)
             if not fragment:
                 result.add_error(f"Fragment not found: {fragment_id}")
                 continue
-            
-            # Update progress
-            if progress_callback:
-                progress = int(10 + (i / total_fragments) * 70)
-                progress_callback(
-                    progress, 100, 
-                    f"Extracting fragment {i+1}/{total_fragments}: {fragment_id}"
-                )
-            
-            # Extract this fragment
-            archive_path = Path(fragment.location)
-            extract_result = self._extraction_service.extract_archive(
-                archive_path,
-                plan.target_location,
-                plan.target_path,
-                plan.assembly_filter,
-                config
-            )
-            
-            # Record result
-            result.add_extraction_result(fragment_id, extract_result)
-            result.log_fragment_action(
-                fragment_id, "extract", 
-                {"files_extracted": extract_result.files_extracted}
-            )
-            
-            # Check for critical errors
-            if extract_result.has_errors and config.conflict_resolution == ConflictResolution.FAIL:
-                result.add_error(f"Fragment extraction failed: {fragment_id}")
-                return False
+            fragment_steps.append((fragment, "extract", {}))
         
-        return True
+        return self._extract_fragments(
+            plan, config, fragment_steps, progress_callback, result, stop_on_failure=True
+        )
     
     def _assemble_temporal_fragments(
         self,
@@ -921,37 +968,11 @@ class FragmentAssemblyService:
         temporal_fragments.sort(key=lambda x: x[1].start_date or datetime.min)
         
         # Extract in temporal order
-        total_fragments = len(temporal_fragments)
-        for i, (fragment, date_range) in enumerate(temporal_fragments):
-            # Update progress
-            if progress_callback:
-                progress = int(10 + (i / total_fragments) * 70)
-                progress_callback(
-                    progress, 100,
-                    f"Extracting temporal fragment {i+1}/{total_fragments}: {fragment.archive_id}"
-                )
-            
-            # Extract this fragment
-            archive_path = Path(fragment.location)
-            extract_result = self._extraction_service.extract_archive(
-                archive_path,
-                plan.target_location,
-                plan.target_path,
-                plan.assembly_filter,
-                config
-            )
-            
-            # Record result
-            result.add_extraction_result(str(fragment.archive_id), extract_result)
-            result.log_fragment_action(
-                str(fragment.archive_id), "temporal_extract",
-                {
-                    "date_range": fragment.fragment_info['date_range'],
-                    "files_extracted": extract_result.files_extracted
-                }
-            )
-        
-        return True
+        fragment_steps = [
+            (fragment, "temporal_extract", {"date_range": fragment.fragment_info['date_range']})
+            for fragment, date_range in temporal_fragments
+        ]
+        return self._extract_fragments(plan, config, fragment_steps, progress_callback, result)
     
     def _assemble_content_type_fragments(
         self,
@@ -970,47 +991,22 @@ class FragmentAssemblyService:
                         content_groups[content_type] = []
                     content_groups[content_type].append(fragment)
         
-        # Extract in priority order: inputs first, then outputs
+        # Extract in priority order: inputs first, then outputs. Fragments
+        # holding several content types are extracted with their first one.
         priority_order = ['input', 'restart', 'output', 'log', 'other']
-        extracted_count = 0
-        total_fragments = len(plan.fragments)
+        fragment_steps = []
+        scheduled = set()
         
         for content_type in priority_order:
-            if content_type not in content_groups:
-                continue
-            
-            for fragment in content_groups[content_type]:
-                # Update progress
-                if progress_callback:
-                    progress = int(10 + (extracted_count / total_fragments) * 70)
-                    progress_callback(
-                        progress, 100,
-                        f"Extracting {content_type} fragment: {fragment.archive_id}"
-                    )
-                
-                # Extract this fragment
-                archive_path = Path(fragment.location)
-                extract_result = self._extraction_service.extract_archive(
-                    archive_path,
-                    plan.target_location,
-                    plan.target_path,
-                    plan.assembly_filter,
-                    config
+            for fragment in content_groups.get(content_type, []):
+                if str(fragment.archive_id) in scheduled:
+                    continue
+                scheduled.add(str(fragment.archive_id))
+                fragment_steps.append(
+                    (fragment, "content_type_extract", {"content_type": content_type})
                 )
-                
-                # Record result
-                result.add_extraction_result(str(fragment.archive_id), extract_result)
-                result.log_fragment_action(
-                    str(fragment.archive_id), "content_type_extract",
-                    {
-                        "content_type": content_type,
-                        "files_extracted": extract_result.files_extracted
-                    }
-                )
-                
-                extracted_count += 1
         
-        return True
+        return self._extract_fragments(plan, config, fragment_steps, progress_callback, result)
     
     def _assemble_directory_fragments(
         self,
@@ -1023,6 +1019,96 @@ class FragmentAssemblyService:
         # This is similar to complete assembly but with directory awareness
         return self._assemble_complete_fragments(plan, config, progress_callback, result)
     
+    def _extract_fragments(
+        self,
+        plan: AssemblyPlan,
+        config: ArchiveExtractionConfig,
+        fragment_steps: List[Tuple[ArchiveMetadata, str, Dict[str, Any]]],
+        progress_callback: Optional[Callable[[int, int, str], None]],
+        result: AssemblyResult,
+        stop_on_failure: bool = False
+    ) -> bool:
+        """
+        Extract fragments in the given order, concurrently where possible.
+        
+        Fragments are run as the plan's dependency graph allows: overlapping
+        fragments one after another in the given order, so conflicts resolve
+        as in a sequential assembly, and all others in parallel.
+        
+        Args:
+            fragment_steps: (fragment, log action, log details) in extraction order
+            stop_on_failure: Stop starting fragments once one fails under
+                fail-on-conflict resolution
+        """
+        steps = {str(fragment.archive_id): (fragment, action, details)
+                 for fragment, action, details in fragment_steps}
+        graph = plan.build_dependency_graph(list(steps))
+        total_fragments = len(graph.order)
+        workers = min(self._max_concurrent_fragments, max(1, graph.max_parallelism))
+        failed = False
+        
+        # The fragment tracking file is shared, so it is updated as fragments complete
+        fragment_config = replace(config, enable_fragment_tracking=False)
+        
+        self._logger.info(
+            f"Extracting {total_fragments} fragments in {len(graph.stages())} stages "
+            f"with up to {workers} in parallel"
+        )
+        
+        def submit(executor, fragment_id):
+            fragment = steps[fragment_id][0]
+            return executor.submit(
+                extract_archive_task, self._extraction_service, Path(fragment.location),
+                plan.target_location, plan.target_path, plan.assembly_filter, fragment_config
+            )
+        
+        def on_complete(fragment_id, future):
+            nonlocal failed
+            fragment, action, details = steps[fragment_id]
+            try:
+                extract_result = future.result()
+            except Exception as e:
+                extract_result = ExtractionResult()
+                extract_result.add_error(f"Archive extraction failed with exception: {str(e)}")
+            
+            if extract_result.success:
+                self._extraction_service.record_fragment_extraction(
+                    Path(fragment.location), plan.target_location, plan.target_path,
+                    config, extract_result
+                )
+            
+            # Record result
+            result.add_extraction_result(fragment_id, extract_result)
+            result.log_fragment_action(
+                fragment_id, action,
+                {**details, "files_extracted": extract_result.files_extracted}
+            )
+            
+            # Update progress
+            if progress_callback:
+                progress = int(10 + (result.fragments_processed / total_fragments) * 70)
+                progress_callback(
+                    progress, 100,
+                    f"Extracted fragment {result.fragments_processed}/{total_fragments}: {fragment_id}"
+                )
+            
+            # Check for critical errors
+            if (stop_on_failure and extract_result.has_errors and
+                    config.conflict_resolution == ConflictResolution.FAIL):
+                result.add_error(f"Fragment extraction failed: {fragment_id}")
+                failed = True
+                return False
+            return True
+        
+        # Custom filter functions are usually lambdas that cannot be sent to other processes
+        use_processes = self._use_process_pool and not (
+            plan.assembly_filter and plan.assembly_filter.custom_filter
+        )
+        with create_fragment_executor(workers, use_processes) as executor:
+            graph.execute(executor, submit, on_complete, max_in_flight=workers)
+        
+        return not failed
+    
     def _validate_assembly_result(
         self,
         plan: AssemblyPlan,
@@ -1074,6 +1160,7 @@ class FragmentAssemblyService:
                 'assembly_mode': plan.assembly_mode.value,
                 'conflict_strategy': plan.conflict_strategy.value,
                 'extraction_order': plan.extraction_order,
+                'extraction_stages': plan.dependency_graph.stages() if plan.dependency_graph else [],
                 'overlaps_detected': len(plan.overlaps),
                 'conflicts_resolved': result.conflicts_resolved,
                 'total_files': result.total_files_extracted,
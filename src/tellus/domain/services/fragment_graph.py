@@ -0,0 +1,188 @@
+"""
+Dependency graphs for extracting several archive fragments into one target.
+
+Fragments that share no files can be extracted concurrently. Fragments that
+may write the same files have to run one after another, in the order a
+sequential assembly would have used, so that conflict resolution (first
+wins, newest wins, fail on conflict, ...) has the same outcome.
+FragmentDependencyGraph captures that ordering and runs fragments on an
+executor as soon as the fragments they depend on have finished.
+"""
+
+import heapq
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ProcessPoolExecutor, ThreadPoolExecutor, wait)
+from typing import (Callable, Dict, Iterable, List, Mapping, Optional,
+                    Sequence, Set, Tuple)
+
+
+class FragmentDependencyGraph:
+    """
+    Directed acyclic graph of fragment extractions.
+
+    Fragment B depends on fragment A when both may write the same file and A
+    comes first in the extraction order. Fragments whose contents are
+    unknown are serialised against all others.
+    """
+
+    def __init__(
+        self,
+        order: Sequence[str],
+        conflicts: Iterable[Tuple[str, str]] = (),
+        serial: Iterable[str] = ()
+    ):
+        """
+        Initialize the graph.
+
+        Args:
+            order: Fragment IDs in sequential extraction order
+            conflicts: Pairs of fragment IDs that may write the same files
+            serial: Fragment IDs that must not run alongside any other fragment
+        """
+        self.order: List[str] = list(dict.fromkeys(order))
+        self._position = {fragment_id: i for i, fragment_id in enumerate(self.order)}
+        self.dependencies: Dict[str, Set[str]] = {fragment_id: set() for fragment_id in self.order}
+
+        for fragment1, fragment2 in conflicts:
+            self._add_conflict(fragment1, fragment2)
+
+        for fragment_id in serial:
+            if fragment_id in self._position:
+                for other_id in self.order:
+                    self._add_conflict(fragment_id, other_id)
+
+        self.dependents: Dict[str, Set[str]] = {fragment_id: set() for fragment_id in self.order}
+        for fragment_id, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                self.dependents[dependency].add(fragment_id)
+
+    @classmethod
+    def from_file_sets(
+        cls,
+        order: Sequence[str],
+        file_sets: Mapping[str, Optional[Iterable[str]]]
+    ) -> 'FragmentDependencyGraph':
+        """
+        Build a graph from the files each fragment contains.
+
+        Fragments sharing a file are chained in extraction order; chaining
+        consecutive holders of each file is enough to keep all of them in
+        order. Fragments mapped to None are treated as unknown.
+        """
+        conflicts = []
+        serial = []
+        last_holder: Dict[str, str] = {}
+
+        for fragment_id in dict.fromkeys(order):
+            files = file_sets.get(fragment_id)
+            if files is None:
+                serial.append(fragment_id)
+                continue
+            for path in files:
+                previous = last_holder.get(path)
+                if previous is not None and previous != fragment_id:
+                    conflicts.append((previous, fragment_id))
+                last_holder[path] = fragment_id
+
+        return cls(order, conflicts, serial)
+
+    def _add_conflict(self, fragment1: str, fragment2: str) -> None:
+        """Order two conflicting fragments by their extraction position."""
+        if fragment1 == fragment2 or fragment1 not in self._position or fragment2 not in self._position:
+            return
+        first, second = sorted((fragment1, fragment2), key=self._position.__getitem__)
+        self.dependencies[second].add(first)
+
+    def stages(self) -> List[List[str]]:
+        """Group fragments into stages that could each run fully in parallel."""
+        depth: Dict[str, int] = {}
+        for fragment_id in self.order:
+            # Dependencies always come earlier in the order
+            depth[fragment_id] = 1 + max((depth[d] for d in self.dependencies[fragment_id]), default=-1)
+
+        stages: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for fragment_id in self.order:
+            stages[depth[fragment_id]].append(fragment_id)
+        return stages
+
+    @property
+    def max_parallelism(self) -> int:
+        """Largest number of fragments that can run at the same time in any stage."""
+        return max((len(stage) for stage in self.stages()), default=0)
+
+    def critical_path_duration(self, durations: Mapping[str, float]) -> float:
+        """Duration of the longest chain of dependent fragments."""
+        finish: Dict[str, float] = {}
+        for fragment_id in self.order:
+            start = max((finish[d] for d in self.dependencies[fragment_id]), default=0.0)
+            finish[fragment_id] = start + durations.get(fragment_id, 0.0)
+        return max(finish.values(), default=0.0)
+
+    def estimate_duration(self, durations: Mapping[str, float], workers: int) -> float:
+        """
+        Estimate the wall time of running the graph with a number of workers.
+
+        Neither the longest dependency chain nor the total work spread over
+        all workers can be beaten, so the larger of the two is used.
+        """
+        total = sum(durations.get(fragment_id, 0.0) for fragment_id in self.order)
+        return max(self.critical_path_duration(durations), total / max(1, workers))
+
+    def execute(
+        self,
+        executor: Executor,
+        submit: Callable[[Executor, str], Future],
+        on_complete: Callable[[str, Future], bool],
+        max_in_flight: Optional[int] = None
+    ) -> List[str]:
+        """
+        Run all fragments, each once its dependencies have completed.
+
+        ``submit`` starts a fragment on the executor. ``on_complete`` is
+        called on the calling thread for each finished fragment, in
+        extraction order among fragments finishing together; returning False
+        stops further fragments from being started. Fragments still running
+        are waited for.
+
+        Returns:
+            IDs of fragments that were not run because execution was stopped
+        """
+        remaining = {fragment_id: len(deps) for fragment_id, deps in self.dependencies.items()}
+        ready = [self._position[fragment_id] for fragment_id in self.order if not remaining[fragment_id]]
+        heapq.heapify(ready)
+        running: Dict[Future, str] = {}
+        finished: Set[str] = set()
+        stopped = False
+
+        while ready or running:
+            while ready and not stopped and (max_in_flight is None or len(running) < max_in_flight):
+                fragment_id = self.order[heapq.heappop(ready)]
+                running[submit(executor, fragment_id)] = fragment_id
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: self._position[running[f]]):
+                fragment_id = running.pop(future)
+                finished.add(fragment_id)
+                if not on_complete(fragment_id, future):
+                    stopped = True
+                for dependent in self.dependents[fragment_id]:
+                    remaining[dependent] -= 1
+                    if not remaining[dependent]:
+                        heapq.heappush(ready, self._position[dependent])
+
+        return [fragment_id for fragment_id in self.order if fragment_id not in finished]
+
+
+def create_fragment_executor(max_workers: int, use_processes: bool = True) -> Executor:
+    """
+    Create an executor for running fragment extractions.
+
+    Processes sidestep the GIL for tar header parsing; tasks and their
+    arguments must then be picklable.
+    """
+    if use_processes and max_workers > 1:
+        return ProcessPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tellus-fragment")
@@ -0,0 +1,138 @@
+"""
+Overlap detection between archive fragments.
+
+Comparing every pair of fragments' file sets is quadratic in the number of
+fragments and rebuilds the sets for every pair, which dominates planning
+when assembling hundreds of yearly fragments with tens of thousands of
+files each. The functions here instead make a single pass over all files,
+building an inverted index from path to the fragments holding it, and find
+temporally overlapping fragments with an interval tree.
+"""
+
+from collections import defaultdict
+from itertools import combinations
+from typing import (Any, Dict, Generic, Iterable, List, Optional, Sequence,
+                    Tuple, TypeVar)
+
+T = TypeVar('T')
+
+
+class IntervalTree(Generic[T]):
+    """
+    Static interval tree answering which closed intervals overlap a query.
+
+    Intervals are kept sorted by start in an implicit balanced binary tree;
+    every node records the largest end in its subtree so that subtrees
+    ending before the query are skipped. Building takes O(n log n) and a
+    query O(log n + k) for k results.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any, T]]):
+        """
+        Initialize the tree.
+
+        Args:
+            intervals: (start, end, item) triples with start <= end
+        """
+        entries = sorted(intervals, key=lambda entry: entry[0])
+        self._starts = [entry[0] for entry in entries]
+        self._ends = [entry[1] for entry in entries]
+        self._items = [entry[2] for entry in entries]
+        self._max_end: List[Any] = list(self._ends)
+        if entries:
+            self._build(0, len(entries))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self, lo: int, hi: int) -> Any:
+        """Fill in the largest end of the subtree over [lo, hi); returns it."""
+        mid = (lo + hi) // 2
+        max_end = self._ends[mid]
+        if lo < mid:
+            max_end = max(max_end, self._build(lo, mid))
+        if mid + 1 < hi:
+            max_end = max(max_end, self._build(mid + 1, hi))
+        self._max_end[mid] = max_end
+        return max_end
+
+    def overlapping(self, start: Any, end: Any) -> List[T]:
+        """Items whose interval overlaps [start, end], in order of interval start."""
+        found: List[Tuple[int, T]] = []
+        stack = [(0, len(self._items))]
+
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] < start:
+                # Nothing in this subtree ends after the query starts
+                continue
+            stack.append((lo, mid))
+            if self._starts[mid] <= end:
+                if self._ends[mid] >= start:
+                    found.append((mid, self._items[mid]))
+                # Intervals to the right start later, so only search them if this one starts in time
+                stack.append((mid + 1, hi))
+
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, item in found]
+
+
+def find_shared_files(file_sets: Sequence[Optional[Iterable[str]]]) -> Dict[Tuple[int, int], List[str]]:
+    """
+    Find the files shared by each pair of fragments.
+
+    Args:
+        file_sets: Relative paths per fragment, None for fragments without inventory
+
+    Returns:
+        Mapping of fragment index pairs (i < j) to the paths both contain,
+        for pairs sharing at least one path
+    """
+    holders: Dict[str, List[int]] = defaultdict(list)
+    for index, files in enumerate(file_sets):
+        if files is None:
+            continue
+        for path in files:
+            fragments = holders[path]
+            if not fragments or fragments[-1] != index:
+                fragments.append(index)
+
+    # Paths held by the same fragments (e.g. namelists present in every
+    # fragment) are grouped so that their pairs are only enumerated once
+    paths_by_holders: Dict[Tuple[int, ...], List[str]] = defaultdict(list)
+    for path, fragments in holders.items():
+        if len(fragments) > 1:
+            paths_by_holders[tuple(fragments)].append(path)
+
+    shared: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+    for fragments, paths in paths_by_holders.items():
+        for pair in combinations(fragments, 2):
+            shared[pair].extend(paths)
+    return dict(shared)
+
+
+def find_overlapping_intervals(intervals: Sequence[Optional[Tuple[Any, Any]]]) -> List[Tuple[int, int]]:
+    """
+    Find all pairs of overlapping closed intervals.
+
+    Args:
+        intervals: (start, end) per fragment, None for fragments without one
+
+    Returns:
+        Sorted fragment index pairs (i < j) whose intervals overlap
+    """
+    tree = IntervalTree(
+        (interval[0], interval[1], index)
+        for index, interval in enumerate(intervals) if interval is not None
+    )
+
+    pairs = []
+    for index, interval in enumerate(intervals):
+        if interval is None:
+            continue
+        pairs.extend((index, other) for other in tree.overlapping(*interval) if other > index)
+    pairs.sort()
+    return pairs
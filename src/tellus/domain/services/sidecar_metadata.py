@@ -55,12 +55,17 @@ class SidecarMetadata:
         return archive_path.parent / f"{base_name}{cls.METADATA_EXTENSION}"
     
     @classmethod
-    def generate_metadata_dict(cls, archive_metadata: ArchiveMetadata) -> Dict[str, Any]:
+    def generate_metadata_dict(
+        cls,
+        archive_metadata: ArchiveMetadata,
+        split_info: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Generate a complete metadata dictionary for sidecar file.
         
         Args:
             archive_metadata: Archive metadata entity
+            split_info: Part number and sibling parts, if the archive is one part of a split archive
             
         Returns:
             Dictionary ready for JSON serialization
@@ -97,6 +102,9 @@ class SidecarMetadata:
             # Fragment information
             "fragment": archive_metadata.fragment_info if archive_metadata.fragment_info else None,
             
+            # Split archive parts
+            "split": split_info,
+            
             # File inventory details
             "inventory": cls._generate_inventory_metadata(archive_metadata.file_inventory) if archive_metadata.file_inventory else None,
             
@@ -107,13 +115,19 @@ class SidecarMetadata:
         return metadata
     
     @classmethod
-    def write_sidecar_file(cls, archive_path: Path, archive_metadata: ArchiveMetadata) -> Path:
+    def write_sidecar_file(
+        cls,
+        archive_path: Path,
+        archive_metadata: ArchiveMetadata,
+        split_info: Optional[Dict[str, Any]] = None
+    ) -> Path:
         """
         Write a sidecar metadata file for an archive.
         
         Args:
             archive_path: Path to the archive file
             archive_metadata: Archive metadata to write
+            split_info: Part number and sibling parts, if the archive is one part of a split archive
             
         Returns:
             Path to the created sidecar file
@@ -122,7 +136,7 @@ class SidecarMetadata:
             IOError: If writing fails
         """
         sidecar_path = cls.create_sidecar_path(archive_path)
-        metadata_dict = cls.generate_metadata_dict(archive_metadata)
+        metadata_dict = cls.generate_metadata_dict(archive_metadata, split_info)
         
         try:
             # Ensure parent directory exists
@@ -255,6 +269,19 @@ class SidecarMetadata:
         extraction_info = sidecar_data.get('extraction', {})
         return extraction_info.get('available_patterns', [])
     
+    @classmethod
+    def get_split_info(cls, sidecar_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Get the split archive section.
+        
+        Args:
+            sidecar_data: Parsed sidecar metadata
+            
+        Returns:
+            Part number and sibling parts, or None if the archive is not split
+        """
+        return sidecar_data.get('split')
+    
     @classmethod
     def get_content_types(cls, sidecar_data: Dict[str, Any]) -> List[str]:
         """
@@ -419,11 +446,8 @@ class SidecarMetadata:
         """Reconstruct FileInventory from metadata."""
         from ..entities.simulation_file import FileContentType, FileImportance
         
-        inventory = FileInventory(
-            total_size=inventory_data.get('total_size', 0),
-            file_count=inventory_data.get('total_files', 0),
-            created_time=inventory_data.get('created_time', time.time())
-        )
+        # Totals are recounted as the files are added
+        inventory = FileInventory(created_time=inventory_data.get('created_time', time.time()))
         
         # Reconstruct files
         for file_data in inventory_data.get('files', []):
@@ -0,0 +1,855 @@
+"""
+Copying files between fsspec filesystems.
+
+FSSpecTransferEngine copies a file between any two filesystems, e.g. the
+(sandboxed) filesystems of two locations:
+
+- Within one filesystem the copy is made server-side: ``cp_file`` where the
+  filesystem implements it (local, object stores), or ``cp`` run over the
+  SSH connection of SFTP filesystems, so no data passes through this host.
+- Otherwise a reader thread and a writer stream the file through a bounded
+  queue of chunks, so reading from the source and writing to the
+  destination overlap while memory use stays at ``buffer_chunks`` chunks.
+  SFTP files are read with prefetching and written pipelined, since
+  paramiko otherwise waits for a round trip per request.
+- Very large files can instead be copied as byte ranges over several
+  connections at once (``copy_ranges``), since one TCP stream over a
+  high-latency link moves at most one window per round trip. Each range is
+  read and written at its own offset, hashed on the way, and retried on its
+  own if it fails.
+
+- Many small files can be copied together (``copy_files``), with one bulk
+  read and one bulk write, so that a copy is not dominated by the requests
+  made per file.
+- A file can be relayed through intermediate filesystems (``relay``), e.g.
+  when the direct link between two sites is slower than a path through a
+  gateway. Every hop runs on a thread of its own and forwards data as soon
+  as the previous hop has written it to its staging file, so all links
+  carry data at once rather than one after another; the staging files are
+  removed once the relay ends.
+
+Both streamed and ranged copies can report completed byte ranges with their
+checksums as they go (``checkpoint``), and streamed copies can continue at
+an offset into an existing destination file, so an interrupted copy can be
+resumed instead of restarted (see ``transfer_journal``).
+
+All methods block; callers in async code run them in an executor.
+"""
+
+import hashlib
+import logging
+import math
+import posixpath
+import queue
+import re
+import shlex
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bytes per read and write request
+DEFAULT_TRANSFER_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Chunks buffered between the reader and the writer
+DEFAULT_BUFFER_CHUNKS = 4
+
+# Largest read request of an SFTP client; paramiko returns prefetched data
+# in pieces of this size and concatenates them for larger reads
+_SFTP_REQUEST_SIZE = 32 * 1024
+
+# Largest byte range copied as a unit by ranged copies
+DEFAULT_RANGE_SIZE = 64 * 1024 * 1024
+
+# Attempts per byte range before a ranged copy fails
+DEFAULT_RANGE_ATTEMPTS = 3
+
+_END_OF_FILE = object()
+
+# Paths that bulk requests would expand as glob patterns
+_GLOB_CHARACTERS = re.compile(r'[*?[]')
+
+
+@dataclass
+class ByteRange:
+    """A byte range of a file and the SHA-256 of its data, once copied."""
+    offset: int
+    length: int
+    checksum: Optional[str] = None
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+def plan_byte_ranges(
+    size: int,
+    streams: int,
+    range_size: int = DEFAULT_RANGE_SIZE,
+    done: Sequence[ByteRange] = ()
+) -> List[ByteRange]:
+    """
+    Split a file into byte ranges for ``streams`` parallel streams.
+
+    Ranges are at most ``range_size`` bytes, but small enough that every
+    stream gets several, so streams finishing early can take over work and a
+    failed range is cheap to retry. Ranges in ``done`` are left out.
+    """
+    if size == 0:
+        return [] if done else [ByteRange(0, 0)]
+    length = min(range_size, max(1, math.ceil(size / (streams * 4))))
+
+    ranges = []
+    start = 0
+    for skipped in sorted(done, key=lambda byte_range: byte_range.offset) + [ByteRange(size, 0)]:
+        end = min(skipped.offset, size)
+        ranges.extend(ByteRange(offset, min(length, end - offset)) for offset in range(start, end, length))
+        start = max(start, skipped.end)
+    return ranges
+
+
+def unwrap_filesystem(filesystem: Any, path: str) -> Tuple[Any, str]:
+    """Underlying filesystem and full path of a path on a possibly sandboxed filesystem."""
+    resolve_path = getattr(filesystem, 'resolve_path', None)
+    if resolve_path is None:
+        return filesystem, path
+    return filesystem.base_filesystem, resolve_path(path)
+
+
+def open_connection(filesystem: Any) -> Any:
+    """
+    A filesystem equal to ``filesystem`` with a connection of its own.
+
+    Only filesystems talking to a server over one SSH connection are
+    reconnected; local filesystems and clients pooling connections
+    themselves are returned unchanged.
+    """
+    if hasattr(filesystem, 'resolve_path'):
+        return type(filesystem)(open_connection(filesystem.base_filesystem), filesystem.base_path)
+    if not hasattr(getattr(filesystem, 'client', None), 'exec_command'):
+        return filesystem
+    options = {**filesystem.storage_options, 'skip_instance_cache': True}
+    return type(filesystem)(*filesystem.storage_args, **options)
+
+
+def close_connection(filesystem: Any) -> None:
+    """Close a connection opened by ``open_connection``."""
+    filesystem = unwrap_filesystem(filesystem, '')[0]
+    client = getattr(filesystem, 'client', None)
+    if hasattr(client, 'close'):
+        client.close()
+
+
+class _RangeHasher:
+    """Hash consecutive byte ranges of a stream of chunks."""
+
+    def __init__(self, offset: int, range_size: int, on_range: Callable[[ByteRange], None]):
+        self._offset = offset
+        self._range_size = range_size
+        self._on_range = on_range
+        self._length = 0
+        self._digest = hashlib.sha256()
+
+    def update(self, chunk: bytes) -> None:
+        """Hash a chunk, reporting every range it completes."""
+        data = memoryview(chunk)
+        while data:
+            take = min(len(data), self._range_size - self._length)
+            self._digest.update(data[:take])
+            self._length += take
+            data = data[take:]
+            if self._length == self._range_size:
+                self.finish()
+
+    def finish(self) -> None:
+        """Report the range hashed so far, if any."""
+        if self._length:
+            self._on_range(ByteRange(self._offset, self._length, self._digest.hexdigest()))
+            self._offset += self._length
+            self._length = 0
+            self._digest = hashlib.sha256()
+
+
+class _RelayStage:
+    """Bytes of a staging file written so far by one hop of a relay."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.size = 0
+        self.finished = False
+        self.error: Optional[BaseException] = None
+
+    def advance(self, length: int) -> None:
+        """Publish ``length`` more bytes, written and flushed."""
+        with self._condition:
+            self.size += length
+            self._condition.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Publish that the staging file is complete (and closed), or that its hop failed."""
+        with self._condition:
+            self.finished = True
+            self.error = error
+            self._condition.notify_all()
+
+    def wait_beyond(self, size: int) -> Tuple[int, bool]:
+        """Wait until more than ``size`` bytes are written or the hop ended; returns both."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.size > size or self.finished)
+            if self.error is not None:
+                raise IOError(f"Previous hop of the relay failed: {self.error}") from self.error
+            return self.size, self.finished
+
+
+class FSSpecTransferEngine:
+    """Copy files within and between fsspec filesystems."""
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_TRANSFER_CHUNK_SIZE,
+        buffer_chunks: int = DEFAULT_BUFFER_CHUNKS
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            chunk_size: Bytes per read and write request
+            buffer_chunks: Chunks buffered between reading and writing
+        """
+        self.chunk_size = chunk_size
+        self.buffer_chunks = buffer_chunks
+
+    def copy(
+        self,
+        source_fs: Any,
+        source_path: str,
+        dest_fs: Any,
+        dest_path: str,
+        same_filesystem: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_size: Optional[int] = None,
+        offset: int = 0,
+        checkpoint: Optional[Callable[[ByteRange], None]] = None,
+        checkpoint_size: int = DEFAULT_RANGE_SIZE
+    ) -> int:
+        """
+        Copy a file, creating the destination directory.
+
+        Args:
+            source_fs: Filesystem to read from
+            source_path: Path on the source filesystem
+            dest_fs: Filesystem to write to
+            dest_path: Path on the destination filesystem
+            same_filesystem: Whether both paths are on one filesystem, so the
+                copy can be made server-side
+            progress: Called with the total bytes of the destination written
+                so far, including the first ``offset`` bytes
+            chunk_size: Bytes per request, defaults to the engine's chunk size
+            offset: Continue an earlier copy whose first ``offset`` bytes are
+                already in the destination file; the destination must support
+                opening files for update (``r+b``)
+            checkpoint: Called with every ``checkpoint_size`` bytes written,
+                as a byte range with the checksum of its data, after the
+                destination file was flushed
+            checkpoint_size: Bytes per checkpointed range
+
+        Returns:
+            Number of bytes copied by this call
+        """
+        size = source_fs.size(source_path)
+        dest_directory = posixpath.dirname(dest_path)
+        if dest_directory:
+            dest_fs.makedirs(dest_directory, exist_ok=True)
+
+        if not offset and same_filesystem and self._copy_server_side(source_fs, source_path, dest_fs, dest_path):
+            if progress:
+                progress(size)
+            return size
+
+        return self._stream(source_fs, source_path, dest_fs, dest_path, size, progress,
+                            chunk_size or self.chunk_size, offset, checkpoint, checkpoint_size)
+
+    def _copy_server_side(self, source_fs: Any, source_path: str, dest_fs: Any, dest_path: str) -> bool:
+        """Copy within one filesystem; returns False if the filesystem cannot."""
+        filesystem, source = unwrap_filesystem(source_fs, source_path)
+        _, dest = unwrap_filesystem(dest_fs, dest_path)
+
+        try:
+            filesystem.cp_file(source, dest)
+            return True
+        except NotImplementedError:
+            pass
+
+        # SFTP has no copy request, but the SSH connection can run cp
+        client = getattr(filesystem, 'client', None)
+        if client is None or not hasattr(client, 'exec_command'):
+            return False
+        try:
+            _, stdout, stderr = client.exec_command(f"cp -- {shlex.quote(source)} {shlex.quote(dest)}")
+            if stdout.channel.recv_exit_status() != 0:
+                raise IOError(stderr.read().decode(errors='replace').strip())
+            return True
+        except Exception as e:
+            logger.debug(f"Server-side copy of {source} failed, streaming instead: {e}")
+            return False
+
+    def _stream(
+        self,
+        source_fs: Any,
+        source_path: str,
+        dest_fs: Any,
+        dest_path: str,
+        size: int,
+        progress: Optional[Callable[[int], None]],
+        chunk_size: int,
+        offset: int = 0,
+        checkpoint: Optional[Callable[[ByteRange], None]] = None,
+        checkpoint_size: int = DEFAULT_RANGE_SIZE
+    ) -> int:
+        """Copy through a bounded buffer, reading on a separate thread."""
+        chunks: queue.Queue = queue.Queue(maxsize=self.buffer_chunks)
+        stop = threading.Event()
+
+        def put(item: Any) -> None:
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def read() -> None:
+            try:
+                with source_fs.open(source_path, 'rb', block_size=chunk_size) as source_file:
+                    for chunk in self._read_range(source_file, ByteRange(offset, size - offset), chunk_size):
+                        if stop.is_set():
+                            break
+                        put(chunk)
+                put(_END_OF_FILE)
+            except BaseException as e:
+                put(e)
+
+        reader = threading.Thread(target=read, name="tellus-transfer-reader", daemon=True)
+        reader.start()
+        bytes_copied = 0
+        try:
+            with dest_fs.open(dest_path, 'r+b' if offset else 'wb', block_size=chunk_size) as dest_file:
+                if offset:
+                    dest_file.seek(offset)
+                if hasattr(dest_file, 'set_pipelined'):
+                    dest_file.set_pipelined(True)
+                hasher = None
+                if checkpoint:
+                    def flushed_checkpoint(byte_range: ByteRange) -> None:
+                        dest_file.flush()
+                        checkpoint(byte_range)
+                    hasher = _RangeHasher(offset, checkpoint_size, flushed_checkpoint)
+                while True:
+                    chunk = chunks.get()
+                    if chunk is _END_OF_FILE:
+                        break
+                    if isinstance(chunk, BaseException):
+                        raise chunk
+                    dest_file.write(chunk)
+                    if hasher:
+                        hasher.update(chunk)
+                    bytes_copied += len(chunk)
+                    if progress:
+                        progress(offset + bytes_copied)
+                if hasher:
+                    hasher.finish()
+        finally:
+            stop.set()
+            reader.join()
+
+        return bytes_copied
+
+    def copy_files(
+        self,
+        source_fs: Any,
+        dest_fs: Any,
+        paths: Sequence[Tuple[str, str]],
+        verify: bool = True
+    ) -> List[Union[int, BaseException]]:
+        """
+        Copy small files together, with one bulk read and one bulk write.
+
+        Filesystems talking to their server asynchronously (HTTP, object
+        stores) issue the requests of a bulk call concurrently, and all
+        filesystems are spared the size and existence requests of copies
+        made one file at a time. The files are held in memory, so callers
+        keep the total size of a call bounded.
+
+        With ``verify``, the written files are read back with one more bulk
+        request and compared with the checksums of the data read from the
+        source, which is not read a second time.
+
+        Args:
+            source_fs: Filesystem to read from
+            dest_fs: Filesystem to write to
+            paths: Source and destination path of every file
+            verify: Read the files back and compare their checksums
+
+        Returns:
+            For every file, the number of bytes copied, or the error that
+            failed it; a failing bulk write raises
+        """
+        source, source_paths = self._unwrap_paths(source_fs, [source_path for source_path, _ in paths])
+        dest, dest_paths = self._unwrap_paths(dest_fs, [dest_path for _, dest_path in paths])
+        results: List[Union[int, BaseException]] = list(self._cat_files(source, source_paths))
+
+        written = {}
+        checksums = {}
+        for dest_path, data in zip(dest_paths, results):
+            if isinstance(data, bytes):
+                written[dest_path] = data
+                checksums[dest_path] = hashlib.sha256(data).hexdigest()
+        for directory in sorted({posixpath.dirname(path) for path in written} - {''}):
+            dest.makedirs(directory, exist_ok=True)
+        if written:
+            dest.pipe(written)
+
+        read_back = dict(zip(written, self._cat_files(dest, list(written)))) if verify else {}
+        for index, (dest_path, data) in enumerate(zip(dest_paths, results)):
+            if not isinstance(data, bytes):
+                continue
+            results[index] = len(data)
+            if verify:
+                copied = read_back[dest_path]
+                if isinstance(copied, BaseException):
+                    results[index] = copied
+                elif hashlib.sha256(copied).hexdigest() != checksums[dest_path]:
+                    results[index] = IOError(f"Checksum of {dest_path} differs from its source")
+        return results
+
+    @staticmethod
+    def _unwrap_paths(filesystem: Any, paths: Sequence[str]) -> Tuple[Any, List[str]]:
+        """Underlying filesystem and full paths of paths on a possibly sandboxed filesystem."""
+        if not paths:
+            return filesystem, []
+        unwrapped = [unwrap_filesystem(filesystem, path) for path in paths]
+        return unwrapped[0][0], [path for _, path in unwrapped]
+
+    @staticmethod
+    def _cat_files(filesystem: Any, paths: Sequence[str]) -> List[Union[bytes, BaseException]]:
+        """Contents of files with one bulk request, or the error reading each."""
+        keys = [filesystem._strip_protocol(path) for path in paths]
+        if len(keys) > 1 and not any(_GLOB_CHARACTERS.search(key) for key in keys):
+            try:
+                contents = filesystem.cat(keys, on_error='return')
+                return [contents.get(key, FileNotFoundError(key)) for key in keys]
+            except FileNotFoundError:
+                pass  # raised for no file found at all; reported per file below
+
+        def cat_file(key: str) -> Union[bytes, BaseException]:
+            try:
+                return filesystem.cat_file(key)
+            except Exception as e:
+                return e
+
+        return [cat_file(key) for key in keys]
+
+    def relay(
+        self,
+        source_fs: Any,
+        source_path: str,
+        dest_fs: Any,
+        dest_path: str,
+        via: Sequence[Tuple[Any, str]],
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_size: Optional[int] = None,
+        offset: int = 0,
+        checkpoint: Optional[Callable[[ByteRange], None]] = None,
+        checkpoint_size: int = DEFAULT_RANGE_SIZE
+    ) -> int:
+        """
+        Copy a file through intermediate filesystems, pipelining the hops.
+
+        The first hop copies the source to a staging file on the first
+        intermediate, the next hop copies that staging file on to the next
+        intermediate or the destination, and so on. Each hop flushes every
+        chunk it writes and publishes it to the next hop, which forwards it
+        right away, so a file crosses all links in about the time of the
+        slowest one. Filesystems whose files only become readable once
+        closed (e.g. object stores) degrade gracefully to store-and-forward.
+
+        A hop failing stops the whole relay. The staging files are removed
+        whether or not the relay succeeded.
+
+        Args:
+            source_fs: Filesystem to read from
+            source_path: Path on the source filesystem
+            dest_fs: Filesystem to write to
+            dest_path: Path on the destination filesystem
+            via: Intermediate filesystems, in order, with the path of the
+                staging file on each
+            progress: Called with the total bytes of the destination written
+                so far, including the first ``offset`` bytes
+            chunk_size: Bytes per request, defaults to the engine's chunk size
+            offset: Continue an earlier copy as in ``copy``; only the rest of
+                the file is relayed
+            checkpoint: Called with every ``checkpoint_size`` bytes written to
+                the destination, as in ``copy``
+            checkpoint_size: Bytes per checkpointed range
+
+        Returns:
+            Number of bytes copied to the destination by this call
+        """
+        if not via:
+            return self.copy(source_fs, source_path, dest_fs, dest_path, progress=progress,
+                             chunk_size=chunk_size, offset=offset, checkpoint=checkpoint,
+                             checkpoint_size=checkpoint_size)
+
+        chunk_size = chunk_size or self.chunk_size
+        size = source_fs.size(source_path)
+        for filesystem, path in list(via) + [(dest_fs, dest_path)]:
+            directory = posixpath.dirname(path)
+            if directory:
+                filesystem.makedirs(directory, exist_ok=True)
+
+        stages = [_RelayStage() for _ in via]
+        stop = threading.Event()
+
+        def chunks_from_source() -> Iterator[bytes]:
+            with source_fs.open(source_path, 'rb', block_size=chunk_size) as source_file:
+                yield from self._read_range(source_file, ByteRange(offset, size - offset), chunk_size)
+
+        def hop(number: int) -> int:
+            if number == 0:
+                chunks = chunks_from_source()
+            else:
+                chunks = self._follow(stages[number - 1], *via[number - 1], chunk_size)
+            if number < len(via):
+                return self._write_stage(chunks, stages[number], *via[number], chunk_size, stop)
+            return self._write_destination(chunks, dest_fs, dest_path, chunk_size, stop, progress,
+                                           offset, checkpoint, checkpoint_size)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(via) + 1, thread_name_prefix="tellus-transfer-hop") as pool:
+                hops = [pool.submit(hop, number) for number in range(len(via) + 1)]
+                try:
+                    bytes_copied = hops[-1].result()
+                    for future in hops[:-1]:
+                        future.result()
+                except BaseException:
+                    stop.set()
+                    for stage in stages:
+                        stage.finish(IOError("relay stopped"))
+                    raise
+        finally:
+            for filesystem, path in via:
+                try:
+                    if filesystem.exists(path):
+                        filesystem.rm(path)
+                except Exception as e:
+                    logger.warning(f"Could not remove relay staging file {path}: {e}")
+
+        if bytes_copied != size - offset:
+            raise IOError(f"Relayed {bytes_copied:,} bytes of {size - offset:,} to {dest_path}")
+        return bytes_copied
+
+    def _write_stage(
+        self,
+        chunks: Iterator[bytes],
+        stage: _RelayStage,
+        filesystem: Any,
+        path: str,
+        chunk_size: int,
+        stop: threading.Event
+    ) -> int:
+        """Write a relay staging file, publishing every chunk once flushed."""
+        written = 0
+        try:
+            with filesystem.open(path, 'wb', block_size=chunk_size) as stage_file:
+                for chunk in chunks:
+                    if stop.is_set():
+                        raise IOError("relay stopped")
+                    stage_file.write(chunk)
+                    stage_file.flush()
+                    written += len(chunk)
+                    stage.advance(len(chunk))
+        except BaseException as e:
+            stage.finish(e)
+            raise
+        stage.finish()
+        return written
+
+    def _write_destination(
+        self,
+        chunks: Iterator[bytes],
+        dest_fs: Any,
+        dest_path: str,
+        chunk_size: int,
+        stop: threading.Event,
+        progress: Optional[Callable[[int], None]],
+        offset: int,
+        checkpoint: Optional[Callable[[ByteRange], None]],
+        checkpoint_size: int
+    ) -> int:
+        """Write the last hop of a relay to the destination file."""
+        written = 0
+        with dest_fs.open(dest_path, 'r+b' if offset else 'wb', block_size=chunk_size) as dest_file:
+            if offset:
+                dest_file.seek(offset)
+            if hasattr(dest_file, 'set_pipelined'):
+                dest_file.set_pipelined(True)
+            hasher = None
+            if checkpoint:
+                def flushed_checkpoint(byte_range: ByteRange) -> None:
+                    dest_file.flush()
+                    checkpoint(byte_range)
+                hasher = _RangeHasher(offset, checkpoint_size, flushed_checkpoint)
+            for chunk in chunks:
+                if stop.is_set():
+                    raise IOError("relay stopped")
+                dest_file.write(chunk)
+                if hasher:
+                    hasher.update(chunk)
+                written += len(chunk)
+                if progress:
+                    progress(offset + written)
+            if hasher:
+                hasher.finish()
+        return written
+
+    def _follow(self, stage: _RelayStage, filesystem: Any, path: str, chunk_size: int) -> Iterator[bytes]:
+        """Read a staging file while the previous hop is still writing it."""
+        position = 0
+        seen = 0
+        stage_file = None
+
+        def read(length: int) -> bytes:
+            nonlocal stage_file
+            if stage_file is not None:
+                data = stage_file.read(length)
+                if data:
+                    return data
+                # Buffered files may not see data written after they were opened
+                stage_file.close()
+                stage_file = None
+            try:
+                stage_file = filesystem.open(path, 'rb', block_size=chunk_size)
+            except FileNotFoundError:
+                return b''  # some filesystems only create files once they are closed
+            stage_file.seek(position)
+            return stage_file.read(length)
+
+        try:
+            while True:
+                size, finished = stage.wait_beyond(seen)
+                if position == size and finished:
+                    return
+                data = read(min(chunk_size, size - position))
+                if not data:
+                    if finished:
+                        raise IOError(f"Relay staging file {path} ended at byte {position:,} of {size:,}")
+                    # Not readable before the previous hop closes it
+                    seen = size
+                    continue
+                position += len(data)
+                seen = position
+                yield data
+        finally:
+            if stage_file is not None:
+                stage_file.close()
+
+    def copy_ranges(
+        self,
+        source_fs: Any,
+        source_path: str,
+        dest_fs: Any,
+        dest_path: str,
+        streams: int,
+        ranges: Optional[Sequence[ByteRange]] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        max_attempts: int = DEFAULT_RANGE_ATTEMPTS,
+        checkpoint: Optional[Callable[[ByteRange], None]] = None
+    ) -> List[ByteRange]:
+        """
+        Copy a file as byte ranges over several connections at once.
+
+        Every stream opens its own connections to both filesystems and copies
+        whole ranges with positional reads and writes, so the destination
+        must support opening files for update (``r+b``), as local and SFTP
+        filesystems do. A range failing is retried on a new connection up to
+        ``max_attempts`` times before the copy fails.
+
+        Args:
+            source_fs: Filesystem to read from
+            source_path: Path on the source filesystem
+            dest_fs: Filesystem to write to
+            dest_path: Path on the destination filesystem
+            streams: Number of parallel streams
+            ranges: Ranges to copy into an existing destination file, e.g.
+                ranges failing verification; by default the whole file is
+                copied into a new one
+            progress: Called with the total bytes copied so far
+            max_attempts: Attempts per range
+            checkpoint: Called from the stream threads with every range
+                copied, with the checksum of its data
+
+        Returns:
+            The copied ranges with the checksums of their data
+        """
+        if ranges is None:
+            size = source_fs.size(source_path)
+            ranges = plan_byte_ranges(size, streams, max(DEFAULT_RANGE_SIZE, self.chunk_size))
+            dest_directory = posixpath.dirname(dest_path)
+            if dest_directory:
+                dest_fs.makedirs(dest_directory, exist_ok=True)
+            with dest_fs.open(dest_path, 'wb'):
+                pass
+
+        lock = threading.Lock()
+        bytes_copied = 0
+
+        def count(length: int) -> None:
+            nonlocal bytes_copied
+            with lock:
+                bytes_copied += length
+                total = bytes_copied
+            if progress:
+                progress(total)
+
+        def copy_range(connections: Tuple[Any, Any], byte_range: ByteRange) -> ByteRange:
+            source, dest = connections
+            digest = hashlib.sha256()
+            range_copied = 0
+            try:
+                with source.open(source_path, 'rb', block_size=self.chunk_size) as source_file, \
+                        dest.open(dest_path, 'r+b', block_size=self.chunk_size) as dest_file:
+                    dest_file.seek(byte_range.offset)
+                    if hasattr(dest_file, 'set_pipelined'):
+                        dest_file.set_pipelined(True)
+                    for chunk in self._read_range(source_file, byte_range):
+                        digest.update(chunk)
+                        dest_file.write(chunk)
+                        range_copied += len(chunk)
+                        count(len(chunk))
+            except BaseException:
+                # The range is copied again from its start
+                count(-range_copied)
+                raise
+            copied = ByteRange(byte_range.offset, byte_range.length, digest.hexdigest())
+            if checkpoint:
+                checkpoint(copied)
+            return copied
+
+        return self._run_ranges(source_fs, dest_fs, ranges, streams, copy_range, max_attempts, "Copying")
+
+    def checksum_ranges(
+        self,
+        filesystem: Any,
+        path: str,
+        ranges: Sequence[ByteRange],
+        streams: int
+    ) -> List[ByteRange]:
+        """SHA-256 of byte ranges of a file, read over ``streams`` connections."""
+
+        def checksum_range(connections: Tuple[Any, Any], byte_range: ByteRange) -> ByteRange:
+            digest = hashlib.sha256()
+            with connections[0].open(path, 'rb', block_size=self.chunk_size) as f:
+                for chunk in self._read_range(f, byte_range):
+                    digest.update(chunk)
+            return ByteRange(byte_range.offset, byte_range.length, digest.hexdigest())
+
+        return self._run_ranges(filesystem, None, ranges, streams, checksum_range, 1, "Reading")
+
+    def _run_ranges(
+        self,
+        source_fs: Any,
+        dest_fs: Optional[Any],
+        ranges: Sequence[ByteRange],
+        streams: int,
+        work: Callable[[Tuple[Any, Any], ByteRange], ByteRange],
+        max_attempts: int,
+        description: str
+    ) -> List[ByteRange]:
+        """Run ``work`` on every range on a pool of streams with connections of their own."""
+        local = threading.local()
+        opened: List[Any] = []
+        opened_lock = threading.Lock()
+
+        def connections() -> Tuple[Any, Any]:
+            if getattr(local, 'connections', None) is None:
+                source = open_connection(source_fs)
+                dest = open_connection(dest_fs) if dest_fs is not None else None
+                with opened_lock:
+                    opened.extend(fs for fs, original in ((source, source_fs), (dest, dest_fs))
+                                  if fs is not original)
+                local.connections = (source, dest)
+            return local.connections
+
+        def attempt(byte_range: ByteRange) -> ByteRange:
+            try:
+                return work(connections(), byte_range)
+            except Exception:
+                # The connection may be broken; the next range reconnects
+                local.connections = None
+                raise
+
+        results = {}
+        pending = list(ranges)
+        errors: List[Tuple[ByteRange, BaseException]] = []
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(streams, len(pending))),
+                                    thread_name_prefix="tellus-transfer-range") as pool:
+                for attempt_number in range(1, max_attempts + 1):
+                    futures = [(byte_range, pool.submit(attempt, byte_range)) for byte_range in pending]
+                    errors = []
+                    for byte_range, future in futures:
+                        try:
+                            results[byte_range.offset] = future.result()
+                        except Exception as e:
+                            errors.append((byte_range, e))
+                    if not errors:
+                        break
+                    pending = [byte_range for byte_range, _ in errors]
+                    if attempt_number < max_attempts:
+                        logger.warning(f"Retrying {len(pending)} byte ranges of {len(ranges)}: {errors[0][1]}")
+        finally:
+            for filesystem in opened:
+                try:
+                    close_connection(filesystem)
+                except Exception as e:
+                    logger.debug(f"Closing connection failed: {e}")
+
+        if errors:
+            byte_range, error = errors[0]
+            raise IOError(
+                f"{description} {len(errors)} of {len(ranges)} byte ranges failed after {max_attempts} attempts, "
+                f"first at bytes {byte_range.offset}-{byte_range.end}: {error}"
+            ) from error
+        return [results[byte_range.offset] for byte_range in ranges]
+
+    def _read_range(
+        self,
+        fileobj: Any,
+        byte_range: ByteRange,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Read a byte range in chunks; SFTP files are read with prefetched requests."""
+        chunk_size = chunk_size or self.chunk_size
+        if byte_range.offset:
+            fileobj.seek(byte_range.offset)
+        prefetching = hasattr(fileobj, 'prefetch')
+        if prefetching:
+            fileobj.prefetch(byte_range.end)
+        request_size = _SFTP_REQUEST_SIZE if prefetching else chunk_size
+
+        remaining = byte_range.length
+        while remaining:
+            chunk = bytearray()
+            while len(chunk) < min(chunk_size, remaining):
+                data = fileobj.read(min(request_size, remaining - len(chunk)))
+                if not data:
+                    raise IOError(f"Unexpected end of file at byte {byte_range.end - remaining + len(chunk)}")
+                chunk += data
+                if prefetching and not getattr(fileobj, '_prefetching', True) and len(chunk) < remaining:
+                    # paramiko stops prefetching for good when its responses
+                    # overtake its requests, then reads one request at a time
+                    fileobj.prefetch(byte_range.end)
+            remaining -= len(chunk)
+            yield bytes(chunk)
@@ -324,6 +324,15 @@ class PathSandboxedFileSystem:
         """Return the base path for this sandboxed filesystem."""
         return self._base_path
     
+    @property
+    def base_filesystem(self) -> AbstractFileSystem:
+        """Return the wrapped filesystem."""
+        return self._fs
+    
+    def resolve_path(self, path: Union[str, Path]) -> str:
+        """Resolve a path to its full path on the wrapped filesystem."""
+        return self._resolve_path(path)
+    
     def __getattr__(self, name: str) -> Any:
         """
         Delegate unknown attributes/methods to the underlying filesystem.
@@ -0,0 +1,372 @@
+"""
+Checkpoint journal for resumable transfers.
+
+A TransferJournal records, for one transfer operation, which byte ranges of
+each file have been written to the destination (with the SHA-256 of their
+data) and which files are complete. It is kept as an append-only file of
+JSON lines, so a checkpoint costs one small write, and a journal cut short
+by a killed process loses at most its last line.
+
+``copy_resumable`` and ``copy_ranges_resumable`` copy a file through an
+``FSSpecTransferEngine`` while checkpointing into a journal. Run again under
+the same journal, e.g. on a retry or when a killed command is re-run with
+its operation id, they continue partial files (and ``is_transferred`` tells
+which files are complete):
+
+- The recorded ranges are hashed in the destination file again, and only
+  ranges whose data still matches are kept.
+- Streamed copies continue after the longest verified prefix; ranged copies
+  copy every range not verified.
+- A source file whose size or modification time changed since it was
+  recorded is copied from the start.
+"""
+
+import hashlib
+import json
+import logging
+import posixpath
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .fsspec_transfer import (DEFAULT_RANGE_ATTEMPTS, DEFAULT_RANGE_SIZE,
+                              ByteRange, FSSpecTransferEngine,
+                              plan_byte_ranges)
+
+logger = logging.getLogger(__name__)
+
+# Directory of relay staging files on intermediate locations
+RELAY_DIRECTORY = '.tellus-relay'
+
+
+class TransferJournal:
+    """Completed files and byte ranges of one transfer operation."""
+
+    VERSION = 1
+
+    def __init__(self, operation_id: str, journal_path: Optional[Path] = None):
+        """
+        Initialize the journal, loading earlier records from ``journal_path``.
+
+        Args:
+            operation_id: Transfer operation the journal belongs to
+            journal_path: File the journal is kept in; without it the journal
+                is only kept in memory, which still lets retries within one
+                process resume
+        """
+        self.operation_id = operation_id
+        self.journal_path = Path(journal_path) if journal_path is not None else None
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def in_directory(cls, directory: Optional[Path], operation_id: str) -> 'TransferJournal':
+        """The journal of an operation, kept in ``directory`` (in memory if None)."""
+        journal_path = Path(directory) / f"{operation_id}.jsonl" if directory is not None else None
+        return cls(operation_id, journal_path)
+
+    @staticmethod
+    def file_key(source_location: str, source_path: str, dest_location: str, dest_path: str) -> str:
+        """Key of a file transfer within a journal."""
+        return f"{source_location}:{source_path} -> {dest_location}:{dest_path}"
+
+    @property
+    def exists(self) -> bool:
+        """Whether anything was recorded for the operation."""
+        return bool(self._files)
+
+    def has_file(self, key: str) -> bool:
+        """Whether a transfer of the file was started under this operation."""
+        return key in self._files
+
+    def is_complete(self, key: str) -> bool:
+        """Whether the file was transferred completely."""
+        return self._files.get(key, {}).get('complete', False)
+
+    def is_verified(self, key: str) -> bool:
+        """Whether the completed file was verified against its source."""
+        return self._files.get(key, {}).get('verified', False)
+
+    def signature(self, key: str) -> Optional[Dict[str, Any]]:
+        """Source size and modification time the file was journaled with."""
+        entry = self._files.get(key)
+        return entry['signature'] if entry is not None else None
+
+    def ranges(self, key: str) -> List[ByteRange]:
+        """Byte ranges of the file recorded as written, by offset."""
+        entry = self._files.get(key)
+        if entry is None:
+            return []
+        return [entry['ranges'][offset] for offset in sorted(entry['ranges'])]
+
+    def begin_file(self, key: str, signature: Dict[str, Any]) -> None:
+        """
+        Start or continue the transfer of a file.
+
+        Records of the file are discarded if its source signature (size and
+        modification time) differs from the recorded one.
+        """
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry['signature'] == signature:
+                return
+            if entry is not None:
+                logger.info(f"Source of {key} changed since it was journaled, transferring it from the start")
+            self._apply({'file': key, 'begin': signature})
+            self._append({'file': key, 'begin': signature})
+
+    def record_range(self, key: str, byte_range: ByteRange) -> None:
+        """Record a byte range written to the destination; safe to call from several threads."""
+        record = {'file': key, 'range': [byte_range.offset, byte_range.length, byte_range.checksum]}
+        with self._lock:
+            self._apply(record)
+            self._append(record)
+
+    def discard_ranges(self, key: str, ranges: Sequence[ByteRange]) -> None:
+        """Forget byte ranges, e.g. ones whose data no longer matches."""
+        if not ranges:
+            return
+        record = {'file': key, 'discard': [byte_range.offset for byte_range in ranges]}
+        with self._lock:
+            self._apply(record)
+            self._append(record)
+
+    def complete_file(self, key: str, verified: bool = False) -> None:
+        """Record that the file was transferred completely, and whether it was verified."""
+        record = {'file': key, 'complete': True, 'verified': verified}
+        with self._lock:
+            self._apply(record)
+            self._append(record)
+
+    def remove(self) -> None:
+        """Delete the journal, e.g. once its operation has completed."""
+        with self._lock:
+            self._files = {}
+            if self.journal_path is not None:
+                try:
+                    self.journal_path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        key = record['file']
+        if 'begin' in record:
+            self._files[key] = {'signature': record['begin'], 'ranges': {}, 'complete': False}
+            return
+        entry = self._files.get(key)
+        if entry is None:
+            return
+        if 'range' in record:
+            offset, length, checksum = record['range']
+            entry['ranges'][offset] = ByteRange(offset, length, checksum)
+        elif 'discard' in record:
+            for offset in record['discard']:
+                entry['ranges'].pop(offset, None)
+        elif record.get('complete'):
+            entry['complete'] = True
+            entry['verified'] = record.get('verified', False)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self.journal_path is None:
+            return
+        new = not self.journal_path.exists() or self.journal_path.stat().st_size == 0
+        if new:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a') as f:
+            if new:
+                f.write(json.dumps({'version': self.VERSION, 'operation_id': self.operation_id}) + '\n')
+            f.write(json.dumps(record) + '\n')
+
+    def _load(self) -> None:
+        if self.journal_path is None or not self.journal_path.exists():
+            return
+        try:
+            with open(self.journal_path, 'rb') as f:
+                lines = f.read().splitlines(keepends=True)
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable transfer journal {self.journal_path}: {e}")
+            return
+
+        valid_bytes = 0
+        for number, line in enumerate(lines):
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("incomplete line")
+                record = json.loads(line)
+            except ValueError:
+                # A record torn by a killed process; it was never relied on.
+                # Cut it off so that new records start on a line of their own.
+                logger.debug(f"Dropping truncated record {number} of {self.journal_path}")
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+                break
+            if number == 0 and record.get('version') != self.VERSION:
+                logger.warning(f"Discarding transfer journal {self.journal_path} of another version")
+                self.journal_path.unlink()
+                return
+            if number > 0:
+                self._apply(record)
+            valid_bytes += len(line)
+
+
+def relay_staging_path(operation_id: str, key: str) -> str:
+    """Path of the staging file of a relayed file transfer on an intermediate location."""
+    token = hashlib.sha256(f"{operation_id} {key}".encode()).hexdigest()[:16]
+    return posixpath.join(RELAY_DIRECTORY, f"{token}-{posixpath.basename(key)}")
+
+
+def source_signature(filesystem: Any, path: str) -> Dict[str, Any]:
+    """Size and modification time of a file, to tell whether it changed between transfers."""
+    info = filesystem.info(path)
+    modified = None
+    for field in ('mtime', 'LastModified', 'last_modified', 'ETag', 'created'):
+        if info.get(field) is not None:
+            modified = str(info[field])
+            break
+    return {'size': info['size'], 'modified': modified}
+
+
+def is_transferred(
+    journal: TransferJournal,
+    key: str,
+    source_fs: Any,
+    source_path: str,
+    dest_fs: Any,
+    dest_path: str
+) -> bool:
+    """Whether the journal has the file as complete and neither side changed since."""
+    journal.begin_file(key, source_signature(source_fs, source_path))
+    if not journal.is_complete(key) or not dest_fs.exists(dest_path):
+        return False
+    return dest_fs.size(dest_path) == journal.signature(key)['size']
+
+
+def verify_journaled_ranges(
+    engine: FSSpecTransferEngine,
+    journal: TransferJournal,
+    key: str,
+    dest_fs: Any,
+    dest_path: str,
+    streams: int = 1
+) -> List[ByteRange]:
+    """
+    Recorded byte ranges of a file whose data in the destination still matches.
+
+    Ranges that no longer match, or lie past the end of the destination file,
+    are discarded from the journal.
+    """
+    recorded = journal.ranges(key)
+    if not recorded:
+        return []
+    dest_size = dest_fs.size(dest_path) if dest_fs.exists(dest_path) else 0
+    present = [byte_range for byte_range in recorded if byte_range.end <= dest_size]
+    written = engine.checksum_ranges(dest_fs, dest_path, present, streams) if present else []
+    verified = [expected for expected, actual in zip(present, written) if expected.checksum == actual.checksum]
+
+    verified_offsets = {byte_range.offset for byte_range in verified}
+    journal.discard_ranges(key, [byte_range for byte_range in recorded if byte_range.offset not in verified_offsets])
+    return verified
+
+
+def verified_prefix(ranges: Sequence[ByteRange]) -> int:
+    """Length of the contiguous run of ranges from the start of a file."""
+    end = 0
+    for byte_range in sorted(ranges, key=lambda byte_range: byte_range.offset):
+        if byte_range.offset != end:
+            break
+        end = byte_range.end
+    return end
+
+
+def copy_resumable(
+    engine: FSSpecTransferEngine,
+    journal: TransferJournal,
+    key: str,
+    source_fs: Any,
+    source_path: str,
+    dest_fs: Any,
+    dest_path: str,
+    same_filesystem: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+    chunk_size: Optional[int] = None,
+    via: Sequence[Tuple[Any, str]] = ()
+) -> Tuple[int, int]:
+    """
+    Copy a file in one stream, checkpointing into a journal.
+
+    With ``via``, the file is relayed through intermediate filesystems (see
+    ``FSSpecTransferEngine.relay``); a resumed relay only relays the part of
+    the file not verified in the destination.
+
+    The file is not marked complete, so that callers can verify it first
+    (see ``TransferJournal.complete_file``).
+
+    Returns:
+        Bytes copied by this call, and the offset the copy resumed from
+    """
+    signature = source_signature(source_fs, source_path)
+    size = signature['size']
+    journal.begin_file(key, signature)
+
+    offset = verified_prefix(verify_journaled_ranges(engine, journal, key, dest_fs, dest_path))
+    if offset:
+        logger.info(f"Resuming {dest_path} at byte {offset:,} of {size:,}")
+
+    def checkpoint(byte_range: ByteRange) -> None:
+        journal.record_range(key, byte_range)
+
+    if via:
+        copied = engine.relay(source_fs, source_path, dest_fs, dest_path, via, progress=progress,
+                              chunk_size=chunk_size, offset=offset, checkpoint=checkpoint)
+    else:
+        copied = engine.copy(source_fs, source_path, dest_fs, dest_path, same_filesystem=same_filesystem,
+                             progress=progress, chunk_size=chunk_size, offset=offset, checkpoint=checkpoint)
+    return copied, offset
+
+
+def copy_ranges_resumable(
+    engine: FSSpecTransferEngine,
+    journal: TransferJournal,
+    key: str,
+    source_fs: Any,
+    source_path: str,
+    dest_fs: Any,
+    dest_path: str,
+    streams: int,
+    progress: Optional[Callable[[int], None]] = None,
+    max_attempts: int = DEFAULT_RANGE_ATTEMPTS
+) -> Tuple[List[ByteRange], int]:
+    """
+    Copy a file as byte ranges over parallel streams, checkpointing into a journal.
+
+    As with ``copy_resumable``, the file is not marked complete.
+
+    Returns:
+        All byte ranges of the file with the checksums of their source data,
+        and the number of bytes verified from earlier attempts
+    """
+    signature = source_signature(source_fs, source_path)
+    size = signature['size']
+    journal.begin_file(key, signature)
+
+    verified = verify_journaled_ranges(engine, journal, key, dest_fs, dest_path, streams)
+    resumed = sum(byte_range.length for byte_range in verified)
+
+    def checkpoint(byte_range: ByteRange) -> None:
+        journal.record_range(key, byte_range)
+
+    def count(total: int) -> None:
+        if progress:
+            progress(resumed + total)
+
+    if not verified:
+        copied = engine.copy_ranges(source_fs, source_path, dest_fs, dest_path, streams,
+                                    progress=count, max_attempts=max_attempts, checkpoint=checkpoint)
+        return copied, 0
+
+    logger.info(f"Resuming {dest_path} with {resumed:,} of {size:,} bytes verified")
+    missing = plan_byte_ranges(size, streams, max(engine.chunk_size, DEFAULT_RANGE_SIZE), done=verified)
+    copied = engine.copy_ranges(source_fs, source_path, dest_fs, dest_path, streams, ranges=missing,
+                                progress=count, max_attempts=max_attempts, checkpoint=checkpoint) if missing else []
+    return sorted(verified + copied, key=lambda byte_range: byte_range.offset), resumed
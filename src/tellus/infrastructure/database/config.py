@@ -136,18 +136,17 @@ class DatabaseManager:
                 "echo": self.config.echo,
             }
 
-            if self.config.database_type == "postgresql":
+            if os.getenv("TESTING"):
+                # Use NullPool only for testing
+                engine_params["poolclass"] = NullPool
+            elif self.config.database_type == "postgresql":
                 # PostgreSQL supports connection pooling
                 engine_params.update({
                     "pool_size": self.config.pool_size,
                     "max_overflow": self.config.max_overflow,
                 })
-                # Use NullPool only for testing
-                if os.getenv("TESTING"):
-                    engine_params["poolclass"] = NullPool
-            else:
-                # SQLite uses NullPool by default and doesn't support pool parameters
-                engine_params["poolclass"] = NullPool
+            # SQLite keeps SQLAlchemy's default pool, so connections are reused
+            # across operations running on the shared background event loop
 
             self._engine = create_async_engine(
                 self.config.get_database_url(),
@@ -0,0 +1,132 @@
+"""
+Background event loop for running async database code from sync callers.
+
+The sync repository wrappers used to call ``asyncio.run()`` for every
+operation, creating and tearing down an event loop (and a database
+connection) each time, and failing outright when called from inside a
+running loop such as FastAPI's. Instead, all database coroutines run on one
+long-lived loop in a daemon thread, so the engine's connection pool is
+reused across calls.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+from loguru import logger
+
+
+class BackgroundEventLoop:
+    """
+    An asyncio event loop running forever in a daemon thread.
+
+    Sync code calls ``run()`` to block on a coroutine; async code running on
+    another loop awaits ``submit()`` instead, so it does not block its own loop.
+    The thread is started lazily and restarted after a fork.
+    """
+
+    def __init__(self, name: str = "tellus-db-loop"):
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running background loop, starting it if necessary."""
+        with self._lock:
+            if not self._is_running():
+                self._start()
+            return self._loop
+
+    def _is_running(self) -> bool:
+        return (self._loop is not None and self._pid == os.getpid()
+                and self._thread is not None and self._thread.is_alive())
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run_forever():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=run_forever, name=self._name, daemon=True)
+        thread.start()
+        started.wait()
+
+        self._loop = loop
+        self._thread = thread
+        self._pid = os.getpid()
+        logger.debug(f"Started background event loop thread {self._name}")
+
+    def in_loop_thread(self) -> bool:
+        """Whether the caller is running on the background loop's thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """
+        Run a coroutine on the background loop and wait for its result.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the background loop itself, which
+                would deadlock
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(
+                "Cannot block on the background event loop from its own thread; "
+                "await the coroutine instead"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def submit(self, coro: Awaitable[Any]) -> Any:
+        """
+        Await a coroutine running on the background loop from another loop.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        if self.in_loop_thread():
+            return await coro
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return await asyncio.wrap_future(future)
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread to finish."""
+        with self._lock:
+            if not self._is_running():
+                return
+            loop, thread = self._loop, self._thread
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            self._loop = None
+            self._thread = None
+
+
+# Global background loop shared by all sync repository wrappers
+_background_loop: Optional[BackgroundEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Get the global background event loop."""
+    global _background_loop
+
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = BackgroundEventLoop()
+    return _background_loop
@@ -1,15 +1,16 @@
 """
 SQLAlchemy database models for Tellus domain entities.
 
-These models provide the database representation of SimulationEntity and LocationEntity,
-with proper relational mappings and constraints.
+These models provide the database representation of SimulationEntity, LocationEntity
+and SimulationFile, with proper relational mappings and constraints.
 """
 
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, Table, JSON, Boolean
+from sqlalchemy import (BigInteger, Boolean, Column, DateTime, ForeignKey,
+                        ForeignKeyConstraint, Index, JSON, String, Table, Text)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -150,4 +151,79 @@ class SimulationLocationContextModel(Base):
     location = relationship("LocationModel", lazy="selectin")
 
     def __repr__(self) -> str:
-        return f"<SimulationLocationContextModel(simulation_id='{self.simulation_id}', location_name='{self.location_name}')>"
\ No newline at end of file
+        return f"<SimulationLocationContextModel(simulation_id='{self.simulation_id}', location_name='{self.location_name}')>"
+
+
+class SimulationFileModel(Base):
+    """
+    SQLAlchemy model for SimulationFile.
+
+    The columns used for filtering are stored explicitly so that they can be
+    indexed; the complete entity is kept in ``data`` for lossless round trips.
+    Simulation IDs are not a foreign key, since files may be registered for
+    simulations that are tracked elsewhere (e.g. staging areas).
+    """
+
+    __tablename__ = 'simulation_files'
+
+    # Composite primary key: paths are unique within a simulation
+    simulation_id: Mapped[str] = mapped_column(String, primary_key=True)
+    relative_path: Mapped[str] = mapped_column(String, primary_key=True)
+
+    # Classification
+    file_type: Mapped[str] = mapped_column(String, nullable=False)
+    content_type: Mapped[str] = mapped_column(String, nullable=False)
+    importance: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+
+    # Hierarchy, temporal and location information
+    parent_file_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    simulation_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    location_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    # Full entity representation (SimulationFile.to_dict())
+    data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+    __table_args__ = (
+        Index('ix_simulation_files_relative_path', 'relative_path'),
+        Index('ix_simulation_files_parent_file_id', 'parent_file_id'),
+        Index('ix_simulation_files_content_type_date', 'content_type', 'simulation_date'),
+        Index('ix_simulation_files_file_type', 'file_type'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<SimulationFileModel(simulation_id='{self.simulation_id}', relative_path='{self.relative_path}')>"
+
+
+class SimulationFileLocationModel(Base):
+    """
+    Locations at which a simulation file is available.
+
+    One row per entry of SimulationFile.available_locations, so that
+    location filters are answered from an index.
+    """
+
+    __tablename__ = 'simulation_file_locations'
+
+    simulation_id: Mapped[str] = mapped_column(String, primary_key=True)
+    relative_path: Mapped[str] = mapped_column(String, primary_key=True)
+    location_name: Mapped[str] = mapped_column(String, primary_key=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['simulation_id', 'relative_path'],
+            ['simulation_files.simulation_id', 'simulation_files.relative_path'],
+            ondelete='CASCADE'
+        ),
+        Index('ix_simulation_file_locations_location_name', 'location_name'),
+    )
+
+    def __repr__(self) -> str:
+        return (f"<SimulationFileLocationModel(simulation_id='{self.simulation_id}', "
+                f"relative_path='{self.relative_path}', location_name='{self.location_name}')>")
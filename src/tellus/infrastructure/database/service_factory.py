@@ -8,12 +8,19 @@ using PostgreSQL repositories.
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...application.services.simulation_service import SimulationApplicationService
-from ...application.services.location_service import LocationApplicationService
+from ...application.services.simulation_service import (
+    AsyncSimulationApplicationService,
+    SimulationApplicationService
+)
+from ...application.services.location_service import (
+    AsyncLocationApplicationService,
+    LocationApplicationService
+)
 from ...domain.repositories.simulation_repository import ISimulationRepository
 from ...domain.repositories.location_repository import ILocationRepository
 
 from .config import DatabaseManager, get_database_manager
+from .event_loop import get_background_loop
 from ..repositories.postgres_simulation_repository import (
     PostgresSimulationRepository,
     AsyncSimulationRepositoryWrapper
@@ -86,42 +93,47 @@ class DatabaseServiceFactory:
 
         return LocationApplicationService(location_repository=loc_repo)
 
-    async def create_async_simulation_service(
+    def create_async_simulation_service(
         self, session: Optional[AsyncSession] = None
-    ) -> "AsyncSimulationApplicationService":
+    ) -> AsyncSimulationApplicationService:
         """
         Create an async simulation service with PostgreSQL repository.
 
+        Without a session, repository calls run on the shared background event
+        loop, which owns the pooled engine. A given session is used on the
+        caller's loop.
+
         Args:
             session: Optional async session. If not provided, will use per-operation sessions.
 
         Returns:
             Configured async simulation application service
         """
-        sim_repo = PostgresSimulationRepository(session)
-        loc_repo = PostgresLocationRepository(session)
-
-        # This would require creating an async version of the service
-        # For now, this is a placeholder for future async service implementation
-        raise NotImplementedError("Async services not yet implemented")
+        return AsyncSimulationApplicationService(
+            simulation_repository=PostgresSimulationRepository(session),
+            loop=None if session is not None else get_background_loop()
+        )
 
-    async def create_async_location_service(
+    def create_async_location_service(
         self, session: Optional[AsyncSession] = None
-    ) -> "AsyncLocationApplicationService":
+    ) -> AsyncLocationApplicationService:
         """
         Create an async location service with PostgreSQL repository.
 
+        Without a session, repository calls run on the shared background event
+        loop, which owns the pooled engine. A given session is used on the
+        caller's loop.
+
         Args:
             session: Optional async session. If not provided, will use per-operation sessions.
 
         Returns:
             Configured async location application service
         """
-        loc_repo = PostgresLocationRepository(session)
-
-        # This would require creating an async version of the service
-        # For now, this is a placeholder for future async service implementation
-        raise NotImplementedError("Async services not yet implemented")
+        return AsyncLocationApplicationService(
+            location_repository=PostgresLocationRepository(session),
+            loop=None if session is not None else get_background_loop()
+        )
 
 
 # Global service factory instance
@@ -2,10 +2,13 @@
 
 from .postgres_location_repository import PostgresLocationRepository, AsyncLocationRepositoryWrapper
 from .postgres_simulation_repository import PostgresSimulationRepository, AsyncSimulationRepositoryWrapper
+from .postgres_simulation_file_repository import PostgresSimulationFileRepository, AsyncSimulationFileRepositoryWrapper
 
 __all__ = [
     'PostgresLocationRepository',
     'PostgresSimulationRepository',
+    'PostgresSimulationFileRepository',
     'AsyncLocationRepositoryWrapper',
     'AsyncSimulationRepositoryWrapper',
+    'AsyncSimulationFileRepositoryWrapper',
 ]
\ No newline at end of file
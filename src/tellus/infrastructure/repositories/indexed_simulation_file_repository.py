@@ -0,0 +1,669 @@
+"""
+Indexed, append-only implementation of the unified SimulationFile repository.
+
+Instead of rewriting a whole JSON document for every saved file, this backend
+appends each change to a write-ahead log and periodically compacts the log into
+a snapshot on a background thread. All records are kept in memory together with
+secondary indexes, so hierarchical and location lookups never scan the full
+inventory.
+
+On-disk layout inside ``storage_dir``::
+
+    simulation-files.snapshot.json   # compacted state {simulation_id: {path: data}}
+    simulation-files.wal             # JSON lines appended since the last snapshot
+    simulation-files.wal.compacting  # log being folded into the snapshot (transient)
+    simulation-files.wal.lock        # held while appending to or rotating the log
+    simulation-files.snapshot.lock   # held while loading or replacing the snapshot
+
+Several processes may share a storage directory: the lock files serialize
+appends with log rotation, and loads with compaction, so no process loses
+another's entries. On platforms without ``fcntl`` the locks are no-ops and
+the backend must only be written by a single process.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ...domain.entities.simulation_file import (FileContentType, FileType,
+                                                SimulationFile)
+from ...domain.repositories.exceptions import RepositoryError
+from ...domain.repositories.simulation_file_repository import ISimulationFileRepository
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# (simulation_id, relative_path) - the primary key of a stored record
+RecordKey = Tuple[str, str]
+
+
+class IndexedSimulationFileRepository(ISimulationFileRepository):
+    """
+    Append-only, indexed implementation of the unified SimulationFile repository.
+
+    Saving a file costs one appended log line, independent of how many files
+    the simulation already holds. Secondary indexes on ``relative_path``,
+    ``parent_file_id``, ``file_type``, ``content_type`` and
+    ``available_locations`` turn the common lookups into dictionary accesses.
+
+    Changes written by other processes are picked up by replaying the tail of
+    the log before each operation. Appends, log rotation, loads and
+    compaction take file locks, so processes sharing a storage directory
+    neither lose each other's entries nor read a half-compacted state.
+    """
+
+    SNAPSHOT_FILENAME = "simulation-files.snapshot.json"
+    LOG_FILENAME = "simulation-files.wal"
+    COMPACTING_FILENAME = "simulation-files.wal.compacting"
+    LOG_LOCK_FILENAME = "simulation-files.wal.lock"
+    SNAPSHOT_LOCK_FILENAME = "simulation-files.snapshot.lock"
+    LEGACY_PATTERN = "simulation-files-*.json"
+
+    def __init__(
+        self,
+        storage_dir: str = None,
+        auto_create_dirs: bool = True,
+        compact_threshold: int = 10000,
+        background_compaction: bool = True,
+        fsync: bool = False,
+    ):
+        """
+        Initialize the indexed repository.
+
+        Args:
+            storage_dir: Directory holding the snapshot and write-ahead log
+            auto_create_dirs: Whether to auto-create the storage directory
+            compact_threshold: Number of log entries after which compaction is triggered
+            background_compaction: Compact on a daemon thread instead of inline
+            fsync: Whether to fsync the log after every append
+        """
+        if storage_dir is None:
+            storage_dir = ".tellus"
+
+        self.storage_dir = Path(storage_dir)
+        self.auto_create_dirs = auto_create_dirs
+        self.compact_threshold = compact_threshold
+        self.background_compaction = background_compaction
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._holds_snapshot_lock = False  # Set while compact() holds the snapshot lock
+
+        # Primary storage: simulation_id -> relative_path -> file data
+        self._records: Dict[str, Dict[str, Dict]] = {}
+
+        # Secondary indexes
+        self._path_index: Dict[str, Set[str]] = defaultdict(set)  # relative_path -> simulation_ids
+        self._parent_index: Dict[str, Set[RecordKey]] = defaultdict(set)
+        self._type_index: Dict[str, Set[RecordKey]] = defaultdict(set)
+        self._content_type_index: Dict[str, Set[RecordKey]] = defaultdict(set)
+        self._location_index: Dict[str, Set[RecordKey]] = defaultdict(set)
+
+        # Log position bookkeeping used to detect writes by other processes
+        self._log_entries = 0
+        self._log_inode: Optional[int] = None
+        self._log_offset = 0
+
+        # Log entries held back while a batch is open
+        self._batch_depth = 0
+        self._pending: List[Dict] = []
+
+        if self.auto_create_dirs:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+
+        self._load()
+        logger.debug(f"Initialized indexed SimulationFile repository in: {self.storage_dir}")
+
+    # === Storage paths ===
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.storage_dir / self.SNAPSHOT_FILENAME
+
+    @property
+    def log_path(self) -> Path:
+        return self.storage_dir / self.LOG_FILENAME
+
+    @property
+    def compacting_path(self) -> Path:
+        return self.storage_dir / self.COMPACTING_FILENAME
+
+    # === Inter-process locking ===
+
+    def _acquire_file_lock(self, filename: str, exclusive: bool = True):
+        """Open and flock a lock file; returns the file to pass to _release_file_lock."""
+        lock_file = open(self.storage_dir / filename, 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            except OSError:
+                lock_file.close()
+                raise
+        return lock_file
+
+    @staticmethod
+    def _release_file_lock(lock_file) -> None:
+        """Release and close a lock file from _acquire_file_lock."""
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            lock_file.close()
+
+    @contextmanager
+    def _file_lock(self, filename: str, exclusive: bool = True) -> Iterator[None]:
+        """Hold a lock file, excluding other processes and threads with their own descriptors."""
+        lock_file = self._acquire_file_lock(filename, exclusive)
+        try:
+            yield
+        finally:
+            self._release_file_lock(lock_file)
+
+    # === Loading and replay ===
+
+    def _reset_state(self) -> None:
+        """Drop all in-memory records and indexes."""
+        self._records = {}
+        for index in (self._path_index, self._parent_index, self._type_index,
+                      self._content_type_index, self._location_index):
+            index.clear()
+        self._log_entries = 0
+        self._log_inode = None
+        self._log_offset = 0
+
+    def _load(self) -> None:
+        """Load the snapshot and replay any outstanding log entries."""
+        with self._lock:
+            if self._holds_snapshot_lock or not self.storage_dir.exists():
+                self._load_state()
+                return
+            # Shared with other loads, exclusive with compaction, so the snapshot
+            # and compacting log are never read halfway through a compaction
+            with self._file_lock(self.SNAPSHOT_LOCK_FILENAME, exclusive=False):
+                self._load_state()
+
+    def _load_state(self) -> None:
+        """Load the snapshot and replay the logs; the caller holds the snapshot lock."""
+        with self._lock:
+            self._reset_state()
+
+            has_state = (self.snapshot_path.exists() or self.log_path.exists()
+                         or self.compacting_path.exists())
+            if not has_state:
+                self._import_legacy_files()
+                return
+
+            try:
+                if self.snapshot_path.exists():
+                    with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                        snapshot = json.load(f)
+                    for simulation_id, files in snapshot.items():
+                        for file_data in files.values():
+                            self._apply_put(simulation_id, file_data)
+
+                # A leftover compacting log means a compaction was interrupted;
+                # replaying it on top of the snapshot is idempotent.
+                if self.compacting_path.exists():
+                    with open(self.compacting_path, 'r', encoding='utf-8') as f:
+                        self._replay_lines(f)
+
+                self._replay_log_tail()
+
+            except (json.JSONDecodeError, IOError) as e:
+                logger.error(f"Error loading indexed simulation files: {e}")
+                raise RepositoryError(f"Failed to load simulation files: {e}") from e
+
+            logger.debug(
+                f"Loaded {sum(len(v) for v in self._records.values())} files "
+                f"for {len(self._records)} simulations"
+            )
+
+    def _import_legacy_files(self) -> None:
+        """Seed the store from per-simulation JSON files written by JsonSimulationFileRepository."""
+        if not self.storage_dir.exists():
+            return
+
+        imported = 0
+        for file_path in self.storage_dir.glob(self.LEGACY_PATTERN):
+            simulation_id = file_path.name[len("simulation-files-"):-len(".json")]
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Skipping unreadable legacy file {file_path}: {e}")
+                continue
+            for file_data in data.values():
+                self._apply_put(simulation_id, file_data)
+                imported += 1
+
+        if imported:
+            self._write_snapshot(self._copy_records())
+            logger.info(f"Imported {imported} files from legacy JSON storage")
+
+    def _replay_lines(self, lines: Iterable[str]) -> int:
+        """Apply log lines to the in-memory state. Returns the number applied."""
+        applied = 0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from a crashed writer - ignore it
+                logger.warning("Ignoring corrupt write-ahead log entry")
+                continue
+            self._replay_entries([entry])
+            applied += 1
+        return applied
+
+    def _replay_entries(self, entries: Iterable[Dict]) -> None:
+        """Apply log entries to the in-memory state."""
+        for entry in entries:
+            if entry.get('op') == 'put':
+                self._apply_put(entry['sim'], entry['data'])
+            elif entry.get('op') == 'del':
+                self._apply_delete(entry['sim'], entry['path'])
+
+    def _replay_log_tail(self) -> None:
+        """Apply log entries appended since we last read the log."""
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            self._log_inode = None
+            self._log_offset = 0
+            return
+
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            f.seek(self._log_offset)
+            self._log_entries += self._replay_lines(f)
+            self._log_offset = f.tell()
+        self._log_inode = stat.st_ino
+
+    def _refresh(self) -> None:
+        """Pick up changes made by other processes sharing the storage directory."""
+        if self._pending:
+            return  # Reloading now would drop the open batch's changes
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            if self._log_inode is not None:
+                # Log was rotated away by another process's compaction
+                self._load()
+            return
+
+        if self._log_inode is not None and stat.st_ino != self._log_inode:
+            self._load()
+        elif stat.st_size < self._log_offset:
+            self._load()
+        elif stat.st_size > self._log_offset:
+            self._replay_log_tail()
+
+    # === In-memory state and indexes ===
+
+    def _index(self, key: RecordKey, file_data: Dict) -> None:
+        simulation_id, relative_path = key
+        self._path_index[relative_path].add(simulation_id)
+        if file_data.get('parent_file_id'):
+            self._parent_index[file_data['parent_file_id']].add(key)
+        self._type_index[file_data.get('file_type', 'regular')].add(key)
+        self._content_type_index[file_data.get('content_type', 'outdata')].add(key)
+        for location in file_data.get('available_locations', []):
+            self._location_index[location].add(key)
+
+    def _unindex(self, key: RecordKey, file_data: Dict) -> None:
+        simulation_id, relative_path = key
+        self._discard(self._path_index, relative_path, simulation_id)
+        if file_data.get('parent_file_id'):
+            self._discard(self._parent_index, file_data['parent_file_id'], key)
+        self._discard(self._type_index, file_data.get('file_type', 'regular'), key)
+        self._discard(self._content_type_index, file_data.get('content_type', 'outdata'), key)
+        for location in file_data.get('available_locations', []):
+            self._discard(self._location_index, location, key)
+
+    @staticmethod
+    def _discard(index: Dict, index_key, value) -> None:
+        bucket = index.get(index_key)
+        if bucket is not None:
+            bucket.discard(value)
+            if not bucket:
+                del index[index_key]
+
+    def _apply_put(self, simulation_id: str, file_data: Dict) -> None:
+        relative_path = file_data['relative_path']
+        key = (simulation_id, relative_path)
+        simulation_files = self._records.setdefault(simulation_id, {})
+        previous = simulation_files.get(relative_path)
+        if previous is not None:
+            self._unindex(key, previous)
+        simulation_files[relative_path] = file_data
+        self._index(key, file_data)
+
+    def _apply_delete(self, simulation_id: str, relative_path: str) -> bool:
+        simulation_files = self._records.get(simulation_id)
+        if not simulation_files or relative_path not in simulation_files:
+            return False
+        previous = simulation_files.pop(relative_path)
+        self._unindex((simulation_id, relative_path), previous)
+        if not simulation_files:
+            del self._records[simulation_id]
+        return True
+
+    def _find_key(self, relative_path: str) -> Optional[RecordKey]:
+        """Resolve a relative path to its record key, or None."""
+        simulation_ids = self._path_index.get(relative_path)
+        if not simulation_ids:
+            return None
+        return (min(simulation_ids), relative_path)
+
+    def _materialize(self, keys: Iterable[RecordKey]) -> List[SimulationFile]:
+        files = []
+        for simulation_id, relative_path in sorted(keys):
+            files.append(SimulationFile.from_dict(self._records[simulation_id][relative_path]))
+        return files
+
+    # === Write-ahead log and compaction ===
+
+    def _append_to_log(self, entries: List[Dict]) -> None:
+        """Append entries to the write-ahead log and trigger compaction if due."""
+        try:
+            with self._file_lock(self.LOG_LOCK_FILENAME):
+                # Catch up on entries other processes appended, so that moving our
+                # offset past the new entries does not skip theirs
+                position = (self._log_inode, self._log_offset)
+                self._refresh()
+                caught_up = (self._log_inode, self._log_offset) != position
+
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(e, ensure_ascii=False) + '\n' for e in entries)
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                    self._log_offset = f.tell()
+                self._log_inode = self.log_path.stat().st_ino
+        except (IOError, OSError) as e:
+            logger.error(f"Error appending to write-ahead log: {e}")
+            raise RepositoryError(f"Failed to write simulation files: {e}") from e
+
+        if caught_up:
+            # Entries replayed just now were applied over ours; the log orders ours last
+            self._replay_entries(entries)
+        self._log_entries += len(entries)
+        if self._log_entries >= self.compact_threshold:
+            self.compact(wait=not self.background_compaction)
+
+    def _copy_records(self) -> Dict[str, Dict[str, Dict]]:
+        # Records are replaced rather than mutated, so a shallow copy is consistent
+        return {sim_id: dict(files) for sim_id, files in self._records.items()}
+
+    def _write_snapshot(self, records: Dict[str, Dict[str, Dict]]) -> None:
+        temp_path = self.snapshot_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, separators=(',', ':'))
+        temp_path.replace(self.snapshot_path)
+
+    def compact(self, wait: bool = True) -> None:
+        """
+        Fold the write-ahead log into the snapshot.
+
+        The active log is rotated aside under the log lock, so writers keep
+        appending to a fresh log while the snapshot is being written. The
+        snapshot lock is held from rotation until the rotated log is
+        discarded, so no process loads a snapshot that is missing entries
+        of a log that has already gone.
+
+        Compaction is skipped while a batch is open, as the in-memory state
+        then holds changes that are not in the log yet.
+
+        Args:
+            wait: Block until compaction has finished
+        """
+        with self._lock:
+            if self._batch_depth:
+                return
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                if not wait:
+                    return
+                self._compaction_thread.join()
+
+            with self._file_lock(self.LOG_LOCK_FILENAME):
+                if not self.log_path.exists():
+                    return
+                # Waits for a compaction running in another process to finish
+                snapshot_lock = self._acquire_file_lock(self.SNAPSHOT_LOCK_FILENAME)
+                self._holds_snapshot_lock = True
+                try:
+                    if self.compacting_path.exists():
+                        # Finish an interrupted compaction before rotating again
+                        self._load()
+                        self._write_snapshot(self._copy_records())
+                        self.compacting_path.unlink()
+                    else:
+                        # Nobody can append now, so the snapshot will hold every rotated entry
+                        self._refresh()
+
+                    self.log_path.replace(self.compacting_path)
+                    self._log_entries = 0
+                    self._log_inode = None
+                    self._log_offset = 0
+                    records = self._copy_records()
+                except BaseException:
+                    self._release_file_lock(snapshot_lock)
+                    raise
+                finally:
+                    self._holds_snapshot_lock = False
+
+            if wait:
+                self._finish_compaction(records, snapshot_lock)
+                return
+
+            self._compaction_thread = threading.Thread(
+                target=self._finish_compaction, args=(records, snapshot_lock),
+                name="tellus-file-repo-compaction", daemon=True
+            )
+            self._compaction_thread.start()
+
+    def _finish_compaction(self, records: Dict[str, Dict[str, Dict]], snapshot_lock) -> None:
+        """Write the snapshot for a rotated log, discard the rotated log and release the snapshot lock."""
+        try:
+            self._write_snapshot(records)
+            self.compacting_path.unlink()
+            logger.debug("Compacted simulation file write-ahead log")
+        except (IOError, OSError) as e:
+            # The compacting log is kept and replayed on the next load
+            logger.error(f"Compaction of simulation file log failed: {e}")
+        finally:
+            self._release_file_lock(snapshot_lock)
+
+    def close(self) -> None:
+        """Wait for any running background compaction to finish."""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+        self._compaction_thread = None
+
+    def _write(self, entries: List[Dict]) -> None:
+        """Append entries to the log, or hold them back while a batch is open."""
+        if self._batch_depth:
+            self._pending.extend(entries)
+        else:
+            self._append_to_log(entries)
+
+    # === ISimulationFileRepository ===
+
+    @contextmanager
+    def batch(self) -> Iterator['IndexedSimulationFileRepository']:
+        """
+        Group changes into a single log append.
+
+        The repository lock is held for the duration of the batch. If the
+        block raises, the pending entries are dropped and the in-memory
+        state is reloaded from disk.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._pending = []
+                    self._load()
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending:
+                entries, self._pending = self._pending, []
+                try:
+                    self._append_to_log(entries)
+                except RepositoryError:
+                    self._load()
+                    raise
+
+    def save_many(self, files: Iterable[SimulationFile]) -> None:
+        """Save several simulation files with a single log append."""
+        with self.batch():
+            for file in files:
+                self.save(file)
+
+    def _extract_simulation_id_from_file(self, file: SimulationFile) -> Optional[str]:
+        """Extract simulation_id from a SimulationFile's attributes."""
+        return file.attributes.get('simulation_id') if file.attributes else None
+
+    def save(self, file: SimulationFile) -> None:
+        """Save a simulation file entity."""
+        simulation_id = self._extract_simulation_id_from_file(file)
+        if not simulation_id:
+            raise RepositoryError("Cannot save file without simulation_id in attributes")
+
+        with self._lock:
+            self._refresh()
+            file_data = file.to_dict()
+            self._apply_put(simulation_id, file_data)
+            self._write([{'op': 'put', 'sim': simulation_id, 'data': file_data}])
+
+        logger.debug(f"Saved simulation file: {file.relative_path} for simulation {simulation_id}")
+
+    def get_by_path(self, relative_path: str) -> Optional[SimulationFile]:
+        """Retrieve a file by its relative path."""
+        with self._lock:
+            self._refresh()
+            key = self._find_key(relative_path)
+            if key is None:
+                return None
+            return SimulationFile.from_dict(self._records[key[0]][key[1]])
+
+    def get_by_id(self, file_id: str) -> Optional[SimulationFile]:
+        """Retrieve a file by its ID (same as path for now)."""
+        return self.get_by_path(file_id)
+
+    def list_all(self) -> List[SimulationFile]:
+        """Retrieve all simulation files."""
+        with self._lock:
+            self._refresh()
+            return [
+                SimulationFile.from_dict(file_data)
+                for simulation_files in self._records.values()
+                for file_data in simulation_files.values()
+            ]
+
+    def list_by_type(self, file_type: FileType) -> List[SimulationFile]:
+        """Retrieve files by their type."""
+        with self._lock:
+            self._refresh()
+            return self._materialize(self._type_index.get(file_type.value, ()))
+
+    def list_by_content_type(self, content_type: FileContentType) -> List[SimulationFile]:
+        """Retrieve files by their content type."""
+        with self._lock:
+            self._refresh()
+            return self._materialize(self._content_type_index.get(content_type.value, ()))
+
+    def list_by_simulation(self, simulation_id: str) -> List[SimulationFile]:
+        """Retrieve files associated with a simulation."""
+        with self._lock:
+            self._refresh()
+            return [
+                SimulationFile.from_dict(file_data)
+                for file_data in self._records.get(simulation_id, {}).values()
+            ]
+
+    def list_by_location(self, location_name: str) -> List[SimulationFile]:
+        """Retrieve files available at a specific location."""
+        with self._lock:
+            self._refresh()
+            return self._materialize(self._location_index.get(location_name, ()))
+
+    def list_by_parent(self, parent_file_id: str) -> List[SimulationFile]:
+        """Retrieve files that have a specific parent file."""
+        with self._lock:
+            self._refresh()
+            return self._materialize(self._parent_index.get(parent_file_id, ()))
+
+    def get_children(self, file_id: str) -> List[SimulationFile]:
+        """Get all files contained by a specific file."""
+        with self._lock:
+            self._refresh()
+            parent_key = self._find_key(file_id)
+            if parent_key is None:
+                return []
+
+            parent_data = self._records[parent_key[0]][parent_key[1]]
+            keys = set(self._parent_index.get(file_id, ()))
+            for contained_id in parent_data.get('contained_file_ids', []):
+                contained_key = self._find_key(contained_id)
+                if contained_key is not None:
+                    keys.add(contained_key)
+            return self._materialize(keys)
+
+    def delete(self, file_path_or_id: str) -> bool:
+        """Delete a simulation file."""
+        with self._lock:
+            self._refresh()
+            key = self._find_key(file_path_or_id)
+            if key is None:
+                return False
+            self._apply_delete(*key)
+            self._write([{'op': 'del', 'sim': key[0], 'path': key[1]}])
+
+        logger.info(f"Deleted simulation file: {file_path_or_id} from simulation {key[0]}")
+        return True
+
+    def exists(self, file_path_or_id: str) -> bool:
+        """Check if a file exists."""
+        with self._lock:
+            self._refresh()
+            return file_path_or_id in self._path_index
+
+    def count_by_type(self) -> Dict[FileType, int]:
+        """Get count of files by type."""
+        with self._lock:
+            self._refresh()
+            return {
+                file_type: len(self._type_index.get(file_type.value, ()))
+                for file_type in FileType
+            }
+
+    def search(self, pattern: str, file_type: Optional[FileType] = None) -> List[SimulationFile]:
+        """Search for files matching a pattern."""
+        with self._lock:
+            self._refresh()
+            if file_type is not None:
+                candidates = self._type_index.get(file_type.value, ())
+            else:
+                candidates = (
+                    (simulation_id, relative_path)
+                    for simulation_id, files in self._records.items()
+                    for relative_path in files
+                )
+            return self._materialize(key for key in candidates if fnmatch(key[1], pattern))
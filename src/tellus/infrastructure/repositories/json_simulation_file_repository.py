@@ -9,9 +9,10 @@ import json
 import logging
 import os
 import time
+from contextlib import contextmanager
 from fnmatch import fnmatch
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from ...domain.entities.simulation_file import FileType, SimulationFile
 from ...domain.repositories.exceptions import RepositoryError
@@ -28,7 +29,16 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
     simulation-files-{simulation_id}.json
     
     This provides better scaling and cleaner organization than a single large file.
+    A reverse index maps every relative path to the simulations holding it and
+    every parent file to its children, so single-file and hierarchy lookups only
+    load the simulations that are actually involved. The index is sharded per
+    simulation (simulation-file-index/{simulation_id}.json), so saving a file
+    only rewrites the shard of its own simulation.
     """
+
+    INDEX_DIRNAME = "simulation-file-index"
+    INDEX_VERSION = 2
+    LEGACY_INDEX_FILENAME = "simulation-file-index.json"  # Unsharded index, removed on first use
     
     def __init__(self, storage_dir: str = None, auto_create_dirs: bool = True):
         """
@@ -46,6 +56,18 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
         self.auto_create_dirs = auto_create_dirs
         self._simulation_data: Dict[str, Dict[str, Dict]] = {}  # simulation_id -> file_path -> file_data
         self._last_modified: Dict[str, float] = {}  # simulation_id -> timestamp
+
+        # Reverse indexes, persisted as one shard per simulation in INDEX_DIRNAME
+        self._path_index: Dict[str, Set[str]] = {}  # relative_path -> simulation_ids
+        self._children_index: Dict[str, Set[Tuple[str, str]]] = {}  # parent_file_id -> (simulation_id, path)
+        self._indexed_files: Dict[str, Dict[str, Optional[str]]] = {}  # simulation_id -> path -> parent_file_id
+        self._index_sources: Dict[str, float] = {}  # simulation_id -> data file mtime when indexed
+        self._shard_mtimes: Dict[str, float] = {}  # simulation_id -> shard mtime when loaded or written
+        self._index_verified = False
+
+        # Batch state: simulations with unflushed changes while a batch is open
+        self._batch_depth = 0
+        self._dirty_simulations: Set[str] = set()
         
         logger.debug(f"Initialized JSON SimulationFile repository in: {self.storage_dir}")
         
@@ -58,6 +80,8 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
     
     def _load_simulation_data(self, simulation_id: str) -> None:
         """Load data for a specific simulation if it exists."""
+        if simulation_id in self._dirty_simulations:
+            return  # Unflushed batch changes take precedence over disk
         if simulation_id in self._simulation_data:
             # Check if we need to reload
             file_path = self._get_simulation_file_path(simulation_id)
@@ -143,6 +167,267 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
         """
         return file.relative_path
     
+    # Reverse index management
+
+    def _get_index_dir(self) -> Path:
+        """Get the directory holding the index shards."""
+        return self.storage_dir / self.INDEX_DIRNAME
+
+    def _get_shard_path(self, simulation_id: str) -> Path:
+        """Get the file path of a simulation's index shard."""
+        return self._get_index_dir() / f"{simulation_id}.json"
+
+    def _scan_shards(self) -> Dict[str, float]:
+        """Map every persisted index shard to its mtime."""
+        shards = {}
+        try:
+            with os.scandir(self._get_index_dir()) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json'):
+                        shards[entry.name[:-len('.json')]] = entry.stat().st_mtime
+        except FileNotFoundError:
+            pass
+        return shards
+
+    def _ensure_index(self) -> None:
+        """Make sure the in-memory reverse index reflects the persisted shards."""
+        if self._dirty_simulations:
+            return  # The open batch's in-memory index is authoritative
+        shards = self._scan_shards()
+        for simulation_id in set(self._shard_mtimes) - set(shards):
+            self._unindex_simulation(simulation_id)
+        for simulation_id, mtime in shards.items():
+            if self._shard_mtimes.get(simulation_id) != mtime:
+                self._load_shard(simulation_id, mtime)
+
+        # Data files written by something other than this repository are only
+        # detected once per instance, when the index is first read.
+        if not self._index_verified:
+            self._index_verified = True
+            (self.storage_dir / self.LEGACY_INDEX_FILENAME).unlink(missing_ok=True)
+            stale = self._stale_simulations()
+            if stale:
+                logger.info(f"Simulation file index is out of date for {len(stale)} simulations, rebuilding")
+                self._rebuild_index(stale)
+
+    def _load_shard(self, simulation_id: str, mtime: float) -> None:
+        """Replace a simulation's index entries with its persisted shard."""
+        try:
+            with open(self._get_shard_path(simulation_id), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.INDEX_VERSION:
+                raise ValueError(f"unsupported index version {data.get('version')}")
+        except FileNotFoundError:
+            self._unindex_simulation(simulation_id)
+            return
+        except (json.JSONDecodeError, IOError, ValueError) as e:
+            logger.warning(f"Rebuilding unreadable index shard of simulation {simulation_id}: {e}")
+            self._rebuild_index([simulation_id])
+            return
+
+        self._unindex_simulation(simulation_id)
+        parents = {
+            path: parent
+            for parent, children in data.get('children', {}).items()
+            for path in children
+        }
+        for relative_path in data.get('paths', []):
+            self._index_file(simulation_id, {
+                'relative_path': relative_path,
+                'parent_file_id': parents.get(relative_path),
+            })
+        self._index_sources[simulation_id] = data.get('source_mtime')
+        self._shard_mtimes[simulation_id] = mtime
+
+    def _stale_simulations(self) -> List[str]:
+        """Simulations whose data files no longer match what was indexed."""
+        on_disk = {}
+        for simulation_id in self._discover_simulation_files():
+            try:
+                on_disk[simulation_id] = self._get_simulation_file_path(simulation_id).stat().st_mtime
+            except FileNotFoundError:
+                continue
+        indexed = set(self._index_sources) | set(self._indexed_files)
+        return sorted(
+            simulation_id for simulation_id in set(on_disk) | indexed
+            if on_disk.get(simulation_id) != self._index_sources.get(simulation_id)
+        )
+
+    def _rebuild_index(self, simulation_ids: Optional[Iterable[str]] = None) -> None:
+        """Rebuild the index shards of some or all simulations from their data files."""
+        if simulation_ids is None:
+            simulation_ids = set(self._discover_simulation_files()) | set(self._indexed_files)
+        for simulation_id in sorted(set(simulation_ids)):
+            self._load_simulation_data(simulation_id)
+            self._unindex_simulation(simulation_id)
+            if (simulation_id not in self._dirty_simulations
+                    and not self._get_simulation_file_path(simulation_id).exists()):
+                self._simulation_data.pop(simulation_id, None)
+                self._get_shard_path(simulation_id).unlink(missing_ok=True)
+                continue
+            for file_data in self._simulation_data.get(simulation_id, {}).values():
+                self._index_file(simulation_id, file_data)
+            self._record_index_source(simulation_id)
+            if not self._batch_depth:
+                self._write_shard(simulation_id)
+        logger.debug(f"Rebuilt simulation file index with {len(self._path_index)} paths")
+
+    def _record_index_source(self, simulation_id: str) -> None:
+        """Remember the data file mtime the index was built from."""
+        try:
+            self._index_sources[simulation_id] = self._get_simulation_file_path(simulation_id).stat().st_mtime
+        except FileNotFoundError:
+            self._index_sources.pop(simulation_id, None)
+
+    def _index_file(self, simulation_id: str, file_data: Dict) -> None:
+        """Add a file record to the reverse index."""
+        relative_path = file_data['relative_path']
+        parent_file_id = file_data.get('parent_file_id')
+        self._indexed_files.setdefault(simulation_id, {})[relative_path] = parent_file_id
+        self._path_index.setdefault(relative_path, set()).add(simulation_id)
+        if parent_file_id:
+            self._children_index.setdefault(parent_file_id, set()).add((simulation_id, relative_path))
+
+    def _unindex_file(self, simulation_id: str, file_data: Dict) -> None:
+        """Remove a file record from the reverse index."""
+        relative_path = file_data['relative_path']
+        self._indexed_files.get(simulation_id, {}).pop(relative_path, None)
+        sim_ids = self._path_index.get(relative_path)
+        if sim_ids is not None:
+            sim_ids.discard(simulation_id)
+            if not sim_ids:
+                del self._path_index[relative_path]
+        parent_file_id = file_data.get('parent_file_id')
+        children = self._children_index.get(parent_file_id) if parent_file_id else None
+        if children is not None:
+            children.discard((simulation_id, relative_path))
+            if not children:
+                del self._children_index[parent_file_id]
+
+    def _unindex_simulation(self, simulation_id: str) -> None:
+        """Remove all of a simulation's records from the reverse index."""
+        for relative_path, parent_file_id in self._indexed_files.pop(simulation_id, {}).items():
+            self._unindex_file(simulation_id, {'relative_path': relative_path, 'parent_file_id': parent_file_id})
+        self._index_sources.pop(simulation_id, None)
+        self._shard_mtimes.pop(simulation_id, None)
+
+    def _write_shard(self, simulation_id: str) -> None:
+        """Persist a simulation's index shard atomically."""
+        shard_path = self._get_shard_path(simulation_id)
+        files = self._indexed_files.get(simulation_id, {})
+        children: Dict[str, List[str]] = {}
+        for relative_path, parent_file_id in files.items():
+            if parent_file_id:
+                children.setdefault(parent_file_id, []).append(relative_path)
+        data = {
+            'version': self.INDEX_VERSION,
+            'source_mtime': self._index_sources.get(simulation_id),
+            'paths': sorted(files),
+            'children': {parent: sorted(paths) for parent, paths in children.items()},
+        }
+        try:
+            shard_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = shard_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            temp_path.replace(shard_path)
+            self._shard_mtimes[simulation_id] = shard_path.stat().st_mtime
+        except (IOError, OSError) as e:
+            logger.error(f"Error saving index shard of simulation {simulation_id}: {e}")
+            raise RepositoryError(f"Failed to save simulation file index: {e}") from e
+
+    def _locate(self, relative_path: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Find the simulation holding a file via the reverse index.
+
+        Returns:
+            Tuple of (simulation_id, file_data) if found, None otherwise
+        """
+        self._ensure_index()
+        for attempt in range(2):
+            for simulation_id in sorted(self._path_index.get(relative_path, ())):
+                self._load_simulation_data(simulation_id)
+                file_data = self._simulation_data.get(simulation_id, {}).get(relative_path)
+                if file_data:
+                    return simulation_id, file_data
+            if attempt == 0 and relative_path in self._path_index:
+                # Index points at a simulation that no longer has the file
+                self._rebuild_index(self._path_index[relative_path])
+            else:
+                break
+        return None
+
+    def _load_children_records(self, parent_file_id: str) -> List[Dict]:
+        """Load the records of all files whose parent is parent_file_id."""
+        records = []
+        for simulation_id, relative_path in sorted(self._children_index.get(parent_file_id, ())):
+            self._load_simulation_data(simulation_id)
+            file_data = self._simulation_data.get(simulation_id, {}).get(relative_path)
+            if file_data and file_data.get('parent_file_id') == parent_file_id:
+                records.append(file_data)
+        return records
+
+    # Batch support
+
+    @contextmanager
+    def batch(self) -> Iterator['JsonSimulationFileRepository']:
+        """
+        Defer writes until the outermost batch exits.
+
+        Each touched simulation file and its index shard are written once
+        when the batch completes. If the block raises, unflushed changes are
+        discarded and reloaded from disk on next access.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._discard_batch()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        """Persist all simulations changed during the batch and their index shards."""
+        if not self._dirty_simulations:
+            return
+        try:
+            for simulation_id in sorted(self._dirty_simulations):
+                self._save_simulation_data(simulation_id)
+                self._record_index_source(simulation_id)
+                self._write_shard(simulation_id)
+            logger.debug(f"Flushed batch for {len(self._dirty_simulations)} simulations")
+        except Exception:
+            self._discard_batch()
+            raise
+        self._dirty_simulations.clear()
+
+    def _discard_batch(self) -> None:
+        """Drop unflushed batch changes so they are reloaded from disk."""
+        for simulation_id in self._dirty_simulations:
+            self._simulation_data.pop(simulation_id, None)
+            self._last_modified.pop(simulation_id, None)
+            self._shard_mtimes.pop(simulation_id, None)  # Reload the shard on next access
+        self._dirty_simulations.clear()
+
+    def _persist(self, simulation_id: str) -> None:
+        """Write a simulation's data and index shard, or defer them to the open batch."""
+        if self._batch_depth:
+            self._dirty_simulations.add(simulation_id)
+            return
+        self._save_simulation_data(simulation_id)
+        self._record_index_source(simulation_id)
+        self._write_shard(simulation_id)
+
+    def save_many(self, files: Iterable[SimulationFile]) -> None:
+        """Save several simulation files, writing each touched simulation once."""
+        with self.batch():
+            for file in files:
+                self.save(file)
+
     def save(self, file: SimulationFile) -> None:
         """Save a simulation file entity."""
         simulation_id = self._extract_simulation_id_from_file(file)
@@ -150,14 +435,21 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
             raise RepositoryError("Cannot save file without simulation_id in attributes")
         
         self._load_simulation_data(simulation_id)
+        self._ensure_index()
         
         try:
             key = self._get_file_key(file)
             if simulation_id not in self._simulation_data:
                 self._simulation_data[simulation_id] = {}
             
-            self._simulation_data[simulation_id][key] = file.to_dict()
-            self._save_simulation_data(simulation_id)
+            previous = self._simulation_data[simulation_id].get(key)
+            file_data = file.to_dict()
+            self._simulation_data[simulation_id][key] = file_data
+
+            if previous:
+                self._unindex_file(simulation_id, previous)
+            self._index_file(simulation_id, file_data)
+            self._persist(simulation_id)
             
             logger.info(f"Saved simulation file: {key} (type: {file.file_type.value}) for simulation {simulation_id}")
             
@@ -167,18 +459,12 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
     
     def get_by_path(self, relative_path: str) -> Optional[SimulationFile]:
         """Retrieve a file by its relative path."""
-        # Need to search across all simulations since we don't know which one contains this file
-        self._load_all_simulations()
-        
         try:
-            # Search through all loaded simulation data
-            for simulation_id, simulation_files in self._simulation_data.items():
-                file_data = simulation_files.get(relative_path)
-                if file_data:
-                    return SimulationFile.from_dict(file_data)
-            
-            return None
+            located = self._locate(relative_path)
+            return SimulationFile.from_dict(located[1]) if located else None
             
+        except RepositoryError:
+            raise
         except Exception as e:
             logger.error(f"Failed to retrieve file by path {relative_path}: {e}")
             raise RepositoryError(f"Failed to retrieve file: {e}") from e
@@ -262,17 +548,10 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
     
     def list_by_parent(self, parent_file_id: str) -> List[SimulationFile]:
         """Retrieve files that have a specific parent file."""
-        self._load_all_simulations()
+        self._ensure_index()
         
         try:
-            files = []
-            # Search through all simulations for files with this parent
-            for simulation_id, simulation_files in self._simulation_data.items():
-                for file_data in simulation_files.values():
-                    if file_data.get('parent_file_id') == parent_file_id:
-                        files.append(SimulationFile.from_dict(file_data))
-            
-            return files
+            return [SimulationFile.from_dict(data) for data in self._load_children_records(parent_file_id)]
             
         except Exception as e:
             logger.error(f"Failed to list files by parent {parent_file_id}: {e}")
@@ -280,34 +559,22 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
     
     def get_children(self, file_id: str) -> List[SimulationFile]:
         """Get all files contained by a specific file."""
-        self._load_all_simulations()
-        
         try:
-            # First find the parent file
-            parent_file_data = None
-            parent_simulation_id = None
-            
-            for simulation_id, simulation_files in self._simulation_data.items():
-                if file_id in simulation_files:
-                    parent_file_data = simulation_files[file_id]
-                    parent_simulation_id = simulation_id
-                    break
-            
-            if not parent_file_data:
+            located = self._locate(file_id)
+            if not located:
                 return []
             
-            contained_file_ids = parent_file_data.get('contained_file_ids', [])
-            files = []
+            _, parent_file_data = located
+            records = {data['relative_path']: data for data in self._load_children_records(file_id)}
             
-            # Find files by contained IDs - search through all simulations
-            for contained_id in contained_file_ids:
-                for simulation_id, simulation_files in self._simulation_data.items():
-                    for file_data in simulation_files.values():
-                        if (file_data.get('relative_path') == contained_id or 
-                            file_data.get('parent_file_id') == file_id):
-                            files.append(SimulationFile.from_dict(file_data))
+            # Contained IDs are resolved through the path index as well
+            for contained_id in parent_file_data.get('contained_file_ids', []):
+                if contained_id not in records:
+                    contained = self._locate(contained_id)
+                    if contained:
+                        records[contained_id] = contained[1]
             
-            return files
+            return [SimulationFile.from_dict(data) for data in records.values()]
             
         except Exception as e:
             logger.error(f"Failed to get children of {file_id}: {e}")
@@ -315,18 +582,18 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
     
     def delete(self, file_path_or_id: str) -> bool:
         """Delete a simulation file."""
-        self._load_all_simulations()
-        
         try:
-            # Find which simulation contains this file
-            for simulation_id, simulation_files in self._simulation_data.items():
-                if file_path_or_id in simulation_files:
-                    del simulation_files[file_path_or_id]
-                    self._save_simulation_data(simulation_id)
-                    logger.info(f"Deleted simulation file: {file_path_or_id} from simulation {simulation_id}")
-                    return True
+            located = self._locate(file_path_or_id)
+            if not located:
+                return False
             
-            return False
+            simulation_id, file_data = located
+            del self._simulation_data[simulation_id][file_path_or_id]
+            self._unindex_file(simulation_id, file_data)
+            self._persist(simulation_id)
+            
+            logger.info(f"Deleted simulation file: {file_path_or_id} from simulation {simulation_id}")
+            return True
             
         except Exception as e:
             logger.error(f"Failed to delete file {file_path_or_id}: {e}")
@@ -334,14 +601,7 @@ class JsonSimulationFileRepository(ISimulationFileRepository):
     
     def exists(self, file_path_or_id: str) -> bool:
         """Check if a file exists."""
-        self._load_all_simulations()
-        
-        # Check if file exists in any simulation
-        for simulation_id, simulation_files in self._simulation_data.items():
-            if file_path_or_id in simulation_files:
-                return True
-        
-        return False
+        return self._locate(file_path_or_id) is not None
     
     def count_by_type(self) -> Dict[FileType, int]:
         """Get count of files by type."""
@@ -14,6 +14,7 @@ from ...domain.repositories.exceptions import (
     LocationNotFoundError,
 )
 from ...domain.repositories.location_repository import ILocationRepository
+from ..database.event_loop import BackgroundEventLoop, get_background_loop
 from ..database.models import LocationModel
 
 
@@ -333,48 +334,44 @@ class AsyncLocationRepositoryWrapper:
     """
     Wrapper to adapt the async repository to sync interface.
 
-    This allows gradual migration from sync to async patterns.
+    This allows gradual migration from sync to async patterns. All calls run
+    on the shared background event loop, so the engine's connection pool is
+    reused and the wrapper also works when called from a running event loop.
     """
 
-    def __init__(self, async_repo: PostgresLocationRepository):
+    def __init__(self, async_repo: PostgresLocationRepository,
+                 loop: Optional[BackgroundEventLoop] = None):
         self.async_repo = async_repo
+        self._loop = loop or get_background_loop()
 
     def save(self, location: LocationEntity) -> None:
         """Sync wrapper for save operation."""
-        import asyncio
-        asyncio.run(self.async_repo.save(location))
+        self._loop.run(self.async_repo.save(location))
 
     def get_by_name(self, name: str) -> Optional[LocationEntity]:
         """Sync wrapper for get_by_name operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.get_by_name(name))
+        return self._loop.run(self.async_repo.get_by_name(name))
 
     def list_all(self) -> List[LocationEntity]:
         """Sync wrapper for list_all operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.list_all())
+        return self._loop.run(self.async_repo.list_all())
 
     def delete(self, name: str) -> bool:
         """Sync wrapper for delete operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.delete(name))
+        return self._loop.run(self.async_repo.delete(name))
 
     def exists(self, name: str) -> bool:
         """Sync wrapper for exists operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.exists(name))
+        return self._loop.run(self.async_repo.exists(name))
 
     def find_by_kind(self, kind: LocationKind) -> List[LocationEntity]:
         """Sync wrapper for find_by_kind operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.find_by_kind(kind))
+        return self._loop.run(self.async_repo.find_by_kind(kind))
 
     def find_by_protocol(self, protocol: str) -> List[LocationEntity]:
         """Sync wrapper for find_by_protocol operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.find_by_protocol(protocol))
+        return self._loop.run(self.async_repo.find_by_protocol(protocol))
 
     def count(self) -> int:
         """Sync wrapper for count operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.count())
\ No newline at end of file
+        return self._loop.run(self.async_repo.count())
\ No newline at end of file
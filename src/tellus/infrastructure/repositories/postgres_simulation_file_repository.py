@@ -0,0 +1,569 @@
+"""
+PostgreSQL-based simulation file repository implementation.
+
+File inventories are stored one row per file in the ``simulation_files`` table,
+with the locations of each file in ``simulation_file_locations``. Filtering and
+pagination are pushed down to the database so that queries such as "all restart
+files at location X for the years 2000-2014" are answered from indexes.
+"""
+
+import fnmatch
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...domain.entities.simulation_file import (FileContentType, FileType,
+                                                SimulationFile)
+from ...domain.repositories.exceptions import RepositoryError
+from ...domain.repositories.simulation_file_repository import \
+    ISimulationFileRepository
+from ..database.event_loop import BackgroundEventLoop, get_background_loop
+from ..database.models import SimulationFileLocationModel, SimulationFileModel
+
+# Upper bound for the number of values bound into a single IN clause
+_IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def _chunks(values: List[Any], size: int = _IN_CLAUSE_CHUNK_SIZE) -> Iterator[List[Any]]:
+    """Split a list into chunks of at most ``size`` items."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _glob_to_like(pattern: str) -> str:
+    """Translate a glob pattern (without character classes) to a LIKE pattern."""
+    escaped = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped.replace('*', '%').replace('?', '_')
+
+
+class PostgresSimulationFileRepository:
+    """
+    PostgreSQL-based implementation of the simulation file repository.
+
+    Uses SQLAlchemy async patterns like the other database repositories.
+    Use AsyncSimulationFileRepositoryWrapper to obtain the synchronous
+    ISimulationFileRepository interface.
+    """
+
+    def __init__(self, session: Optional[AsyncSession] = None):
+        """
+        Initialize repository with optional session.
+
+        Args:
+            session: Optional async session. If not provided, will use global session factory.
+        """
+        self._session = session
+        self._owns_session = session is None
+
+    def _get_db_manager(self):
+        """Get database manager for session creation."""
+        from ..database.config import get_database_manager
+        return get_database_manager()
+
+    async def _execute(self, operation, *args, **kwargs):
+        """Run ``operation`` with the provided session or a per-operation session."""
+        if self._session:
+            return await operation(self._session, *args, **kwargs)
+        db_manager = self._get_db_manager()
+        async with db_manager.get_session() as session:
+            return await operation(session, *args, **kwargs)
+
+    # Writes
+
+    async def save(self, file: SimulationFile) -> None:
+        """Save a simulation file entity."""
+        await self.save_many([file])
+
+    async def save_many(self, files: Iterable[SimulationFile]) -> None:
+        """Save several simulation file entities in one transaction."""
+        await self._execute(self._save_many_with_session, list(files))
+
+    async def _save_many_with_session(self, session: AsyncSession, files: List[SimulationFile]) -> None:
+        """Save with provided session."""
+        # Later entries win if the same file is passed more than once
+        rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for file in files:
+            row = self._entity_to_row(file)
+            rows[(row['simulation_id'], row['relative_path'])] = row
+        if not rows:
+            return
+
+        try:
+            # Replace existing rows: delete by key, then insert everything in bulk
+            paths_by_simulation = defaultdict(list)
+            for simulation_id, relative_path in rows:
+                paths_by_simulation[simulation_id].append(relative_path)
+            for simulation_id, paths in paths_by_simulation.items():
+                for chunk in _chunks(paths):
+                    await self._delete_rows(session, simulation_id, chunk)
+
+            await session.execute(insert(SimulationFileModel), list(rows.values()))
+
+            location_rows = [
+                {
+                    'simulation_id': row['simulation_id'],
+                    'relative_path': row['relative_path'],
+                    'location_name': location_name,
+                }
+                for row in rows.values()
+                for location_name in row['data'].get('available_locations', [])
+            ]
+            if location_rows:
+                await session.execute(insert(SimulationFileLocationModel), location_rows)
+
+            if self._owns_session:
+                await session.commit()
+
+        except Exception as e:
+            if self._owns_session:
+                await session.rollback()
+            raise RepositoryError(f"Failed to save {len(rows)} simulation files: {e}") from e
+
+    async def delete(self, file_path_or_id: str) -> bool:
+        """Delete a simulation file."""
+        return await self._execute(self._delete_with_session, file_path_or_id)
+
+    async def _delete_with_session(self, session: AsyncSession, file_path_or_id: str) -> bool:
+        """Delete with provided session."""
+        try:
+            simulation_id = await self._locate(session, file_path_or_id)
+            if simulation_id is None:
+                return False
+
+            await self._delete_rows(session, simulation_id, [file_path_or_id])
+
+            if self._owns_session:
+                await session.commit()
+
+            return True
+
+        except Exception as e:
+            if self._owns_session:
+                await session.rollback()
+            raise RepositoryError(f"Failed to delete file '{file_path_or_id}': {e}") from e
+
+    async def _delete_rows(self, session: AsyncSession, simulation_id: str, paths: List[str]) -> None:
+        """Delete files and their location rows (explicitly, SQLite may not cascade)."""
+        await session.execute(
+            delete(SimulationFileLocationModel).where(
+                SimulationFileLocationModel.simulation_id == simulation_id,
+                SimulationFileLocationModel.relative_path.in_(paths),
+            )
+        )
+        await session.execute(
+            delete(SimulationFileModel).where(
+                SimulationFileModel.simulation_id == simulation_id,
+                SimulationFileModel.relative_path.in_(paths),
+            )
+        )
+
+    # Lookups
+
+    async def get_by_path(self, relative_path: str) -> Optional[SimulationFile]:
+        """Retrieve a file by its relative path."""
+        return await self._execute(self._get_by_path_with_session, relative_path)
+
+    async def _get_by_path_with_session(self, session: AsyncSession, relative_path: str) -> Optional[SimulationFile]:
+        """Get by path with provided session."""
+        try:
+            stmt = (
+                select(SimulationFileModel.data)
+                .where(SimulationFileModel.relative_path == relative_path)
+                .order_by(SimulationFileModel.simulation_id)
+                .limit(1)
+            )
+            result = await session.execute(stmt)
+            data = result.scalar_one_or_none()
+            return SimulationFile.from_dict(data) if data else None
+
+        except Exception as e:
+            raise RepositoryError(f"Failed to retrieve file '{relative_path}': {e}") from e
+
+    async def get_by_id(self, file_id: str) -> Optional[SimulationFile]:
+        """Retrieve a file by its ID (same as path)."""
+        return await self.get_by_path(file_id)
+
+    async def exists(self, file_path_or_id: str) -> bool:
+        """Check if a file exists."""
+        return await self._execute(self._exists_with_session, file_path_or_id)
+
+    async def _exists_with_session(self, session: AsyncSession, file_path_or_id: str) -> bool:
+        """Check existence with provided session."""
+        try:
+            return await self._locate(session, file_path_or_id) is not None
+
+        except Exception as e:
+            raise RepositoryError(f"Failed to check file existence '{file_path_or_id}': {e}") from e
+
+    async def _locate(self, session: AsyncSession, relative_path: str) -> Optional[str]:
+        """Return the simulation ID owning ``relative_path``, if any."""
+        stmt = (
+            select(SimulationFileModel.simulation_id)
+            .where(SimulationFileModel.relative_path == relative_path)
+            .order_by(SimulationFileModel.simulation_id)
+            .limit(1)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_children(self, file_id: str) -> List[SimulationFile]:
+        """Get all files contained by a specific file."""
+        return await self._execute(self._get_children_with_session, file_id)
+
+    async def _get_children_with_session(self, session: AsyncSession, file_id: str) -> List[SimulationFile]:
+        """Get children with provided session."""
+        try:
+            parent = await self._get_by_path_with_session(session, file_id)
+            if parent is None:
+                return []
+
+            children = {
+                f.relative_path: f
+                for f in await self._query_with_session(session, parent_file_id=file_id)
+            }
+
+            # Contained IDs not linked through parent_file_id are looked up by path
+            missing = sorted(parent.contained_file_ids - set(children))
+            for chunk in _chunks(missing):
+                stmt = (
+                    select(SimulationFileModel.data)
+                    .where(SimulationFileModel.relative_path.in_(chunk))
+                    .order_by(SimulationFileModel.simulation_id, SimulationFileModel.relative_path)
+                )
+                result = await session.execute(stmt)
+                for data in result.scalars():
+                    children.setdefault(data['relative_path'], SimulationFile.from_dict(data))
+
+            return list(children.values())
+
+        except RepositoryError:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to get children of '{file_id}': {e}") from e
+
+    async def count_by_type(self) -> Dict[FileType, int]:
+        """Get count of files by type."""
+        return await self._execute(self._count_by_type_with_session)
+
+    async def _count_by_type_with_session(self, session: AsyncSession) -> Dict[FileType, int]:
+        """Count by type with provided session."""
+        try:
+            stmt = (
+                select(SimulationFileModel.file_type, func.count())
+                .group_by(SimulationFileModel.file_type)
+            )
+            result = await session.execute(stmt)
+
+            counts = {file_type: 0 for file_type in FileType}
+            for file_type, count in result.all():
+                counts[FileType(file_type)] = count
+            return counts
+
+        except Exception as e:
+            raise RepositoryError(f"Failed to count files by type: {e}") from e
+
+    # Filtered queries
+
+    async def query(self, **filters) -> List[SimulationFile]:
+        """
+        Retrieve files matching all given filters, one page at a time.
+
+        Accepts the same keyword arguments as ISimulationFileRepository.query.
+        """
+        return await self._execute(self._query_with_session, **filters)
+
+    async def _query_with_session(
+        self,
+        session: AsyncSession,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        **filters,
+    ) -> List[SimulationFile]:
+        """Query with provided session."""
+        try:
+            stmt, pattern = self._apply_filters(session, select(SimulationFileModel.data), **filters)
+            # Character classes have no LIKE equivalent; those patterns are
+            # matched (and paginated) in Python after fetching the candidates
+            match_in_python = pattern is not None
+
+            stmt = stmt.order_by(SimulationFileModel.simulation_id, SimulationFileModel.relative_path)
+            if not match_in_python:
+                if offset:
+                    stmt = stmt.offset(offset)
+                if limit is not None:
+                    stmt = stmt.limit(limit)
+
+            result = await session.execute(stmt)
+            files = [SimulationFile.from_dict(data) for data in result.scalars()]
+
+            if match_in_python:
+                files = [f for f in files if f.matches_pattern(pattern)]
+                end = None if limit is None else offset + limit
+                files = files[offset:end]
+
+            return files
+
+        except Exception as e:
+            raise RepositoryError(f"Failed to query simulation files: {e}") from e
+
+    async def count_matching(self, **filters) -> int:
+        """
+        Get the number of files matching all given filters.
+
+        Accepts the same keyword arguments as ISimulationFileRepository.count_matching.
+        """
+        return await self._execute(self._count_matching_with_session, **filters)
+
+    async def _count_matching_with_session(self, session: AsyncSession, **filters) -> int:
+        """Count matching files with provided session."""
+        try:
+            stmt, pattern = self._apply_filters(session, select(SimulationFileModel.relative_path), **filters)
+            if pattern is not None:
+                result = await session.execute(stmt)
+                return sum(1 for path in result.scalars() if fnmatch.fnmatch(path, pattern))
+
+            result = await session.execute(select(func.count()).select_from(stmt.subquery()))
+            return result.scalar_one()
+
+        except Exception as e:
+            raise RepositoryError(f"Failed to count simulation files: {e}") from e
+
+    def _apply_filters(
+        self,
+        session: AsyncSession,
+        stmt,
+        simulation_id: Optional[str] = None,
+        file_type: Optional[FileType] = None,
+        content_type: Optional[FileContentType] = None,
+        location_name: Optional[str] = None,
+        parent_file_id: Optional[str] = None,
+        pattern: Optional[str] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+    ):
+        """
+        Add WHERE clauses for the query filters.
+
+        Returns the statement and the pattern still to be matched in Python,
+        which is None unless the pattern uses character classes.
+        """
+        if simulation_id is not None:
+            stmt = stmt.where(SimulationFileModel.simulation_id == simulation_id)
+        if file_type is not None:
+            stmt = stmt.where(SimulationFileModel.file_type == file_type.value)
+        if content_type is not None:
+            stmt = stmt.where(SimulationFileModel.content_type == content_type.value)
+        if parent_file_id is not None:
+            stmt = stmt.where(SimulationFileModel.parent_file_id == parent_file_id)
+        if start_year is not None:
+            stmt = stmt.where(SimulationFileModel.simulation_date >= datetime(start_year, 1, 1))
+        if end_year is not None:
+            stmt = stmt.where(SimulationFileModel.simulation_date < datetime(end_year + 1, 1, 1))
+        if location_name is not None:
+            stmt = stmt.join(
+                SimulationFileLocationModel,
+                and_(
+                    SimulationFileLocationModel.simulation_id == SimulationFileModel.simulation_id,
+                    SimulationFileLocationModel.relative_path == SimulationFileModel.relative_path,
+                )
+            ).where(SimulationFileLocationModel.location_name == location_name)
+
+        if pattern is None or '[' in pattern:
+            return stmt, pattern
+        if session.get_bind().dialect.name == 'sqlite':
+            # SQLite's LIKE is case-insensitive, GLOB matches like fnmatch
+            stmt = stmt.where(SimulationFileModel.relative_path.op('GLOB')(pattern))
+        else:
+            stmt = stmt.where(SimulationFileModel.relative_path.like(_glob_to_like(pattern), escape='\\'))
+        return stmt, None
+
+    async def list_all(self) -> List[SimulationFile]:
+        """Retrieve all simulation files."""
+        return await self.query()
+
+    async def list_by_type(self, file_type: FileType) -> List[SimulationFile]:
+        """Retrieve files by their type."""
+        return await self.query(file_type=file_type)
+
+    async def list_by_content_type(self, content_type: FileContentType) -> List[SimulationFile]:
+        """Retrieve files by their content type."""
+        return await self.query(content_type=content_type)
+
+    async def list_by_simulation(self, simulation_id: str) -> List[SimulationFile]:
+        """Retrieve files associated with a simulation."""
+        return await self.query(simulation_id=simulation_id)
+
+    async def list_by_location(self, location_name: str) -> List[SimulationFile]:
+        """Retrieve files available at a specific location."""
+        return await self.query(location_name=location_name)
+
+    async def list_by_parent(self, parent_file_id: str) -> List[SimulationFile]:
+        """Retrieve files that have a specific parent file."""
+        return await self.query(parent_file_id=parent_file_id)
+
+    async def search(self, pattern: str, file_type: Optional[FileType] = None) -> List[SimulationFile]:
+        """Search for files matching a glob pattern."""
+        return await self.query(pattern=pattern, file_type=file_type)
+
+    def _entity_to_row(self, file: SimulationFile) -> Dict[str, Any]:
+        """Convert SimulationFile to a simulation_files row."""
+        simulation_id = file.attributes.get('simulation_id')
+        if not simulation_id:
+            raise RepositoryError("Cannot save file without simulation_id in attributes")
+
+        simulation_date = file.simulation_date
+        if simulation_date is not None and simulation_date.tzinfo is not None:
+            simulation_date = simulation_date.replace(tzinfo=None)
+
+        return {
+            'simulation_id': simulation_id,
+            'relative_path': file.relative_path,
+            'file_type': file.file_type.value,
+            'content_type': file.content_type.value,
+            'importance': file.importance.value,
+            'size': file.size,
+            'parent_file_id': file.parent_file_id,
+            'simulation_date': simulation_date,
+            'location_name': file.location_name,
+            'data': file.to_dict(),
+        }
+
+
+class AsyncSimulationFileRepositoryWrapper(ISimulationFileRepository):
+    """
+    Wrapper to adapt the async repository to the sync ISimulationFileRepository interface.
+
+    All calls run on the shared background event loop, so that a batch can keep
+    a single session (and transaction) open across several calls and the
+    engine's connection pool is reused. An open batch belongs to the thread
+    that opened it; calls from other threads sharing the wrapper keep using
+    their own sessions.
+    """
+
+    def __init__(self, async_repo: PostgresSimulationFileRepository,
+                 loop: Optional[BackgroundEventLoop] = None):
+        self.async_repo = async_repo
+        self._loop = loop or get_background_loop()
+        self._local = threading.local()  # Per-thread batch_depth, batch_session, batch_repo
+
+    def _run(self, coro):
+        """Run a coroutine to completion on the background event loop."""
+        return self._loop.run(coro)
+
+    @property
+    def _repo(self) -> PostgresSimulationFileRepository:
+        """The repository bound to this thread's open batch, or the wrapped one."""
+        return getattr(self._local, 'batch_repo', None) or self.async_repo
+
+    @contextmanager
+    def batch(self) -> Iterator['AsyncSimulationFileRepositoryWrapper']:
+        """Run all calls of this thread inside the block in one database transaction."""
+        # A caller-provided session already defines the transaction
+        if self.async_repo._session is not None:
+            yield self
+            return
+
+        local = self._local
+        depth = getattr(local, 'batch_depth', 0)
+        if depth == 0:
+            local.batch_session = self.async_repo._get_db_manager().get_session()
+            local.batch_repo = PostgresSimulationFileRepository(local.batch_session)
+        local.batch_depth = depth + 1
+
+        succeeded = False
+        try:
+            yield self
+            succeeded = True
+        finally:
+            local.batch_depth -= 1
+            if local.batch_depth == 0:
+                session = local.batch_session
+                local.batch_session = None
+                local.batch_repo = None
+                self._run(self._end_batch(session, commit=succeeded))
+
+    async def _end_batch(self, session: AsyncSession, commit: bool) -> None:
+        """Commit or roll back the batch transaction and release the session."""
+        try:
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        except Exception as e:
+            await session.rollback()
+            raise RepositoryError(f"Failed to commit simulation file batch: {e}") from e
+        finally:
+            await session.close()
+
+    def save(self, file: SimulationFile) -> None:
+        """Sync wrapper for save operation."""
+        self._run(self._repo.save(file))
+
+    def save_many(self, files: Iterable[SimulationFile]) -> None:
+        """Sync wrapper for save_many operation."""
+        self._run(self._repo.save_many(files))
+
+    def get_by_path(self, relative_path: str) -> Optional[SimulationFile]:
+        """Sync wrapper for get_by_path operation."""
+        return self._run(self._repo.get_by_path(relative_path))
+
+    def get_by_id(self, file_id: str) -> Optional[SimulationFile]:
+        """Sync wrapper for get_by_id operation."""
+        return self._run(self._repo.get_by_id(file_id))
+
+    def list_all(self) -> List[SimulationFile]:
+        """Sync wrapper for list_all operation."""
+        return self._run(self._repo.list_all())
+
+    def list_by_type(self, file_type: FileType) -> List[SimulationFile]:
+        """Sync wrapper for list_by_type operation."""
+        return self._run(self._repo.list_by_type(file_type))
+
+    def list_by_content_type(self, content_type: FileContentType) -> List[SimulationFile]:
+        """Sync wrapper for list_by_content_type operation."""
+        return self._run(self._repo.list_by_content_type(content_type))
+
+    def list_by_simulation(self, simulation_id: str) -> List[SimulationFile]:
+        """Sync wrapper for list_by_simulation operation."""
+        return self._run(self._repo.list_by_simulation(simulation_id))
+
+    def list_by_location(self, location_name: str) -> List[SimulationFile]:
+        """Sync wrapper for list_by_location operation."""
+        return self._run(self._repo.list_by_location(location_name))
+
+    def list_by_parent(self, parent_file_id: str) -> List[SimulationFile]:
+        """Sync wrapper for list_by_parent operation."""
+        return self._run(self._repo.list_by_parent(parent_file_id))
+
+    def get_children(self, file_id: str) -> List[SimulationFile]:
+        """Sync wrapper for get_children operation."""
+        return self._run(self._repo.get_children(file_id))
+
+    def delete(self, file_path_or_id: str) -> bool:
+        """Sync wrapper for delete operation."""
+        return self._run(self._repo.delete(file_path_or_id))
+
+    def exists(self, file_path_or_id: str) -> bool:
+        """Sync wrapper for exists operation."""
+        return self._run(self._repo.exists(file_path_or_id))
+
+    def count_by_type(self) -> Dict[FileType, int]:
+        """Sync wrapper for count_by_type operation."""
+        return self._run(self._repo.count_by_type())
+
+    def search(self, pattern: str, file_type: Optional[FileType] = None) -> List[SimulationFile]:
+        """Sync wrapper for search operation."""
+        return self._run(self._repo.search(pattern, file_type))
+
+    def query(self, **filters) -> List[SimulationFile]:
+        """Sync wrapper for query operation."""
+        return self._run(self._repo.query(**filters))
+
+    def count_matching(self, **filters) -> int:
+        """Sync wrapper for count_matching operation."""
+        return self._run(self._repo.count_matching(**filters))
@@ -2,10 +2,13 @@
 PostgreSQL-based simulation repository implementation.
 """
 
-from typing import List, Optional
-from sqlalchemy import select, delete
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import String, and_, cast, delete, exists, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import lazyload
+from sqlalchemy.sql.functions import FunctionElement
 
 from ...domain.entities.simulation import SimulationEntity
 from ...domain.repositories.exceptions import (
@@ -13,9 +16,36 @@ from ...domain.repositories.exceptions import (
     SimulationExistsError,
     SimulationNotFoundError,
 )
-from ...domain.repositories.simulation_repository import ISimulationRepository
+from ...domain.repositories.simulation_repository import (
+    ISimulationRepository,
+    SimulationFilters,
+    SimulationPage,
+    decode_cursor,
+    encode_cursor,
+    parse_order_by,
+)
 from ..database.models import SimulationModel, SimulationLocationContextModel
 from ..database.config import get_session
+from ..database.event_loop import BackgroundEventLoop, get_background_loop
+
+# Upper bound for the number of simulation IDs bound into a single IN clause
+_IN_CLAUSE_CHUNK_SIZE = 500
+
+
+class _json_each_text(FunctionElement):
+    """Rows of (key, value) for the top-level members of a JSON object, values as text."""
+    name = "json_each_text"
+    inherit_cache = True
+
+
+@compiles(_json_each_text)
+def _compile_json_each_text(element, compiler, **kw):
+    return f"json_each_text({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(_json_each_text, "sqlite")
+def _compile_json_each_text_sqlite(element, compiler, **kw):
+    return f"json_each({compiler.process(element.clauses, **kw)})"
 
 
 class PostgresSimulationRepository(ISimulationRepository):
@@ -61,7 +91,7 @@ class PostgresSimulationRepository(ISimulationRepository):
         """Save with provided session."""
         try:
             # Check if simulation already exists
-            stmt = select(SimulationModel).where(
+            stmt = self._select_simulations().where(
                 SimulationModel.simulation_id == simulation.simulation_id
             )
             existing = await session.execute(stmt)
@@ -104,7 +134,7 @@ class PostgresSimulationRepository(ISimulationRepository):
     async def _get_by_id_with_session(self, session: AsyncSession, simulation_id: str) -> Optional[SimulationEntity]:
         """Get by ID with provided session."""
         try:
-            stmt = select(SimulationModel).where(
+            stmt = self._select_simulations().where(
                 SimulationModel.simulation_id == simulation_id
             )
             result = await session.execute(stmt)
@@ -133,19 +163,19 @@ class PostgresSimulationRepository(ISimulationRepository):
     async def _list_all_with_session(self, session: AsyncSession) -> List[SimulationEntity]:
         """List all with provided session."""
         try:
-            stmt = select(SimulationModel)
+            stmt = self._select_simulations()
             result = await session.execute(stmt)
             sim_models = result.scalars().all()
 
-            entities = []
-            for sim_model in sim_models:
-                location_contexts = await self._get_location_contexts(
-                    session, sim_model.simulation_id
-                )
-                entity = self._model_to_entity(sim_model, location_contexts)
-                entities.append(entity)
+            # Load the contexts of all simulations at once instead of one query each
+            contexts_by_simulation = await self._get_location_contexts_for(session)
 
-            return entities
+            return [
+                self._model_to_entity(
+                    sim_model, contexts_by_simulation.get(sim_model.simulation_id, {})
+                )
+                for sim_model in sim_models
+            ]
 
         except Exception as e:
             raise RepositoryError(f"Failed to list simulations: {e}") from e
@@ -218,13 +248,161 @@ class PostgresSimulationRepository(ISimulationRepository):
     async def _count_with_session(self, session: AsyncSession) -> int:
         """Count with provided session."""
         try:
-            stmt = select(SimulationModel)
+            stmt = select(func.count()).select_from(SimulationModel)
+            result = await session.execute(stmt)
+            return result.scalar_one()
+
+        except Exception as e:
+            raise RepositoryError(f"Failed to count simulations: {e}") from e
+
+    async def query(
+        self,
+        filters: Optional[SimulationFilters] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        order_by: str = "simulation_id",
+        cursor: Optional[str] = None,
+    ) -> SimulationPage:
+        """Retrieve one page of simulations, filtered, ordered and paginated in SQL."""
+        if self._session:
+            return await self._query_with_session(self._session, filters, offset, limit, order_by, cursor)
+        else:
+            db_manager = self._get_db_manager()
+            async with db_manager.get_session() as session:
+                return await self._query_with_session(session, filters, offset, limit, order_by, cursor)
+
+    async def _query_with_session(
+        self,
+        session: AsyncSession,
+        filters: Optional[SimulationFilters],
+        offset: int,
+        limit: Optional[int],
+        order_by: str,
+        cursor: Optional[str],
+    ) -> SimulationPage:
+        """Query with provided session."""
+        field_name, descending = parse_order_by(order_by)
+        position = decode_cursor(cursor, order_by) if cursor else None
+
+        try:
+            stmt = self._apply_filters(self._select_simulations(), filters)
+
+            column = getattr(SimulationModel, field_name)
+            if field_name != "simulation_id":
+                column = func.coalesce(column, "")
+
+            if position is not None:
+                value, simulation_id = position
+                if descending:
+                    after = or_(column < value, and_(column == value, SimulationModel.simulation_id < simulation_id))
+                else:
+                    after = or_(column > value, and_(column == value, SimulationModel.simulation_id > simulation_id))
+                stmt = stmt.where(after)
+                offset = 0
+
+            if descending:
+                stmt = stmt.order_by(column.desc(), SimulationModel.simulation_id.desc())
+            else:
+                stmt = stmt.order_by(column, SimulationModel.simulation_id)
+
+            # Tags live in a JSON array, which has no portable SQL filter; with a
+            # tag filter, pagination happens after filtering the rows in Python
+            paginate_in_python = bool(filters and filters.tags)
+            if not paginate_in_python:
+                if offset:
+                    stmt = stmt.offset(offset)
+                if limit is not None:
+                    # Fetch one extra row to find out whether there is a next page
+                    stmt = stmt.limit(limit + 1)
+
+            result = await session.execute(stmt)
+            sim_models = list(result.scalars().all())
+
+            if paginate_in_python:
+                sim_models = [m for m in sim_models if self._has_any_tag(m, filters.tags)][offset:]
+
+            has_more = limit is not None and len(sim_models) > limit
+            if limit is not None:
+                sim_models = sim_models[:limit]
+
+            contexts_by_simulation = await self._get_location_contexts_for(
+                session, [m.simulation_id for m in sim_models]
+            )
+            simulations = [
+                self._model_to_entity(m, contexts_by_simulation.get(m.simulation_id, {}))
+                for m in sim_models
+            ]
+
+            return SimulationPage(
+                simulations=simulations,
+                next_cursor=encode_cursor(simulations[-1], order_by) if has_more and simulations else None,
+            )
+
+        except Exception as e:
+            raise RepositoryError(f"Failed to query simulations: {e}") from e
+
+    async def count_matching(self, filters: Optional[SimulationFilters] = None) -> int:
+        """Get the number of simulations matching the filters."""
+        if self._session:
+            return await self._count_matching_with_session(self._session, filters)
+        else:
+            db_manager = self._get_db_manager()
+            async with db_manager.get_session() as session:
+                return await self._count_matching_with_session(session, filters)
+
+    async def _count_matching_with_session(
+        self, session: AsyncSession, filters: Optional[SimulationFilters]
+    ) -> int:
+        """Count matching simulations with provided session."""
+        try:
+            if filters and filters.tags:
+                stmt = self._apply_filters(select(SimulationModel.attrs), filters)
+                result = await session.execute(stmt)
+                return sum(
+                    1 for attrs in result.scalars()
+                    if filters.tags.intersection((attrs or {}).get("tags", []))
+                )
+
+            stmt = self._apply_filters(select(func.count()).select_from(SimulationModel), filters)
             result = await session.execute(stmt)
-            return len(result.scalars().all())
+            return result.scalar_one()
 
         except Exception as e:
             raise RepositoryError(f"Failed to count simulations: {e}") from e
 
+    def _apply_filters(self, stmt, filters: Optional[SimulationFilters]):
+        """Add WHERE clauses for the search term, attribute and location filters."""
+        if filters is None:
+            return stmt
+
+        if filters.search_term:
+            term = filters.search_term
+            # Search the attribute values only, not the keys of the serialized JSON
+            attr_values = _json_each_text(SimulationModel.attrs).table_valued("value")
+            stmt = stmt.where(or_(
+                SimulationModel.simulation_id.icontains(term, autoescape=True),
+                SimulationModel.model_id.icontains(term, autoescape=True),
+                exists(select(1).select_from(attr_values).where(
+                    attr_values.c.value.icontains(term, autoescape=True)
+                )),
+            ))
+
+        for key, value in filters.attributes.items():
+            stmt = stmt.where(cast(SimulationModel.attrs[key].as_string(), String) == str(value))
+
+        for location_name in filters.location_names:
+            stmt = stmt.where(exists().where(
+                SimulationLocationContextModel.simulation_id == SimulationModel.simulation_id,
+                SimulationLocationContextModel.location_name == location_name,
+            ))
+
+        return stmt
+
+    @staticmethod
+    def _has_any_tag(model: SimulationModel, tags) -> bool:
+        """Check whether a simulation model carries one of the tags."""
+        return bool(tags.intersection((model.attrs or {}).get("tags", [])))
+
     def _entity_to_model(self, entity: SimulationEntity) -> SimulationModel:
         """Convert SimulationEntity to SimulationModel."""
         return SimulationModel(
@@ -265,20 +443,61 @@ class PostgresSimulationRepository(ISimulationRepository):
             location_contexts=location_contexts,
         )
 
+    def _select_simulations(self):
+        """
+        Select simulation models without loading associated_locations.
+
+        Entities are built from the location contexts, so the eager
+        relationship load would only add a query per statement.
+        """
+        return select(SimulationModel).options(lazyload(SimulationModel.associated_locations))
+
     async def _get_location_contexts(
         self, session: AsyncSession, simulation_id: str
     ) -> dict:
         """Get location contexts for a simulation."""
-        stmt = select(SimulationLocationContextModel).where(
-            SimulationLocationContextModel.simulation_id == simulation_id
+        contexts = await self._get_location_contexts_for(session, [simulation_id])
+        return contexts.get(simulation_id, {})
+
+    async def _get_location_contexts_for(
+        self, session: AsyncSession, simulation_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, dict]:
+        """
+        Get location contexts for several simulations in as few queries as possible.
+
+        Args:
+            session: Session to query with
+            simulation_ids: Simulations to load contexts for (None for all)
+
+        Returns:
+            Mapping of simulation ID to {location_name: context_data}
+        """
+        # Select plain columns so the context model's relationships are not loaded
+        base_stmt = select(
+            SimulationLocationContextModel.simulation_id,
+            SimulationLocationContextModel.location_name,
+            SimulationLocationContextModel.context_data,
         )
-        result = await session.execute(stmt)
-        contexts = result.scalars().all()
 
-        return {
-            ctx.location_name: ctx.context_data
-            for ctx in contexts
-        }
+        if simulation_ids is None:
+            statements = [base_stmt]
+        else:
+            ids = list(dict.fromkeys(simulation_ids))
+            statements = [
+                base_stmt.where(
+                    SimulationLocationContextModel.simulation_id.in_(
+                        ids[start:start + _IN_CLAUSE_CHUNK_SIZE]
+                    )
+                )
+                for start in range(0, len(ids), _IN_CLAUSE_CHUNK_SIZE)
+            ]
+
+        contexts: Dict[str, dict] = {}
+        for stmt in statements:
+            result = await session.execute(stmt)
+            for simulation_id, location_name, context_data in result.all():
+                contexts.setdefault(simulation_id, {})[location_name] = context_data
+        return contexts
 
     async def _update_location_contexts(
         self, session: AsyncSession, entity: SimulationEntity
@@ -305,38 +524,51 @@ class AsyncSimulationRepositoryWrapper:
     """
     Wrapper to adapt the async repository to sync interface.
 
-    This allows gradual migration from sync to async patterns.
+    This allows gradual migration from sync to async patterns. All calls run
+    on the shared background event loop, so the engine's connection pool is
+    reused and the wrapper also works when called from a running event loop.
     """
 
-    def __init__(self, async_repo: PostgresSimulationRepository):
+    def __init__(self, async_repo: PostgresSimulationRepository,
+                 loop: Optional[BackgroundEventLoop] = None):
         self.async_repo = async_repo
+        self._loop = loop or get_background_loop()
 
     def save(self, simulation: SimulationEntity) -> None:
         """Sync wrapper for save operation."""
-        import asyncio
-        asyncio.run(self.async_repo.save(simulation))
+        self._loop.run(self.async_repo.save(simulation))
 
     def get_by_id(self, simulation_id: str) -> Optional[SimulationEntity]:
         """Sync wrapper for get_by_id operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.get_by_id(simulation_id))
+        return self._loop.run(self.async_repo.get_by_id(simulation_id))
 
     def list_all(self) -> List[SimulationEntity]:
         """Sync wrapper for list_all operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.list_all())
+        return self._loop.run(self.async_repo.list_all())
 
     def delete(self, simulation_id: str) -> bool:
         """Sync wrapper for delete operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.delete(simulation_id))
+        return self._loop.run(self.async_repo.delete(simulation_id))
 
     def exists(self, simulation_id: str) -> bool:
         """Sync wrapper for exists operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.exists(simulation_id))
+        return self._loop.run(self.async_repo.exists(simulation_id))
 
     def count(self) -> int:
         """Sync wrapper for count operation."""
-        import asyncio
-        return asyncio.run(self.async_repo.count())
\ No newline at end of file
+        return self._loop.run(self.async_repo.count())
+
+    def query(
+        self,
+        filters: Optional[SimulationFilters] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        order_by: str = "simulation_id",
+        cursor: Optional[str] = None,
+    ) -> SimulationPage:
+        """Sync wrapper for query operation."""
+        return self._loop.run(self.async_repo.query(filters, offset, limit, order_by, cursor))
+
+    def count_matching(self, filters: Optional[SimulationFilters] = None) -> int:
+        """Sync wrapper for count_matching operation."""
+        return self._loop.run(self.async_repo.count_matching(filters))
@@ -1654,7 +1654,9 @@ def index_archive_contents(ctx, simulation_id: str, archive_id: str = None, forc
             TimeRemainingColumn(),
         ]
         
-        with Progress(*progress_columns, console=console, disable=output_json, refresh_per_second=4) as progress:
+        # Archive metadata updates are persisted in one write once all archives are indexed
+        with Progress(*progress_columns, console=console, disable=output_json, refresh_per_second=4) as progress, \
+                file_service.batch():
             main_task = progress.add_task("Indexing archives...", total=len(archives))
             
             for archive in archives:
@@ -1809,6 +1811,76 @@ def _get_current_timestamp() -> str:
     return datetime.datetime.now().isoformat()
 
 
+def _open_transfer_journal(container, resume: str, prefix: str, quiet: bool = False):
+    """Checkpoint journal of a resumed transfer operation, or of a new one."""
+    import time
+    import uuid
+    
+    operation_id = resume or f"{prefix}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+    journal = container.service_factory.file_transfer_service.open_journal(operation_id)
+    if not quiet:
+        if resume and not journal.exists:
+            console.print(f"[yellow]Warning:[/yellow] Nothing recorded for operation '{resume}', starting from scratch")
+        console.print(f"[dim]Operation {operation_id} (continue an interrupted run with --resume {operation_id})[/dim]")
+    return journal
+
+
+def _journaled_copy(journal, key: str, source_fs, source_path: str, dest_fs, dest_path: str,
+                    progress=None, via=()) -> bool:
+    """
+    Copy a file under a transfer journal, resuming a partial copy.
+    
+    With ``via`` (see ``_relay_hops``), the file is relayed through
+    intermediate locations.
+    
+    Returns:
+        False if the journal has the file as transferred already
+    """
+    from ...infrastructure.adapters.fsspec_transfer import FSSpecTransferEngine
+    from ...infrastructure.adapters.transfer_journal import (TransferJournal,
+                                                             copy_resumable,
+                                                             is_transferred)
+    
+    if journal is None:
+        journal = TransferJournal(key)
+    elif journal.has_file(key) and is_transferred(journal, key, source_fs, source_path, dest_fs, dest_path):
+        return False
+    copy_resumable(FSSpecTransferEngine(), journal, key, source_fs, source_path, dest_fs, dest_path,
+                   progress=progress, via=via)
+    journal.complete_file(key)
+    return True
+
+
+def _relay_hops(network_route_info, journal, key: str) -> list:
+    """Filesystems and staging paths on the intermediate locations of a route, for ``_journaled_copy``."""
+    import os
+    
+    from ...infrastructure.adapters.fsspec_adapter import FSSpecAdapter
+    from ...infrastructure.adapters.transfer_journal import relay_staging_path
+    
+    hop_names = (network_route_info or {}).get('intermediate_hops') or []
+    if not hop_names:
+        return []
+    
+    location_service = _get_location_service()
+    staging_path = relay_staging_path(journal.operation_id if journal is not None else "stage", key)
+    hops = []
+    for name in hop_names:
+        hop_location = FSSpecAdapter(location_service.get_location_filesystem(name))
+        base_path = hop_location.location.get_base_path() or ""
+        hops.append((hop_location.fs, os.path.join(base_path, staging_path) if base_path else staging_path))
+    return hops
+
+
+def _finish_transfer_journal(journal, failed: int, quiet: bool = False) -> None:
+    """Drop the journal of a completed operation, or tell how to resume it."""
+    if failed:
+        if not quiet:
+            console.print(f"[yellow]Retry the failed files with --resume {journal.operation_id}[/yellow]")
+    else:
+        journal.remove()
+
+
 @archive.command(name="stage")
 @click.argument("simulation_id", required=True)
 @click.option("--from-location", required=True, help="Source location")
@@ -1821,10 +1893,11 @@ def _get_current_timestamp() -> str:
               type=click.Choice(['bandwidth', 'latency', 'cost', 'reliability']),
               default='bandwidth',
               help="Optimization criteria for route selection")
+@click.option("--resume", "resume", metavar="OPERATION_ID", help="Resume an interrupted staging operation")
 @click.pass_context
 def stage_simulation_archive(ctx, simulation_id: str, from_location: str, to_location: str, reconstruct: bool = False, 
                            optimize_route: bool = False, via: str = None, show_route: bool = False, 
-                           optimize_for: str = 'bandwidth'):
+                           optimize_for: str = 'bandwidth', resume: str = None):
     """Stage archives from remote to local location.
     
     Downloads archives from remote locations and optionally reconstructs
@@ -1858,17 +1931,23 @@ def stage_simulation_archive(ctx, simulation_id: str, from_location: str, to_loc
             --to-location isibhv \
             --optimize-route \
             --optimize-for latency
+            
+        # Continue an interrupted staging run where it stopped
+        tellus simulation archive stage Eem125-S2 \
+            --from-location hsm.dmawi.de \
+            --to-location local-scratch \
+            --resume stage_1718000000_1a2b3c4d
     """
     import asyncio
     return asyncio.run(_stage_simulation_archive_async(
         ctx, simulation_id, from_location, to_location, reconstruct,
-        optimize_route, via, show_route, optimize_for
+        optimize_route, via, show_route, optimize_for, resume
     ))
 
 
 async def _stage_simulation_archive_async(ctx, simulation_id: str, from_location: str, to_location: str, reconstruct: bool = False, 
                                         optimize_route: bool = False, via: str = None, show_route: bool = False, 
-                                        optimize_for: str = 'bandwidth'):
+                                        optimize_for: str = 'bandwidth', resume: str = None):
     """Async implementation of stage_simulation_archive."""
     output_json = ctx.obj.get('output_json', False) if ctx.obj else False
     
@@ -1947,6 +2026,9 @@ async def _stage_simulation_archive_async(ctx, simulation_id: str, from_location
             TimeRemainingColumn(),
         ]
         
+        journal = _open_transfer_journal(get_service_container(), resume, "stage", quiet=output_json)
+        failed_archives = 0
+        
         with Progress(*progress_columns, console=console, disable=output_json, refresh_per_second=4) as progress:
             main_task = progress.add_task(f"Staging archives...", total=total_archives)
             
@@ -1963,26 +2045,32 @@ async def _stage_simulation_archive_async(ctx, simulation_id: str, from_location
                         # Handle split archive
                         staged_file = await _stage_split_archive(
                             source_location, dest_location, pattern, split_parts, 
-                            reconstruct, progress, network_route_info
+                            reconstruct, progress, network_route_info, journal
                         )
                     else:
                         # Handle single archive
                         staged_file = await _stage_single_archive(
-                            source_location, dest_location, pattern, progress, network_route_info
+                            source_location, dest_location, pattern, progress, network_route_info, journal
                         )
                     
                     if staged_file:
                         staged_files.append(staged_file)
+                    else:
+                        failed_archives += 1
                         
                 except Exception as e:
+                    failed_archives += 1
                     if not output_json:
                         console.print(f"[red]Failed to stage {archive_name}:[/red] {str(e)}")
                     continue
                     
                 progress.advance(main_task)
         
+        _finish_transfer_journal(journal, failed_archives, quiet=output_json)
+        
         # Prepare results
         staging_info = {
+            "operation_id": journal.operation_id,
             "simulation_id": simulation_id,
             "from_location": from_location,
             "to_location": to_location,
@@ -2006,11 +2094,14 @@ async def _stage_simulation_archive_async(ctx, simulation_id: str, from_location
         console.print(f"[red]Error:[/red] {str(e)}")
 
 
-async def _stage_single_archive(source_location, dest_location, pattern: str, progress, network_route_info=None) -> str:
-    """Stage a single archive file."""
+async def _stage_single_archive(source_location, dest_location, pattern: str, progress, network_route_info=None,
+                                journal=None) -> str:
+    """Stage a single archive file, resuming a partial copy recorded in the journal."""
     from pathlib import Path
     import os
     
+    from ...infrastructure.adapters.transfer_journal import TransferJournal
+    
     try:
         # Get filesystem objects from locations
         source_fs = source_location.fs
@@ -2037,15 +2128,15 @@ async def _stage_single_archive(source_location, dest_location, pattern: str, pr
         
         # Check if network optimization should be used
         if network_route_info and network_route_info.get('optimization_used') and len(network_route_info.get('intermediate_hops', [])) > 0:
-            # Use network-aware transfer for multi-hop routes
             transfer_time_est = _estimate_transfer_time(file_size, network_route_info)
             if transfer_time_est.get('estimated_time_seconds'):
                 est_min = transfer_time_est['estimated_time_seconds'] / 60
                 console.print(f"[dim]Using optimized route, estimated transfer time: {est_min:.1f} minutes[/dim]")
-            
-            # Note: Multi-hop transfers would require the network-aware transfer service
-            # For now, we'll use direct transfer but with network performance estimates
-            console.print(f"[yellow]Note:[/yellow] Multi-hop optimization not yet fully implemented, using direct transfer")
+        
+        # Multi-hop routes relay the file through their intermediate locations
+        key = TransferJournal.file_key(source_location.location.name, source_file,
+                                       dest_location.location.name, dest_file)
+        via = _relay_hops(network_route_info, journal, key)
         
         # Create progress tracker
         from ...infrastructure.adapters.fsspec_adapter import ProgressTracker, FSSpecProgressCallback
@@ -2061,37 +2152,10 @@ async def _stage_single_archive(source_location, dest_location, pattern: str, pr
         
         # Create progress task for this file
         file_task = progress.add_task(f"Transferring {os.path.basename(source_file)}", total=file_size)
-        bytes_transferred = 0
-        
-        # Use get_file if available, otherwise try copy
-        if hasattr(source_fs, 'get_file'):
-            # Create local temp file first, then upload to destination
-            import tempfile
-            with tempfile.NamedTemporaryFile() as tmp_file:
-                # Download with progress tracking
-                with source_fs.open(source_file, 'rb') as src:
-                    while True:
-                        chunk = src.read(8192)
-                        if not chunk:
-                            break
-                        tmp_file.write(chunk)
-                        bytes_transferred += len(chunk)
-                        progress.update(file_task, completed=bytes_transferred)
-                
-                tmp_file.flush()
-                # Upload to destination (could add progress here too if needed)
-                dest_fs.put_file(tmp_file.name, dest_file)
-        else:
-            # Direct copy between filesystems with progress
-            with source_fs.open(source_file, 'rb') as src:
-                with dest_fs.open(dest_file, 'wb') as dst:
-                    while True:
-                        chunk = src.read(8192)  # 8KB chunks
-                        if not chunk:
-                            break
-                        dst.write(chunk)
-                        bytes_transferred += len(chunk)
-                        progress.update(file_task, completed=bytes_transferred)
+        
+        # Stream between the filesystems, checkpointing so an interrupted copy can be resumed
+        _journaled_copy(journal, key, source_fs, source_file, dest_fs, dest_file,
+                        progress=lambda done: progress.update(file_task, completed=done), via=via)
         
         progress.remove_task(file_task)
         
@@ -2102,13 +2166,19 @@ async def _stage_single_archive(source_location, dest_location, pattern: str, pr
         return None
 
 
-async def _stage_split_archive(source_location, dest_location, pattern: str, split_parts: int, reconstruct: bool, progress, network_route_info=None) -> str:
-    """Stage and optionally reconstruct a split archive."""
+async def _stage_split_archive(source_location, dest_location, pattern: str, split_parts: int, reconstruct: bool, progress, network_route_info=None,
+                               journal=None) -> str:
+    """Stage and optionally reconstruct a split archive, resuming parts recorded in the journal."""
     from pathlib import Path
+    import shutil
     import tempfile
     import os
     import subprocess
     
+    import fsspec
+    
+    from ...infrastructure.adapters.transfer_journal import TransferJournal
+    
     try:
         # Get filesystem objects
         source_fs = source_location.fs  
@@ -2130,11 +2200,13 @@ async def _stage_split_archive(source_location, dest_location, pattern: str, spl
             dest_file = os.path.join(dest_base_path, base_name) if dest_base_path else base_name
             
             # Display network optimization information for split archives
-            if network_route_info and network_route_info.get('optimization_used'):
+            if network_route_info and network_route_info.get('intermediate_hops'):
+                # The parts come to this host to be joined, so they do not take the route
+                console.print(f"[yellow]Note:[/yellow] Reconstructed archives are not relayed via "
+                              f"{', '.join(network_route_info['intermediate_hops'])}")
+            elif network_route_info and network_route_info.get('optimization_used'):
                 route_desc = network_route_info.get('route_description', 'optimized route')
                 console.print(f"[dim]Using {route_desc} for split archive reconstruction[/dim]")
-                if len(network_route_info.get('intermediate_hops', [])) > 0:
-                    console.print(f"[yellow]Note:[/yellow] Multi-hop optimization for split archives not fully implemented")
             
             # Calculate total size for all parts
             total_archive_size = 0
@@ -2153,113 +2225,118 @@ async def _stage_split_archive(source_location, dest_location, pattern: str, spl
             # Create subtask for reconstruction with total bytes
             subtask = progress.add_task(f"Reconstructing {base_name}...", total=total_archive_size)
             
-            # Download all parts to temporary directory and reconstruct
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_parts = []
-                total_size = 0
+            # Download all parts to a staging directory and reconstruct. The
+            # directory outlives an interrupted run, so that its parts can be resumed.
+            operation_id = journal.operation_id if journal is not None else f"{os.getpid()}"
+            temp_dir = os.path.join(tempfile.gettempdir(), f"tellus-stage-{operation_id}-{os.path.basename(base_name)}")
+            os.makedirs(temp_dir, exist_ok=True)
+            local_fs = fsspec.filesystem("file")
+            temp_parts = []
+            total_size = 0
+            
+            # Step 1: Download all parts in parallel
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            import threading
+            
+            # Thread lock for progress updates
+            progress_lock = threading.Lock()
+            
+            # Pre-create progress tasks for all parts (but only show active ones)
+            part_tasks = {}
+            
+            def download_part(part_info):
+                """Download a single part with progress tracking."""
+                part_num, part_pattern, source_part_path, part_size = part_info
                 
-                # Step 1: Download all parts in parallel
-                from concurrent.futures import ThreadPoolExecutor, as_completed
-                import threading
+                if part_size == 0:
+                    return None, 0, part_num
                 
-                # Thread lock for progress updates
-                progress_lock = threading.Lock()
+                # Find the actual part file
+                matching_parts = list(source_fs.glob(source_part_path))
+                if not matching_parts:
+                    with progress_lock:
+                        console.print(f"[yellow]Warning:[/yellow] Part {part_num + 1} not found: {part_pattern}")
+                    return None, 0, part_num
                 
-                # Pre-create progress tasks for all parts (but only show active ones)
-                part_tasks = {}
+                source_part = matching_parts[0]
+                temp_part_path = os.path.join(temp_dir, f"part_{part_num:04d}")
                 
-                def download_part(part_info):
-                    """Download a single part with progress tracking."""
-                    part_num, part_pattern, source_part_path, part_size = part_info
-                    
-                    if part_size == 0:
-                        return None, 0, part_num
-                    
-                    # Find the actual part file
-                    matching_parts = list(source_fs.glob(source_part_path))
-                    if not matching_parts:
-                        with progress_lock:
-                            console.print(f"[yellow]Warning:[/yellow] Part {part_num + 1} not found: {part_pattern}")
-                        return None, 0, part_num
-                    
-                    source_part = matching_parts[0]
-                    temp_part_path = os.path.join(temp_dir, f"part_{part_num:04d}")
-                    
-                    # Create task for this download
-                    with progress_lock:
-                        part_task = progress.add_task(
-                            f"Part {part_num + 1}/{split_parts}", 
-                            total=part_size
-                        )
-                        part_tasks[part_num] = part_task
-                    
-                    bytes_transferred = 0
-                    
-                    try:
-                        with source_fs.open(source_part, 'rb') as src:
-                            with open(temp_part_path, 'wb') as dst:
-                                while True:
-                                    chunk = src.read(8192)
-                                    if not chunk:
-                                        break
-                                    dst.write(chunk)
-                                    bytes_transferred += len(chunk)
-                                    # Update progress
-                                    with progress_lock:
-                                        progress.update(part_task, completed=bytes_transferred)
-                        
-                        # Mark as complete
-                        with progress_lock:
-                            progress.update(part_task, completed=part_size)
-                        return temp_part_path, part_size, part_num
-                    except Exception as e:
-                        with progress_lock:
-                            console.print(f"[red]Error downloading part {part_num + 1}:[/red] {str(e)}")
-                        return None, 0, part_num
+                # Create task for this download
+                with progress_lock:
+                    part_task = progress.add_task(
+                        f"Part {part_num + 1}/{split_parts}", 
+                        total=part_size
+                    )
+                    part_tasks[part_num] = part_task
                 
-                # Prepare download tasks
-                download_tasks = []
-                subtask_bytes_completed = 0
+                def update_part(bytes_transferred):
+                    with progress_lock:
+                        progress.update(part_task, completed=bytes_transferred)
                 
-                for part_num in range(split_parts):
-                    part_pattern = pattern.replace('*', f'{part_num:04d}')
-                    source_part_path = os.path.join(source_base_path, part_pattern) if source_base_path else part_pattern
-                    part_size = part_sizes[part_num]
+                try:
+                    key = TransferJournal.file_key(source_location.location.name, source_part,
+                                                   "local", temp_part_path)
+                    _journaled_copy(journal, key, source_fs, source_part, local_fs, temp_part_path,
+                                    progress=update_part)
                     
-                    if part_size > 0:
-                        download_tasks.append((part_num, part_pattern, source_part_path, part_size))
-                        total_size += part_size
+                    # Mark as complete
+                    with progress_lock:
+                        progress.update(part_task, completed=part_size)
+                    return temp_part_path, part_size, part_num
+                except Exception as e:
+                    with progress_lock:
+                        console.print(f"[red]Error downloading part {part_num + 1}:[/red] {str(e)}")
+                    return None, 0, part_num
+            
+            # Prepare download tasks
+            download_tasks = []
+            subtask_bytes_completed = 0
+            
+            for part_num in range(split_parts):
+                part_pattern = pattern.replace('*', f'{part_num:04d}')
+                source_part_path = os.path.join(source_base_path, part_pattern) if source_base_path else part_pattern
+                part_size = part_sizes[part_num]
                 
-                # Execute downloads in parallel (limit concurrent downloads to avoid overwhelming the server)
-                max_workers = min(8, len(download_tasks))  # Max 8 concurrent downloads
-                completed_parts = {}
+                if part_size > 0:
+                    download_tasks.append((part_num, part_pattern, source_part_path, part_size))
+                    total_size += part_size
+            
+            # Execute downloads in parallel (limit concurrent downloads to avoid overwhelming the server)
+            max_workers = min(8, len(download_tasks))  # Max 8 concurrent downloads
+            completed_parts = {}
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Submit all download tasks
+                future_to_part = {executor.submit(download_part, task): task[0] for task in download_tasks}
                 
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    # Submit all download tasks
-                    future_to_part = {executor.submit(download_part, task): task[0] for task in download_tasks}
-                    
-                    # Process completed downloads
-                    for future in as_completed(future_to_part):
-                        part_num = future_to_part[future]
-                        try:
-                            temp_part_path, part_size_actual, part_num_result = future.result()
-                            if temp_part_path:
-                                completed_parts[part_num_result] = temp_part_path
-                                subtask_bytes_completed += part_size_actual
-                                progress.update(subtask, completed=subtask_bytes_completed)
-                                console.print(f"[dim]  Downloaded part {part_num_result + 1}/{split_parts} ({part_size_actual} bytes)[/dim]")
-                        except Exception as e:
-                            console.print(f"[red]Error downloading part {part_num + 1}:[/red] {str(e)}")
-                
-                # Sort parts by number and create temp_parts list
-                temp_parts = []
-                for part_num in sorted(completed_parts.keys()):
-                    temp_parts.append(completed_parts[part_num])
-                
-                # Step 2: Reconstruct by concatenating parts
+                # Process completed downloads
+                for future in as_completed(future_to_part):
+                    part_num = future_to_part[future]
+                    try:
+                        temp_part_path, part_size_actual, part_num_result = future.result()
+                        if temp_part_path:
+                            completed_parts[part_num_result] = temp_part_path
+                            subtask_bytes_completed += part_size_actual
+                            progress.update(subtask, completed=subtask_bytes_completed)
+                            console.print(f"[dim]  Downloaded part {part_num_result + 1}/{split_parts} ({part_size_actual} bytes)[/dim]")
+                    except Exception as e:
+                        console.print(f"[red]Error downloading part {part_num + 1}:[/red] {str(e)}")
+            
+            # Sort parts by number and create temp_parts list
+            temp_parts = []
+            for part_num in sorted(completed_parts.keys()):
+                temp_parts.append(completed_parts[part_num])
+            
+            if len(temp_parts) < len(download_tasks):
+                # Keep the downloaded parts for a resumed run
+                console.print(f"[red]{len(download_tasks) - len(temp_parts)} parts failed to download, not reconstructing[/red]")
+                progress.remove_task(subtask)
+                return None
+            
+            # Step 2: Reconstruct by concatenating parts, unless a resumed run already did
+            reconstructed_path = os.path.join(temp_dir, "reconstructed.tar.gz")
+            if not (os.path.exists(reconstructed_path) and os.path.getsize(reconstructed_path) == total_size):
                 console.print(f"[dim]  Concatenating {len(temp_parts)} parts into {dest_file}[/dim]")
-                reconstructed_path = os.path.join(temp_dir, "reconstructed.tar.gz")
-                
                 with open(reconstructed_path, 'wb') as output:
                     for part_path in temp_parts:
                         with open(part_path, 'rb') as part:
@@ -2268,26 +2345,21 @@ async def _stage_split_archive(source_location, dest_location, pattern: str, spl
                                 if not chunk:
                                     break
                                 output.write(chunk)
-                
-                # Step 3: Upload reconstructed file to destination
-                upload_task = progress.add_task(f"Uploading reconstructed archive", total=total_size)
-                bytes_uploaded = 0
-                
-                with open(reconstructed_path, 'rb') as src:
-                    with dest_fs.open(dest_file, 'wb') as dst:
-                        while True:
-                            chunk = src.read(8192)
-                            if not chunk:
-                                break
-                            dst.write(chunk)
-                            bytes_uploaded += len(chunk)
-                            progress.update(upload_task, completed=bytes_uploaded)
-                
-                progress.remove_task(upload_task)
-                progress.remove_task(subtask)
-                
-                console.print(f"[dim]Reconstructed archive: {dest_file} ({total_size} bytes total)[/dim]")
-                return dest_file
+            
+            # Step 3: Upload reconstructed file to destination
+            upload_task = progress.add_task(f"Uploading reconstructed archive", total=total_size)
+            
+            key = TransferJournal.file_key("local", reconstructed_path,
+                                           dest_location.location.name, dest_file)
+            _journaled_copy(journal, key, local_fs, reconstructed_path, dest_fs, dest_file,
+                            progress=lambda done: progress.update(upload_task, completed=done))
+            
+            progress.remove_task(upload_task)
+            progress.remove_task(subtask)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            
+            console.print(f"[dim]Reconstructed archive: {dest_file} ({total_size} bytes total)[/dim]")
+            return dest_file
             
         else:
             # Stage all parts separately without reconstruction
@@ -2341,20 +2413,15 @@ async def _stage_split_archive(source_location, dest_location, pattern: str, spl
                         total=part_size
                     )
                 
-                bytes_transferred = 0
+                def update_part(bytes_transferred):
+                    with progress_lock:
+                        progress.update(part_task, completed=bytes_transferred)
                 
                 try:
-                    with source_fs.open(source_part, 'rb') as src:
-                        with dest_fs.open(dest_part, 'wb') as dst:
-                            while True:
-                                chunk = src.read(8192)
-                                if not chunk:
-                                    break
-                                dst.write(chunk)
-                                bytes_transferred += len(chunk)
-                                # Update progress
-                                with progress_lock:
-                                    progress.update(part_task, completed=bytes_transferred)
+                    key = TransferJournal.file_key(source_location.location.name, source_part,
+                                                   dest_location.location.name, dest_part)
+                    _journaled_copy(journal, key, source_fs, source_part, dest_fs, dest_part,
+                                    progress=update_part, via=_relay_hops(network_route_info, journal, key))
                     
                     # Mark as complete
                     with progress_lock:
@@ -2735,6 +2802,7 @@ async def _get_network_route_info(source_location: str, dest_location: str, via:
                     'route_type': 'manual',
                     'route_description': f'manual route via {via}',
                     'intermediate_location': via,
+                    'intermediate_hops': [via],
                     'path': [source_location, via, dest_location],
                     'optimization_used': False,
                     'warning': 'Manual routing may not be optimal'
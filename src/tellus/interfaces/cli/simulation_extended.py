@@ -1,5 +1,10 @@
 """Extended simulation CLI commands."""
 
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
 import rich_click as click
 from rich.console import Console
 from rich.panel import Panel
@@ -11,7 +16,8 @@ from ...application.dtos import (FileRegistrationDto,
 from ...application.exceptions import EntityNotFoundError
 from ...application.container import get_service_container
 from .main import console
-from .simulation import _get_simulation_service, simulation
+from .simulation import (_finish_transfer_journal, _get_simulation_service,
+                         _journaled_copy, _open_transfer_journal, simulation)
 
 
 def _complete_simulation_id(ctx, param, incomplete):
@@ -1369,8 +1375,9 @@ def _perform_simple_listing(path: str, long_format: bool, show_all: bool,
 @click.option("--glob", "-g", help="Use glob pattern to select multiple files")
 @click.option("--progress", "-p", is_flag=True, default=True, help="Show progress bar")
 @click.option("--overwrite", "-f", is_flag=True, help="Force overwrite existing files")
+@click.option("--resume", "resume", metavar="OPERATION_ID", help="Resume an interrupted upload")
 def put_file(sim_id: str, location_name: str, local_file: str = None, remote_path: str = None,
-            glob: str = None, progress: bool = True, overwrite: bool = False):
+            glob: str = None, progress: bool = True, overwrite: bool = False, resume: str = None):
     """Upload a file to simulation location.
     
     Upload local files to a remote simulation location. Supports interactive
@@ -1381,10 +1388,15 @@ def put_file(sim_id: str, location_name: str, local_file: str = None, remote_pat
         tellus simulation location put MIS11.3-B tellus_hsm ./data.nc /remote/path/
         tellus simulation location put MIS11.3-B tellus_hsm --glob "*.nc" /remote/output/
         tellus simulation location put MIS11.3-B tellus_hsm --interactive
+        tellus simulation location put MIS11.3-B tellus_hsm ./data.nc --resume put_1718000000_1a2b3c4d
     """
     import glob as glob_module
     import os
     from pathlib import Path
+
+    import fsspec
+
+    from ...infrastructure.adapters.transfer_journal import TransferJournal
     
     try:
         # Get the simulation to verify location association
@@ -1491,6 +1503,9 @@ def put_file(sim_id: str, location_name: str, local_file: str = None, remote_pat
             return
             
         console.print(f"[dim]Uploading {len(files_to_upload)} file(s) to {location_name}[/dim]")
+        journal = _open_transfer_journal(container, resume, "put")
+        local_fs = fsspec.filesystem("file")
+        failed_uploads = 0
         
         # Upload files
         for local_path, remote_name in files_to_upload:
@@ -1510,12 +1525,14 @@ def put_file(sim_id: str, location_name: str, local_file: str = None, remote_pat
                 resolved_remote = f"{resolved_path}/{remote_name.lstrip('/')}" if resolved_path != "." else remote_name
                 
             try:
-                # Check if file exists and handle overwrite
-                if fs.exists(resolved_remote) and not overwrite:
+                key = TransferJournal.file_key("local", os.path.abspath(local_path), location_name, resolved_remote)
+                
+                # Check if file exists and handle overwrite; a partial upload of this operation is resumed
+                if fs.exists(resolved_remote) and not overwrite and not journal.has_file(key):
                     console.print(f"[yellow]Skipping '{remote_name}' - already exists (use --overwrite to force)[/yellow]")
                     continue
                     
-                # Create progress callback if requested
+                # Create progress bar if requested
                 if progress:
                     from rich.progress import (BarColumn, Progress, SpinnerColumn, 
                                                TextColumn, DownloadColumn, TransferSpeedColumn)
@@ -1531,45 +1548,25 @@ def put_file(sim_id: str, location_name: str, local_file: str = None, remote_pat
                         console=console
                     ) as prog:
                         task = prog.add_task(f"Uploading {os.path.basename(local_path)}", total=file_size)
-                        
-                        # Create proper fsspec callback
-                        from fsspec.callbacks import Callback
-                        
-                        class ProgressCallback(Callback):
-                            def __init__(self, prog_instance, task_id, size=None):
-                                super().__init__(size=size)
-                                self.prog = prog_instance
-                                self.task = task_id
-                                
-                            def set_size(self, size):
-                                """Called when file size is determined"""
-                                super().set_size(size)
-                                self.prog.update(self.task, total=size)
-                                
-                            def absolute_update(self, value):
-                                """Called with absolute bytes transferred"""
-                                super().absolute_update(value)
-                                self.prog.update(self.task, completed=value)
-                                
-                            def relative_update(self, inc=1):
-                                """Called with incremental bytes transferred"""
-                                super().relative_update(inc)
-                                self.prog.advance(self.task, inc)
-                        
-                        callback = ProgressCallback(prog, task, file_size)
-                        
-                        # Upload with progress callback
-                        fs.put(local_path, resolved_remote, callback=callback)
+                        copied = _journaled_copy(journal, key, local_fs, os.path.abspath(local_path),
+                                                 fs, resolved_remote,
+                                                 progress=lambda done: prog.update(task, completed=done))
                         
                 else:
                     # Upload without progress
-                    fs.put(local_path, resolved_remote)
+                    copied = _journaled_copy(journal, key, local_fs, os.path.abspath(local_path),
+                                             fs, resolved_remote)
                     
-                console.print(f"[green]✓[/green] Uploaded '{local_path}' → '{resolved_remote}'")
+                if copied:
+                    console.print(f"[green]✓[/green] Uploaded '{local_path}' → '{resolved_remote}'")
+                else:
+                    console.print(f"[dim]Already uploaded '{local_path}'[/dim]")
                 
             except Exception as e:
                 console.print(f"[red]✗[/red] Failed to upload '{local_path}': {str(e)}")
+                failed_uploads += 1
                 
+        _finish_transfer_journal(journal, failed_uploads)
         console.print(f"[green]Upload completed[/green]")
         
     except Exception as e:
@@ -1584,8 +1581,9 @@ def put_file(sim_id: str, location_name: str, local_file: str = None, remote_pat
 @click.option("--glob", "-g", help="Use glob pattern to select multiple remote files")
 @click.option("--progress", "-p", is_flag=True, default=True, help="Show progress bar")
 @click.option("--overwrite", "-f", is_flag=True, help="Force overwrite existing files")
+@click.option("--resume", "resume", metavar="OPERATION_ID", help="Resume an interrupted download")
 def get_file(sim_id: str, location_name: str, remote_file: str = None, local_path: str = None,
-            glob: str = None, progress: bool = True, overwrite: bool = False):
+            glob: str = None, progress: bool = True, overwrite: bool = False, resume: str = None):
     """Download a file from simulation location.
     
     Download files from a remote simulation location to local filesystem.
@@ -1596,9 +1594,14 @@ def get_file(sim_id: str, location_name: str, remote_file: str = None, local_pat
         tellus simulation location get MIS11.3-B tellus_hsm data.nc ./local_data.nc
         tellus simulation location get MIS11.3-B tellus_hsm --glob "*.nc" ./output/
         tellus simulation location get MIS11.3-B tellus_hsm --interactive
+        tellus simulation location get MIS11.3-B tellus_hsm data.nc --resume get_1718000000_1a2b3c4d
     """
     import os
     from pathlib import Path
+
+    import fsspec
+
+    from ...infrastructure.adapters.transfer_journal import TransferJournal
     
     try:
         # Get the simulation to verify location association
@@ -1714,6 +1717,9 @@ def get_file(sim_id: str, location_name: str, remote_file: str = None, local_pat
             return
             
         console.print(f"[dim]Downloading {len(files_to_download)} file(s) from {location_name}[/dim]")
+        journal = _open_transfer_journal(container, resume, "get")
+        local_fs = fsspec.filesystem("file")
+        failed_downloads = 0
         
         # Download files
         for remote_name, local_name in files_to_download:
@@ -1733,28 +1739,21 @@ def get_file(sim_id: str, location_name: str, remote_file: str = None, local_pat
                 resolved_remote = f"{resolved_path}/{remote_name.lstrip('/')}" if resolved_path != "." else remote_name
                 
             try:
-                # Check if local file exists and handle overwrite
-                if os.path.exists(local_name) and not overwrite:
+                key = TransferJournal.file_key(location_name, resolved_remote, "local", os.path.abspath(local_name))
+                
+                # Check if local file exists and handle overwrite; a partial download of this operation is resumed
+                if os.path.exists(local_name) and not overwrite and not journal.has_file(key):
                     console.print(f"[yellow]Skipping '{local_name}' - already exists (use --overwrite to force)[/yellow]")
                     continue
                     
-                # Create local directory if needed
-                local_dir = os.path.dirname(local_name)
-                if local_dir:
-                    Path(local_dir).mkdir(parents=True, exist_ok=True)
-                    
-                # Create progress callback if requested
+                # Create progress bar if requested
                 if progress:
                     from rich.progress import (BarColumn, Progress, SpinnerColumn, 
                                                TextColumn, DownloadColumn, TransferSpeedColumn)
                     
                     try:
-                        file_info = fs.info(resolved_remote)
-                        file_size = file_info.get('size', 0)
-                        console.print(f"[dim]Debug: file_info = {file_info}[/dim]")
-                        console.print(f"[dim]Debug: extracted file_size = {file_size}[/dim]")
-                    except Exception as e:
-                        console.print(f"[dim]Debug: fs.info() failed: {e}[/dim]")
+                        file_size = fs.info(resolved_remote).get('size', 0)
+                    except Exception:
                         file_size = 0
                         
                     with Progress(
@@ -1766,53 +1765,25 @@ def get_file(sim_id: str, location_name: str, remote_file: str = None, local_pat
                         console=console
                     ) as prog:
                         task = prog.add_task(f"Downloading {remote_name}", total=file_size)
-                        
-                        # Create proper fsspec callback with debugging
-                        from fsspec.callbacks import Callback
-                        
-                        class DownloadProgressCallback(Callback):
-                            def __init__(self, prog_instance, task_id, size=None):
-                                console.print(f"[dim]Debug: DownloadProgressCallback init with size={size}[/dim]")
-                                super().__init__(size=size)
-                                self.prog = prog_instance
-                                self.task = task_id
-                                
-                            def set_size(self, size):
-                                """Called when file size is determined"""
-                                console.print(f"[dim]Debug: set_size called with size={size}, current size={self.size}[/dim]")
-                                # Only update if we don't have a size or the new size is larger
-                                if self.size is None or self.size == 0 or size > self.size:
-                                    super().set_size(size)
-                                    self.prog.update(self.task, total=size)
-                                else:
-                                    console.print(f"[dim]Debug: ignoring set_size({size}) because we have better size={self.size}[/dim]")
-                                
-                            def absolute_update(self, value):
-                                """Called with absolute bytes transferred"""
-                                console.print(f"[dim]Debug: absolute_update called with value={value}[/dim]")
-                                super().absolute_update(value)
-                                self.prog.update(self.task, completed=value)
-                                
-                            def relative_update(self, inc=1):
-                                """Called with incremental bytes transferred"""
-                                console.print(f"[dim]Debug: relative_update called with inc={inc}[/dim]")
-                                super().relative_update(inc)
-                                self.prog.advance(self.task, inc)
-                        
-                        callback = DownloadProgressCallback(prog, task, file_size)
-                        
-                        # Download with progress callback
-                        fs.get(resolved_remote, local_name, callback=callback)
+                        copied = _journaled_copy(journal, key, fs, resolved_remote,
+                                                 local_fs, os.path.abspath(local_name),
+                                                 progress=lambda done: prog.update(task, completed=done))
                         
                 else:
                     # Download without progress
-                    fs.get(resolved_remote, local_name)
+                    copied = _journaled_copy(journal, key, fs, resolved_remote,
+                                             local_fs, os.path.abspath(local_name))
                     
-                console.print(f"[green]✓[/green] Downloaded '{resolved_remote}' → '{local_name}'")
+                if copied:
+                    console.print(f"[green]✓[/green] Downloaded '{resolved_remote}' → '{local_name}'")
+                else:
+                    console.print(f"[dim]Already downloaded '{local_name}'[/dim]")
                 
             except Exception as e:
                 console.print(f"[red]✗[/red] Failed to download '{remote_name}': {str(e)}")
+                failed_downloads += 1
                 
+        _finish_transfer_journal(journal, failed_downloads)
         console.print(f"[green]Download completed[/green]")
         
     except Exception as e:
@@ -1827,9 +1798,10 @@ def get_file(sim_id: str, location_name: str, remote_file: str = None, local_pat
 @click.option("--progress", "-p", is_flag=True, default=True, help="Show progress bar")
 @click.option("--overwrite", "-f", is_flag=True, help="Force overwrite existing files")
 @click.option("--exclude", help="Exclude pattern (can be used multiple times)", multiple=True)
+@click.option("--resume", "resume", metavar="OPERATION_ID", help="Resume an interrupted upload")
 def mput_files(sim_id: str, location_name: str, pattern: str = None,
                recursive: bool = False, progress: bool = True,
-               overwrite: bool = False, exclude: tuple = ()):
+               overwrite: bool = False, exclude: tuple = (), resume: str = None):
     """Upload multiple files/directories to simulation location.
     
     Upload multiple files and directories using glob patterns or interactive selection.
@@ -1840,11 +1812,16 @@ def mput_files(sim_id: str, location_name: str, pattern: str = None,
         tellus simulation location mput MIS11.3-B tellus_hsm --interactive
         tellus simulation location mput MIS11.3-B tellus_hsm "data/*" --recursive
         tellus simulation location mput MIS11.3-B tellus_hsm "*.txt" --exclude "*.tmp"
+        tellus simulation location mput MIS11.3-B tellus_hsm "*.nc" --resume mput_1718000000_1a2b3c4d
     """
     import fnmatch
     import glob as glob_module
     import os
     from pathlib import Path
+
+    import fsspec
+
+    from ...infrastructure.adapters.transfer_journal import TransferJournal
     
     try:
         # Get the simulation to verify location association
@@ -1990,6 +1967,8 @@ def mput_files(sim_id: str, location_name: str, pattern: str = None,
             return
             
         console.print(f"[dim]Uploading {len(files_to_upload)} file(s) to {location_name}[/dim]")
+        journal = _open_transfer_journal(container, resume, "mput")
+        local_fs = fsspec.filesystem("file")
         
         # Upload files with progress
         successful_uploads = 0
@@ -2034,16 +2013,21 @@ def mput_files(sim_id: str, location_name: str, pattern: str = None,
                             pass  # Directory might already exist
                             
                     try:
+                        key = TransferJournal.file_key("local", os.path.abspath(local_path),
+                                                       location_name, resolved_remote)
+                        
                         # Check if file exists and handle overwrite
-                        if fs.exists(resolved_remote) and not overwrite:
+                        if fs.exists(resolved_remote) and not overwrite and not journal.has_file(key):
                             console.print(f"[yellow]Skipping '{remote_name}' - already exists[/yellow]")
                             prog.advance(overall_task)
                             continue
                             
-                        # Upload file
-                        fs.put(local_path, resolved_remote)
+                        # Upload file, resuming a partial upload of this operation
+                        if _journaled_copy(journal, key, local_fs, os.path.abspath(local_path), fs, resolved_remote):
+                            console.print(f"[green]✓[/green] {remote_name}")
+                        else:
+                            console.print(f"[dim]Already uploaded {remote_name}[/dim]")
                         successful_uploads += 1
-                        console.print(f"[green]✓[/green] {remote_name}")
                         
                     except Exception as e:
                         console.print(f"[red]✗[/red] Failed to upload '{remote_name}': {str(e)}")
@@ -2078,15 +2062,20 @@ def mput_files(sim_id: str, location_name: str, pattern: str = None,
                         pass  # Directory might already exist
                         
                 try:
+                    key = TransferJournal.file_key("local", os.path.abspath(local_path),
+                                                   location_name, resolved_remote)
+                    
                     # Check if file exists and handle overwrite
-                    if fs.exists(resolved_remote) and not overwrite:
+                    if fs.exists(resolved_remote) and not overwrite and not journal.has_file(key):
                         console.print(f"[yellow]Skipping '{remote_name}' - already exists (use --overwrite to force)[/yellow]")
                         continue
                         
-                    # Upload file
-                    fs.put(local_path, resolved_remote)
+                    # Upload file, resuming a partial upload of this operation
+                    if _journaled_copy(journal, key, local_fs, os.path.abspath(local_path), fs, resolved_remote):
+                        console.print(f"[green]✓[/green] Uploaded '{local_path}' → '{resolved_remote}'")
+                    else:
+                        console.print(f"[dim]Already uploaded '{local_path}'[/dim]")
                     successful_uploads += 1
-                    console.print(f"[green]✓[/green] Uploaded '{local_path}' → '{resolved_remote}'")
                     
                 except Exception as e:
                     console.print(f"[red]✗[/red] Failed to upload '{remote_name}': {str(e)}")
@@ -2094,6 +2083,7 @@ def mput_files(sim_id: str, location_name: str, pattern: str = None,
                     
         # Summary
         console.print(f"\n[green]Upload summary:[/green] {successful_uploads} successful, {failed_uploads} failed")
+        _finish_transfer_journal(journal, failed_uploads)
         
     except Exception as e:
         console.print(f"[red]Error:[/red] {str(e)}")
@@ -2108,9 +2098,11 @@ def mput_files(sim_id: str, location_name: str, pattern: str = None,
 @click.option("--overwrite", "-f", is_flag=True, help="Force overwrite existing files")
 @click.option("--exclude", help="Exclude pattern (can be used multiple times)", multiple=True)
 @click.option("--output-dir", "-o", help="Output directory (default: current directory)")
+@click.option("--resume", "resume", metavar="OPERATION_ID", help="Resume an interrupted download")
 def mget_files(sim_id: str, location_name: str, pattern: str = None,
                recursive: bool = False, progress: bool = True,
-               overwrite: bool = False, exclude: tuple = (), output_dir: str = None):
+               overwrite: bool = False, exclude: tuple = (), output_dir: str = None,
+               resume: str = None):
     """Download multiple files/directories from simulation location.
     
     Download multiple files and directories using glob patterns or interactive selection.
@@ -2121,10 +2113,15 @@ def mget_files(sim_id: str, location_name: str, pattern: str = None,
         tellus simulation location mget MIS11.3-B tellus_hsm --interactive
         tellus simulation location mget MIS11.3-B tellus_hsm "*.txt" --output-dir ./downloads/
         tellus simulation location mget MIS11.3-B tellus_hsm "*" --exclude "*.tmp" --recursive
+        tellus simulation location mget MIS11.3-B tellus_hsm "*.nc" --resume mget_1718000000_1a2b3c4d
     """
     import fnmatch
     import os
     from pathlib import Path
+
+    import fsspec
+
+    from ...infrastructure.adapters.transfer_journal import TransferJournal
     
     try:
         # Get the simulation to verify location association
@@ -2290,6 +2287,8 @@ def mget_files(sim_id: str, location_name: str, pattern: str = None,
             return
             
         console.print(f"[dim]Downloading {len(files_to_download)} file(s) from {location_name}[/dim]")
+        journal = _open_transfer_journal(container, resume, "mget")
+        local_fs = fsspec.filesystem("file")
         
         # Download files with progress
         successful_downloads = 0
@@ -2326,21 +2325,21 @@ def mget_files(sim_id: str, location_name: str, pattern: str = None,
                         resolved_remote = f"{resolved_path}/{remote_name.lstrip('/')}" if resolved_path != "." else remote_name
                         
                     try:
+                        key = TransferJournal.file_key(location_name, resolved_remote,
+                                                       "local", os.path.abspath(local_name))
+                        
                         # Check if local file exists and handle overwrite
-                        if os.path.exists(local_name) and not overwrite:
+                        if os.path.exists(local_name) and not overwrite and not journal.has_file(key):
                             console.print(f"[yellow]Skipping '{remote_name}' - already exists[/yellow]")
                             prog.advance(overall_task)
                             continue
                             
-                        # Create local directory if needed
-                        local_dir = os.path.dirname(local_name)
-                        if local_dir:
-                            Path(local_dir).mkdir(parents=True, exist_ok=True)
-                            
-                        # Download file
-                        fs.get(resolved_remote, local_name)
+                        # Download file, resuming a partial download of this operation
+                        if _journaled_copy(journal, key, fs, resolved_remote, local_fs, os.path.abspath(local_name)):
+                            console.print(f"[green]✓[/green] {remote_name}")
+                        else:
+                            console.print(f"[dim]Already downloaded {remote_name}[/dim]")
                         successful_downloads += 1
-                        console.print(f"[green]✓[/green] {remote_name}")
                         
                     except Exception as e:
                         console.print(f"[red]✗[/red] Failed to download '{remote_name}': {str(e)}")
@@ -2367,20 +2366,20 @@ def mget_files(sim_id: str, location_name: str, pattern: str = None,
                     resolved_remote = f"{resolved_path}/{remote_name.lstrip('/')}" if resolved_path != "." else remote_name
                     
                 try:
+                    key = TransferJournal.file_key(location_name, resolved_remote,
+                                                   "local", os.path.abspath(local_name))
+                    
                     # Check if local file exists and handle overwrite
-                    if os.path.exists(local_name) and not overwrite:
+                    if os.path.exists(local_name) and not overwrite and not journal.has_file(key):
                         console.print(f"[yellow]Skipping '{remote_name}' - already exists (use --overwrite to force)[/yellow]")
                         continue
                         
-                    # Create local directory if needed
-                    local_dir = os.path.dirname(local_name)
-                    if local_dir:
-                        Path(local_dir).mkdir(parents=True, exist_ok=True)
-                        
-                    # Download file
-                    fs.get(resolved_remote, local_name)
+                    # Download file, resuming a partial download of this operation
+                    if _journaled_copy(journal, key, fs, resolved_remote, local_fs, os.path.abspath(local_name)):
+                        console.print(f"[green]✓[/green] Downloaded '{resolved_remote}' → '{local_name}'")
+                    else:
+                        console.print(f"[dim]Already downloaded '{local_name}'[/dim]")
                     successful_downloads += 1
-                    console.print(f"[green]✓[/green] Downloaded '{resolved_remote}' → '{local_name}'")
                     
                 except Exception as e:
                     console.print(f"[red]✗[/red] Failed to download '{remote_name}': {str(e)}")
@@ -2388,6 +2387,7 @@ def mget_files(sim_id: str, location_name: str, pattern: str = None,
                     
         # Summary
         console.print(f"\n[green]Download summary:[/green] {successful_downloads} successful, {failed_downloads} failed")
+        _finish_transfer_journal(journal, failed_downloads)
         
     except Exception as e:
         console.print(f"[red]Error:[/red] {str(e)}")
@@ -2583,18 +2583,31 @@ def list_files(sim_id: str, location: str = None, content_type: str = None, type
 
 @simulation_files.command(name="add")
 @click.argument("sim_id")
-@click.option("--from-archive", required=True, help="Archive ID to register files from")
+@click.option("--from-archive", help="Archive ID to register files from")
+@click.option("--from-directory", type=click.Path(exists=True, file_okay=False),
+              help="Directory to scan and register files from")
+@click.option("--location", help="Location the scanned directory belongs to")
+@click.option("--incremental/--full-scan", default=True,
+              help="Only re-scan files that changed since the last directory scan")
+@click.option("--checksums", is_flag=True, help="Compute checksums of scanned files")
 @click.option("--content-type", help="Filter files by content type (input, output, log, config)")
 @click.option("--pattern", help="Filter files by pattern (glob)")
 @click.option("--overwrite", is_flag=True, help="Overwrite existing file registrations")
 @click.option("--dry-run", is_flag=True, help="Show what would be registered without making changes")
-def add_files(sim_id: str, from_archive: str, content_type: str = None, pattern: str = None, 
+def add_files(sim_id: str, from_archive: str = None, from_directory: str = None,
+              location: str = None, incremental: bool = True, checksums: bool = False,
+              content_type: str = None, pattern: str = None,
               overwrite: bool = False, dry_run: bool = False):
-    """Add (register) files from an archive to this simulation.
+    """Add (register) files from an archive or a directory to this simulation.
     
     This is similar to 'git add' - it registers files from an archive as being
     associated with this simulation for tracking and provenance.
     
+    Directory scans are incremental by default: a scan cache in the project's
+    .tellus directory remembers each file's size, modification time and inode,
+    so only new or changed files are classified, checksummed and registered,
+    and files deleted since the last scan are reported.
+    
     Examples:
     
         # Register all files from an archive
@@ -2608,7 +2621,24 @@ def add_files(sim_id: str, from_archive: str, content_type: str = None, pattern:
         
         # Preview what would be registered
         tellus simulation files add my-sim --from-archive my-archive --dry-run
+        
+        # Register new and changed files from an experiment directory
+        tellus simulation files add my-sim --from-directory /work/exp01 --location hpc
     """
+    if bool(from_archive) == bool(from_directory):
+        console.print("[red]Error:[/red] Specify exactly one of --from-archive or --from-directory")
+        return
+    
+    if from_directory:
+        try:
+            _add_files_from_directory(
+                sim_id, Path(from_directory), location, incremental, checksums,
+                content_type, pattern, dry_run
+            )
+        except Exception as e:
+            console.print(f"[red]Error:[/red] {str(e)}")
+        return
+    
     try:
         # Check if we should use REST API
         use_rest_api = os.getenv('TELLUS_CLI_USE_REST_API', 'false').lower() == 'true'
@@ -2703,6 +2733,88 @@ def add_files(sim_id: str, from_archive: str, content_type: str = None, pattern:
         console.print(f"[red]Error:[/red] {str(e)}")
 
 
+def _scan_cache_path(container, sim_id: str, directory: Path,
+                     content_type: Optional[str], pattern: Optional[str]) -> Path:
+    """Scan cache file for a simulation directory and filter combination."""
+    key = json.dumps([str(directory.resolve()), content_type, pattern])
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return container.project_data_path / "scan-cache" / f"{sim_id}-{digest}.json"
+
+
+def _add_files_from_directory(sim_id: str, directory: Path, location: Optional[str],
+                              incremental: bool, checksums: bool,
+                              content_type: Optional[str], pattern: Optional[str],
+                              dry_run: bool) -> None:
+    """Scan a directory and register its new or changed files with a simulation."""
+    from ...domain.services.file_scanner import FileScanner
+    
+    container = get_service_container()
+    simulation_service = container.service_factory.simulation_service
+    unified_service = container.service_factory.unified_file_service
+    
+    if simulation_service.get_simulation(sim_id) is None:
+        _handle_simulation_not_found(sim_id, simulation_service)
+        return
+    
+    # A dry run must not advance the cache, or the real run would skip its files
+    cache_path = None
+    if incremental and not dry_run:
+        cache_path = _scan_cache_path(container, sim_id, directory, content_type, pattern)
+    
+    scanner = FileScanner()
+    with console.status(f"Scanning {directory}..."):
+        result = scanner.scan_directory(
+            directory,
+            simulation_context={"simulation_id": sim_id},
+            include_patterns=[pattern] if pattern else None,
+            compute_checksums=checksums,
+            cache_path=cache_path
+        )
+    
+    if not result.success:
+        for error in result.errors:
+            console.print(f"[red]Error:[/red] {error}")
+        return
+    
+    paths = result.new_files + result.modified_files if cache_path else list(result.inventory.files)
+    if content_type:
+        paths = [
+            path for path in paths
+            if result.inventory.get_file(path).content_type.value == content_type
+        ]
+    
+    if dry_run:
+        console.print(f"[yellow]Dry run:[/yellow] Would register {len(paths)} files from '{directory}'")
+        for path in sorted(paths)[:10]:
+            console.print(f"  {path}")
+        if len(paths) > 10:
+            console.print(f"[dim]... and {len(paths) - 10} more files[/dim]")
+        console.print("[dim]Use without --dry-run to register these files[/dim]")
+        return
+    
+    try:
+        registered = unified_service.register_scanned_files(
+            result, sim_id, location_name=location, paths=paths
+        )
+    except Exception:
+        # Forget the scan so the next run registers these files again
+        if cache_path is not None:
+            cache_path.unlink(missing_ok=True)
+        raise
+    
+    console.print(f"[green]✓[/green] Scanned '{directory}' in {result.scan_time:.1f}s:")
+    console.print(f"  • {registered} files registered")
+    if cache_path is not None:
+        console.print(f"  • {len(result.new_files)} new, {len(result.modified_files)} modified, "
+                      f"{result.unchanged_files} unchanged")
+        if result.deleted_files:
+            console.print(f"  • [yellow]{len(result.deleted_files)} files deleted since the last scan:[/yellow]")
+            for path in result.deleted_files[:10]:
+                console.print(f"      {path}")
+            if len(result.deleted_files) > 10:
+                console.print(f"      [dim]... and {len(result.deleted_files) - 10} more[/dim]")
+
+
 @simulation_files.command(name="rm")
 @click.argument("sim_id")
 @click.option("--from-archive", required=True, help="Archive ID to unregister files from")
@@ -8,8 +8,10 @@ routes to the application services through the service container.
 from fastapi import Request, Depends
 
 from ...application.container import ServiceContainer
-from ...application.services.simulation_service import SimulationApplicationService
-from ...application.services.location_service import LocationApplicationService
+from ...application.services.simulation_service import (AsyncSimulationApplicationService,
+                                                         SimulationApplicationService)
+from ...application.services.location_service import (AsyncLocationApplicationService,
+                                                       LocationApplicationService)
 from ...application.services.unified_file_service import UnifiedFileService
 
 
@@ -62,6 +64,36 @@ def get_location_service(
     return container.service_factory.location_service
 
 
+def get_async_simulation_service(
+    container: ServiceContainer = Depends(get_service_container)
+) -> AsyncSimulationApplicationService:
+    """
+    Get the async simulation service from the container.
+    
+    Args:
+        container: Service container instance
+        
+    Returns:
+        Async simulation service instance
+    """
+    return container.async_simulation_service
+
+
+def get_async_location_service(
+    container: ServiceContainer = Depends(get_service_container)
+) -> AsyncLocationApplicationService:
+    """
+    Get the async location service from the container.
+    
+    Args:
+        container: Service container instance
+        
+    Returns:
+        Async location service instance
+    """
+    return container.async_location_service
+
+
 def get_unified_file_service(
     container: ServiceContainer = Depends(get_service_container)
 ) -> UnifiedFileService:
@@ -17,8 +17,9 @@ from ....application.dtos import (
     LocationDto, CreateLocationDto, UpdateLocationDto,
     LocationListDto, LocationTestResult, PaginationInfo, FilterOptions
 )
-from ....application.services.location_service import LocationApplicationService
-from ..dependencies import get_location_service
+from ....application.services.location_service import (AsyncLocationApplicationService,
+                                                        LocationApplicationService)
+from ..dependencies import get_async_location_service, get_location_service
 
 router = APIRouter()
 
@@ -30,7 +31,7 @@ async def list_locations(
     page_size: int = Query(50, ge=1, le=100, description="Number of items per page"),
     search: Optional[str] = Query(None, description="Search term for location names"),
     kind: Optional[str] = Query(None, description="Filter by location kind (DISK, COMPUTE, etc.)"),
-    location_service: LocationApplicationService = Depends(get_location_service)
+    location_service: AsyncLocationApplicationService = Depends(get_async_location_service)
 ):
     """
     List all storage locations with pagination and optional filtering.
@@ -50,7 +51,7 @@ async def list_locations(
         # Note: Kind filtering would need to be added to FilterOptions or handled differently
         
         # Get locations using the service (it handles pagination and filtering)
-        result = location_service.list_locations(
+        result = await location_service.list_locations(
             page=page,
             page_size=page_size,
             filters=filters
@@ -121,7 +122,7 @@ async def create_location(
 @router.get("/{location_name}", response_model=LocationDto)
 async def get_location(
     location_name: str,
-    location_service: LocationApplicationService = Depends(get_location_service)
+    location_service: AsyncLocationApplicationService = Depends(get_async_location_service)
 ):
     """
     Get details of a specific location.
@@ -136,7 +137,7 @@ async def get_location(
         404: If location is not found
     """
     try:
-        location = location_service.get_location(location_name)
+        location = await location_service.get_location(location_name)
         return location
         
     except HTTPException:
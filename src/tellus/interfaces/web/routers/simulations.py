@@ -20,9 +20,12 @@ from ....application.dtos import (
     SimulationListDto, PaginationInfo, FilterOptions,
     SimulationLocationAssociationDto
 )
-from ....application.services.simulation_service import SimulationApplicationService
+from ....application.exceptions import ValidationError
+from ....application.services.simulation_service import (AsyncSimulationApplicationService,
+                                                          SimulationApplicationService)
 from ....application.services.unified_file_service import UnifiedFileService
-from ..dependencies import get_simulation_service, get_unified_file_service
+from ..dependencies import (get_async_simulation_service, get_simulation_service,
+                            get_unified_file_service)
 
 router = APIRouter()
 
@@ -88,7 +91,10 @@ async def list_simulations(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Number of items per page"),
     search: Optional[str] = Query(None, description="Search term for simulation IDs"),
-    simulation_service: SimulationApplicationService = Depends(get_simulation_service)
+    location: Optional[str] = Query(None, description="Only simulations associated with this location"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page (overrides page)"),
+    order_by: str = Query("simulation_id", description="Sort field, prefix with '-' for descending"),
+    simulation_service: AsyncSimulationApplicationService = Depends(get_async_simulation_service)
 ):
     """
     List all simulations with pagination and optional filtering.
@@ -97,23 +103,33 @@ async def list_simulations(
         page: Page number (1-based)
         page_size: Number of simulations per page (1-100)
         search: Optional search term to filter simulation IDs
+        location: Optional location filter
+        cursor: Optional cursor returned as pagination.next_cursor by the previous page
+        order_by: Field to sort by
         
     Returns:
         Paginated list of simulations with metadata
     """
     try:
         # Create filter options
-        filters = FilterOptions(search_term=search) if search else None
+        filters = FilterOptions(search_term=search, location=location) if (search or location) else None
         
         # Get simulations using the service (it handles pagination and filtering)
-        result = simulation_service.list_simulations(
+        result = await simulation_service.list_simulations(
             page=page,
             page_size=page_size,
-            filters=filters
+            filters=filters,
+            cursor=cursor,
+            order_by=order_by
         )
         
         return result
         
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -169,7 +185,7 @@ async def create_simulation(
 @router.get("/{simulation_id}", response_model=SimulationDto)
 async def get_simulation(
     simulation_id: str,
-    simulation_service: SimulationApplicationService = Depends(get_simulation_service)
+    simulation_service: AsyncSimulationApplicationService = Depends(get_async_simulation_service)
 ):
     """
     Get details of a specific simulation.
@@ -184,7 +200,7 @@ async def get_simulation(
         404: If simulation is not found
     """
     try:
-        simulation = simulation_service.get_simulation(simulation_id)
+        simulation = await simulation_service.get_simulation(simulation_id)
         return simulation
         
     except HTTPException:
@@ -900,7 +916,7 @@ class ArchiveContentResponse(BaseModel):
     """Response model for archive content listing."""
     archive_id: str = Field(..., description="The archive identifier")
     files: List[Dict[str, Any]] = Field(..., description="List of files in the archive")
-    total_files: int = Field(..., description="Total number of files")
+    total_files: int = Field(..., description="Total number of matching files across all pages")
 
 
 @router.get(
@@ -974,7 +990,7 @@ async def list_archive_contents(
         return ArchiveContentResponse(
             archive_id=archive_id,
             files=file_list,
-            total_files=len(file_list)
+            total_files=file_service.count_files(**filters)
         )
         
     except HTTPException:
@@ -1089,50 +1105,63 @@ async def list_simulation_files(
     file_service: UnifiedFileService = Depends(get_unified_file_service),
     location: Optional[str] = Query(None, description="Filter by location"),
     content_type: Optional[str] = Query(None, description="Filter by content type"),
-    file_type: Optional[str] = Query(None, description="Filter by file type (regular, archive, directory)")
+    file_type: Optional[str] = Query(None, description="Filter by file type (regular, archive, directory)"),
+    start_year: Optional[int] = Query(None, description="First simulation year (inclusive)"),
+    end_year: Optional[int] = Query(None, description="Last simulation year (inclusive)"),
+    offset: int = Query(0, ge=0, description="Number of files to skip"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of files to return")
 ):
     """
     List files associated with a simulation.
     
+    Filtering and pagination are done by the file repository.
+    
     Args:
         simulation_id: The simulation identifier
         location: Optional location filter
         content_type: Optional content type filter
         file_type: Optional file type filter
+        start_year: Optional first simulation year
+        end_year: Optional last simulation year
+        offset: Number of files to skip
+        limit: Maximum number of files to return
         
     Returns:
         List of files associated with the simulation
     """
     try:
-        # Get simulation files
-        files = file_service.get_simulation_files(simulation_id)
-        
-        # Apply filters
-        if location:
-            files = [f for f in files if f.location_name == location]
+        from ....domain.entities.simulation_file import FileContentType, FileType
         
+        ct = None
         if content_type:
-            from ....domain.entities.simulation_file import FileContentType
             try:
                 ct = FileContentType(content_type)
-                files = [f for f in files if f.content_type == ct]
             except ValueError:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Invalid content type: {content_type}"
                 )
         
+        ft = None
         if file_type:
-            from ....domain.entities.simulation_file import FileType
             try:
                 ft = FileType(file_type)
-                files = [f for f in files if f.file_type == ft]
             except ValueError:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Invalid file type: {file_type}"
                 )
         
+        filters = dict(
+            simulation_id=simulation_id,
+            location_name=location,
+            content_type=ct,
+            file_type=ft,
+            start_year=start_year,
+            end_year=end_year,
+        )
+        files = file_service.list_files(**filters, offset=offset, limit=limit)
+        
         # Convert to response format
         file_list = []
         for file_obj in files:
@@ -1151,9 +1180,11 @@ async def list_simulation_files(
         return FileListResponse(
             simulation_id=simulation_id,
             files=file_list,
-            total_files=len(file_list)
+            total_files=file_service.count_files(**filters)
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1302,12 +1333,13 @@ async def unregister_files_from_simulation(
             archive_files = [f for f in archive_files if fnmatch.fnmatch(f.relative_path, request.pattern_filter)]
         
         # Unregister files
-        unregistered_count = 0
+        unregistered = []
         for file_obj in archive_files:
             if 'simulation_id' in file_obj.attributes:
                 del file_obj.attributes['simulation_id']
-                file_service.file_repository.save(file_obj)
-                unregistered_count += 1
+                unregistered.append(file_obj)
+        file_service.file_repository.save_many(unregistered)
+        unregistered_count = len(unregistered)
         
         return UnregisterFilesResponse(
             simulation_id=simulation_id,
@@ -8,7 +8,7 @@ test client setup, mock services, and test data.
 import pytest
 import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 from typing import Generator, Dict, Any, List
 
@@ -55,7 +55,7 @@ def mock_simulation_service():
     ]
     
     # Configure mock methods - handle parameters properly
-    def mock_list_simulations(page=1, page_size=50, filters=None):
+    def mock_list_simulations(page=1, page_size=50, filters=None, cursor=None, order_by="simulation_id"):
         # Apply search filter if provided
         filtered_sims = mock_simulations
         if filters and filters.search_term:
@@ -409,6 +409,16 @@ def mock_file_service():
     return service
 
 
+def async_service_facade(service, *method_names):
+    """Async service mock whose methods delegate to the sync service mock."""
+    facade = MagicMock()
+    for name in method_names:
+        setattr(facade, name, AsyncMock(
+            side_effect=lambda *args, _name=name, **kwargs: getattr(service, _name)(*args, **kwargs)
+        ))
+    return facade
+
+
 @pytest.fixture
 def mock_service_container(mock_simulation_service, mock_location_service, mock_file_service):
     """Mock service container for dependency injection."""
@@ -420,6 +430,10 @@ def mock_service_container(mock_simulation_service, mock_location_service, mock_
     mock_factory.location_service = mock_location_service
     mock_factory.unified_file_service = mock_file_service
     container.service_factory = mock_factory
+    container.async_simulation_service = async_service_facade(
+        mock_simulation_service, "get_simulation", "list_simulations")
+    container.async_location_service = async_service_facade(
+        mock_location_service, "get_location", "list_locations")
     
     return container
 
@@ -0,0 +1,99 @@
+"""
+Throughput benchmark for archive compression codecs.
+
+Compresses the same synthetic tar stream with Python's single-threaded gzip,
+as ArchiveCreationService used to, and with ParallelCompressionWriter for
+every codec and level, once with a single worker and once with one worker
+per CPU.
+
+Run with:
+    pytest -m performance tests/performance/test_archive_compression_benchmark.py -s
+
+The data size can be tuned via TELLUS_BENCH_COMPRESSION_MB (default 64).
+"""
+
+import gzip
+import io
+import os
+import random
+import time
+
+import pytest
+
+from tellus.domain.services.archive_compression import (CompressionCodec,
+                                                        CompressionLevel,
+                                                        ParallelCompressionWriter)
+
+pytestmark = [pytest.mark.performance, pytest.mark.benchmark]
+
+DATA_MB = int(os.getenv("TELLUS_BENCH_COMPRESSION_MB", "64"))
+WRITE_SIZE = 16 * 1024  # tarfile copies member data in 16 KiB chunks
+LEVELS = [CompressionLevel.FAST, CompressionLevel.BALANCED, CompressionLevel.BEST]
+
+
+def _model_output(size):
+    """Float-like records with low-order noise, roughly as compressible as model output."""
+    rng = random.Random(42)
+    record = bytearray()
+    while len(record) < 1024 * 1024:
+        record += f"{rng.gauss(280.0, 15.0):.3f} ".encode()
+    data = bytearray()
+    while len(data) < size:
+        data += record
+        data += rng.randbytes(4096)
+    return bytes(data[:size])
+
+
+def _throughput(compress, data):
+    start = time.perf_counter()
+    compressed_size = compress(data)
+    elapsed = time.perf_counter() - start
+    return len(data) / elapsed / 1024**2, compressed_size / len(data)
+
+
+def _serial_gzip(level):
+    def compress(data):
+        output = io.BytesIO()
+        with gzip.GzipFile(fileobj=output, mode="wb", compresslevel=level.value) as stream:
+            for offset in range(0, len(data), WRITE_SIZE):
+                stream.write(data[offset:offset + WRITE_SIZE])
+        return len(output.getvalue())
+    return compress
+
+
+def _parallel(codec, level, workers):
+    def compress(data):
+        output = io.BytesIO()
+        with ParallelCompressionWriter(output, codec=codec, level=level, workers=workers) as writer:
+            for offset in range(0, len(data), WRITE_SIZE):
+                writer.write(data[offset:offset + WRITE_SIZE])
+        return len(output.getvalue())
+    return compress
+
+
+def _codecs():
+    codecs = [CompressionCodec.GZIP, CompressionCodec.XZ]
+    try:
+        import zstandard  # noqa: F401
+        codecs.append(CompressionCodec.ZSTD)
+    except ImportError:
+        pass
+    return codecs
+
+
+def test_compression_throughput():
+    """Report MB/s and compression ratio per codec, level and worker count."""
+    data = _model_output(DATA_MB * 1024**2)
+    cpus = os.cpu_count() or 1
+
+    print(f"\nCompressing {DATA_MB} MB on {cpus} CPUs")
+    print(f"{'codec':<14}{'level':<10}{'workers':>8}{'MB/s':>10}{'ratio':>8}")
+
+    for level in LEVELS:
+        rate, ratio = _throughput(_serial_gzip(level), data)
+        print(f"{'gzip (serial)':<14}{level.name:<10}{1:>8}{rate:>10.1f}{ratio:>8.3f}")
+
+        for codec in _codecs():
+            for workers in sorted({1, cpus}):
+                rate, ratio = _throughput(_parallel(codec, level, workers), data)
+                print(f"{codec.value:<14}{level.name:<10}{workers:>8}{rate:>10.1f}{ratio:>8.3f}")
@@ -0,0 +1,105 @@
+"""
+Benchmark for registering archive members to a simulation.
+
+Compares the per-file save() loop used before bulk persistence existed with
+UnifiedFileService.register_files_to_simulation, which now persists through
+save_many(). The per-file loop is quadratic on the JSON backend, so it runs on
+a smaller sample and is extrapolated to the full size.
+
+Run with:
+    pytest -m performance tests/performance/test_file_registration_benchmark.py -s
+
+Sizes can be tuned via TELLUS_BENCH_FILES (default 100000) and
+TELLUS_BENCH_BASELINE_FILES (default 2000).
+"""
+
+import os
+import time
+
+import pytest
+
+from tellus.application.dtos import FileRegistrationDto
+from tellus.application.services.unified_file_service import UnifiedFileService
+from tellus.domain.entities.simulation_file import FileType, SimulationFile
+from tellus.infrastructure.repositories.indexed_simulation_file_repository import \
+    IndexedSimulationFileRepository
+from tellus.infrastructure.repositories.json_simulation_file_repository import \
+    JsonSimulationFileRepository
+
+pytestmark = [pytest.mark.performance, pytest.mark.benchmark]
+
+N_FILES = int(os.getenv("TELLUS_BENCH_FILES", "100000"))
+N_BASELINE = int(os.getenv("TELLUS_BENCH_BASELINE_FILES", "2000"))
+
+BACKENDS = {
+    "json": JsonSimulationFileRepository,
+    "indexed": lambda storage_dir: IndexedSimulationFileRepository(
+        storage_dir=storage_dir, background_compaction=False
+    ),
+}
+
+
+def _archive_members(count):
+    archive = SimulationFile(
+        relative_path="archive.tar.gz",
+        file_type=FileType.ARCHIVE,
+        attributes={"simulation_id": "staging"},
+    )
+    members = [
+        SimulationFile(
+            relative_path=f"outdata/fesom/temp.fesom.{1850 + i // 12}.{i % 12 + 1:02d}.{i}.nc",
+            size=1024 * (i % 100 + 1),
+            parent_file_id="archive.tar.gz",
+            attributes={"simulation_id": "staging"},
+        )
+        for i in range(count)
+    ]
+    return archive, members
+
+
+def _time_per_file_loop(repository, count):
+    _, members = _archive_members(count)
+    for member in members:
+        member.attributes["simulation_id"] = "target"
+    start = time.perf_counter()
+    for member in members:
+        repository.save(member)
+    return time.perf_counter() - start
+
+
+def _time_registration(repository, count):
+    archive, members = _archive_members(count)
+    repository.save_many([archive] + members)
+
+    service = UnifiedFileService(repository)
+    start = time.perf_counter()
+    result = service.register_files_to_simulation(
+        FileRegistrationDto(archive_id="archive.tar.gz", simulation_id="target",
+                            overwrite_existing=True)
+    )
+    elapsed = time.perf_counter() - start
+
+    assert result.success, result.error_message
+    assert result.files_updated == count
+    return elapsed
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_registration_throughput(backend, tmp_path):
+    """Report per-file vs. bulk registration time for each backend."""
+    create = BACKENDS[backend]
+
+    baseline = _time_per_file_loop(create(str(tmp_path / "baseline")), N_BASELINE)
+    bulk = _time_registration(create(str(tmp_path / "bulk")), N_FILES)
+
+    # The per-file loop rewrites the whole simulation file on every save for
+    # the JSON backend, so its cost grows quadratically with the file count.
+    scale = N_FILES / N_BASELINE
+    extrapolated = baseline * (scale ** 2 if backend == "json" else scale)
+
+    print(
+        f"\n[{backend}] per-file save: {N_BASELINE} files in {baseline:.2f}s "
+        f"(~{extrapolated:.0f}s extrapolated to {N_FILES}); "
+        f"save_many registration: {N_FILES} files in {bulk:.2f}s "
+        f"({N_FILES / bulk:,.0f} files/s)"
+    )
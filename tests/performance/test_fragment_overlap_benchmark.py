@@ -0,0 +1,80 @@
+"""
+Benchmark for overlap detection between archive fragments.
+
+Compares the pairwise comparison FragmentAssemblyService used to do, which
+rebuilt both fragments' path sets for every pair, with the inverted index
+and interval tree from fragment_overlaps, for 500 yearly fragments.
+
+Run with:
+    pytest -m performance tests/performance/test_fragment_overlap_benchmark.py -s
+
+The fragment count and files per fragment can be tuned via
+TELLUS_BENCH_FRAGMENTS (default 500) and TELLUS_BENCH_FRAGMENT_FILES
+(default 2000). The pairwise comparison is skipped above 200 fragments
+unless TELLUS_BENCH_PAIRWISE=1 is set, as it takes minutes.
+"""
+
+import os
+import time
+from datetime import datetime
+from itertools import combinations
+
+import pytest
+
+from tellus.domain.services.fragment_overlaps import (find_overlapping_intervals,
+                                                      find_shared_files)
+
+pytestmark = [pytest.mark.performance, pytest.mark.benchmark]
+
+FRAGMENTS = int(os.getenv("TELLUS_BENCH_FRAGMENTS", "500"))
+FILES_PER_FRAGMENT = int(os.getenv("TELLUS_BENCH_FRAGMENT_FILES", "2000"))
+RUN_PAIRWISE = FRAGMENTS <= 200 or os.getenv("TELLUS_BENCH_PAIRWISE") == "1"
+
+
+def _yearly_fragments():
+    """Yearly output fragments sharing their namelists and the last month of the previous year."""
+    file_sets = []
+    date_ranges = []
+    for index in range(FRAGMENTS):
+        year = 1850 + index
+        files = [f"outdata/fesom/var{n}.fesom.{year}.nc" for n in range(FILES_PER_FRAGMENT - 5)]
+        files += [f"config/namelist.{model}" for model in ("echam", "fesom", "jsbach")]
+        files += [f"outdata/fesom/var0.fesom.{year - 1}12.nc", f"restart/fesom.{year}.nc"]
+        file_sets.append(files)
+        date_ranges.append((datetime(year - 1, 12, 1), datetime(year, 12, 31)))
+    return file_sets, date_ranges
+
+
+def _pairwise(file_sets, date_ranges):
+    overlaps = 0
+    for i, j in combinations(range(len(file_sets)), 2):
+        # Sets are rebuilt per pair, as _analyze_fragment_overlap did
+        if set(file_sets[i]) & set(file_sets[j]):
+            overlaps += 1
+        elif date_ranges[i][0] <= date_ranges[j][1] and date_ranges[j][0] <= date_ranges[i][1]:
+            overlaps += 1
+    return overlaps
+
+
+def _indexed(file_sets, date_ranges):
+    shared = find_shared_files(file_sets)
+    temporal = find_overlapping_intervals(date_ranges)
+    return len(set(shared).union(temporal))
+
+
+def test_overlap_detection():
+    """Report overlap detection time for pairwise comparison and the inverted index."""
+    file_sets, date_ranges = _yearly_fragments()
+    print(f"\n{FRAGMENTS} fragments with {FILES_PER_FRAGMENT} files each")
+
+    start = time.perf_counter()
+    indexed = _indexed(file_sets, date_ranges)
+    indexed_time = time.perf_counter() - start
+    print(f"{'inverted index':<16}{indexed_time:>10.2f}s{indexed:>10} overlaps")
+
+    if RUN_PAIRWISE:
+        start = time.perf_counter()
+        pairwise = _pairwise(file_sets, date_ranges)
+        pairwise_time = time.perf_counter() - start
+        print(f"{'pairwise':<16}{pairwise_time:>10.2f}s{pairwise:>10} overlaps")
+        assert pairwise == indexed
@@ -0,0 +1,76 @@
+"""
+Benchmark for sync repository calls on a SQLite database.
+
+Compares calling the async repository through ``asyncio.run()`` on an engine
+without connection pooling, as the sync wrappers used to, with
+AsyncSimulationRepositoryWrapper, which runs every call on the shared
+background event loop with a pooled engine.
+
+Run with:
+    pytest -m performance tests/performance/test_repository_event_loop_benchmark.py -s
+
+The number of lookups can be tuned via TELLUS_BENCH_LOOKUPS (default 10000).
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from tellus.domain.entities.simulation import SimulationEntity
+from tellus.infrastructure.database.config import DatabaseConfig, DatabaseManager
+from tellus.infrastructure.database.event_loop import get_background_loop
+from tellus.infrastructure.repositories.postgres_simulation_repository import (
+    AsyncSimulationRepositoryWrapper, PostgresSimulationRepository)
+
+pytestmark = [pytest.mark.performance, pytest.mark.benchmark]
+
+N_LOOKUPS = int(os.getenv("TELLUS_BENCH_LOOKUPS", "10000"))
+N_SIMULATIONS = 100
+
+
+def _simulation_ids():
+    return [f"sim_{i:03d}" for i in range(N_SIMULATIONS)]
+
+
+def _populate(manager):
+    async def populate():
+        await manager.create_tables()
+        repository = PostgresSimulationRepository()
+        for simulation_id in _simulation_ids():
+            await repository.save(SimulationEntity(simulation_id=simulation_id, model_id="fesom"))
+
+    get_background_loop().run(populate())
+
+
+def _time_lookups(get_by_id):
+    ids = _simulation_ids()
+    start = time.perf_counter()
+    for i in range(N_LOOKUPS):
+        assert get_by_id(ids[i % len(ids)]) is not None
+    return time.perf_counter() - start
+
+
+def test_get_by_id_throughput(tmp_path):
+    """Report asyncio.run() per call vs. the background loop wrapper."""
+    pooled = DatabaseManager(DatabaseConfig.for_sqlite(str(tmp_path / "tellus.db")))
+    with patch('tellus.infrastructure.database.config.get_database_manager', return_value=pooled):
+        _populate(pooled)
+        wrapper = AsyncSimulationRepositoryWrapper(PostgresSimulationRepository())
+        background = _time_lookups(wrapper.get_by_id)
+    get_background_loop().run(pooled.close())
+
+    # Previous behaviour: a new event loop and a new connection for every call
+    unpooled = DatabaseManager(DatabaseConfig.for_sqlite(str(tmp_path / "tellus.db")))
+    with patch.dict(os.environ, {"TESTING": "1"}), \
+            patch('tellus.infrastructure.database.config.get_database_manager', return_value=unpooled):
+        repository = PostgresSimulationRepository()
+        per_call = _time_lookups(lambda simulation_id: asyncio.run(repository.get_by_id(simulation_id)))
+    asyncio.run(unpooled.close())
+
+    print(
+        f"\nget_by_id x{N_LOOKUPS}: asyncio.run() per call {per_call:.2f}s "
+        f"({N_LOOKUPS / per_call:,.0f} calls/s); background loop {background:.2f}s "
+        f"({N_LOOKUPS / background:,.0f} calls/s); speedup {per_call / background:.1f}x"
+    )
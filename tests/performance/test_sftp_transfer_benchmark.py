@@ -0,0 +1,182 @@
+"""
+Throughput benchmark for transfers between SFTP and local filesystems.
+
+Runs an in-process SFTP server on localhost as a stand-in for a remote
+location and copies the same file sftp→file and file→sftp three ways:
+
+- sequentially, one blocking read or write request at a time, as
+  FileTransferApplicationService used to;
+- with FSSpecTransferEngine, in one stream and as byte ranges over four
+  SSH connections;
+- with paramiko's own ``getfo``/``putfo``, which prefetch and pipeline and
+  serve as the line-rate reference.
+
+Run with:
+    pytest -m performance tests/performance/test_sftp_transfer_benchmark.py -s
+
+The file size can be tuned via TELLUS_BENCH_TRANSFER_MB (default 32).
+"""
+
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+paramiko = pytest.importorskip("paramiko")
+fsspec = pytest.importorskip("fsspec")
+
+from tellus.infrastructure.adapters.fsspec_transfer import FSSpecTransferEngine
+
+pytestmark = [pytest.mark.performance, pytest.mark.benchmark]
+
+DATA_MB = int(os.getenv("TELLUS_BENCH_TRANSFER_MB", "32"))
+SEQUENTIAL_CHUNK_SIZE = 32 * 1024
+USERNAME = PASSWORD = "tellus"
+
+
+class _Handle(paramiko.SFTPHandle):
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+
+class _LocalSFTPServer(paramiko.SFTPServerInterface):
+    """Serves the local filesystem unchanged."""
+
+    def open(self, path, flags, attr):
+        try:
+            fd = os.open(path, flags, 0o644)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        mode = "rb" if flags & (os.O_WRONLY | os.O_RDWR) == 0 else "r+b"
+        handle = _Handle(flags)
+        handle.readfile = handle.writefile = os.fdopen(fd, mode)
+        return handle
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    lstat = stat
+
+    def list_folder(self, path):
+        try:
+            return [paramiko.SFTPAttributes.from_stat(os.stat(os.path.join(path, name)), name)
+                    for name in os.listdir(path)]
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def mkdir(self, path, attr):
+        try:
+            os.mkdir(path)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+
+class _PasswordServer(paramiko.ServerInterface):
+    def check_auth_password(self, username, password):
+        if (username, password) == (USERNAME, PASSWORD):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+
+@pytest.fixture(scope="module")
+def sftp_server():
+    """Port of an SFTP server on localhost, accepting connections until the module ends."""
+    host_key = paramiko.RSAKey.generate(2048)
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    transports = []
+
+    def serve():
+        while True:
+            try:
+                connection, _ = listener.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(connection)
+            transport.add_server_key(host_key)
+            transport.set_subsystem_handler("sftp", paramiko.SFTPServer, _LocalSFTPServer)
+            transport.start_server(server=_PasswordServer())
+            transports.append(transport)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield listener.getsockname()[1]
+    listener.close()
+    for transport in transports:
+        transport.close()
+
+
+@pytest.fixture
+def sftp_fs(sftp_server):
+    fs = fsspec.filesystem("sftp", host="127.0.0.1", port=sftp_server, username=USERNAME,
+                           password=PASSWORD, look_for_keys=False, allow_agent=False, skip_instance_cache=True)
+    yield fs
+    fs.client.close()
+
+
+def _sequential(source_fs, source_path, dest_fs, dest_path):
+    with source_fs.open(source_path, "rb") as source, dest_fs.open(dest_path, "wb") as dest:
+        while chunk := source.read(SEQUENTIAL_CHUNK_SIZE):
+            dest.write(chunk)
+
+
+def _engine(source_fs, source_path, dest_fs, dest_path):
+    FSSpecTransferEngine().copy(source_fs, source_path, dest_fs, dest_path)
+
+
+def _ranged(source_fs, source_path, dest_fs, dest_path):
+    FSSpecTransferEngine().copy_ranges(source_fs, source_path, dest_fs, dest_path, streams=4)
+
+
+def _paramiko(source_fs, source_path, dest_fs, dest_path):
+    if hasattr(source_fs, "ftp"):
+        with open(dest_path, "wb") as dest:
+            source_fs.ftp.getfo(source_path, dest)
+    else:
+        with open(source_path, "rb") as source:
+            dest_fs.ftp.putfo(source, dest_path)
+
+
+def _throughput(copy, *args):
+    start = time.perf_counter()
+    copy(*args)
+    return DATA_MB / (time.perf_counter() - start)
+
+
+@pytest.mark.parametrize("direction", ["sftp→file", "file→sftp"])
+def test_sftp_transfer_throughput(tmp_path, sftp_fs, direction):
+    source = tmp_path / "source.nc"
+    source.write_bytes(os.urandom(DATA_MB * 1024 * 1024))
+    local_fs = fsspec.filesystem("file")
+
+    results = {}
+    for name, copy in (("sequential", _sequential), ("engine", _engine), ("ranged", _ranged),
+                       ("paramiko", _paramiko)):
+        dest = tmp_path / f"{name}.nc"
+        if direction == "sftp→file":
+            results[name] = _throughput(copy, sftp_fs, str(source), local_fs, str(dest))
+        else:
+            results[name] = _throughput(copy, local_fs, str(source), sftp_fs, str(dest))
+        assert dest.read_bytes() == source.read_bytes()
+
+    print(f"\n{direction} {DATA_MB} MiB: " + ", ".join(f"{name} {mbps:.1f} MiB/s" for name, mbps in results.items()))
+    assert results["engine"] >= 0.8 * results["paramiko"]
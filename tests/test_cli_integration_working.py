@@ -372,6 +372,68 @@ class TestCLIPerformance:
             assert result.exit_code == 0
 
 
+class TestSimulationFilesAddCommand:
+    """Test tellus simulation files add --from-directory."""
+
+    @pytest.fixture
+    def container(self, temp_dir):
+        """Service container with a JSON file repository and a known simulation."""
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        from tellus.application.services.unified_file_service import UnifiedFileService
+        from tellus.infrastructure.repositories.json_simulation_file_repository import \
+            JsonSimulationFileRepository
+
+        simulation_service = MagicMock()
+        simulation_service.get_simulation.side_effect = lambda sim_id: object() if sim_id == "test_sim_001" else None
+        repository = JsonSimulationFileRepository(str(temp_dir / "files"))
+        container = SimpleNamespace(
+            project_data_path=temp_dir / ".tellus",
+            service_factory=SimpleNamespace(
+                simulation_service=simulation_service,
+                unified_file_service=UnifiedFileService(repository)
+            )
+        )
+        with patch('tellus.interfaces.cli.simulation_extended.get_service_container', return_value=container):
+            yield container
+
+    @pytest.fixture
+    def experiment(self, temp_dir):
+        directory = temp_dir / "exp01"
+        (directory / "outdata").mkdir(parents=True)
+        (directory / "outdata" / "fesom.2000.nc").write_bytes(b"x" * 100)
+        (directory / "run.log").write_text("done")
+        return directory
+
+    def test_registers_and_rescans_directory(self, runner, app, container, experiment):
+        args = ['simulation', 'files', 'add', 'test_sim_001', '--from-directory', str(experiment)]
+
+        result = runner.invoke(app, args, catch_exceptions=False)
+
+        assert result.exit_code == 0
+        assert "Error" not in result.output
+        assert "2 files registered" in result.output
+        repository = container.service_factory.unified_file_service.file_repository
+        assert sorted(f.relative_path for f in repository.list_by_simulation("test_sim_001")) == [
+            "outdata/fesom.2000.nc", "run.log"]
+
+        (experiment / "run.log").write_text("restarted")
+        (experiment / "outdata" / "fesom.2000.nc").unlink()
+        result = runner.invoke(app, args, catch_exceptions=False)
+
+        assert "1 files registered" in result.output
+        assert "0 new, 1 modified, 0 unchanged" in result.output
+        assert "outdata/fesom.2000.nc" in result.output
+
+    def test_unknown_simulation(self, runner, app, container, experiment):
+        result = runner.invoke(app, ['simulation', 'files', 'add', 'missing', '--from-directory', str(experiment)],
+                               catch_exceptions=False)
+
+        assert result.exit_code == 0
+        assert "not found" in result.output.lower()
+
+
 @pytest.mark.integration 
 class TestCLIWithRealData:
     """Integration tests that work with actual data files."""
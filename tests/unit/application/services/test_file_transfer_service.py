@@ -0,0 +1,408 @@
+"""
+Unit tests for FileTransferApplicationService transfers through location filesystems.
+"""
+
+import asyncio
+import hashlib
+import time
+import uuid
+from unittest.mock import Mock
+
+import fsspec
+import pytest
+
+from tellus.application.dtos import (BatchFileTransferOperationDto,
+                                     DirectoryTransferOperationDto,
+                                     FileTransferOperationDto)
+from tellus.application.services.file_transfer_service import \
+    FileTransferApplicationService
+from tellus.domain.entities.location import LocationEntity, LocationKind
+from tellus.domain.entities.network_connection import (ConnectionType,
+                                                       NetworkConnection)
+from tellus.domain.entities.network_metrics import (BandwidthMetrics,
+                                                    LatencyMetrics)
+from tellus.domain.entities.network_topology import NetworkTopology
+from tellus.infrastructure.adapters.sandboxed_filesystem import \
+    PathSandboxedFileSystem
+
+
+@pytest.fixture
+def memory_root():
+    """Unique root on the in-memory filesystem, cleaned up after the test."""
+    fs = fsspec.filesystem("memory")
+    root = f"/hpc-{uuid.uuid4().hex}"
+    fs.makedirs(root, exist_ok=True)
+    yield root
+    fs.rm(root, recursive=True)
+
+
+@pytest.fixture
+def locations(tmp_path, memory_root):
+    """A local disk location and a 'remote' location on the memory filesystem."""
+    return {
+        "workspace": LocationEntity(name="workspace", kinds=[LocationKind.DISK],
+                                    config={"protocol": "file", "path": str(tmp_path)}),
+        "hpc": LocationEntity(name="hpc", kinds=[LocationKind.COMPUTE],
+                              config={"protocol": "memory", "path": memory_root}),
+    }
+
+
+def create_filesystem(location):
+    return PathSandboxedFileSystem(fsspec.filesystem(location.get_protocol()), location.get_base_path())
+
+
+@pytest.fixture
+def service(locations):
+    repo = Mock()
+    repo.get_by_name = Mock(side_effect=locations.get)
+    return FileTransferApplicationService(repo, filesystem_factory=create_filesystem)
+
+
+class TestFileTransfer:
+    """Test single file transfers between location filesystems."""
+
+    @pytest.mark.asyncio
+    async def test_remote_to_local(self, service, memory_root, tmp_path):
+        data = b"\x00\x01" * 300_000
+        fsspec.filesystem("memory").pipe(f"{memory_root}/outdata/echam.nc", data)
+
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="hpc", source_path="outdata/echam.nc",
+            dest_location="workspace", dest_path="data/echam.nc", chunk_size=64 * 1024
+        ))
+
+        assert result.success, result.error_message
+        assert result.bytes_transferred == len(data)
+        assert result.checksum_verified
+        assert (tmp_path / "data" / "echam.nc").read_bytes() == data
+
+    @pytest.mark.asyncio
+    async def test_local_to_remote(self, service, memory_root, tmp_path):
+        (tmp_path / "namelist.echam").write_text("&runctl\n/\n")
+
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="workspace", source_path="namelist.echam",
+            dest_location="hpc", dest_path="config/namelist.echam"
+        ))
+
+        assert result.success, result.error_message
+        assert fsspec.filesystem("memory").cat(f"{memory_root}/config/namelist.echam") == b"&runctl\n/\n"
+
+    @pytest.mark.asyncio
+    async def test_same_location_is_copied_server_side(self, service, memory_root, monkeypatch):
+        fsspec.filesystem("memory").pipe(f"{memory_root}/restart/fesom.nc", b"restart")
+        monkeypatch.setattr(service._transfer_engine, "_stream", lambda *args: pytest.fail("copy was streamed"))
+
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="hpc", source_path="restart/fesom.nc",
+            dest_location="hpc", dest_path="backup/fesom.nc"
+        ))
+
+        assert result.success, result.error_message
+        assert fsspec.filesystem("memory").cat(f"{memory_root}/backup/fesom.nc") == b"restart"
+
+    @pytest.mark.asyncio
+    async def test_existing_destination_without_overwrite(self, service, tmp_path):
+        (tmp_path / "a.nc").write_bytes(b"a")
+        (tmp_path / "b.nc").write_bytes(b"b")
+
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="workspace", source_path="a.nc",
+            dest_location="workspace", dest_path="b.nc", verify_checksum=False
+        ))
+
+        assert not result.success
+        assert "overwrite=False" in result.error_message
+        assert (tmp_path / "b.nc").read_bytes() == b"b"
+
+    @pytest.mark.asyncio
+    async def test_missing_source(self, service):
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="hpc", source_path="missing.nc",
+            dest_location="workspace", dest_path="missing.nc"
+        ))
+
+        assert not result.success
+        assert "Source file not found" in result.error_message
+
+    @pytest.mark.asyncio
+    async def test_transfer_does_not_block_event_loop(self, locations, tmp_path):
+        (tmp_path / "big.nc").write_bytes(b"x" * 200_000)
+
+        class SlowReads(PathSandboxedFileSystem):
+            def open(self, path, mode="rb", **kwargs):
+                f = super().open(path, mode, **kwargs)
+                if mode == "rb":
+                    read = f.read
+                    f.read = lambda size=-1: time.sleep(0.01) or read(size)
+                return f
+
+        repo = Mock()
+        repo.get_by_name = Mock(side_effect=locations.get)
+        service = FileTransferApplicationService(
+            repo, filesystem_factory=lambda location: SlowReads(fsspec.filesystem(location.get_protocol()),
+                                                           location.get_base_path())
+        )
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="workspace", source_path="big.nc",
+            dest_location="hpc", dest_path="copy/big.nc",
+            chunk_size=10_000, verify_checksum=False
+        ))
+        ticker.cancel()
+
+        assert result.success, result.error_message
+        # 20 reads of 10ms; the loop kept running meanwhile
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_default_filesystems_for_local_transfers(self, tmp_path):
+        (tmp_path / "run.log").write_bytes(b"done\n")
+        service = FileTransferApplicationService(Mock())
+
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="local", source_path=str(tmp_path / "run.log"),
+            dest_location="local", dest_path=str(tmp_path / "logs" / "run.log")
+        ))
+
+        assert result.success, result.error_message
+        assert (tmp_path / "logs" / "run.log").read_bytes() == b"done\n"
+
+
+class TestDirectoryTransfer:
+    """Test recursive transfers from location filesystems."""
+
+    @pytest.mark.asyncio
+    async def test_remote_directory(self, service, memory_root, tmp_path):
+        fs = fsspec.filesystem("memory")
+        for year in (2000, 2001):
+            fs.pipe(f"{memory_root}/outdata/echam.{year}.nc", str(year).encode())
+        fs.pipe(f"{memory_root}/outdata/tmp/scratch.tmp", b"scratch")
+
+        result = await service.transfer_directory(DirectoryTransferOperationDto(
+            source_location="hpc", source_path="outdata",
+            dest_location="workspace", dest_path="mirror",
+            exclude_patterns=["*.tmp"]
+        ))
+
+        assert len(result.successful_transfers) == 2
+        assert sorted(p.name for p in (tmp_path / "mirror").iterdir()) == ["echam.2000.nc", "echam.2001.nc"]
+        assert hashlib.sha256((tmp_path / "mirror" / "echam.2001.nc").read_bytes()).hexdigest() == \
+            hashlib.sha256(b"2001").hexdigest()
+
+
+class TestMultiStreamTransfer:
+    """Test transfers of large files as byte ranges over parallel streams."""
+
+    @pytest.fixture
+    def wan_locations(self, tmp_path):
+        """An 'sftp' location across a WAN link, served from a local directory."""
+        (tmp_path / "levante").mkdir()
+        (tmp_path / "workspace").mkdir()
+        return {
+            "levante": LocationEntity(name="levante", kinds=[LocationKind.COMPUTE],
+                                      config={"protocol": "sftp", "path": str(tmp_path / "levante"),
+                                              "storage_options": {"host": "levante.dkrz.de"}}),
+            "workspace": LocationEntity(name="workspace", kinds=[LocationKind.DISK],
+                                        config={"protocol": "file", "path": str(tmp_path / "workspace")}),
+        }
+
+    @pytest.fixture
+    def topology(self):
+        return NetworkTopology(name="default", connections=[NetworkConnection(
+            source_location="levante", destination_location="workspace",
+            connection_type=ConnectionType.WAN,
+            bandwidth_metrics=BandwidthMetrics(measured_mbps=1000.0),
+            latency_metrics=LatencyMetrics(avg_latency_ms=100.0, min_latency_ms=90.0, max_latency_ms=110.0)
+        )])
+
+    def make_service(self, wan_locations, topology=None):
+        repo = Mock()
+        repo.get_by_name = Mock(side_effect=wan_locations.get)
+        network_repo = Mock()
+        network_repo.get_topology = Mock(return_value=topology)
+        service = FileTransferApplicationService(
+            repo,
+            filesystem_factory=lambda location: PathSandboxedFileSystem(fsspec.filesystem("file"),
+                                                                        location.get_base_path()),
+            network_repository=network_repo
+        )
+        service._transfer_engine.chunk_size = 4096
+        service.multi_stream_threshold = 100_000
+        return service
+
+    @pytest.mark.asyncio
+    async def test_streams_from_network_metrics(self, wan_locations, topology, tmp_path, monkeypatch):
+        data = bytes(range(256)) * 1000
+        (tmp_path / "levante" / "restart.nc").write_bytes(data)
+        service = self.make_service(wan_locations, topology)
+        engine = service._transfer_engine
+        copy_ranges = engine.copy_ranges
+        streams = []
+        monkeypatch.setattr(engine, "copy_ranges", lambda *args, **kwargs: streams.append(args[4]) or
+                            copy_ranges(*args, **kwargs))
+
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="levante", source_path="restart.nc",
+            dest_location="workspace", dest_path="restart.nc"
+        ))
+
+        assert result.success, result.error_message
+        assert result.checksum_verified
+        assert streams == [6]
+        assert (tmp_path / "workspace" / "restart.nc").read_bytes() == data
+
+    @pytest.mark.asyncio
+    async def test_small_files_use_one_stream(self, wan_locations, topology, tmp_path, monkeypatch):
+        (tmp_path / "levante" / "namelist.echam").write_bytes(b"&runctl\n/\n")
+        service = self.make_service(wan_locations, topology)
+        monkeypatch.setattr(service._transfer_engine, "copy_ranges", lambda *args, **kwargs: pytest.fail("ranged"))
+
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="levante", source_path="namelist.echam",
+            dest_location="workspace", dest_path="namelist.echam"
+        ))
+
+        assert result.success, result.error_message
+
+    @pytest.mark.asyncio
+    async def test_differing_ranges_are_transferred_again(self, wan_locations, tmp_path, monkeypatch):
+        data = bytes(range(256)) * 1000
+        (tmp_path / "levante" / "restart.nc").write_bytes(data)
+        service = self.make_service(wan_locations)
+        engine = service._transfer_engine
+        checksum_ranges = engine.checksum_ranges
+        retransferred = []
+
+        def corrupt_once(filesystem, path, ranges, streams):
+            if not retransferred:
+                with open(tmp_path / "workspace" / "restart.nc", "r+b") as f:
+                    f.seek(200_000)
+                    f.write(b"bit rot")
+            written = checksum_ranges(filesystem, path, ranges, streams)
+            retransferred.append([r.offset for r, w in zip(ranges, written) if r.checksum != w.checksum])
+            return written
+
+        monkeypatch.setattr(engine, "checksum_ranges", corrupt_once)
+        result = await service.transfer_file(FileTransferOperationDto(
+            source_location="levante", source_path="restart.nc",
+            dest_location="workspace", dest_path="restart.nc", parallel_streams=4
+        ))
+
+        assert result.success, result.error_message
+        assert result.checksum_verified
+        assert retransferred == [[192_000], []]
+        assert (tmp_path / "workspace" / "restart.nc").read_bytes() == data
+
+
+class TestResumableTransfer:
+    """Test resuming interrupted transfers from the checkpoint journal."""
+
+    class DroppingFileSystem(PathSandboxedFileSystem):
+        """Remote filesystem whose reads fail once after ``limit`` bytes, like a dropped connection."""
+
+        limit = None
+        bytes_read = 0
+
+        def open(self, path, mode="rb", **kwargs):
+            f = super().open(path, mode, **kwargs)
+            if mode == "rb":
+                read = f.read
+
+                def dropping_read(size=-1):
+                    cls = TestResumableTransfer.DroppingFileSystem
+                    if cls.limit is not None and cls.bytes_read >= cls.limit:
+                        cls.limit = None
+                        raise IOError("connection lost")
+                    data = read(size)
+                    cls.bytes_read += len(data)
+                    return data
+
+                f.read = dropping_read
+            return f
+
+    @pytest.fixture
+    def make_service(self, tmp_path):
+        (tmp_path / "hpc").mkdir()
+        (tmp_path / "workspace").mkdir()
+        locations = {
+            "hpc": LocationEntity(name="hpc", kinds=[LocationKind.COMPUTE],
+                                  config={"protocol": "sftp", "path": str(tmp_path / "hpc"),
+                                          "storage_options": {"host": "levante.dkrz.de"}}),
+            "workspace": LocationEntity(name="workspace", kinds=[LocationKind.DISK],
+                                        config={"protocol": "file", "path": str(tmp_path / "workspace")}),
+        }
+
+        def make_service():
+            repo = Mock()
+            repo.get_by_name = Mock(side_effect=locations.get)
+            service = FileTransferApplicationService(
+                repo,
+                filesystem_factory=lambda location: (
+                    self.DroppingFileSystem if location.name == "hpc" else PathSandboxedFileSystem
+                )(fsspec.filesystem("file"), location.get_base_path()),
+                journal_directory=tmp_path / "journal"
+            )
+            service.retry_backoff_base = 0
+            engine = service._transfer_engine
+            copy = engine.copy
+            engine.copy = lambda *args, **kwargs: copy(*args, checkpoint_size=50_000, **kwargs)
+            return service
+
+        self.DroppingFileSystem.limit = None
+        self.DroppingFileSystem.bytes_read = 0
+        return make_service
+
+    @pytest.mark.asyncio
+    async def test_retry_resumes_at_checkpoint(self, make_service, tmp_path):
+        data = bytes(range(256)) * 1000
+        (tmp_path / "hpc" / "restart.nc").write_bytes(data)
+        self.DroppingFileSystem.limit = 120_000
+
+        result = await make_service().transfer_file(FileTransferOperationDto(
+            source_location="hpc", source_path="restart.nc",
+            dest_location="workspace", dest_path="restart.nc", chunk_size=10_000
+        ))
+
+        assert result.success, result.error_message
+        assert result.partial_transfer
+        assert result.bytes_transferred == len(data) - 100_000
+        # The checksum verification reads the file once more
+        assert self.DroppingFileSystem.bytes_read == 120_000 + len(data) - 100_000 + len(data)
+        assert (tmp_path / "workspace" / "restart.nc").read_bytes() == data
+        assert not list((tmp_path / "journal").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_rerun_continues_batch(self, make_service, tmp_path):
+        for year in (2000, 2001):
+            (tmp_path / "hpc" / f"echam.{year}.nc").write_bytes(str(year).encode() * 10_000)
+        batch = BatchFileTransferOperationDto(operation_id="mget_1", parallel_transfers=1, transfers=[
+            FileTransferOperationDto(source_location="hpc", source_path=f"echam.{year}.nc",
+                                     dest_location="workspace", dest_path=f"echam.{year}.nc")
+            for year in (2000, 2001, 2002)
+        ])
+
+        first = await make_service().batch_transfer_files(batch)
+        assert len(first.successful_transfers) == 2
+        assert (tmp_path / "journal" / "mget_1.jsonl").exists()
+
+        (tmp_path / "hpc" / "echam.2002.nc").write_bytes(b"2002" * 10_000)
+        read_before = self.DroppingFileSystem.bytes_read
+        second = await make_service().batch_transfer_files(batch)
+
+        assert len(second.successful_transfers) == 3
+        assert [r.metadata.get("skipped") is not None for r in second.successful_transfers] == [True, True, False]
+        assert not any(r.partial_transfer for r in second.successful_transfers)
+        assert [r.bytes_transferred for r in second.successful_transfers] == [0, 0, 40_000]
+        # Only the new file was read, once to copy and once to verify
+        assert self.DroppingFileSystem.bytes_read - read_before == 2 * 40_000
+        assert (tmp_path / "workspace" / "echam.2002.nc").read_bytes() == b"2002" * 10_000
+        assert not (tmp_path / "journal" / "mget_1.jsonl").exists()
@@ -0,0 +1,248 @@
+"""
+Unit tests for NetworkAwareFileTransferService relays and batch scheduling.
+"""
+
+import asyncio
+import posixpath
+import time
+from unittest.mock import AsyncMock, Mock
+
+import fsspec
+import pytest
+
+from tellus.application.dtos import (BatchFileTransferOperationDto,
+                                     FileTransferOperationDto,
+                                     FileTransferResultDto)
+from tellus.application.services.file_transfer_service import \
+    FileTransferApplicationService
+from tellus.application.services.network_aware_transfer_service import \
+    NetworkAwareFileTransferService
+from tellus.application.services.network_topology_service import (
+    NetworkPathDto, OptimalRouteResponseDto)
+from tellus.domain.entities.location import LocationEntity, LocationKind
+from tellus.domain.entities.network_connection import (ConnectionType,
+                                                       NetworkConnection)
+from tellus.domain.entities.network_metrics import (BandwidthMetrics,
+                                                    LatencyMetrics)
+from tellus.domain.entities.network_topology import NetworkTopology
+from tellus.infrastructure.adapters.sandboxed_filesystem import \
+    PathSandboxedFileSystem
+
+WRITE_DELAY = 0.02
+
+
+class ThrottledLink(PathSandboxedFileSystem):
+    """Location filesystem whose writes sleep, standing in for the link to its site; logs the site written."""
+
+    writes = []
+
+    def open(self, path, mode="rb", **kwargs):
+        f = super().open(path, mode, **kwargs)
+        if mode != "rb":
+            write = f.write
+
+            def throttled_write(data):
+                time.sleep(WRITE_DELAY)
+                ThrottledLink.writes.append(posixpath.basename(self.base_path.rstrip("/")))
+                return write(data)
+
+            f.write = throttled_write
+        return f
+
+
+def link(source, destination, mbps):
+    return NetworkConnection(
+        source_location=source, destination_location=destination,
+        connection_type=ConnectionType.WAN,
+        bandwidth_metrics=BandwidthMetrics(measured_mbps=mbps),
+        latency_metrics=LatencyMetrics(avg_latency_ms=20.0, min_latency_ms=15.0, max_latency_ms=25.0)
+    )
+
+
+@pytest.fixture
+def sites(tmp_path):
+    """Tape archive, gateway and workspace sites as local directories, reached over 'sftp'."""
+    locations = {}
+    for name in ("hsm", "albedo", "workspace"):
+        (tmp_path / name).mkdir()
+        locations[name] = LocationEntity(name=name, kinds=[LocationKind.DISK],
+                                         config={"protocol": "sftp", "path": str(tmp_path / name),
+                                                 "storage_options": {"host": f"{name}.dmawi.de"}})
+    ThrottledLink.writes = []
+    return locations
+
+
+@pytest.fixture
+def topology():
+    """The direct link to the workspace is slow; the path through the gateway is fast."""
+    return NetworkTopology(name="default", connections=[
+        link("hsm", "workspace", 10.0), link("hsm", "albedo", 1000.0), link("albedo", "workspace", 800.0)
+    ])
+
+
+@pytest.fixture
+def service(sites, topology):
+    repo = Mock()
+    repo.get_by_name = Mock(side_effect=sites.get)
+    base_service = FileTransferApplicationService(
+        repo,
+        filesystem_factory=lambda location: ThrottledLink(fsspec.filesystem("file"), location.get_base_path())
+    )
+    base_service.retry_backoff_base = 0
+
+    async def find_optimal_route(request):
+        path = topology.find_optimal_path(request.source_location, request.destination_location,
+                                          request.optimize_for)
+        return OptimalRouteResponseDto(
+            request_id="route_1",
+            primary_path=NetworkPathDto(
+                source_location=path.source_location, destination_location=path.destination_location,
+                intermediate_hops=path.intermediate_hops, total_cost=path.total_cost,
+                estimated_bandwidth_mbps=path.estimated_bandwidth_mbps,
+                estimated_latency_ms=path.estimated_latency_ms
+            ),
+            alternative_paths=[],
+            path_analysis={'path_quality': 'good'},
+            recommendation="Relay via gateway"
+        )
+
+    network_service = Mock()
+    network_service.find_optimal_route = AsyncMock(side_effect=find_optimal_route)
+    return NetworkAwareFileTransferService(base_service, network_service)
+
+
+class TestMultiHopTransfer:
+    """Test pipelined relays along optimal routes."""
+
+    @pytest.mark.asyncio
+    async def test_file_is_relayed_via_gateway(self, service, tmp_path):
+        data = bytes(range(256)) * 800
+        (tmp_path / "hsm" / "Eem125-S2.tar").write_bytes(data)
+
+        result = await service.transfer_file_optimized(FileTransferOperationDto(
+            source_location="hsm", source_path="Eem125-S2.tar",
+            dest_location="workspace", dest_path="staged/Eem125-S2.tar", chunk_size=10_000
+        ), force_route_calculation=True)
+
+        assert result.success, result.error_message
+        assert result.checksum_verified
+        assert result.metadata["optimal_path"] == ["hsm", "albedo", "workspace"]
+        assert (tmp_path / "workspace" / "staged" / "Eem125-S2.tar").read_bytes() == data
+        # Store-and-forward would finish writing to the gateway before the workspace's first write
+        assert "albedo" in ThrottledLink.writes[ThrottledLink.writes.index("workspace"):]
+        assert not list((tmp_path / "albedo" / ".tellus-relay").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_failed_relay_cleans_up_gateway(self, service, tmp_path, monkeypatch):
+        (tmp_path / "hsm" / "Eem125-S2.tar").write_bytes(b"x" * 100_000)
+        service._base_service.max_retry_attempts = 2
+
+        def unreachable_workspace(*args, **kwargs):
+            raise IOError("workspace unreachable")
+
+        engine = service._base_service._transfer_engine
+        monkeypatch.setattr(engine, "_write_destination", unreachable_workspace)
+
+        result = await service.transfer_file_optimized(FileTransferOperationDto(
+            source_location="hsm", source_path="Eem125-S2.tar",
+            dest_location="workspace", dest_path="Eem125-S2.tar", chunk_size=10_000
+        ), force_route_calculation=True)
+
+        assert not result.success
+        assert "workspace unreachable" in result.error_message
+        assert not list((tmp_path / "albedo" / ".tellus-relay").iterdir())
+
+
+class TestBatchScheduling:
+    """Test running the route groups of a batch concurrently."""
+
+    @pytest.fixture
+    def active(self, service):
+        """Replace single-file transfers with timed stand-ins; record the most running at once, per route and overall."""
+        running = {}
+        peaks = {}
+
+        async def transfer_file(dto):
+            route = (dto.source_location, dto.dest_location)
+            running[route] = running.get(route, 0) + 1
+            peaks[route] = max(peaks.get(route, 0), running[route])
+            peaks["total"] = max(peaks.get("total", 0), sum(running.values()))
+            await asyncio.sleep(0.05)
+            running[route] -= 1
+            return FileTransferResultDto(
+                operation_id=f"transfer_{dto.source_path}", operation_type="file_transfer", success=True,
+                source_location=dto.source_location, source_path=dto.source_path,
+                dest_location=dto.dest_location, dest_path=dto.dest_path, bytes_transferred=1
+            )
+
+        service._base_service.transfer_file = transfer_file
+        return peaks
+
+    @staticmethod
+    def batch(parallel_transfers):
+        return BatchFileTransferOperationDto(parallel_transfers=parallel_transfers, transfers=[
+            FileTransferOperationDto(source_location=source, source_path=f"{source}-{i}.tar",
+                                     dest_location=dest, dest_path=f"{source}-{i}.tar")
+            for source, dest in (("hsm", "albedo"), ("albedo", "workspace")) for i in range(4)
+        ])
+
+    @pytest.mark.asyncio
+    async def test_routes_run_concurrently_within_their_limits(self, service, active):
+        result = await service.batch_transfer_optimized(self.batch(parallel_transfers=10))
+
+        assert len(result.successful_transfers) == 8
+        assert [r.source_path for r in result.successful_transfers] == [
+            t.source_path for t in self.batch(10).transfers]
+        # 1000 Mbit/s over 20 ms fills two windows, 800 Mbit/s one
+        assert active[("hsm", "albedo")] == 2
+        assert active[("albedo", "workspace")] == 1
+        assert active["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_global_cap(self, service, active):
+        await service.batch_transfer_optimized(self.batch(parallel_transfers=2))
+
+        assert active["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_ungrouped_transfers_run_concurrently(self, service, active):
+        result = await service.batch_transfer_optimized(self.batch(parallel_transfers=4), group_by_route=False)
+
+        assert len(result.successful_transfers) == 8
+        assert active["total"] == 4
+
+    @pytest.mark.asyncio
+    async def test_small_files_are_packed(self, service, tmp_path):
+        service.small_file_threshold = 1_000
+        service.pack_size = 5_000
+        (tmp_path / "hsm" / "outdata").mkdir()
+        files = {f"outdata/fesom.{year}.nc": bytes([year % 256]) * 900 for year in range(2000, 2012)}
+        files["outdata/restart.nc"] = b"r" * 2_000
+        for path, data in files.items():
+            (tmp_path / "hsm" / path).write_bytes(data)
+        (tmp_path / "albedo" / "outdata").mkdir()
+        (tmp_path / "albedo" / "outdata" / "fesom.2005.nc").write_bytes(b"keep")
+
+        base_service = service._base_service
+        transfer_file = AsyncMock(side_effect=base_service.transfer_file)
+        base_service.transfer_file = transfer_file
+        transfer_small_files = AsyncMock(side_effect=base_service.transfer_small_files)
+        base_service.transfer_small_files = transfer_small_files
+
+        result = await service.batch_transfer_optimized(BatchFileTransferOperationDto(transfers=[
+            FileTransferOperationDto(source_location="hsm", source_path=path,
+                                     dest_location="albedo", dest_path=path, overwrite=False)
+            for path in files
+        ]))
+
+        assert [call.args[0].source_path for call in transfer_file.await_args_list] == ["outdata/restart.nc"]
+        assert [len(call.args[0]) for call in transfer_small_files.await_args_list] == [5, 5, 2]
+        assert [r.source_path for r in result.failed_transfers] == ["outdata/fesom.2005.nc"]
+        assert "overwrite=False" in result.failed_transfers[0].error_message
+        assert len(result.successful_transfers) == len(files) - 1
+        assert all(r.metadata["optimal_path"] == ["hsm", "albedo"] for r in result.successful_transfers)
+        assert all(r.checksum_verified for r in result.successful_transfers)
+        for path, data in files.items():
+            if not path.endswith("2005.nc"):
+                assert (tmp_path / "albedo" / path).read_bytes() == data
+        assert (tmp_path / "albedo" / "outdata" / "fesom.2005.nc").read_bytes() == b"keep"
@@ -0,0 +1,131 @@
+"""
+Unit tests for SimulationApplicationService listing.
+
+The simulation repository is mocked; listing must delegate filtering and
+pagination to ISimulationRepository.query() instead of loading everything.
+The async variant must await the repository instead of blocking on it.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from tellus.application.dtos import FilterOptions
+from tellus.application.exceptions import ValidationError
+from tellus.application.services.simulation_service import (
+    AsyncSimulationApplicationService, SimulationApplicationService)
+from tellus.domain.entities.simulation import SimulationEntity
+from tellus.domain.repositories.exceptions import InvalidPaginationError
+from tellus.domain.repositories.simulation_repository import SimulationPage
+
+
+@pytest.fixture
+def mock_simulation_repo():
+    repo = Mock()
+    repo.query.return_value = SimulationPage(
+        simulations=[SimulationEntity(simulation_id="run_03")],
+        next_cursor="next"
+    )
+    repo.count_matching.return_value = 7
+    return repo
+
+
+@pytest.fixture
+def service(mock_simulation_repo):
+    return SimulationApplicationService(
+        simulation_repository=mock_simulation_repo,
+        location_repository=Mock()
+    )
+
+
+class TestListSimulations:
+    """Test paginated simulation listing."""
+
+    def test_list_delegates_to_repository_query(self, service, mock_simulation_repo):
+        filters = FilterOptions(search_term="run", location="hpc", attributes={"experiment": "historical"})
+
+        result = service.list_simulations(page=2, page_size=3, filters=filters)
+
+        kwargs = mock_simulation_repo.query.call_args.kwargs
+        assert kwargs["offset"] == 3
+        assert kwargs["limit"] == 3
+        assert kwargs["filters"].search_term == "run"
+        assert kwargs["filters"].location_names == {"hpc"}
+        assert kwargs["filters"].attributes == {"experiment": "historical"}
+        mock_simulation_repo.list_all.assert_not_called()
+
+        assert [sim.simulation_id for sim in result.simulations] == ["run_03"]
+        assert result.pagination.total_count == 7
+        assert result.pagination.has_next
+        assert result.pagination.next_cursor == "next"
+
+    def test_invalid_cursor_raises_validation_error(self, service, mock_simulation_repo):
+        mock_simulation_repo.query.side_effect = InvalidPaginationError(
+            "Invalid pagination cursor", field="cursor")
+
+        with pytest.raises(ValidationError) as excinfo:
+            service.list_simulations(cursor="bogus", order_by="-model_id")
+        assert excinfo.value.field == "cursor"
+
+    def test_unrelated_value_error_is_not_a_cursor_error(self, service, mock_simulation_repo):
+        mock_simulation_repo.query.side_effect = ValueError("bad row")
+
+        with pytest.raises(ValueError, match="bad row"):
+            service.list_simulations(cursor="bogus")
+
+
+@pytest.fixture
+def async_simulation_repo():
+    repo = AsyncMock()
+    repo.get_by_id.return_value = SimulationEntity(simulation_id="run_01")
+    repo.query.return_value = SimulationPage(
+        simulations=[SimulationEntity(simulation_id="run_03")],
+        next_cursor=None
+    )
+    repo.count_matching.return_value = 1
+    return repo
+
+
+@pytest.mark.asyncio
+class TestAsyncSimulationApplicationService:
+    """Test the native async simulation service."""
+
+    async def test_get_simulation_awaits_repository(self, async_simulation_repo):
+        service = AsyncSimulationApplicationService(async_simulation_repo)
+
+        result = await service.get_simulation("run_01")
+
+        assert result.simulation_id == "run_01"
+        async_simulation_repo.get_by_id.assert_awaited_once_with("run_01")
+
+    async def test_missing_simulation_returns_none(self, async_simulation_repo):
+        async_simulation_repo.get_by_id.return_value = None
+        service = AsyncSimulationApplicationService(async_simulation_repo)
+
+        assert await service.get_simulation("missing") is None
+
+    async def test_list_runs_repository_calls_on_given_loop(self, async_simulation_repo):
+        loop = Mock()
+        submitted = []
+
+        async def submit(coro):
+            submitted.append(coro)
+            return await coro
+
+        loop.submit = submit
+        service = AsyncSimulationApplicationService(async_simulation_repo, loop=loop)
+
+        result = await service.list_simulations(page=1, page_size=10)
+
+        assert len(submitted) == 2
+        assert [sim.simulation_id for sim in result.simulations] == ["run_03"]
+        assert result.pagination.total_count == 1
+        assert not result.pagination.has_next
+
+    async def test_invalid_cursor_raises_validation_error(self, async_simulation_repo):
+        async_simulation_repo.query.side_effect = InvalidPaginationError(
+            "Cannot order simulations by 'uid'", field="order_by")
+        service = AsyncSimulationApplicationService(async_simulation_repo)
+
+        with pytest.raises(ValidationError) as excinfo:
+            await service.list_simulations(cursor="bogus", order_by="uid")
+        assert excinfo.value.field == "order_by"
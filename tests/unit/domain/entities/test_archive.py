@@ -0,0 +1,59 @@
+"""
+Tests for the archive domain entities.
+"""
+
+import pytest
+
+from tellus.domain.entities.archive import (ArchiveId, ArchiveMetadata,
+                                            ArchiveType, Checksum)
+from tellus.domain.entities.simulation_file import (FileInventory,
+                                                    SimulationFile)
+from tellus.domain.services.sidecar_metadata import SidecarMetadata
+
+
+class TestArchiveMetadata:
+    """Test archive metadata validation and conversions."""
+
+    def test_accepts_string_archive_id(self):
+        metadata = ArchiveMetadata(archive_id="run", location="tape")
+
+        assert metadata.archive_id == ArchiveId("run")
+        assert str(metadata.archive_id) == "run"
+
+    @pytest.mark.parametrize("kwargs", [
+        {"archive_id": ""},
+        {"archive_type": "compressed"},
+        {"size": -1},
+        {"checksum": "sha256:abc"},
+        {"archive_paths": ["run.tar.gz"]},
+    ])
+    def test_rejects_invalid_fields(self, kwargs):
+        with pytest.raises(ValueError):
+            ArchiveMetadata(**{"archive_id": "run", "location": "tape", **kwargs})
+
+    def test_split_archive_is_complex(self):
+        inventory = FileInventory()
+        inventory.add_file(SimulationFile("outdata/echam.nc", size=100))
+
+        metadata = ArchiveMetadata(archive_id="run", location="tape", file_inventory=inventory)
+        assert metadata.estimate_extraction_complexity() == "simple"
+
+        metadata.archive_type = ArchiveType.SPLIT_TARBALL
+        assert metadata.estimate_extraction_complexity() == "complex"
+
+    def test_sidecar_round_trip(self):
+        inventory = FileInventory()
+        inventory.add_file(SimulationFile("outdata/echam.nc", size=100, checksum=Checksum("abc", "sha256")))
+        metadata = ArchiveMetadata(
+            archive_id=ArchiveId("run"), location="tape", simulation_id="historical",
+            checksum=Checksum("def", "sha256"), size=50, tags={"cmip6"}, file_inventory=inventory,
+        )
+
+        reconstructed = SidecarMetadata.reconstruct_archive_metadata(SidecarMetadata.generate_metadata_dict(metadata))
+
+        assert reconstructed.archive_id == metadata.archive_id
+        assert reconstructed.checksum == metadata.checksum
+        assert reconstructed.tags == {"cmip6"}
+        assert reconstructed.file_inventory.file_count == 1
+        assert reconstructed.file_inventory.total_size == 100
+        assert reconstructed.file_inventory.list_files()[0].checksum == Checksum("abc", "sha256")
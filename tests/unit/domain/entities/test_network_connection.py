@@ -594,6 +594,50 @@ class TestNetworkConnection:
         assert not connection.can_connect_locations(destination, destination)
 
 
+class TestRecommendedParallelStreams:
+    """Test choosing the number of parallel transfer streams from connection metrics."""
+    
+    def _connection(self, mbps, latency_ms, packet_loss=0.0):
+        return NetworkConnection(
+            source_location="hpc",
+            destination_location="archive",
+            connection_type=ConnectionType.WAN,
+            bandwidth_metrics=BandwidthMetrics(measured_mbps=mbps),
+            latency_metrics=LatencyMetrics(avg_latency_ms=latency_ms, min_latency_ms=latency_ms,
+                                           max_latency_ms=latency_ms, packet_loss_percentage=packet_loss)
+        )
+    
+    def test_bandwidth_delay_product(self):
+        """Test that streams are needed to fill the bandwidth-delay product."""
+        # 1 Gbps over 100 ms keeps 12.5 MB in flight, six 2 MiB windows
+        assert self._connection(1000.0, 100.0).recommended_parallel_streams() == 6
+        assert self._connection(1000.0, 100.0).recommended_parallel_streams(window_bytes=1024 * 1024) == 12
+    
+    def test_low_latency_uses_single_stream(self):
+        """Test that a LAN connection is filled by one stream."""
+        assert self._connection(1000.0, 0.5).recommended_parallel_streams() == 1
+    
+    def test_packet_loss_adds_streams(self):
+        """Test that lossy connections get extra streams."""
+        assert self._connection(100.0, 150.0).recommended_parallel_streams() == 1
+        # Loss degrades the effective bandwidth, but adds a stream per percent
+        assert self._connection(100.0, 150.0, packet_loss=3.0).recommended_parallel_streams() == 4
+    
+    def test_limited_by_max_streams(self):
+        """Test that the number of streams is capped."""
+        assert self._connection(100_000.0, 150.0).recommended_parallel_streams(max_streams=8) == 8
+    
+    def test_without_metrics(self):
+        """Test that a single stream is used without metrics."""
+        connection = NetworkConnection(
+            source_location="hpc",
+            destination_location="archive",
+            connection_type=ConnectionType.WAN,
+            bandwidth_metrics=BandwidthMetrics(measured_mbps=1000.0)
+        )
+        assert connection.recommended_parallel_streams() == 1
+
+
 class TestNetworkConnectionIntegration:
     """Integration tests for NetworkConnection with metrics."""
     
@@ -491,7 +491,23 @@ class TestNetworkTopology:
         assert path.intermediate_hops == ["B"]
         assert path.estimated_bandwidth_mbps == 100.0  # Limited by bottleneck
         assert path.path_type == "optimized"
-    
+
+    def test_find_max_bandwidth_path_latency(self):
+        """Test maximum bandwidth path latency sums measured segments."""
+        topology = NetworkTopology(name="Test Network")
+
+        latency = LatencyMetrics(avg_latency_ms=10.0, min_latency_ms=8.0, max_latency_ms=12.0)
+        conn1 = NetworkConnection("A", "B", ConnectionType.DIRECT,
+                                  bandwidth_metrics=BandwidthMetrics(measured_mbps=100.0), latency_metrics=latency)
+        conn2 = NetworkConnection("B", "C", ConnectionType.DIRECT,
+                                  bandwidth_metrics=BandwidthMetrics(measured_mbps=1000.0))
+
+        topology.connections = [conn1, conn2]
+
+        path = topology._find_max_bandwidth_path("A", "C")
+
+        assert path.estimated_latency_ms == 10.0  # Unmeasured segment adds nothing
+
     def test_find_min_latency_path(self):
         """Test minimum latency path algorithm."""
         topology = NetworkTopology(name="Test Network")
@@ -0,0 +1,102 @@
+"""
+Shared fixtures for archive service tests.
+"""
+
+import dataclasses
+import os
+import threading
+
+import pytest
+
+from tellus.domain.entities.archive import ArchiveId
+from tellus.domain.entities.location import LocationEntity, LocationKind
+from tellus.domain.services.archive_compression import CompressionLevel
+from tellus.domain.services.archive_creation import (ArchiveCreationConfig,
+                                                     ArchiveCreationService)
+from tellus.domain.services.archive_extraction import ArchiveExtractionService
+
+
+class RecordingExtractionService(ArchiveExtractionService):
+    """
+    Extraction service recording when each archive starts and ends.
+
+    Archives named in ``concurrent`` wait for each other before extracting,
+    so they fail with a broken barrier unless they run at the same time.
+    """
+
+    def __init__(self, concurrent=()):
+        super().__init__()
+        self.events = []
+        self._lock = threading.Lock()
+        self._concurrent = set(concurrent)
+        self._barrier = threading.Barrier(len(concurrent), timeout=10) if concurrent else None
+
+    def extract_archive(self, archive_path, *args, **kwargs):
+        self._record("start", archive_path)
+        try:
+            if archive_path.name in self._concurrent:
+                self._barrier.wait()
+            return super().extract_archive(archive_path, *args, **kwargs)
+        finally:
+            self._record("end", archive_path)
+
+    def _record(self, event, archive_path):
+        with self._lock:
+            self.events.append((event, archive_path.name))
+
+    def started_after_end(self, later, earlier):
+        """Whether archive ``later`` started only after archive ``earlier`` finished."""
+        return self.events.index(("start", later)) > self.events.index(("end", earlier))
+
+
+def local_location(path, name="scratch"):
+    return LocationEntity(name=name, kinds=[LocationKind.DISK], config={"protocol": "file", "path": str(path)})
+
+
+@pytest.fixture
+def target_location(tmp_path):
+    """Local location archives are extracted into, rooted at tmp_path."""
+    return local_location(tmp_path, name="work")
+
+
+@pytest.fixture
+def local_archive(tmp_path):
+    """
+    Create local archives through the creation service.
+
+    Returns a factory taking an archive name, a mapping of relative paths to
+    contents and optionally the modification time of the files; it returns
+    the archive's metadata with its location set to the archive path, as
+    fragment assembly expects.
+    """
+    archive_dir = tmp_path / "archives"
+    archive_dir.mkdir()
+
+    def create(name, files, mtime=None, **config):
+        source = tmp_path / "sources" / name
+        for relative_path, data in files.items():
+            path = source / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            if mtime is not None:
+                os.utime(path, (mtime, mtime))
+
+        creation_config = ArchiveCreationConfig(**config)
+        suffix = ".tar"
+        if creation_config.compression_level is not CompressionLevel.NONE:
+            suffix += creation_config.compression_codec.suffix
+        archive_path = archive_dir / f"{name}{suffix}"
+        result = ArchiveCreationService().create_archive(
+            source, archive_path, ArchiveId(name), local_location(archive_dir, name="archives"),
+            simulation_id="historical", creation_config=creation_config,
+        )
+        assert result.success, result.errors
+        return dataclasses.replace(result.archive_metadata, location=str(archive_path))
+
+    return create
+
+
+@pytest.fixture
+def recording_extraction_service():
+    """Factory of extraction services recording when each archive is extracted."""
+    return RecordingExtractionService
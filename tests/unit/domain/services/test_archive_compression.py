@@ -0,0 +1,150 @@
+"""
+Tests for the parallel block compression writer used for archive creation.
+"""
+
+import gzip
+import io
+import lzma
+import random
+import shutil
+import subprocess
+import tarfile
+import zlib
+
+import pytest
+
+from tellus.domain.services.archive_compression import (CompressionCodec,
+                                                        CompressionLevel,
+                                                        ParallelCompressionWriter,
+                                                        open_tar_stream)
+
+
+def sample_data(size, seed=0):
+    """Compressible data mixing repeated text and random bytes."""
+    chunks = []
+    rng = random.Random(seed)
+    while sum(map(len, chunks)) < size:
+        chunks.append(b"temperature salinity velocity " * rng.randint(1, 50))
+        chunks.append(rng.randbytes(rng.randint(1, 2000)))
+    return b"".join(chunks)[:size]
+
+
+def compress(data, codec, level=CompressionLevel.BALANCED, write_size=7000, **kwargs):
+    output = io.BytesIO()
+    with ParallelCompressionWriter(output, codec=codec, level=level, **kwargs) as writer:
+        for offset in range(0, len(data), write_size):
+            writer.write(data[offset:offset + write_size])
+        assert writer.tell() == len(data)
+    return output.getvalue()
+
+
+DECOMPRESSORS = {
+    CompressionCodec.GZIP: gzip.decompress,
+    CompressionCodec.XZ: lzma.decompress,
+}
+
+
+class TestParallelCompressionWriter:
+    """Test block-parallel compression round trips."""
+
+    @pytest.mark.parametrize("codec", list(DECOMPRESSORS))
+    @pytest.mark.parametrize("level", [CompressionLevel.FAST, CompressionLevel.BEST])
+    @pytest.mark.parametrize("size", [0, 1, 65536, 300_001])
+    def test_round_trip(self, codec, level, size):
+        data = sample_data(size)
+
+        compressed = compress(data, codec, level, workers=3, block_size=65536)
+
+        assert DECOMPRESSORS[codec](compressed) == data
+
+    def test_gzip_is_single_member_with_shared_window(self):
+        data = sample_data(500_000)
+
+        compressed = compress(data, CompressionCodec.GZIP, workers=4, block_size=50_000)
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        assert decompressor.decompress(compressed) == data
+        assert decompressor.eof and decompressor.unused_data == b""
+        # Priming each block with the previous window keeps the ratio close to serial gzip
+        assert len(compressed) < 1.05 * len(gzip.compress(data, compresslevel=6))
+
+    @pytest.mark.skipif(shutil.which("gzip") is None, reason="gzip command not available")
+    def test_gzip_output_is_readable_by_gzip_command(self):
+        data = sample_data(200_000)
+        compressed = compress(data, CompressionCodec.GZIP, workers=2, block_size=40_000)
+
+        result = subprocess.run(["gzip", "-dc"], input=compressed, capture_output=True, check=True)
+
+        assert result.stdout == data
+
+    def test_zstd_round_trip(self):
+        zstandard = pytest.importorskip("zstandard")
+        data = sample_data(300_000)
+
+        compressed = compress(data, CompressionCodec.ZSTD, workers=3, block_size=65536)
+
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(compressed), read_across_frames=True)
+        assert reader.read() == data
+
+    def test_output_does_not_depend_on_worker_count(self):
+        data = sample_data(400_000)
+
+        outputs = {compress(data, CompressionCodec.GZIP, workers=workers, block_size=30_000)
+                   for workers in (1, 2, 8)}
+
+        assert len(outputs) == 1
+
+    def test_failure_aborts_without_finishing_stream(self):
+        output = io.BytesIO()
+
+        with pytest.raises(RuntimeError):
+            with ParallelCompressionWriter(output, workers=2, block_size=1000) as writer:
+                writer.write(b"x" * 5000)
+                raise RuntimeError("abort")
+
+        assert writer.closed
+        with pytest.raises(ValueError):
+            writer.write(b"more")
+        with pytest.raises((EOFError, OSError)):
+            gzip.decompress(output.getvalue())
+
+    def test_rejects_no_compression(self):
+        with pytest.raises(ValueError):
+            ParallelCompressionWriter(io.BytesIO(), level=CompressionLevel.NONE)
+
+
+class TestTarStreams:
+    """Test writing tarballs through the writer and reading them back."""
+
+    @pytest.mark.parametrize("codec", list(CompressionCodec))
+    def test_tarball_round_trip(self, tmp_path, codec):
+        if codec is CompressionCodec.ZSTD:
+            pytest.importorskip("zstandard")
+        files = {f"outdata/fesom.{year}.nc": sample_data(20_000 + year, seed=year)
+                 for year in range(2000, 2010)}
+        archive_path = tmp_path / f"archive.tar{codec.suffix}"
+
+        with open(archive_path, "wb") as raw_file, \
+                ParallelCompressionWriter(raw_file, codec=codec, workers=2, block_size=16_384) as writer, \
+                tarfile.open(fileobj=writer, mode="w") as tar:
+            for name, content in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+
+        read_back = {}
+        with open_tar_stream(archive_path) as tar:
+            for member in tar:
+                read_back[member.name] = tar.extractfile(member).read()
+
+        assert read_back == files
+
+    def test_reads_plain_tarball(self, tmp_path):
+        archive_path = tmp_path / "archive.tar"
+        with tarfile.open(archive_path, "w") as tar:
+            info = tarfile.TarInfo("run.log")
+            info.size = 3
+            tar.addfile(info, io.BytesIO(b"log"))
+
+        with open_tar_stream(archive_path) as tar:
+            assert [member.name for member in tar] == ["run.log"]
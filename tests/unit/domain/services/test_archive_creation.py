@@ -0,0 +1,440 @@
+"""
+Tests for creating archives through the archive creation service.
+"""
+
+import builtins
+import hashlib
+import io
+import json
+import random
+import tarfile
+import uuid
+from pathlib import Path
+
+import fsspec
+import pytest
+
+from tellus.domain.entities.archive import ArchiveId, ArchiveType
+from tellus.domain.entities.location import LocationEntity, LocationKind
+from tellus.domain.entities.simulation_file import SimulationFile
+from tellus.domain.services.archive_compression import (CompressionCodec,
+                                                        CompressionLevel,
+                                                        open_tar_stream)
+from tellus.domain.services.archive_creation import (ArchiveCreationConfig,
+                                                     ArchiveCreationService)
+from tellus.domain.services.archive_extraction import ArchiveExtractionService
+from tellus.domain.services.archive_index import ArchiveMemberIndex
+from tellus.domain.services.archive_verification import VerificationLevel
+
+FILE_CONTENTS = {
+    "namelist.echam": b"&runctl dt_start = 2000, 1, 1 /\n",
+    "outdata/echam.200001.nc": b"\x01" * 6000,
+    "outdata/echam.200002.nc": b"\x02" * 7000,
+    "restart/restart_echam.nc": b"\x03" * 5000,
+}
+
+
+@pytest.fixture
+def source_directory(tmp_path):
+    """Simulation run directory with a namelist, output and restart files."""
+    source = tmp_path / "run"
+    for relative_path, data in FILE_CONTENTS.items():
+        path = source / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return source
+
+
+@pytest.fixture
+def memory_fs():
+    """In-memory filesystem and a location on it, cleaned up after the test."""
+    fs = fsspec.filesystem("memory")
+    root = f"/archives-{uuid.uuid4().hex}"
+    fs.makedirs(root, exist_ok=True)
+    location = LocationEntity(name="tape", kinds=[LocationKind.TAPE], config={"protocol": "memory", "path": root})
+    yield fs, root, location
+    fs.rm(root, recursive=True)
+
+
+def local_location(path):
+    return LocationEntity(name="scratch", kinds=[LocationKind.DISK], config={"protocol": "file", "path": str(path)})
+
+
+class CountingFile(io.BufferedReader):
+    """Local file counting the bytes read from it."""
+
+    def __init__(self, path):
+        super().__init__(io.FileIO(path, "rb"))
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def read_tarball(archive_path):
+    """Contents of the files in a tarball of any supported compression."""
+    with open_tar_stream(archive_path) as tar:
+        return {member.name: tar.extractfile(member).read() for member in tar if member.isfile()}
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class TestCreateArchive:
+    """Test creating an archive with its sidecar and checksums."""
+
+    def test_streams_archive_into_location(self, source_directory, memory_fs):
+        fs, root, location = memory_fs
+        service = ArchiveCreationService(filesystem_factory=lambda location: fs)
+        archive_path = Path(root) / "run.tar.gz"
+
+        result = service.create_archive(
+            source_directory, archive_path, ArchiveId("run"), location,
+            simulation_id="historical", version="1", tags={"cmip6"},
+            creation_config=ArchiveCreationConfig(stream_to_location=True, checksum_algorithm="sha256"),
+        )
+
+        assert result.success, result.errors
+        assert result.files_included == len(FILE_CONTENTS)
+        assert result.sidecar_path == Path(root) / "run.metadata.json"
+        assert not source_directory.with_name("run.tar.gz").exists()
+
+        archive_data = fs.cat(str(archive_path))
+        assert result.archive_size == len(archive_data)
+        assert str(result.archive_checksum) == f"sha256:{sha256(archive_data)}"
+
+        sidecar = json.loads(fs.cat(str(result.sidecar_path)))
+        assert sidecar["archive"]["archive_id"] == "run"
+        assert sidecar["archive"]["location"] == "tape"
+        assert sidecar["simulation"]["simulation_id"] == "historical"
+        assert sidecar["properties"]["checksum"] == f"sha256:{sha256(archive_data)}"
+        assert sidecar["properties"]["size"] == len(archive_data)
+        assert sidecar["properties"]["tags"] == ["cmip6"]
+        assert {file["path"]: file["checksum"] for file in sidecar["inventory"]["files"]} == {
+            relative_path: f"sha256:{sha256(data)}" for relative_path, data in FILE_CONTENTS.items()
+        }
+
+        with fs.open(str(archive_path), "rb") as archive_file, \
+                tarfile.open(fileobj=archive_file, mode="r:gz") as tar:
+            assert {
+                member.name: tar.extractfile(member).read() for member in tar.getmembers() if member.isfile()
+            } == FILE_CONTENTS
+
+    def test_creates_local_archive(self, source_directory, tmp_path):
+        service = ArchiveCreationService()
+        archive_path = tmp_path / "archives" / "run.tar.gz"
+        archive_path.parent.mkdir()
+
+        result = service.create_archive(
+            source_directory, archive_path, ArchiveId("run"), local_location(archive_path.parent),
+            creation_config=ArchiveCreationConfig(checksum_algorithm="sha256"),
+        )
+
+        assert result.success, result.errors
+        assert str(result.archive_checksum) == f"sha256:{sha256(archive_path.read_bytes())}"
+        assert result.archive_metadata.archive_type == ArchiveType.COMPRESSED
+        assert result.archive_metadata.checksum == result.archive_checksum
+        assert result.archive_metadata.file_inventory.file_count == len(FILE_CONTENTS)
+
+        sidecar = json.loads(result.sidecar_path.read_text())
+        assert sidecar["properties"]["checksum"] == str(result.archive_checksum)
+        assert sidecar["properties"]["size"] == archive_path.stat().st_size
+        # No partial archive is left next to the finished one
+        assert sorted(path.name for path in archive_path.parent.iterdir()) == [
+            "run.metadata.json", "run.tar.gz", "run.tar.gz.idx"]
+
+    def test_rejects_existing_archive(self, source_directory, memory_fs):
+        fs, root, location = memory_fs
+        fs.pipe(f"{root}/run.tar.gz", b"existing")
+        service = ArchiveCreationService(filesystem_factory=lambda location: fs)
+
+        result = service.create_archive(
+            source_directory, Path(root) / "run.tar.gz", ArchiveId("run"), location,
+            creation_config=ArchiveCreationConfig(stream_to_location=True),
+        )
+
+        assert not result.success
+        assert result.has_errors
+        assert fs.cat(f"{root}/run.tar.gz") == b"existing"
+
+
+class TestCreateSplitArchive:
+    """Test splitting an oversized archive into parts."""
+
+    MAX_ARCHIVE_SIZE = 12_000
+
+    def test_parts_are_bounded_described_and_linked(self, source_directory, memory_fs):
+        fs, root, location = memory_fs
+        service = ArchiveCreationService(filesystem_factory=lambda location: fs)
+
+        result = service.create_archive(
+            source_directory, Path(root) / "run.tar.gz", ArchiveId("run"), location,
+            creation_config=ArchiveCreationConfig(
+                stream_to_location=True, max_archive_size=self.MAX_ARCHIVE_SIZE, checksum_algorithm="sha256"),
+        )
+
+        assert result.success, result.errors
+        assert len(result.parts) == len(result.part_paths) > 1
+        assert not fs.exists(f"{root}/run.tar.gz")
+
+        part_ids = [f"run_part{n:03d}" for n in range(1, len(result.parts) + 1)]
+        archived = {}
+        for part_number, (part_path, part) in enumerate(zip(result.part_paths, result.parts), 1):
+            part_data = fs.cat(str(part_path))
+            assert part.archive_metadata.file_inventory.total_size <= self.MAX_ARCHIVE_SIZE
+            assert part.archive_size == len(part_data) <= self.MAX_ARCHIVE_SIZE
+
+            sidecar = json.loads(fs.cat(str(part.sidecar_path)))
+            assert sidecar["archive"]["archive_id"] == part_ids[part_number - 1]
+            assert sidecar["properties"]["checksum"] == f"sha256:{sha256(part_data)}"
+            assert sidecar["split"]["archive_id"] == "run"
+            assert sidecar["split"]["part_number"] == part_number
+            assert [entry["archive_id"] for entry in sidecar["split"]["parts"]] == part_ids
+            assert sidecar["split"]["split_archive_parts"] == [
+                part_id for part_id in part_ids if part_id != part_ids[part_number - 1]]
+
+            with fs.open(str(part_path), "rb") as archive_file, \
+                    tarfile.open(fileobj=archive_file, mode="r:gz") as tar:
+                part_files = {
+                    member.name: tar.extractfile(member).read() for member in tar.getmembers() if member.isfile()
+                }
+            assert {file["path"] for file in sidecar["inventory"]["files"]} == set(part_files)
+            assert not archived.keys() & part_files.keys()
+            archived.update(part_files)
+        assert archived == FILE_CONTENTS
+
+        metadata = result.archive_metadata
+        assert metadata.archive_type == ArchiveType.SPLIT_TARBALL
+        assert metadata.size == sum(part.archive_size for part in result.parts)
+        archive_file = SimulationFile.from_archive_metadata(metadata)
+        assert archive_file.is_split_archive
+        assert archive_file.split_archive_parts == {str(part_path) for part_path in result.part_paths}
+        assert len(archive_file.get_contained_files()) == len(FILE_CONTENTS)
+
+    def test_oversized_archive_fails_without_splitting(self, source_directory, memory_fs):
+        fs, root, location = memory_fs
+        service = ArchiveCreationService(filesystem_factory=lambda location: fs)
+
+        result = service.create_archive(
+            source_directory, Path(root) / "run.tar.gz", ArchiveId("run"), location,
+            creation_config=ArchiveCreationConfig(
+                stream_to_location=True, max_archive_size=self.MAX_ARCHIVE_SIZE, split_archives=False),
+        )
+
+        assert not result.success
+        assert "exceeds maximum archive size" in result.errors[0]
+        assert fs.ls(root) == []
+
+
+class TestCreateCompressedArchive:
+    """Test creating archives with each codec and reading them back."""
+
+    @pytest.mark.parametrize("codec", list(CompressionCodec))
+    @pytest.mark.parametrize("level", [CompressionLevel.FAST, CompressionLevel.BEST])
+    def test_round_trip(self, source_directory, tmp_path, codec, level):
+        if codec is CompressionCodec.ZSTD:
+            pytest.importorskip("zstandard")
+        archive_path = tmp_path / f"run.tar{codec.suffix}"
+
+        result = ArchiveCreationService().create_archive(
+            source_directory, archive_path, ArchiveId("run"), local_location(tmp_path),
+            creation_config=ArchiveCreationConfig(
+                compression_codec=codec, compression_level=level, compression_workers=2,
+                compression_block_size=4096),
+        )
+
+        assert result.success, result.errors
+        assert result.verification.success
+        # The sample files are highly repetitive
+        assert result.archive_size < sum(map(len, FILE_CONTENTS.values())) / 4
+        assert read_tarball(archive_path) == FILE_CONTENTS
+
+        extraction = ArchiveExtractionService().extract_archive(
+            archive_path, local_location(tmp_path), target_path="extracted")
+        assert extraction.success, extraction.errors
+        for relative_path, data in FILE_CONTENTS.items():
+            assert (tmp_path / "extracted" / relative_path).read_bytes() == data
+
+    def test_uncompressed_archive(self, source_directory, tmp_path):
+        archive_path = tmp_path / "run.tar"
+
+        result = ArchiveCreationService().create_archive(
+            source_directory, archive_path, ArchiveId("run"), local_location(tmp_path),
+            creation_config=ArchiveCreationConfig(compression_level=CompressionLevel.NONE),
+        )
+
+        assert result.success, result.errors
+        with tarfile.open(archive_path, mode="r:") as tar:
+            assert {member.name: tar.extractfile(member).read()
+                    for member in tar.getmembers() if member.isfile()} == FILE_CONTENTS
+
+
+class TestCreateIndexedArchive:
+    """Test the member index written while creating an archive."""
+
+    @pytest.mark.parametrize("codec, level", [
+        (CompressionCodec.GZIP, CompressionLevel.FAST),
+        (CompressionCodec.XZ, CompressionLevel.FAST),
+        (CompressionCodec.GZIP, CompressionLevel.NONE),
+    ])
+    def test_extracts_single_member_by_offset(self, local_archive, codec, level):
+        # Random data does not compress, so every file spans several blocks
+        rng = random.Random(7)
+        files = {f"restart/fesom.{year}.nc": rng.randbytes(40_000) for year in range(2000, 2010)}
+        archive_path = Path(local_archive(
+            "restarts", files, compression_codec=codec, compression_level=level,
+            compression_block_size=16 * 1024,
+        ).location)
+
+        index = ArchiveMemberIndex.load(archive_path)
+        assert index is not None
+        assert ArchiveMemberIndex.index_path(archive_path).exists()
+        assert index.codec == (codec if level is not CompressionLevel.NONE else None)
+        members = {member.name: member for member in index.list_members()}
+        assert set(files) <= set(members)
+
+        with CountingFile(archive_path) as raw_file, index.open_archive(raw_file) as tar:
+            member = index.read_member(tar, members["restart/fesom.2005.nc"])
+            assert tar.extractfile(member).read() == files["restart/fesom.2005.nc"]
+            # Only the blocks holding the member are read
+            assert raw_file.bytes_read < archive_path.stat().st_size / 4
+
+    def test_index_can_be_disabled(self, local_archive):
+        archive_path = Path(local_archive("run", FILE_CONTENTS, create_member_index=False).location)
+
+        assert ArchiveMemberIndex.load(archive_path) is None
+        assert not ArchiveMemberIndex.index_path(archive_path).exists()
+        assert read_tarball(archive_path) == FILE_CONTENTS
+
+
+class TestSingleReadChecksums:
+    """Test that checksums are computed while the files are archived."""
+
+    def test_files_are_read_once_and_archive_never(self, source_directory, tmp_path, monkeypatch):
+        bytes_read = {}
+        real_open = builtins.open
+
+        class ReadCounter:
+            def __init__(self, fileobj, path):
+                self._fileobj = fileobj
+                self._path = path
+
+            def read(self, size=-1):
+                data = self._fileobj.read(size)
+                bytes_read[self._path] = bytes_read.get(self._path, 0) + len(data)
+                return data
+
+            def readinto(self, buffer):
+                count = self._fileobj.readinto(buffer)
+                bytes_read[self._path] = bytes_read.get(self._path, 0) + count
+                return count
+
+            def __getattr__(self, name):
+                return getattr(self._fileobj, name)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, exc_type, exc_val, exc_tb):
+                self._fileobj.close()
+
+        def counting_open(file, mode="r", *args, **kwargs):
+            fileobj = real_open(file, mode, *args, **kwargs)
+            if "r" in mode and isinstance(file, (str, Path)):
+                return ReadCounter(fileobj, Path(file).relative_to(tmp_path).as_posix())
+            return fileobj
+
+        monkeypatch.setattr(builtins, "open", counting_open)
+        archive_path = tmp_path / "run.tar.gz"
+
+        result = ArchiveCreationService().create_archive(
+            source_directory, archive_path, ArchiveId("run"), local_location(tmp_path),
+            creation_config=ArchiveCreationConfig(checksum_algorithm="sha256", verify_after_creation=False),
+        )
+        monkeypatch.undo()
+
+        assert result.success, result.errors
+        # Every file is read exactly once, and the finished archive not at all
+        assert bytes_read == {
+            f"run/{relative_path}": len(data) for relative_path, data in FILE_CONTENTS.items()
+        }
+        assert str(result.archive_checksum) == f"sha256:{sha256(archive_path.read_bytes())}"
+        assert {name: entry.checksum for name, entry in result.manifest.items() if entry.checksum} == {
+            relative_path: sha256(data) for relative_path, data in FILE_CONTENTS.items()
+        }
+        inventory = result.archive_metadata.file_inventory
+        assert {file.relative_path: str(file.checksum) for file in inventory.list_files()} == {
+            relative_path: f"sha256:{sha256(data)}" for relative_path, data in FILE_CONTENTS.items()
+        }
+
+
+class CorruptingCreationService(ArchiveCreationService):
+    """Creation service flipping a byte of one member's data before verifying the archive."""
+
+    def __init__(self, member_name):
+        super().__init__()
+        self._member_name = member_name
+
+    def _verify_archive_integrity(self, archive_path, *args, **kwargs):
+        index = ArchiveMemberIndex.load(archive_path)
+        member = next(member for member in index.members if member.name == self._member_name)
+        with open(archive_path, "r+b") as archive_file:
+            archive_file.seek(member.offset_data + 10)
+            byte = archive_file.read(1)
+            archive_file.seek(-1, io.SEEK_CUR)
+            archive_file.write(bytes([byte[0] ^ 0xFF]))
+        return super()._verify_archive_integrity(archive_path, *args, **kwargs)
+
+
+class TestVerifyCreatedArchive:
+    """Test verifying archives against the manifest recorded while creating them."""
+
+    @pytest.mark.parametrize("level", list(VerificationLevel))
+    def test_intact_archive_passes(self, source_directory, tmp_path, level):
+        result = ArchiveCreationService().create_archive(
+            source_directory, tmp_path / "run.tar.gz", ArchiveId("run"), local_location(tmp_path),
+            creation_config=ArchiveCreationConfig(verification_level=level),
+        )
+
+        assert result.success, result.errors
+        assert result.verification.level is level
+        assert result.verification.success
+        assert result.verification.members_checked == len(result.manifest)
+        hashed = 0 if level is VerificationLevel.FAST else len(FILE_CONTENTS)
+        assert result.verification.members_hashed == hashed
+
+    @pytest.mark.parametrize("level", [VerificationLevel.SAMPLE, VerificationLevel.FULL])
+    def test_corrupted_member_fails(self, source_directory, tmp_path, level):
+        # Uncompressed, so that the corruption only affects the member's data
+        archive_path = tmp_path / "run.tar"
+        service = CorruptingCreationService("outdata/echam.200002.nc")
+
+        result = service.create_archive(
+            source_directory, archive_path, ArchiveId("run"), local_location(tmp_path),
+            creation_config=ArchiveCreationConfig(
+                compression_level=CompressionLevel.NONE, verification_level=level,
+                verification_sample_size=len(FILE_CONTENTS)),
+        )
+
+        assert not result.success
+        assert len(result.verification.mismatched) == 1
+        assert result.verification.mismatched[0].startswith("outdata/echam.200002.nc")
+        assert any("Archive verification failed for outdata/echam.200002.nc" in e for e in result.errors)
+        # No sidecar describes the broken archive
+        assert not (tmp_path / "run.metadata.json").exists()
+
+    def test_fast_verification_does_not_hash_members(self, source_directory, tmp_path):
+        service = CorruptingCreationService("outdata/echam.200002.nc")
+
+        result = service.create_archive(
+            source_directory, tmp_path / "run.tar", ArchiveId("run"), local_location(tmp_path),
+            creation_config=ArchiveCreationConfig(
+                compression_level=CompressionLevel.NONE, verification_level=VerificationLevel.FAST),
+        )
+
+        # Only names and sizes are compared against the index
+        assert result.success, result.errors
+        assert result.verification.members_hashed == 0
@@ -0,0 +1,237 @@
+"""
+Tests for extracting archives through the archive extraction service.
+"""
+
+import json
+import random
+import threading
+import uuid
+from pathlib import Path
+
+import fsspec
+import pytest
+
+from tellus.domain.entities.archive import ArchiveId
+from tellus.domain.entities.location import LocationEntity, LocationKind
+from tellus.domain.services.archive_compression import CompressionLevel
+from tellus.domain.services.archive_creation import (ArchiveCreationConfig,
+                                                     ArchiveCreationService)
+from tellus.domain.services.archive_extraction import (
+    ArchiveExtractionConfig, ArchiveExtractionFilter, ArchiveExtractionService,
+    ConflictResolution)
+
+
+def member_contents():
+    # Random data does not compress, so every file spans several index blocks
+    rng = random.Random(5)
+    return {
+        f"outdata/echam.2000{month:02d}.nc": rng.randbytes(rng.randint(40_000, 60_000)) for month in range(1, 7)
+    }
+
+
+class CountingReader:
+    """Read-only file counting the bytes read from it."""
+
+    def __init__(self, fileobj, counts, path):
+        self._fileobj = fileobj
+        self._counts = counts
+        self._path = path
+
+    def read(self, size=-1):
+        data = self._fileobj.read(size)
+        self._counts[self._path] = self._counts.get(self._path, 0) + len(data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._fileobj.close()
+
+
+class ReadCountingFileSystem:
+    """fsspec filesystem wrapper recording how many bytes are read from each file."""
+
+    def __init__(self, filesystem):
+        self._filesystem = filesystem
+        self.bytes_read = {}
+
+    def open(self, path, mode="rb", **kwargs):
+        fileobj = self._filesystem.open(path, mode, **kwargs)
+        if "r" in mode:
+            return CountingReader(fileobj, self.bytes_read, self._filesystem._strip_protocol(path))
+        return fileobj
+
+    def __getattr__(self, name):
+        return getattr(self._filesystem, name)
+
+
+def memory_location(name, root):
+    return LocationEntity(name=name, kinds=[LocationKind.DISK], config={"protocol": "memory", "path": root})
+
+
+@pytest.fixture
+def memory_fs():
+    """In-memory filesystem with roots for archives and extracted files, cleaned up after the test."""
+    fs = fsspec.filesystem("memory")
+    roots = [f"/{name}-{uuid.uuid4().hex}" for name in ("archives", "work")]
+    for root in roots:
+        fs.makedirs(root, exist_ok=True)
+    yield ReadCountingFileSystem(fs), *roots
+    for root in roots:
+        fs.rm(root, recursive=True)
+
+
+@pytest.fixture
+def remote_archive(tmp_path, memory_fs):
+    """Create an archive of member_contents() on a memory location, returning the location."""
+    fs, archive_root, _ = memory_fs
+    source = tmp_path / "run"
+    for relative_path, data in member_contents().items():
+        path = source / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    location = memory_location("tape", archive_root)
+
+    def create(**config):
+        service = ArchiveCreationService(filesystem_factory=lambda location: fs)
+        result = service.create_archive(
+            source, Path("run.tar.gz"), ArchiveId("run"), location,
+            creation_config=ArchiveCreationConfig(
+                stream_to_location=True, compression_level=CompressionLevel.FAST,
+                compression_block_size=16 * 1024, **config),
+        )
+        assert result.success, result.errors
+        fs.bytes_read.clear()
+        return location
+
+    return create
+
+
+class TestRemoteExtraction:
+    """Test extracting archives streamed from a remote filesystem into a remote target."""
+
+    def test_extracts_every_member(self, memory_fs, remote_archive):
+        fs, archive_root, work_root = memory_fs
+        archive_location = remote_archive(create_member_index=False)
+        service = ArchiveExtractionService(filesystem_factory=lambda location: fs)
+
+        result = service.extract_archive(
+            Path("run.tar.gz"), memory_location("work", work_root), target_path="run",
+            archive_location=archive_location,
+        )
+
+        assert result.success, result.errors
+        assert not result.used_member_index
+        assert sorted(result.extracted_files) == sorted(member_contents())
+        for relative_path, data in member_contents().items():
+            assert fs.cat(f"{work_root}/run/{relative_path}") == data
+        # Written through partial files, none of which are left behind
+        assert not [path for path in fs.find(work_root) if path.endswith(".partial")]
+        assert fs.exists(f"{work_root}/run/.tellus_fragments.json")
+
+    def test_member_index_skips_unselected_members(self, memory_fs, remote_archive):
+        fs, archive_root, work_root = memory_fs
+        archive_location = remote_archive()
+        archive_size = fs.info(f"{archive_root}/run.tar.gz")["size"]
+        service = ArchiveExtractionService(filesystem_factory=lambda location: fs)
+
+        result = service.extract_archive(
+            Path("run.tar.gz"), memory_location("work", work_root), target_path="run",
+            extraction_filter=ArchiveExtractionFilter(include_patterns=["outdata/echam.200003.nc"]),
+            archive_location=archive_location,
+        )
+
+        assert result.success, result.errors
+        assert result.used_member_index
+        assert result.extracted_files == ["outdata/echam.200003.nc"]
+        assert sorted(result.skipped_files) == sorted(set(member_contents()) - {"outdata/echam.200003.nc"})
+        assert fs.find(f"{work_root}/run/outdata", detail=False) == [f"{work_root}/run/outdata/echam.200003.nc"]
+        assert fs.cat(f"{work_root}/run/outdata/echam.200003.nc") == member_contents()["outdata/echam.200003.nc"]
+        # Only the blocks holding the selected member are read from the archive
+        assert 0 < fs.bytes_read[f"{archive_root}/run.tar.gz"] < archive_size / 3
+
+
+class ConcurrencyLimitedExtractionService(ArchiveExtractionService):
+    """
+    Extraction service tracking how many members are written at once.
+
+    Writers wait in groups of ``expected_writers``, so extraction fails
+    with a broken barrier unless that many write at the same time.
+    """
+
+    def __init__(self, expected_writers):
+        super().__init__()
+        self.max_writing = 0
+        self._writing = 0
+        self._lock = threading.Lock()
+        self._barrier = threading.Barrier(expected_writers, timeout=10)
+
+    def _write_file_atomically(self, *args, **kwargs):
+        with self._lock:
+            self._writing += 1
+            self.max_writing = max(self.max_writing, self._writing)
+        try:
+            self._barrier.wait()
+            return super()._write_file_atomically(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._writing -= 1
+
+
+class TestConcurrentExtraction:
+    """Test writing the members of one archive on several threads."""
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_writers_are_bounded_by_max_concurrent_extractions(self, tmp_path, target_location,
+                                                               local_archive, workers):
+        files = {f"outdata/echam.2000{month:02d}.nc": bytes([month]) * 1000 for month in range(1, 13)}
+        archive = Path(local_archive("run", files).location)
+        service = ConcurrencyLimitedExtractionService(expected_writers=workers)
+
+        result = service.extract_archive(
+            archive, target_location, target_path="run",
+            extraction_config=ArchiveExtractionConfig(max_concurrent_extractions=workers),
+        )
+
+        assert result.success, result.errors
+        assert result.extraction_workers == workers
+        assert service.max_writing == workers
+        for relative_path, data in files.items():
+            assert (tmp_path / "run" / relative_path).read_bytes() == data
+
+
+class TestExtractMultipleArchives:
+    """Test extracting several archives into one target."""
+
+    @pytest.mark.parametrize("conflict_resolution, expected", [
+        (ConflictResolution.NEWEST, b"rerun"),
+        (ConflictResolution.SKIP, b"first"),
+    ])
+    def test_archives_sharing_files_are_serialised(self, tmp_path, target_location, local_archive,
+                                                   recording_extraction_service, conflict_resolution, expected):
+        archives = [
+            Path(local_archive(name, files, mtime=mtime).location) for name, files, mtime in [
+                ("run_2000", {"outdata/echam.2000.nc": b"first"}, 1_000_000),
+                ("run_2001", {"outdata/echam.2001.nc": b"2001"}, 1_000_000),
+                ("rerun_2000", {"outdata/echam.2000.nc": b"rerun"}, 2_000_000),
+            ]
+        ]
+        service = recording_extraction_service(concurrent={"run_2000.tar.gz", "run_2001.tar.gz"})
+
+        results = service.extract_multiple_archives(
+            archives, target_location, target_path="run",
+            extraction_config=ArchiveExtractionConfig(
+                conflict_resolution=conflict_resolution, use_process_pool=False),
+        )
+
+        assert all(result.success for result in results.values()), [r.errors for r in results.values()]
+        assert service.started_after_end("rerun_2000.tar.gz", "run_2000.tar.gz")
+        assert (tmp_path / "run/outdata/echam.2000.nc").read_bytes() == expected
+        assert (tmp_path / "run/outdata/echam.2001.nc").read_bytes() == b"2001"
+        assert json.loads((tmp_path / "run/.tellus_fragments.json").read_text()).keys() == {
+            str(archive) for archive in archives}
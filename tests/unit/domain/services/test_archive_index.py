@@ -0,0 +1,207 @@
+"""
+Tests for random-access extraction through the archive member index.
+"""
+
+import gzip
+import io
+import random
+import tarfile
+
+import pytest
+
+from tellus.domain.services.archive_compression import (
+    BlockIndexedReader, CompressionCodec, CompressionLevel,
+    ParallelBlockReader, ParallelCompressionWriter, open_tar_stream)
+from tellus.domain.services.archive_index import ArchiveMemberIndex
+
+
+BLOCK_SIZE = 16 * 1024
+
+
+def member_contents():
+    rng = random.Random(1)
+    files = {}
+    for year in range(2000, 2020):
+        files[f"restart/fesom.{year}.nc"] = rng.randbytes(rng.randint(0, 40_000))
+    files["run.log"] = b"done\n" * 100
+    return files
+
+
+def add_member(tar, index, tarinfo, fileobj=None):
+    """Add a member the way ArchiveCreationService does."""
+    header_offset = tar.offset
+    tar.addfile(tarinfo, fileobj)
+    index.add_member(tarinfo, header_offset, tar.offset, has_data=fileobj is not None)
+
+
+def write_archive(archive_path, files, codec=CompressionCodec.GZIP):
+    index = ArchiveMemberIndex()
+    with open(archive_path, "wb") as raw_file:
+        if codec is None:
+            stream = raw_file
+        else:
+            stream = ParallelCompressionWriter(raw_file, codec=codec, level=CompressionLevel.FAST,
+                                               workers=2, block_size=BLOCK_SIZE, independent_blocks=True)
+        with tarfile.open(fileobj=stream, mode="w") as tar:
+            directory = tarfile.TarInfo("restart")
+            directory.type = tarfile.DIRTYPE
+            add_member(tar, index, directory)
+            for name, content in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                info.mtime = 1_700_000_000
+                add_member(tar, index, info, io.BytesIO(content))
+            link = tarfile.TarInfo("latest.nc")
+            link.type = tarfile.SYMTYPE
+            link.linkname = "restart/fesom.2019.nc"
+            add_member(tar, index, link)
+        if codec is not None:
+            stream.close()
+            index.codec = codec
+            index.blocks = stream.blocks
+    index.write(archive_path)
+    return index
+
+
+class TestBlockIndexedReader:
+    """Test random reads over independently compressed blocks."""
+
+    @pytest.mark.parametrize("codec", [CompressionCodec.GZIP, CompressionCodec.XZ])
+    def test_random_reads_match_uncompressed_data(self, codec):
+        data = random.Random(0).randbytes(200_000)
+        output = io.BytesIO()
+        with ParallelCompressionWriter(output, codec=codec, workers=3, block_size=10_000,
+                                       independent_blocks=True) as writer:
+            writer.write(data)
+
+        reader = BlockIndexedReader(output, codec, writer.blocks)
+        rng = random.Random(1)
+        for _ in range(200):
+            offset = rng.randint(0, len(data) + 10)
+            size = rng.randint(0, 30_000)
+            reader.seek(offset)
+            assert reader.read(size) == data[offset:offset + size]
+        reader.seek(0)
+        assert reader.read() == data
+
+    def test_independent_gzip_blocks_are_separate_members(self):
+        data = b"salinity " * 50_000
+        output = io.BytesIO()
+        with ParallelCompressionWriter(output, workers=2, block_size=100_000,
+                                       independent_blocks=True) as writer:
+            writer.write(data)
+
+        assert writer.independent_blocks
+        assert len(writer.blocks) == 5
+        assert gzip.decompress(output.getvalue()) == data
+
+
+class TestParallelBlockReader:
+    """Test sequential reads decompressed ahead on a thread pool."""
+
+    def test_sequential_reads_match_uncompressed_data(self):
+        data = random.Random(2).randbytes(150_000)
+        output = io.BytesIO()
+        with ParallelCompressionWriter(output, workers=2, block_size=10_000,
+                                       independent_blocks=True) as writer:
+            writer.write(data)
+
+        with ParallelBlockReader(output, CompressionCodec.GZIP, writer.blocks, workers=3) as reader:
+            chunks = [reader.read(7_000) for _ in range(10)]
+            chunks.append(reader.read())
+
+            assert b"".join(chunks) == data
+            assert reader.read(1) == b""
+            assert reader.blocks_decompressed == 15
+
+    def test_streams_indexed_archive(self, tmp_path):
+        files = member_contents()
+        index = write_archive(tmp_path / "run.tar.gz", files)
+
+        with open(tmp_path / "run.tar.gz", "rb") as raw_file, \
+                ParallelBlockReader(raw_file, index.codec, index.blocks, workers=2) as reader, \
+                tarfile.open(fileobj=reader, mode="r|") as tar:
+            contents = {member.name: tar.extractfile(member).read() for member in tar if member.isfile()}
+
+        assert contents == files
+
+
+class TestArchiveMemberIndex:
+    """Test extracting members through the index."""
+
+    @pytest.mark.parametrize("codec", [CompressionCodec.GZIP, CompressionCodec.XZ, None])
+    def test_reads_single_member_without_scanning_archive(self, tmp_path, codec):
+        files = member_contents()
+        archive_path = tmp_path / "restarts.tar.gz"
+        write_archive(archive_path, files, codec)
+
+        index = ArchiveMemberIndex.load(archive_path)
+        members = {member.name: member for member in index.list_members()}
+        assert set(members) == {"restart", "latest.nc", *files}
+
+        with index.open_archive(archive_path) as tar:
+            tarinfo = index.read_member(tar, members["restart/fesom.2010.nc"])
+            content = tar.extractfile(tarinfo).read()
+            link = index.read_member(tar, members["latest.nc"])
+            if codec is not None:
+                # First header, the member's data (at most 40 kB) and the final link
+                assert tar.fileobj.blocks_decompressed <= 6
+                assert len(index.blocks) > 20
+
+        assert content == files["restart/fesom.2010.nc"]
+        assert tarinfo.mtime == 1_700_000_000
+        assert link.issym() and link.linkname == "restart/fesom.2019.nc"
+
+    def test_reads_member_from_open_file(self, tmp_path):
+        files = member_contents()
+        archive_path = tmp_path / "restarts.tar.gz"
+        write_archive(archive_path, files)
+        index = ArchiveMemberIndex.load(archive_path)
+        member = next(m for m in index.list_members() if m.name == "run.log")
+
+        # e.g. a file opened on a remote filesystem
+        with open(archive_path, "rb") as raw_file:
+            with index.open_archive(raw_file) as tar:
+                content = tar.extractfile(index.read_member(tar, member)).read()
+            assert not raw_file.closed
+
+        assert content == files["run.log"]
+
+    def test_indexed_archive_is_a_regular_tarball(self, tmp_path):
+        files = member_contents()
+        archive_path = tmp_path / "restarts.tar.gz"
+        write_archive(archive_path, files)
+
+        with open_tar_stream(archive_path) as tar:
+            read_back = {member.name: tar.extractfile(member).read()
+                         for member in tar if member.isfile()}
+
+        assert read_back == files
+
+    def test_member_offsets_match_tarfile(self, tmp_path):
+        archive_path = tmp_path / "restarts.tar.gz"
+        index = write_archive(archive_path, member_contents())
+
+        with tarfile.open(archive_path, "r:gz") as tar:
+            expected = [(m.name, m.offset, m.offset_data) for m in tar.getmembers()]
+
+        assert [(m.name, m.offset, m.offset_data) for m in index.members] == expected
+
+    def test_index_for_changed_archive_is_ignored(self, tmp_path):
+        archive_path = tmp_path / "restarts.tar.gz"
+        write_archive(archive_path, member_contents())
+        with open(archive_path, "ab") as f:
+            f.write(b"\0" * 512)
+
+        assert ArchiveMemberIndex.load(archive_path) is None
+
+    def test_missing_index(self, tmp_path):
+        assert ArchiveMemberIndex.load(tmp_path / "none.tar.gz") is None
+
+    def test_invalid_index_raises_value_error(self, tmp_path):
+        archive_path = tmp_path / "restarts.tar.gz"
+        archive_path.write_bytes(b"")
+        ArchiveMemberIndex.index_path(archive_path).write_text('{"index_version": 99}')
+
+        with pytest.raises(ValueError):
+            ArchiveMemberIndex.load(archive_path)
@@ -0,0 +1,111 @@
+"""
+Tests for splitting archives into size-bounded parts.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from tellus.domain.entities.simulation_file import (FileContentType,
+                                                    FileInventory,
+                                                    SimulationFile)
+from tellus.domain.services.archive_splitting import (part_archive_id,
+                                                      part_archive_path,
+                                                      plan_archive_parts,
+                                                      select_split_parts,
+                                                      split_sidecar_section)
+
+
+def inventory_of(*files):
+    inventory = FileInventory()
+    for file in files:
+        inventory.add_file(file)
+    return inventory
+
+
+def monthly_outputs(year, size):
+    return [
+        SimulationFile(f"outdata/echam.{year}{month:02d}.nc", size=size,
+                       content_type=FileContentType.OUTDATA, simulation_date=datetime(year, month, 1))
+        for month in range(1, 13)
+    ]
+
+
+class TestPlanArchiveParts:
+    """Test packing inventories into parts."""
+
+    def test_parts_respect_size_limit(self):
+        inventory = inventory_of(*monthly_outputs(2000, 30), *monthly_outputs(2001, 45))
+        parts = plan_archive_parts(inventory, 100)
+
+        assert all(part.total_size <= 100 for part in parts)
+        assert sum(part.file_count for part in parts) == 24
+        # Pairs of 45-byte files, then triples of 30-byte files
+        assert len(parts) == 10
+
+    def test_groups_are_kept_together(self):
+        restarts = [
+            SimulationFile(f"restart/fesom.{year}.{component}.nc", size=40,
+                           content_type=FileContentType.RESTART, simulation_date=datetime(year, 12, 31))
+            for year in (2000, 2001, 2002) for component in ("ice", "oce")
+        ]
+        inventory = inventory_of(*restarts, SimulationFile("log/run.log", size=15, content_type=FileContentType.LOG))
+        parts = plan_archive_parts(inventory, 100)
+
+        years = [{path.split(".")[1] for path in part.files if path.startswith("restart")} for part in parts]
+        assert years == [{"2000"}, {"2001"}, {"2002"}]
+        assert sum(part.file_count for part in parts) == 7
+
+    def test_large_group_is_split_in_path_order(self):
+        inventory = inventory_of(*monthly_outputs(2000, 30))
+        parts = plan_archive_parts(inventory, 100, group_by_date=False)
+
+        assert [list(part.files) for part in parts] == [
+            [f"outdata/echam.2000{month:02d}.nc" for month in range(start, start + 3)]
+            for start in (1, 4, 7, 10)
+        ]
+
+    def test_oversized_file_gets_own_part(self):
+        inventory = inventory_of(SimulationFile("outdata/huge.nc", size=500), SimulationFile("outdata/small.nc", size=5))
+        parts = plan_archive_parts(inventory, 100)
+
+        assert [list(part.files) for part in parts] == [["outdata/huge.nc"], ["outdata/small.nc"]]
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            plan_archive_parts(FileInventory(), 0)
+
+
+class TestSplitParts:
+    """Test naming, linking and selecting parts."""
+
+    def test_part_names(self):
+        assert part_archive_path(Path("/archive/run.tar.gz"), 2) == Path("/archive/run.part002.tar.gz")
+        assert part_archive_path(Path("run.tar"), 12) == Path("run.part012.tar")
+        assert part_archive_path(Path("run.bin"), 1) == Path("run.bin.part001")
+        assert part_archive_id("run", 3) == "run_part003"
+
+    def test_sidecar_section_links_sibling_parts(self):
+        part_ids = [part_archive_id("run", n) for n in (1, 2, 3)]
+        part_paths = [part_archive_path(Path("run.tar.gz"), n) for n in (1, 2, 3)]
+        section = split_sidecar_section("run", 2, part_ids, part_paths)
+
+        assert section["part_number"] == 2
+        assert section["part_count"] == 3
+        assert section["part_path"] == "run.part002.tar.gz"
+        assert section["split_archive_parts"] == ["run_part001", "run_part003"]
+
+    def test_select_parts_holding_requested_files(self):
+        sidecars = {
+            f"run_part{n:03d}": {
+                "split": {"part_number": n},
+                "inventory": {"files": [{"path": path} for path in paths]},
+            }
+            for n, paths in ((2, ["restart/fesom.2001.nc"]), (1, ["outdata/echam.2000.nc", "log/run.log"]),
+                             (3, ["outdata/echam.2001.nc"]))
+        }
+
+        assert select_split_parts(sidecars, ["restart/fesom.2001.nc"]) == ["run_part002"]
+        assert select_split_parts(sidecars, ["outdata/*.nc"]) == ["run_part001", "run_part003"]
+        assert select_split_parts(sidecars, ["missing.nc"]) == []
@@ -0,0 +1,160 @@
+"""
+Tests for streaming archives into local and fsspec filesystems.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import tarfile
+import uuid
+from pathlib import Path
+
+import fsspec
+import pytest
+
+from tellus.domain.services.archive_compression import (
+    CompressionCodec, CompressionLevel, ParallelCompressionWriter)
+from tellus.domain.services.archive_target import ArchiveTarget, ChecksumWriter
+
+
+@pytest.fixture
+def memory_fs():
+    """In-memory filesystem, cleaned up after the test."""
+    fs = fsspec.filesystem("memory")
+    root = f"/target-{uuid.uuid4().hex}"
+    fs.makedirs(root, exist_ok=True)
+    yield fs, root
+    fs.rm(root, recursive=True)
+
+
+class TestChecksumWriter:
+    """Test checksums computed while writing."""
+
+    def test_hashes_and_counts_written_bytes(self):
+        sink = io.BytesIO()
+        writer = ChecksumWriter(sink)
+        for chunk in (b"restart", bytearray(b" data"), memoryview(b"\x00" * 1000)):
+            writer.write(chunk)
+
+        assert writer.bytes_written == writer.tell() == len(sink.getvalue()) == 1012
+        assert writer.hexdigest() == hashlib.md5(sink.getvalue()).hexdigest()
+
+    def test_count_only_without_algorithm(self):
+        writer = ChecksumWriter(io.BytesIO(), algorithm=None)
+        writer.write(b"abc")
+
+        assert writer.bytes_written == 3
+        assert writer.hexdigest() is None
+
+    def test_does_not_close_underlying_file(self):
+        sink = io.BytesIO()
+        with ChecksumWriter(sink) as writer:
+            writer.write(b"abc")
+
+        assert writer.closed
+        assert not sink.closed
+
+    def test_matches_compressed_archive(self):
+        sink = io.BytesIO()
+        with ChecksumWriter(sink, algorithm="sha256") as writer, \
+                ParallelCompressionWriter(writer, codec=CompressionCodec.GZIP,
+                                          level=CompressionLevel.FAST, block_size=4096) as stream, \
+                tarfile.open(fileobj=stream, mode="w") as tar:
+            data = b"temperature" * 2000
+            tarinfo = tarfile.TarInfo("outdata/echam.nc")
+            tarinfo.size = len(data)
+            tar.addfile(tarinfo, io.BytesIO(data))
+
+        archive = sink.getvalue()
+        assert writer.bytes_written == len(archive)
+        assert writer.hexdigest() == hashlib.sha256(archive).hexdigest()
+        assert gzip.decompress(archive)[512:512 + len(data)] == data
+
+
+class TestArchiveTarget:
+    """Test reading and writing through local and fsspec targets."""
+
+    def test_remote_write_is_chunked_and_moved(self, memory_fs):
+        fs, root = memory_fs
+        target = ArchiveTarget(fs, block_size=1024)
+        archive_path = Path(root) / "run.tar"
+        partial_path = target.partial_path(archive_path)
+
+        with target.open_write(partial_path) as f:
+            for _ in range(10):
+                f.write(b"x" * 500)
+        target.replace(partial_path, archive_path)
+
+        assert target.exists(archive_path)
+        assert not target.exists(partial_path)
+        assert fs.cat(str(archive_path)) == b"x" * 5000
+
+    def test_relative_paths_resolve_against_base_path(self, memory_fs):
+        fs, root = memory_fs
+        target = ArchiveTarget(fs, base_path=root)
+
+        target.makedirs(Path("archives"))
+        target.write_json(Path("archives/run.metadata.json"), {"archive_id": "run"})
+
+        assert json.loads(fs.cat(f"{root}/archives/run.metadata.json")) == {"archive_id": "run"}
+        assert fs.ls(f"{root}/archives", detail=False) == [f"{root}/archives/run.metadata.json"]
+        assert target.describe(Path("archives")) == f"memory://{root}/archives"
+
+    def test_remote_reads(self, memory_fs):
+        fs, root = memory_fs
+        target = ArchiveTarget(fs, base_path=root, block_size=1024)
+        fs.pipe(f"{root}/archives/run.tar", b"y" * 5000)
+        fs.pipe(f"{root}/archives/run.metadata.json", b'{"size": 5000}')
+        fs.pipe(f"{root}/archives/old/run.tar", b"")
+
+        with target.open_read(Path("archives/run.tar")) as f:
+            f.seek(4000)
+            assert f.read() == b"y" * 1000
+        assert target.read_json(Path("archives/run.metadata.json")) == {"size": 5000}
+        assert target.isfile(Path("archives/run.tar"))
+        assert not target.isfile(Path("archives"))
+        assert target.file_info(Path("archives/run.tar"))[0] == 5000
+        assert target.list_files(Path("archives")) == {"run.tar", "run.metadata.json", "old/run.tar"}
+        assert target.list_files(Path("missing")) == set()
+
+    def test_remove(self, memory_fs):
+        fs, root = memory_fs
+        target = ArchiveTarget(fs)
+        path = Path(root) / "run.tar"
+        fs.pipe(str(path), b"data")
+
+        assert target.remove(path)
+        assert not target.remove(path)
+        assert not fs.exists(str(path))
+
+    def test_local_target(self, tmp_path):
+        target = ArchiveTarget()
+        archive_path = tmp_path / "archives" / "run.tar"
+
+        assert not target.is_remote
+        target.makedirs(archive_path.parent)
+        with target.open_write(archive_path) as f:
+            f.write(b"data")
+        target.write_json(tmp_path / "archives" / "run.metadata.json", {"size": 4})
+
+        assert archive_path.read_bytes() == b"data"
+        assert sorted(p.name for p in archive_path.parent.iterdir()) == ["run.metadata.json", "run.tar"]
+        assert target.file_info(archive_path)[0] == 4
+        assert target.list_files(tmp_path) == {"archives/run.tar", "archives/run.metadata.json"}
+        assert target.remove(archive_path)
+        assert not archive_path.exists()
+
+    def test_for_location_uses_filesystem_factory(self, memory_fs):
+        fs, root = memory_fs
+
+        class Location:
+            def get_base_path(self):
+                return root
+
+        target = ArchiveTarget.for_location(Location(), filesystem_factory=lambda location: fs,
+                                            block_size=2048)
+
+        assert target.is_remote
+        assert target.block_size == 2048
+        assert target.resolve(Path("run.tar")) == Path(root) / "run.tar"
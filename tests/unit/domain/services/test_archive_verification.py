@@ -0,0 +1,133 @@
+"""
+Tests for verifying archives against their creation-time manifest.
+"""
+
+import hashlib
+import io
+import random
+import tarfile
+
+import pytest
+
+from tellus.domain.services.archive_compression import (
+    CompressionCodec, CompressionLevel, ParallelCompressionWriter)
+from tellus.domain.services.archive_index import ArchiveMemberIndex
+from tellus.domain.services.archive_verification import (ArchiveVerifier,
+                                                         ManifestEntry,
+                                                         VerificationLevel)
+
+
+def member_contents():
+    rng = random.Random(3)
+    return {f"outdata/echam.{year}.nc": rng.randbytes(rng.randint(1, 30_000)) for year in range(2000, 2015)}
+
+
+def write_archive(archive_path, files, compressed=True):
+    """Write an indexed archive, returning its member index and manifest."""
+    index = ArchiveMemberIndex()
+    manifest = {}
+    with open(archive_path, "wb") as raw_file:
+        stream = raw_file
+        if compressed:
+            stream = ParallelCompressionWriter(raw_file, codec=CompressionCodec.GZIP, level=CompressionLevel.FAST,
+                                               workers=2, block_size=16 * 1024, independent_blocks=True)
+        with tarfile.open(fileobj=stream, mode="w") as tar:
+            directory = tarfile.TarInfo("outdata")
+            directory.type = tarfile.DIRTYPE
+            header_offset = tar.offset
+            tar.addfile(directory)
+            index.add_member(directory, header_offset, tar.offset, has_data=False)
+            manifest["outdata"] = ManifestEntry(None)
+
+            for name, content in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                header_offset = tar.offset
+                tar.addfile(info, io.BytesIO(content))
+                index.add_member(info, header_offset, tar.offset, has_data=True)
+                manifest[name] = ManifestEntry(len(content), hashlib.sha256(content).hexdigest(), "sha256")
+        if compressed:
+            stream.close()
+            index.codec = stream.codec
+            index.blocks = stream.blocks
+    return index, manifest
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive_path = tmp_path / "run.tar.gz"
+    index, manifest = write_archive(archive_path, member_contents())
+    return archive_path, index, manifest
+
+
+def opener(archive_path):
+    return lambda: open(archive_path, "rb")
+
+
+class TestArchiveVerifier:
+    """Test the fast, sample and full verification levels."""
+
+    @pytest.mark.parametrize("level", list(VerificationLevel))
+    def test_intact_archive(self, archive, level):
+        archive_path, index, manifest = archive
+        report = ArchiveVerifier(level, sample_size=4, workers=2).verify(manifest, opener(archive_path), index)
+
+        assert report.success
+        assert report.members_checked == 16
+        assert report.missing == report.unexpected == report.mismatched == []
+        assert report.members_hashed == {"fast": 0, "sample": 4, "full": 15}[level.value]
+
+    def test_full_hashes_every_member_in_parallel(self, archive):
+        archive_path, index, manifest = archive
+        report = ArchiveVerifier(VerificationLevel.FULL, workers=3).verify(manifest, opener(archive_path), index)
+
+        assert report.workers == 3
+        assert report.bytes_hashed == sum(entry.size for entry in manifest.values() if entry.size)
+        assert report.to_dict()["success"]
+
+    def test_full_without_index(self, tmp_path):
+        archive_path = tmp_path / "run.tar"
+        _, manifest = write_archive(archive_path, member_contents(), compressed=False)
+        report = ArchiveVerifier(VerificationLevel.FULL).verify(manifest, opener(archive_path))
+
+        assert report.success
+        assert report.members_hashed == 15
+        assert report.workers == 1
+
+    @pytest.mark.parametrize("level", [VerificationLevel.SAMPLE, VerificationLevel.FULL])
+    def test_detects_checksum_mismatch(self, archive, level):
+        archive_path, index, manifest = archive
+        name = "outdata/echam.2003.nc"
+        manifest[name] = manifest[name]._replace(checksum=hashlib.sha256(b"other").hexdigest())
+
+        verifier = ArchiveVerifier(level, sample_size=len(manifest))
+        report = verifier.verify(manifest, opener(archive_path), index)
+
+        assert not report.success
+        assert len(report.mismatched) == 1
+        assert report.mismatched[0].startswith(name)
+
+    def test_fast_detects_size_mismatch_and_missing_members(self, archive):
+        archive_path, index, manifest = archive
+        archived_size = manifest["outdata/echam.2000.nc"].size
+        manifest["outdata/echam.2000.nc"] = manifest["outdata/echam.2000.nc"]._replace(size=1)
+        manifest["outdata/echam.2099.nc"] = ManifestEntry(10, "0" * 64, "sha256")
+        del manifest["outdata/echam.2014.nc"]
+
+        report = ArchiveVerifier(VerificationLevel.FAST).verify(manifest, lambda: pytest.fail("archive read"), index)
+
+        assert report.missing == ["outdata/echam.2099.nc"]
+        assert report.unexpected == ["outdata/echam.2014.nc"]
+        assert report.mismatched == [f"outdata/echam.2000.nc: size {archived_size} differs from 1 archived"]
+
+    def test_sample_without_index_streams_archive(self, tmp_path):
+        archive_path = tmp_path / "run.tar"
+        _, manifest = write_archive(archive_path, member_contents(), compressed=False)
+        del manifest["outdata/echam.2005.nc"]
+
+        report = ArchiveVerifier(VerificationLevel.SAMPLE, sample_size=3).verify(manifest, opener(archive_path))
+
+        # Unexpected members are reported but do not fail verification
+        assert report.success
+        assert report.members_hashed == 3
+        assert report.unexpected == ["outdata/echam.2005.nc"]
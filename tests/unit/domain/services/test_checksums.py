@@ -0,0 +1,77 @@
+"""
+Tests for checksum algorithm selection and hashing while reading.
+"""
+
+import hashlib
+import io
+import sys
+import tarfile
+
+import pytest
+
+from tellus.domain.services.checksums import (HashingReader, new_hash,
+                                              preferred_checksum_algorithm)
+
+
+class TestAlgorithmSelection:
+    """Test choosing and creating hash functions."""
+
+    def test_falls_back_to_sha256(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "blake3", None)
+        monkeypatch.setitem(sys.modules, "xxhash", None)
+
+        assert preferred_checksum_algorithm() == "sha256"
+
+    def test_prefers_xxhash_without_blake3(self, monkeypatch):
+        pytest.importorskip("xxhash")
+        monkeypatch.setitem(sys.modules, "blake3", None)
+
+        assert preferred_checksum_algorithm() == "xxh3_128"
+
+    def test_blake3(self):
+        blake3 = pytest.importorskip("blake3")
+        hasher = new_hash("blake3")
+        hasher.update(b"salinity")
+
+        assert preferred_checksum_algorithm() == "blake3"
+        assert hasher.hexdigest() == blake3.blake3(b"salinity").hexdigest()
+
+    def test_hashlib_algorithms(self):
+        hasher = new_hash("md5")
+        hasher.update(b"salinity")
+
+        assert hasher.hexdigest() == hashlib.md5(b"salinity").hexdigest()
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(ValueError):
+            new_hash("crc7")
+
+    def test_missing_package(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "blake3", None)
+
+        with pytest.raises(ImportError):
+            new_hash("blake3")
+
+
+class TestHashingReader:
+    """Test member checksums computed while archiving."""
+
+    def test_hashes_data_read(self):
+        reader = HashingReader(io.BytesIO(b"temperature" * 1000), "sha256")
+        chunks = [reader.read(4096) for _ in range(3)]
+
+        assert b"".join(chunks) == b"temperature" * 1000
+        assert reader.bytes_read == 11000
+        assert reader.hexdigest() == hashlib.sha256(b"temperature" * 1000).hexdigest()
+
+    def test_hashes_archived_member_data(self):
+        data = b"\x01\x02" * 50_000
+        reader = HashingReader(io.BytesIO(data + b"appended after stat"), "sha256")
+        tarinfo = tarfile.TarInfo("restart/fesom.2000.nc")
+        tarinfo.size = len(data)
+
+        with tarfile.open(fileobj=io.BytesIO(), mode="w") as tar:
+            tar.addfile(tarinfo, reader)
+
+        # Only the bytes that went into the archive are hashed
+        assert reader.hexdigest() == hashlib.sha256(data).hexdigest()
@@ -0,0 +1,132 @@
+"""
+Tests for the pipelined member writer used for archive extraction.
+"""
+
+import io
+import random
+import tarfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from tellus.domain.services.extraction_pipeline import (DirectoryCache,
+                                                        ParallelMemberWriter)
+
+
+def build_tar(files):
+    output = io.BytesIO()
+    with tarfile.open(fileobj=output, mode="w") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    output.seek(0)
+    return tarfile.open(fileobj=output, mode="r:")
+
+
+def sample_files(count=40):
+    rng = random.Random(0)
+    return {f"outdata/fesom.{year}.nc": rng.randbytes(rng.randint(0, 5000))
+            for year in range(2000, 2000 + count)}
+
+
+def write_to(target_dir):
+    def write_member(member, target_path, source):
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        target_path.write_bytes(source.read())
+    return write_member
+
+
+class TestParallelMemberWriter:
+    """Test reading members sequentially and writing them concurrently."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_extracts_all_members_in_order(self, tmp_path, workers):
+        files = sample_files()
+        tar = build_tar(files)
+        writer = ParallelMemberWriter(write_to(tmp_path), workers=workers)
+
+        outcomes = list(writer.extract(tar, ((m, tmp_path / m.name) for m in tar.getmembers())))
+
+        assert [member.name for member, _, _ in outcomes] == list(files)
+        assert all(error is None for _, _, error in outcomes)
+        for name, content in files.items():
+            assert (tmp_path / name).read_bytes() == content
+
+    def test_writes_run_concurrently(self, tmp_path):
+        tar = build_tar(sample_files(4))
+        barrier = threading.Barrier(2, timeout=10)
+
+        def write_member(member, target_path, source):
+            barrier.wait()  # Only passes if two members are written at the same time
+
+        writer = ParallelMemberWriter(write_member, workers=2)
+        outcomes = list(writer.extract(tar, ((m, tmp_path / m.name) for m in tar.getmembers())))
+
+        assert [error for _, _, error in outcomes] == [None] * 4
+
+    def test_large_members_are_written_from_stream(self, tmp_path):
+        files = {"small.nc": b"s" * 100, "large.nc": b"l" * 5000, "after.nc": b"a" * 100}
+        tar = build_tar(files)
+        writer_threads = {}
+
+        def write_member(member, target_path, source):
+            writer_threads[member.name] = threading.current_thread()
+            target_path.write_bytes(source.read())
+
+        writer = ParallelMemberWriter(write_member, workers=2, max_buffered_bytes=1000)
+        outcomes = list(writer.extract(tar, ((m, tmp_path / m.name) for m in tar.getmembers())))
+
+        assert [member.name for member, _, _ in outcomes] == list(files)
+        assert writer_threads["large.nc"] is threading.current_thread()
+        assert writer_threads["small.nc"] is not threading.current_thread()
+        assert (tmp_path / "large.nc").read_bytes() == files["large.nc"]
+
+    def test_failures_are_reported_per_member(self, tmp_path):
+        files = sample_files(10)
+        tar = build_tar(files)
+        failing = "outdata/fesom.2003.nc"
+
+        def write_member(member, target_path, source):
+            if member.name == failing:
+                raise OSError("disk full")
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            target_path.write_bytes(source.read())
+
+        writer = ParallelMemberWriter(write_member, workers=3)
+        outcomes = list(writer.extract(tar, ((m, tmp_path / m.name) for m in tar.getmembers())))
+
+        errors = {member.name: error for member, _, error in outcomes if error is not None}
+        assert list(errors) == [failing]
+        assert isinstance(errors[failing], OSError)
+        assert len(list((tmp_path / "outdata").iterdir())) == 9
+
+    def test_rejects_zero_workers(self):
+        with pytest.raises(ValueError):
+            ParallelMemberWriter(lambda *args: None, workers=0)
+
+
+class TestDirectoryCache:
+    """Test that directories are created once per extraction."""
+
+    def test_creates_each_directory_once(self, tmp_path):
+        directories = DirectoryCache()
+        target = tmp_path / "outdata" / "2000"
+
+        directories.ensure(target)
+        assert target.is_dir()
+        assert tmp_path / "outdata" in directories
+
+        target.rmdir()
+        directories.ensure(target)
+        assert not target.exists()
+
+    def test_uses_given_makedirs(self):
+        created = []
+        directories = DirectoryCache(created.append)
+
+        for year in (2000, 2000, 2001):
+            directories.ensure(Path("outdata") / str(year))
+
+        assert created == [Path("outdata/2000"), Path("outdata/2001")]
@@ -0,0 +1,158 @@
+"""
+Tests for the compiled pattern matching in FileClassifier.
+
+The compiled tables must classify exactly like the sequential fnmatch loop
+they replace, so the classifier is checked against that reference over a
+large synthetic corpus of Earth system model paths.
+"""
+
+import random
+import re
+from fnmatch import fnmatch
+from pathlib import Path
+
+import pytest
+
+from tellus.domain.entities.simulation_file import (FileContentType,
+                                                    FileImportance, FilePattern)
+from tellus.domain.services.file_classifier import (CompiledPatternTable,
+                                                    FileClassifier)
+
+
+class ReferenceClassifier(FileClassifier):
+    """The classifier matching patterns one fnmatch call at a time."""
+
+    ROLE_PATTERNS = {
+        'parameters': r'param|config|setting|namelist',
+        'restart': r'restart|checkpoint|resume|init',
+        'diagnostic': r'diag|analysis|stat|summary',
+        'log': r'log|output|stdout|stderr|debug',
+        'metadata': r'meta|catalog|index|manifest',
+        'forcing': r'forcing|boundary|driver|input',
+        'output': r'output|result|data'
+    }
+
+    def classify_file(self, file_path, simulation_context=None):
+        path = Path(file_path)
+        directory = str(path.parent).lower()
+        extension = path.suffix.lower()
+
+        if simulation_context:
+            model_type = simulation_context.get('model_id', '').lower()
+            if model_type in self._model_specific_patterns:
+                result = self._reference_match(file_path, self._model_specific_patterns[model_type])
+                if result:
+                    return result
+
+        result = self._reference_match(file_path, self._patterns)
+        if result:
+            return result
+
+        return self._fallback_classification(file_path, directory, extension)
+
+    def _reference_match(self, file_path, patterns):
+        for pattern in patterns:
+            if fnmatch(file_path.lower(), pattern.glob_pattern.lower()):
+                return (pattern.content_type, pattern.importance, self._reference_role(file_path))
+        return None
+
+    def _reference_role(self, file_path):
+        filename = Path(file_path).stem.lower()
+        for role, regex_pattern in self.ROLE_PATTERNS.items():
+            if re.search(regex_pattern, filename):
+                return role
+        return None
+
+
+DIRECTORIES = ["", "input/", "forcing/", "boundary/", "initial/", "outdata/fesom/",
+               "Output/", "results/", "restart/", "checkpoint/", "log/", "logs/",
+               "run/", "config/", "setup/", "data/", ".hidden/", "archive.tar/",
+               "expid/run_2000-2010/", "Forcing/ERA5/"]
+STEMS = ["fesom", "echam_BOT", "echam_ATM", "echam_LOG", "README", "namelist",
+         "user_nl_cam", "env_run", "wrfout_d01", "wrfrst_d01", "wrfbdy_d01",
+         "stdout", "stderr", "slurm-4242", "core", "diag_summary", "catalog",
+         "icon_atm_2d", "icon_oce_3d", "lnd_", "cice.h", "clm2.h0", "pop.h",
+         "temp", "a", "param_file", "init_cond", "metadata", "stats",
+         "driver_input", "results", "output_2000-01-01", "", ".bashrc"]
+EXTENSIONS = ["", ".nc", ".NC", ".nc4", ".cdf", ".hdf", ".h5", ".grib2", ".grb",
+              ".log", ".out", ".err", ".res", ".rst", ".nml", ".cfg", ".xml",
+              ".yaml", ".json", ".sh", ".py", ".r", ".ncl", ".m", ".txt", ".md",
+              ".tmp", ".swp", ".bak", ".tar", ".gz", ".tar.gz", ".tgz", ".zip",
+              ".dat", ".csv", ".png", ".pdf", ".exe", ".x", ".fesom.nc", ".1"]
+EXACT_NAMES = ["namelist.echam", "namelist.input", "namelist.config",
+               "icon_master.namelist", "forcing/wind.nc", "input/sst.nc",
+               "core.1234", "NAMELIST.INPUT", "run/namelist.input"]
+CONTEXTS = [None, {}, {"model_id": "unknown"}, {"model_id": "CESM"},
+            {"model_id": "echam"}, {"model_id": "icon"}, {"model_id": "wrf"},
+            {"model_id": "fesom"}]
+
+
+def synthetic_corpus(size, seed=0):
+    rng = random.Random(seed)
+    paths = list(EXACT_NAMES)
+    while len(paths) < size:
+        stem = rng.choice(STEMS)
+        if rng.random() < 0.3:
+            stem += f".{rng.randint(1990, 2100)}"
+        if rng.random() < 0.2:
+            stem = stem.upper()
+        paths.append(rng.choice(DIRECTORIES) + stem + rng.choice(EXTENSIONS))
+    return paths
+
+
+class TestCompiledPatternTable:
+    """Test first-match lookup in compiled pattern tables."""
+
+    def make_table(self, *globs):
+        return CompiledPatternTable([
+            FilePattern(glob, FileContentType.OUTDATA, FileImportance.OPTIONAL, glob)
+            for glob in globs
+        ])
+
+    def matched(self, table, path):
+        pattern = table.match(path)
+        return pattern.glob_pattern if pattern else None
+
+    def test_earlier_pattern_wins_across_lookup_kinds(self):
+        table = self.make_table("*restart*", "*.nc", "restart.nc", "*.tar.gz", "*.gz")
+
+        assert self.matched(table, "restart.nc") == "*restart*"
+        assert self.matched(table, "fesom.nc") == "*.nc"
+        assert self.matched(table, "run.tar.gz") == "*.tar.gz"
+        assert self.matched(table, "run.gz") == "*.gz"
+        assert self.matched(table, "run.log") is None
+
+    def test_matching_ignores_case(self):
+        table = self.make_table("*BOT*", "*.NC", "README*")
+
+        assert self.matched(table, "echam_bot.grb") == "*BOT*"
+        assert self.matched(table, "OUT/A.nc") == "*.NC"
+        assert self.matched(table, "readme.md") == "README*"
+
+    def test_wildcards_span_directories(self):
+        table = self.make_table("input/*", "*.nc", "[ab]?.txt")
+
+        assert self.matched(table, "input/nested/dir/file.bin") == "input/*"
+        assert self.matched(table, "a.b/c") is None
+        assert self.matched(table, "b1.txt") == "[ab]?.txt"
+
+
+class TestFileClassifier:
+    """Test classification against the sequential fnmatch reference."""
+
+    @pytest.mark.parametrize("context", CONTEXTS, ids=repr)
+    def test_matches_reference_implementation(self, context):
+        classifier = FileClassifier()
+        reference = ReferenceClassifier()
+
+        for path in synthetic_corpus(20000):
+            assert classifier.classify_file(path, context) == reference.classify_file(path, context), path
+
+    def test_default_classifier_is_constructible(self):
+        classifier = FileClassifier()
+
+        assert classifier.classify_file("outdata/fesom.2000.nc")[0] == FileContentType.OUTDATA
+        assert classifier.classify_file("outdata/exp.fesom.2000", {"model_id": "fesom"})[:2] == (
+            FileContentType.OUTDATA, FileImportance.IMPORTANT)
+        assert classifier.classify_file("wrfrst_d01", {"model_id": "wrf"})[0] == FileContentType.RESTART
+        assert classifier.classify_file("plots/map.png")[0] == FileContentType.VIZ
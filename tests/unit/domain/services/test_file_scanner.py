@@ -0,0 +1,215 @@
+"""
+Tests for the directory walk and incremental scanning in FileScanner.
+"""
+
+import os
+from fnmatch import fnmatch
+from unittest.mock import patch
+
+import pytest
+
+from tellus.domain.entities.simulation_file import SimulationFile
+from tellus.domain.services import file_scanner
+from tellus.domain.services.file_scanner import FileScanner
+
+
+class CountingClassifier:
+    """Classifier recording which files were classified."""
+
+    def __init__(self):
+        self.classified = []
+
+    def create_simulation_file(self, file_path, simulation_context=None, **kwargs):
+        self.classified.append(file_path)
+        return SimulationFile(relative_path=file_path, **kwargs)
+
+
+@pytest.fixture
+def experiment(tmp_path):
+    directory = tmp_path / "exp"
+    (directory / "outdata").mkdir(parents=True)
+    for year in range(2000, 2005):
+        (directory / "outdata" / f"fesom.{year}.nc").write_bytes(b"x" * (year - 1999))
+    (directory / "run.log").write_text("log")
+    return directory
+
+
+@pytest.fixture
+def classifier():
+    return CountingClassifier()
+
+
+@pytest.fixture
+def scan(experiment, classifier, tmp_path):
+    scanner = FileScanner(classifier=classifier)
+    cache_path = tmp_path / "scan-cache.json"
+
+    def run(**kwargs):
+        classifier.classified.clear()
+        return scanner.scan_directory(experiment, cache_path=cache_path, max_workers=1, **kwargs)
+
+    return run
+
+
+class TestIncrementalScan:
+    """Test scanning with a persistent stat cache."""
+
+    def test_first_scan_reports_all_files_as_new(self, scan):
+        result = scan()
+
+        assert result.success
+        assert len(result.new_files) == 6
+        assert result.unchanged_files == 0
+        assert result.files_processed == 6
+
+    def test_rescan_only_processes_changed_files(self, scan, experiment, classifier):
+        scan(compute_checksums=True)
+        (experiment / "outdata" / "fesom.2001.nc").write_bytes(b"rewritten")
+        (experiment / "outdata" / "fesom.2005.nc").write_bytes(b"new year")
+        os.remove(experiment / "run.log")
+
+        result = scan(compute_checksums=True)
+
+        assert sorted(classifier.classified) == ["outdata/fesom.2001.nc", "outdata/fesom.2005.nc"]
+        assert result.new_files == ["outdata/fesom.2005.nc"]
+        assert result.modified_files == ["outdata/fesom.2001.nc"]
+        assert result.deleted_files == ["run.log"]
+        assert result.unchanged_files == 4
+        # The inventory still covers every file on disk
+        assert result.files_processed == 6
+        cached = result.inventory.get_file("outdata/fesom.2003.nc")
+        assert cached.size == 4
+        assert cached.checksum.algorithm == "md5"
+
+    def test_unchanged_tree_is_not_reclassified(self, scan, classifier):
+        scan()
+        result = scan()
+
+        assert classifier.classified == []
+        assert result.unchanged_files == 6
+        assert not result.has_warnings
+
+    def test_missing_checksums_are_computed(self, scan, classifier):
+        scan()
+        result = scan(compute_checksums=True)
+
+        assert len(classifier.classified) == 6
+        assert all(f.checksum for f in result.inventory.list_files())
+
+    def test_excluded_files_are_not_reported_as_deleted(self, scan):
+        scan()
+        result = scan(exclude_patterns=["*.log"])
+
+        assert result.deleted_files == []
+        assert result.inventory.get_file("run.log") is None
+
+    def test_changed_context_invalidates_cache(self, scan, classifier):
+        scan(simulation_context={"model": "fesom"})
+        scan(simulation_context={"model": "icon"})
+
+        assert len(classifier.classified) == 6
+
+
+def reference_find_files(base_path, include_patterns=None, exclude_patterns=None):
+    """The rglob-based file discovery the walker replaced."""
+    files = []
+    for path in base_path.rglob('*'):
+        if not path.is_file():
+            continue
+        rel_path = str(path.relative_to(base_path))
+        if include_patterns and not any(fnmatch(rel_path, p) for p in include_patterns):
+            continue
+        if exclude_patterns and any(fnmatch(rel_path, p) for p in exclude_patterns):
+            continue
+        files.append(rel_path)
+    return sorted(files)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    base = tmp_path / "tree"
+    for rel_path in (
+        "outdata/fesom/temp.2000.nc", "outdata/fesom/salt.2000.nc", "outdata/echam/t.grb",
+        "restart/fesom.2000.nc", "scratch/tmp/a.nc", "scratch/b.log", "log/run.log",
+        "README", ".hidden/x.nc",
+    ):
+        (base / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (base / rel_path).write_text(rel_path)
+    (base / "linked.nc").symlink_to(base / "restart" / "fesom.2000.nc")
+    (base / "linked_dir").symlink_to(base / "outdata", target_is_directory=True)
+    return base
+
+
+class TestDirectoryWalk:
+    """Test the os.scandir based directory walk."""
+
+    @pytest.mark.parametrize("include, exclude", [
+        (None, None),
+        (["*.nc"], None),
+        (None, ["scratch/*", "*.log"]),
+        (["outdata/*"], ["*/echam/*"]),
+        (["*fesom*"], ["restart/*", "*.hidden*"]),
+    ])
+    def test_walk_matches_rglob(self, tree, include, exclude):
+        scanner = FileScanner(classifier=CountingClassifier())
+        result = file_scanner.FileScanResult()
+
+        walked = [rel_path for rel_path, _ in scanner._walk_files(tree, include, exclude, result)]
+
+        assert sorted(walked) == reference_find_files(tree, include, exclude)
+
+    def test_walk_yields_stat_results(self, tree):
+        scanner = FileScanner(classifier=CountingClassifier())
+
+        entries = dict(scanner._walk_files(tree, None, None, file_scanner.FileScanResult()))
+
+        assert entries["README"].st_size == len("README")
+
+    def test_excluded_directories_are_not_descended(self, tree):
+        scanner = FileScanner(classifier=CountingClassifier())
+
+        with patch.object(file_scanner.os, "scandir", wraps=os.scandir) as scandir:
+            list(scanner._walk_files(tree, None, ["scratch/*"], file_scanner.FileScanResult()))
+
+        visited = [str(call.args[0]) for call in scandir.call_args_list]
+        assert not any("scratch" in path for path in visited)
+        assert any(path.endswith("outdata") for path in visited)
+
+    def test_processing_starts_before_walk_finishes(self, tmp_path):
+        for i in range(100):
+            (tmp_path / f"{i}.nc").write_bytes(b"x")
+        walked = []
+        classifier = CountingClassifier()
+        first_classified_at = []
+        create = classifier.create_simulation_file
+
+        def record(*args, **kwargs):
+            if not first_classified_at:
+                first_classified_at.append(len(walked))
+            return create(*args, **kwargs)
+
+        classifier.create_simulation_file = record
+        scanner = FileScanner(classifier=classifier)
+        walk = scanner._walk_files
+
+        def counting_walk(*args):
+            for entry in walk(*args):
+                walked.append(entry)
+                yield entry
+
+        with patch.object(scanner, "_walk_files", side_effect=counting_walk):
+            result = scanner.scan_directory(tmp_path, max_workers=2)
+
+        assert result.files_processed == 100
+        # At most max_workers * 4 files are in flight before one is processed
+        assert first_classified_at[0] <= 2 * 4 + 1
+
+    def test_stat_from_walk_is_reused(self, tmp_path):
+        stat_info = os.stat(tmp_path)
+        scanner = FileScanner(classifier=CountingClassifier())
+
+        simulation_file = scanner._process_single_file(
+            tmp_path, "not-on-disk.nc", None, False, stat_info
+        )
+
+        assert simulation_file.size == stat_info.st_size
@@ -0,0 +1,131 @@
+"""
+Tests for assembling simulations from archive fragments.
+"""
+
+import dataclasses
+
+import pytest
+
+from tellus.domain.entities.archive import ArchiveMetadata
+from tellus.domain.entities.simulation_file import (FileInventory,
+                                                    SimulationFile)
+from tellus.domain.services.fragment_assembly import (FragmentAssemblyService,
+                                                      FragmentConflictStrategy)
+
+SHARED_FILE = "outdata/echam.2000.nc"
+
+
+def fragment(archive_id, paths, date_range=None, created_time=0.0):
+    """Fragment metadata with an inventory of the given paths."""
+    inventory = None
+    if paths is not None:
+        inventory = FileInventory()
+        for path in paths:
+            inventory.add_file(SimulationFile(path, size=100))
+    return ArchiveMetadata(
+        archive_id=archive_id, location=f"{archive_id}.tar.gz", simulation_id="historical",
+        created_time=created_time, file_inventory=inventory,
+        fragment_info={"date_range": date_range} if date_range else None,
+    )
+
+
+@pytest.fixture
+def fragments(local_archive):
+    """Two fragments with separate years, and a newer one rewriting a file of the first."""
+    base = [
+        local_archive("fragment_2000", {SHARED_FILE: b"first", "outdata/echam.2000.log": b"log"}, mtime=1_000_000),
+        local_archive("fragment_2001", {"outdata/echam.2001.nc": b"2001"}, mtime=1_000_000),
+        local_archive("fragment_rerun", {SHARED_FILE: b"rerun"}, mtime=2_000_000),
+    ]
+    # Extracted oldest first
+    return [dataclasses.replace(fragment, created_time=float(i)) for i, fragment in enumerate(base)]
+
+
+class TestAssembleFragments:
+    """Test extracting fragments concurrently while serialising overlapping ones."""
+
+    @pytest.mark.parametrize("strategy, expected", [
+        (FragmentConflictStrategy.NEWEST_WINS, b"rerun"),
+        (FragmentConflictStrategy.FIRST_WINS, b"first"),
+        (FragmentConflictStrategy.SKIP_CONFLICTS, b"first"),
+    ])
+    def test_overlapping_fragments_are_serialised(self, tmp_path, target_location, fragments,
+                                                  recording_extraction_service, strategy, expected):
+        extraction_service = recording_extraction_service(concurrent={"fragment_2000.tar.gz", "fragment_2001.tar.gz"})
+        service = FragmentAssemblyService(extraction_service, max_concurrent_fragments=4, use_process_pool=False)
+        plan = service.create_assembly_plan(
+            fragments, target_location, target_path="assembled", conflict_strategy=strategy)
+
+        result = service.assemble_fragments(plan)
+
+        assert result.success, result.errors
+        assert not result.errors
+        assert result.fragments_successful == 3
+        assert extraction_service.started_after_end("fragment_rerun.tar.gz", "fragment_2000.tar.gz")
+        assembled = tmp_path / "assembled"
+        assert (assembled / SHARED_FILE).read_bytes() == expected
+        assert (assembled / "outdata/echam.2001.nc").read_bytes() == b"2001"
+        assert (assembled / "outdata/echam.2000.log").read_bytes() == b"log"
+
+    def test_concurrency_shortens_estimate(self, target_location, fragments):
+        service = FragmentAssemblyService(use_process_pool=False)
+        plan = service.create_assembly_plan(fragments, target_location)
+        durations = plan.get_fragment_durations()
+
+        sequential = service.estimate_assembly_time(plan, max_concurrent_fragments=1)
+        parallel = service.estimate_assembly_time(plan, max_concurrent_fragments=3)
+
+        assert sequential == pytest.approx(sum(durations.values()))
+        # The overlapping fragments still run one after the other
+        assert parallel == pytest.approx(durations["fragment_2000"] + durations["fragment_rerun"])
+        assert parallel < sequential
+
+
+class TestCreateAssemblyPlan:
+    """Test detecting overlapping fragments when planning an assembly."""
+
+    def test_detects_file_and_temporal_overlaps(self, target_location):
+        service = FragmentAssemblyService(use_process_pool=False)
+        fragments = [
+            fragment("echam_2000", [SHARED_FILE, "restart/echam.2000.nc"], "2000-01-01:2000-12-31", 0.0),
+            fragment("echam_2001", ["outdata/echam.2001.nc"], "2001-01-01:2001-12-31", 1.0),
+            fragment("fesom_2000", ["outdata/fesom.2000.nc"], "2000-06-01:2000-12-31", 2.0),
+            fragment("echam_2000_rerun", [SHARED_FILE], "2000-01-01:2000-12-31", 3.0),
+        ]
+
+        plan = service.create_assembly_plan(fragments, target_location)
+
+        overlaps = {
+            (frozenset((overlap.fragment1_id, overlap.fragment2_id)), overlap.overlap_type): overlap
+            for overlap in plan.overlaps
+        }
+        assert set(overlaps) == {
+            (frozenset(("echam_2000", "echam_2000_rerun")), "file"),
+            (frozenset(("echam_2000", "fesom_2000")), "temporal"),
+            (frozenset(("fesom_2000", "echam_2000_rerun")), "temporal"),
+        }
+        assert overlaps[(frozenset(("echam_2000", "echam_2000_rerun")), "file")].overlapping_files == [SHARED_FILE]
+        assert plan.is_valid
+        assert plan.extraction_order == ["echam_2000", "echam_2001", "fesom_2000", "echam_2000_rerun"]
+        # Overlapping fragments run in extraction order, echam_2001 alongside them
+        assert plan.dependency_graph.dependencies == {
+            "echam_2000": set(),
+            "echam_2001": set(),
+            "fesom_2000": {"echam_2000"},
+            "echam_2000_rerun": {"echam_2000", "fesom_2000"},
+        }
+        assert plan.dependency_graph.stages() == [
+            ["echam_2000", "echam_2001"], ["fesom_2000"], ["echam_2000_rerun"]]
+
+    def test_fragments_without_inventory_are_serialised(self, target_location):
+        service = FragmentAssemblyService(use_process_pool=False)
+        fragments = [
+            fragment("echam_2000", ["outdata/echam.2000.nc"], created_time=0.0),
+            fragment("unknown", None, created_time=1.0),
+            fragment("echam_2001", ["outdata/echam.2001.nc"], created_time=2.0),
+        ]
+
+        plan = service.create_assembly_plan(fragments, target_location)
+
+        assert plan.overlaps == []
+        assert plan.dependency_graph.stages() == [["echam_2000"], ["unknown"], ["echam_2001"]]
@@ -0,0 +1,119 @@
+"""
+Tests for the dependency graph used to extract archive fragments in parallel.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from tellus.domain.services.fragment_graph import FragmentDependencyGraph
+
+
+def yearly_restarts(years):
+    """Disjoint file sets of year-by-year restart fragments."""
+    return {
+        f"restart_{year}": {f"restart/fesom.{year}.nc", f"restart/echam.{year}.nc"}
+        for year in years
+    }
+
+
+class TestFragmentDependencyGraph:
+    """Test building the graph."""
+
+    def test_disjoint_fragments_form_a_single_stage(self):
+        file_sets = yearly_restarts(range(2000, 2010))
+
+        graph = FragmentDependencyGraph.from_file_sets(list(file_sets), file_sets)
+
+        assert graph.stages() == [list(file_sets)]
+        assert graph.max_parallelism == 10
+
+    def test_overlapping_fragments_follow_extraction_order(self):
+        file_sets = {
+            "inputs": {"namelist.echam", "input/sst.nc"},
+            "run_a": {"outdata/a.nc"},
+            "rerun": {"namelist.echam", "outdata/a.nc"},
+            "run_b": {"outdata/b.nc"},
+        }
+
+        graph = FragmentDependencyGraph.from_file_sets(list(file_sets), file_sets)
+
+        assert graph.dependencies["rerun"] == {"inputs", "run_a"}
+        assert graph.stages() == [["inputs", "run_a", "run_b"], ["rerun"]]
+
+    def test_fragments_sharing_a_file_are_chained(self):
+        file_sets = {name: {"namelist.echam"} for name in ("a", "b", "c")}
+
+        graph = FragmentDependencyGraph.from_file_sets(["c", "a", "b"], file_sets)
+
+        assert graph.stages() == [["c"], ["a"], ["b"]]
+
+    def test_unknown_fragments_are_serialised(self):
+        file_sets = {**yearly_restarts([2000, 2001]), "unknown": None}
+
+        graph = FragmentDependencyGraph.from_file_sets(["restart_2000", "unknown", "restart_2001"], file_sets)
+
+        assert graph.stages() == [["restart_2000"], ["unknown"], ["restart_2001"]]
+
+    def test_conflicts_with_unplanned_fragments_are_ignored(self):
+        graph = FragmentDependencyGraph(["a", "b"], conflicts=[("a", "z"), ("b", "b")])
+
+        assert graph.stages() == [["a", "b"]]
+
+    def test_estimate_duration_models_parallelism(self):
+        graph = FragmentDependencyGraph(["a", "b", "c", "d"], conflicts=[("a", "b")])
+        durations = {"a": 10.0, "b": 10.0, "c": 5.0, "d": 5.0}
+
+        assert graph.critical_path_duration(durations) == 20.0
+        assert graph.estimate_duration(durations, workers=1) == 30.0
+        assert graph.estimate_duration(durations, workers=4) == 20.0
+
+
+class TestGraphExecution:
+    """Test running fragments as their dependencies complete."""
+
+    def test_dependencies_complete_before_dependents_start(self):
+        file_sets = {
+            "a": {"x"}, "b": {"y"}, "c": {"x", "y"}, "d": {"z"},
+        }
+        graph = FragmentDependencyGraph.from_file_sets(list(file_sets), file_sets)
+        lock = threading.Lock()
+        started, completed = [], []
+
+        def run(fragment_id):
+            with lock:
+                assert graph.dependencies[fragment_id] <= set(completed)
+                started.append(fragment_id)
+
+        def on_complete(fragment_id, future):
+            future.result()
+            completed.append(fragment_id)
+            return True
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            not_run = graph.execute(executor, lambda ex, fid: ex.submit(run, fid), on_complete)
+
+        assert not_run == []
+        assert sorted(completed) == ["a", "b", "c", "d"]
+        assert completed.index("c") > max(completed.index("a"), completed.index("b"))
+
+    def test_independent_fragments_run_concurrently(self):
+        graph = FragmentDependencyGraph(["a", "b"])
+        barrier = threading.Barrier(2, timeout=10)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            graph.execute(executor, lambda ex, fid: ex.submit(barrier.wait),
+                          lambda fid, future: future.result() is not None)
+
+    def test_stopping_skips_remaining_fragments(self):
+        graph = FragmentDependencyGraph(["a", "b", "c"], conflicts=[("a", "b"), ("b", "c")])
+        completed = []
+
+        def on_complete(fragment_id, future):
+            completed.append(fragment_id)
+            return fragment_id != "b"
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            not_run = graph.execute(executor, lambda ex, fid: ex.submit(lambda: None), on_complete)
+
+        assert completed == ["a", "b"]
+        assert not_run == ["c"]
@@ -0,0 +1,104 @@
+"""
+Tests for inverted-index and interval-tree overlap detection between fragments.
+"""
+
+import random
+from datetime import datetime, timedelta
+from itertools import combinations
+
+from tellus.domain.services.fragment_overlaps import (IntervalTree,
+                                                      find_overlapping_intervals,
+                                                      find_shared_files)
+
+
+def pairwise_shared_files(file_sets):
+    """Reference implementation comparing every pair of fragments."""
+    shared = {}
+    for (i, files1), (j, files2) in combinations(enumerate(file_sets), 2):
+        if files1 is None or files2 is None:
+            continue
+        common = set(files1) & set(files2)
+        if common:
+            shared[(i, j)] = common
+    return shared
+
+
+def pairwise_overlapping_intervals(intervals):
+    return [(i, j) for (i, a), (j, b) in combinations(enumerate(intervals), 2)
+            if a is not None and b is not None and a[0] <= b[1] and b[0] <= a[1]]
+
+
+def random_intervals(rng, count):
+    intervals = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            intervals.append(None)
+            continue
+        start = datetime(2000, 1, 1) + timedelta(days=rng.randint(0, 3650))
+        intervals.append((start, start + timedelta(days=rng.choice([0, 30, 365, 1000]))))
+    return intervals
+
+
+class TestIntervalTree:
+    """Test interval queries against brute force."""
+
+    def test_queries_match_brute_force(self):
+        rng = random.Random(3)
+        intervals = [(start, start + rng.randint(0, 50), index)
+                     for index, start in enumerate(rng.randint(0, 1000) for _ in range(300))]
+        tree = IntervalTree(intervals)
+
+        for _ in range(500):
+            start = rng.randint(-20, 1050)
+            end = start + rng.randint(0, 100)
+            expected = {item for s, e, item in intervals if s <= end and start <= e}
+            assert set(tree.overlapping(start, end)) == expected
+
+    def test_touching_intervals_overlap(self):
+        tree = IntervalTree([(1, 5, "a"), (6, 9, "b")])
+
+        assert tree.overlapping(5, 6) == ["a", "b"]
+        assert tree.overlapping(10, 12) == []
+
+    def test_empty_tree(self):
+        assert IntervalTree([]).overlapping(0, 10) == []
+
+
+class TestFindSharedFiles:
+    """Test the inverted index against pairwise comparison."""
+
+    def test_matches_pairwise_comparison(self):
+        rng = random.Random(7)
+        common = [f"namelist.{name}" for name in ("echam", "fesom", "jsbach")]
+        file_sets = []
+        for year in range(60):
+            if rng.random() < 0.1:
+                file_sets.append(None)
+                continue
+            files = [f"restart/fesom.{year + rng.randint(-2, 2)}.nc" for _ in range(5)]
+            files += rng.sample(common, rng.randint(0, len(common)))
+            file_sets.append(files)
+
+        shared = find_shared_files(file_sets)
+
+        assert {pair: set(paths) for pair, paths in shared.items()} == pairwise_shared_files(file_sets)
+        assert all(len(paths) == len(set(paths)) for paths in shared.values())
+
+    def test_disjoint_fragments_share_nothing(self):
+        file_sets = [[f"outdata/fesom.{year}.nc"] for year in range(2000, 2100)]
+
+        assert find_shared_files(file_sets) == {}
+
+
+class TestFindOverlappingIntervals:
+    """Test temporal overlap detection against pairwise comparison."""
+
+    def test_matches_pairwise_comparison(self):
+        intervals = random_intervals(random.Random(11), 200)
+
+        assert find_overlapping_intervals(intervals) == pairwise_overlapping_intervals(intervals)
+
+    def test_consecutive_years_do_not_overlap(self):
+        intervals = [(datetime(year, 1, 1), datetime(year, 12, 31)) for year in range(2000, 2050)]
+
+        assert find_overlapping_intervals(intervals) == []
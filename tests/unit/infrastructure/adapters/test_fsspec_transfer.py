@@ -0,0 +1,379 @@
+"""
+Tests for copying files within and between fsspec filesystems.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+
+import fsspec
+import pytest
+
+from tellus.infrastructure.adapters.fsspec_transfer import (
+    ByteRange, FSSpecTransferEngine, open_connection, plan_byte_ranges)
+from tellus.infrastructure.adapters.sandboxed_filesystem import \
+    PathSandboxedFileSystem
+
+
+@pytest.fixture
+def memory_fs():
+    """In-memory filesystem, cleaned up after the test."""
+    fs = fsspec.filesystem("memory")
+    root = f"/transfer-{uuid.uuid4().hex}"
+    fs.makedirs(root, exist_ok=True)
+    yield fs, root
+    fs.rm(root, recursive=True)
+
+
+class SlowFile:
+    """File wrapper sleeping on every request, like a high-latency connection."""
+
+    def __init__(self, fileobj, delay, log):
+        self._fileobj = fileobj
+        self._delay = delay
+        self._log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._fileobj.close()
+
+    def read(self, size=-1):
+        self._log.append(("read-start", threading.current_thread().name))
+        time.sleep(self._delay)
+        self._log.append(("read", threading.current_thread().name))
+        return self._fileobj.read(size)
+
+    def write(self, data):
+        self._log.append(("write-start", threading.current_thread().name))
+        time.sleep(self._delay)
+        self._log.append(("write", threading.current_thread().name))
+        return self._fileobj.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+
+
+class SlowFileSystem:
+    """Filesystem whose files sleep on every request."""
+
+    def __init__(self, fs, delay, log):
+        self._fs = fs
+        self._delay = delay
+        self._log = log
+
+    def open(self, path, mode="rb", **kwargs):
+        return SlowFile(self._fs.open(path, mode), self._delay, self._log)
+
+    def __getattr__(self, name):
+        return getattr(self._fs, name)
+
+
+class TestFSSpecTransferEngine:
+    """Test server-side and streamed copies."""
+
+    def test_streams_between_filesystems(self, memory_fs, tmp_path):
+        fs, root = memory_fs
+        data = bytes(range(256)) * 4000
+        fs.pipe(f"{root}/restart/fesom.2000.nc", data)
+        progress = []
+
+        engine = FSSpecTransferEngine(chunk_size=100_000, buffer_chunks=2)
+        copied = engine.copy(fs, f"{root}/restart/fesom.2000.nc",
+                             fsspec.filesystem("file"), str(tmp_path / "copy" / "fesom.2000.nc"),
+                             progress=progress.append)
+
+        assert copied == len(data)
+        assert (tmp_path / "copy" / "fesom.2000.nc").read_bytes() == data
+        assert progress == [min(n * 100_000, len(data)) for n in range(1, 12)]
+
+    def test_reads_and_writes_overlap(self, memory_fs):
+        fs, root = memory_fs
+        fs.pipe(f"{root}/source.nc", b"x" * 10_000)
+        log = []
+        slow_fs = SlowFileSystem(fs, 0.02, log)
+
+        FSSpecTransferEngine(chunk_size=1000).copy(slow_fs, f"{root}/source.nc", slow_fs, f"{root}/dest.nc")
+
+        assert fs.cat(f"{root}/dest.nc") == b"x" * 10_000
+        # Copied one after another, a read and a write would never be in flight together
+        in_flight = {"read": 0, "write": 0}
+        overlapped = False
+        for op, name in log:
+            kind = op.split("-")[0]
+            in_flight[kind] += 1 if op.endswith("-start") else -1
+            overlapped = overlapped or (in_flight["read"] > 0 and in_flight["write"] > 0)
+        assert overlapped
+        assert {name for op, name in log if op == "read"} == {"tellus-transfer-reader"}
+
+    def test_server_side_copy_within_filesystem(self, tmp_path):
+        source = tmp_path / "scratch"
+        dest = tmp_path / "work"
+        source.mkdir()
+        (source / "run.log").write_bytes(b"done\n")
+        source_fs = PathSandboxedFileSystem(fsspec.filesystem("file"), str(source))
+        dest_fs = PathSandboxedFileSystem(fsspec.filesystem("file"), str(dest))
+
+        engine = FSSpecTransferEngine()
+        engine._stream = lambda *args: pytest.fail("copy was streamed")
+        copied = engine.copy(source_fs, "run.log", dest_fs, "logs/run.log", same_filesystem=True)
+
+        assert copied == 5
+        assert (dest / "logs" / "run.log").read_bytes() == b"done\n"
+
+    def test_read_error_is_raised(self, memory_fs):
+        fs, root = memory_fs
+        fs.pipe(f"{root}/source.nc", b"x" * 5000)
+
+        class FailingFile(SlowFile):
+            def read(self, size=-1):
+                raise IOError("connection lost")
+
+        class FailingFileSystem(SlowFileSystem):
+            def open(self, path, mode="rb", **kwargs):
+                if mode == "rb":
+                    return FailingFile(self._fs.open(path, mode), 0, [])
+                return self._fs.open(path, mode)
+
+        with pytest.raises(IOError, match="connection lost"):
+            FSSpecTransferEngine(chunk_size=1000).copy(
+                FailingFileSystem(fs, 0, []), f"{root}/source.nc", fs, f"{root}/dest.nc"
+            )
+
+
+class FlakyFileSystem(SlowFileSystem):
+    """Filesystem failing reads at given offsets a number of times."""
+
+    def __init__(self, fs, failures):
+        super().__init__(fs, 0, [])
+        self.failures = failures
+        self.opened = 0
+
+    def open(self, path, mode="rb", **kwargs):
+        self.opened += 1
+        f = self._fs.open(path, mode)
+        if mode == "rb":
+            read = f.read
+
+            def flaky_read(size=-1):
+                if self.failures.get(f.tell(), 0) > 0:
+                    self.failures[f.tell()] -= 1
+                    raise IOError(f"connection reset at byte {f.tell()}")
+                return read(size)
+
+            f.read = flaky_read
+        return f
+
+
+class TestRangedCopy:
+    """Test copying byte ranges over parallel streams."""
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / "restart.nc"
+        path.write_bytes(bytes(range(256)) * 1000)
+        return path
+
+    def test_plan_byte_ranges(self):
+        ranges = plan_byte_ranges(1000, 2, range_size=300)
+
+        assert [(r.offset, r.length) for r in ranges] == [(0, 125), (125, 125), (250, 125), (375, 125),
+                                                          (500, 125), (625, 125), (750, 125), (875, 125)]
+        assert [(r.offset, r.length) for r in plan_byte_ranges(1000, 1, range_size=300)] == \
+            [(0, 250), (250, 250), (500, 250), (750, 250)]
+        assert plan_byte_ranges(0, 4) == [ByteRange(0, 0)]
+
+    def test_copies_ranges_with_checksums(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        data = source.read_bytes()
+        progress = []
+
+        ranges = FSSpecTransferEngine(chunk_size=4096).copy_ranges(
+            fs, str(source), fs, str(tmp_path / "copy" / "restart.nc"), streams=4, progress=progress.append
+        )
+
+        assert (tmp_path / "copy" / "restart.nc").read_bytes() == data
+        assert len(ranges) == 16
+        assert all(r.checksum == hashlib.sha256(data[r.offset:r.end]).hexdigest() for r in ranges)
+        assert max(progress) == len(data)
+
+    def test_failed_range_is_retried_alone(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        flaky = FlakyFileSystem(fs, {64_000: 2})
+
+        ranges = FSSpecTransferEngine(chunk_size=4096).copy_ranges(
+            flaky, str(source), fs, str(tmp_path / "copy.nc"), streams=4
+        )
+
+        assert (tmp_path / "copy.nc").read_bytes() == source.read_bytes()
+        assert 64_000 in {r.offset for r in ranges}
+        # 16 ranges, one of them opened twice more
+        assert flaky.opened == 18
+
+    def test_range_failing_too_often(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        flaky = FlakyFileSystem(fs, {16_000: 3})
+
+        with pytest.raises(IOError, match="1 of 16 byte ranges failed after 3 attempts, first at bytes 16000-32000"):
+            FSSpecTransferEngine(chunk_size=4096).copy_ranges(
+                flaky, str(source), fs, str(tmp_path / "copy.nc"), streams=4
+            )
+
+    def test_checksum_ranges_finds_corrupted_range(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        engine = FSSpecTransferEngine(chunk_size=4096)
+        dest = tmp_path / "copy.nc"
+        ranges = engine.copy_ranges(fs, str(source), fs, str(dest), streams=4)
+
+        with open(dest, "r+b") as f:
+            f.seek(100_000)
+            f.write(b"corrupted")
+        written = engine.checksum_ranges(fs, str(dest), ranges, streams=4)
+
+        assert [r.offset for r, w in zip(ranges, written) if r.checksum != w.checksum] == [96_000]
+
+    def test_local_filesystems_share_connection(self, tmp_path):
+        fs = fsspec.filesystem("file")
+        sandbox = PathSandboxedFileSystem(fs, str(tmp_path))
+
+        assert open_connection(fs) is fs
+        connection = open_connection(sandbox)
+        assert connection.base_filesystem is fs
+        assert connection.base_path == sandbox.base_path
+
+
+class TestRelay:
+    """Test relaying files through intermediate filesystems."""
+
+    @pytest.fixture
+    def sites(self, tmp_path):
+        """Source, two gateways and destination, as local directories."""
+        for site in ("hsm", "albedo", "levante", "workspace"):
+            (tmp_path / site).mkdir()
+        data = bytes(range(256)) * 800
+        (tmp_path / "hsm" / "archive.tar").write_bytes(data)
+        return tmp_path, data
+
+    def links(self, delay):
+        """Throttled stand-ins for the links to the gateways and the destination, sharing a request log."""
+        log = []
+        return log, [SlowFileSystem(fsspec.filesystem("file"), delay, log) for _ in range(3)]
+
+    def test_hops_forward_while_receiving(self, sites):
+        tmp_path, data = sites
+        log, (albedo, levante, workspace) = self.links(0.01)
+        local = fsspec.filesystem("file")
+        engine = FSSpecTransferEngine(chunk_size=10_000)
+        via = [(albedo, str(tmp_path / "albedo" / ".tellus-relay" / "archive.tar")),
+               (levante, str(tmp_path / "levante" / ".tellus-relay" / "archive.tar"))]
+        progress = []
+
+        copied = engine.relay(local, str(tmp_path / "hsm" / "archive.tar"),
+                              workspace, str(tmp_path / "workspace" / "archive.tar"), via,
+                              progress=progress.append)
+
+        assert copied == len(data)
+        assert progress[-1] == len(data)
+        assert (tmp_path / "workspace" / "archive.tar").read_bytes() == data
+        # Store-and-forward would finish writing to one hop before the next hop's first write
+        writers = [thread for kind, thread in log if kind == "write"]
+        assert writers.index(writers[-1]) < len(writers) - 1 - writers[::-1].index(writers[0])
+        assert not list((tmp_path / "albedo" / ".tellus-relay").iterdir())
+        assert not list((tmp_path / "levante" / ".tellus-relay").iterdir())
+
+    def test_failing_hop_stops_relay(self, sites):
+        tmp_path, data = sites
+
+        class BrokenLink(SlowFileSystem):
+            def open(self, path, mode="rb", **kwargs):
+                f = super().open(path, mode, **kwargs)
+                if mode == "rb":
+                    f.read = lambda size=-1: (_ for _ in ()).throw(IOError("gateway unreachable"))
+                return f
+
+        local = fsspec.filesystem("file")
+        via = [(local, str(tmp_path / "albedo" / "archive.tar")),
+               (BrokenLink(local, 0, []), str(tmp_path / "levante" / "archive.tar"))]
+
+        with pytest.raises(IOError, match="gateway unreachable"):
+            FSSpecTransferEngine(chunk_size=10_000).relay(
+                local, str(tmp_path / "hsm" / "archive.tar"),
+                local, str(tmp_path / "workspace" / "archive.tar"), via)
+
+        assert not list((tmp_path / "albedo").iterdir())
+        assert not list((tmp_path / "levante").iterdir())
+
+    def test_files_readable_once_closed_are_stored_and_forwarded(self, sites, memory_fs):
+        tmp_path, data = sites
+        fs, root = memory_fs
+        local = fsspec.filesystem("file")
+
+        FSSpecTransferEngine(chunk_size=10_000).relay(
+            local, str(tmp_path / "hsm" / "archive.tar"),
+            local, str(tmp_path / "workspace" / "archive.tar"), [(fs, f"{root}/relay/archive.tar")])
+
+        assert (tmp_path / "workspace" / "archive.tar").read_bytes() == data
+        assert not fs.exists(f"{root}/relay/archive.tar")
+
+    def test_resumed_relay_relays_rest(self, sites):
+        tmp_path, data = sites
+        local = fsspec.filesystem("file")
+        (tmp_path / "workspace" / "archive.tar").write_bytes(data[:100_000])
+        checkpoints = []
+
+        copied = FSSpecTransferEngine(chunk_size=10_000).relay(
+            local, str(tmp_path / "hsm" / "archive.tar"),
+            local, str(tmp_path / "workspace" / "archive.tar"),
+            [(local, str(tmp_path / "albedo" / "archive.tar"))],
+            offset=100_000, checkpoint=checkpoints.append, checkpoint_size=50_000)
+
+        assert copied == len(data) - 100_000
+        assert (tmp_path / "workspace" / "archive.tar").read_bytes() == data
+        assert [(r.offset, r.length) for r in checkpoints] == [(100_000, 50_000), (150_000, 50_000),
+                                                              (200_000, 4_800)]
+
+
+class TestCopyFiles:
+    """Test copying small files together."""
+
+    @pytest.fixture
+    def outputs(self, tmp_path):
+        (tmp_path / "outdata").mkdir()
+        files = {f"outdata/fesom.{year}.nc": bytes([year % 256]) * (year % 7 + 1) * 100
+                 for year in range(2000, 2010)}
+        for path, data in files.items():
+            (tmp_path / path).write_bytes(data)
+        return tmp_path, files
+
+    def test_copies_files_in_bulk(self, outputs, tmp_path):
+        tmp_path, files = outputs
+        source = PathSandboxedFileSystem(fsspec.filesystem("file"), str(tmp_path))
+        dest = PathSandboxedFileSystem(fsspec.filesystem("file"), str(tmp_path / "copy"))
+
+        results = FSSpecTransferEngine().copy_files(
+            source, dest, [(path, f"run/{path}") for path in files] + [("outdata/missing.nc", "missing.nc")]
+        )
+
+        assert results[:-1] == [len(data) for data in files.values()]
+        assert isinstance(results[-1], FileNotFoundError)
+        for path, data in files.items():
+            assert (tmp_path / "copy" / "run" / path).read_bytes() == data
+        assert not (tmp_path / "copy" / "missing.nc").exists()
+
+    def test_corrupted_copy_fails_verification(self, outputs, tmp_path, monkeypatch):
+        tmp_path, files = outputs
+        fs = fsspec.filesystem("file")
+        pipe = fs.pipe
+
+        def corrupting_pipe(contents):
+            pipe({path: data[::-1] + b"!" if path.endswith("2003.nc") else data for path, data in contents.items()})
+
+        monkeypatch.setattr(fs, "pipe", corrupting_pipe)
+        results = FSSpecTransferEngine().copy_files(
+            fs, fs, [(str(tmp_path / path), str(tmp_path / "copy" / path)) for path in files]
+        )
+
+        failed = [path for path, result in zip(files, results) if isinstance(result, IOError)]
+        assert failed == ["outdata/fesom.2003.nc"]
@@ -0,0 +1,205 @@
+"""
+Tests for resuming transfers from a checkpoint journal.
+"""
+
+import hashlib
+import os
+
+import fsspec
+import pytest
+
+from tellus.infrastructure.adapters.fsspec_transfer import (
+    ByteRange, FSSpecTransferEngine, plan_byte_ranges)
+from tellus.infrastructure.adapters.transfer_journal import (
+    TransferJournal, copy_ranges_resumable, copy_resumable, is_transferred)
+
+KEY = "levante:restart.nc -> local:restart.nc"
+
+
+class InterruptedFileSystem:
+    """Filesystem whose reads fail once ``limit`` bytes were read, like a dropped connection."""
+
+    def __init__(self, fs, limit):
+        self._fs = fs
+        self.limit = limit
+        self.bytes_read = 0
+
+    def open(self, path, mode="rb", **kwargs):
+        f = self._fs.open(path, mode)
+        if mode == "rb":
+            read = f.read
+
+            def interrupted_read(size=-1):
+                if self.limit is not None and self.bytes_read >= self.limit:
+                    raise IOError("connection lost")
+                data = read(size)
+                self.bytes_read += len(data)
+                return data
+
+            f.read = interrupted_read
+        return f
+
+    def __getattr__(self, name):
+        return getattr(self._fs, name)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "restart.nc"
+    path.write_bytes(bytes(range(256)) * 1000)
+    return path
+
+
+class TestTransferJournal:
+    """Test recording and reloading checkpoints."""
+
+    def test_records_survive_reload(self, tmp_path):
+        journal = TransferJournal.in_directory(tmp_path, "mget_1")
+        journal.begin_file(KEY, {"size": 300, "modified": "1"})
+        journal.record_range(KEY, ByteRange(0, 100, "a"))
+        journal.record_range(KEY, ByteRange(100, 100, "b"))
+        journal.discard_ranges(KEY, [ByteRange(100, 100)])
+        journal.begin_file("other", {"size": 1, "modified": "1"})
+        journal.complete_file("other", verified=True)
+
+        reloaded = TransferJournal.in_directory(tmp_path, "mget_1")
+
+        assert reloaded.ranges(KEY) == [ByteRange(0, 100, "a")]
+        assert not reloaded.is_complete(KEY)
+        assert reloaded.is_complete("other") and reloaded.is_verified("other")
+
+    def test_changed_source_discards_records(self, tmp_path):
+        journal = TransferJournal.in_directory(tmp_path, "mget_1")
+        journal.begin_file(KEY, {"size": 300, "modified": "1"})
+        journal.record_range(KEY, ByteRange(0, 100, "a"))
+
+        journal.begin_file(KEY, {"size": 300, "modified": "2"})
+
+        assert journal.ranges(KEY) == []
+        assert TransferJournal.in_directory(tmp_path, "mget_1").ranges(KEY) == []
+
+    def test_torn_record_is_dropped(self, tmp_path):
+        journal = TransferJournal.in_directory(tmp_path, "mget_1")
+        journal.begin_file(KEY, {"size": 300, "modified": "1"})
+        journal.record_range(KEY, ByteRange(0, 100, "a"))
+        with open(journal.journal_path, "a") as f:
+            f.write('{"file": "levante:restart.nc -> local:restart.nc", "range": [100, 1')
+
+        reloaded = TransferJournal.in_directory(tmp_path, "mget_1")
+        reloaded.record_range(KEY, ByteRange(200, 100, "c"))
+
+        assert [r.offset for r in TransferJournal.in_directory(tmp_path, "mget_1").ranges(KEY)] == [0, 200]
+
+    def test_remove(self, tmp_path):
+        journal = TransferJournal.in_directory(tmp_path, "mget_1")
+        journal.begin_file(KEY, {"size": 300, "modified": "1"})
+
+        journal.remove()
+
+        assert not journal.journal_path.exists()
+        assert not TransferJournal.in_directory(tmp_path, "mget_1").exists
+
+    def test_plan_leaves_out_done_ranges(self):
+        done = [ByteRange(0, 250), ByteRange(500, 250)]
+
+        ranges = plan_byte_ranges(1000, 1, range_size=300, done=done)
+
+        assert [(r.offset, r.length) for r in ranges] == [(250, 250), (750, 250)]
+        assert plan_byte_ranges(0, 1, done=[ByteRange(0, 0)]) == []
+
+
+class TestResumableCopy:
+    """Test resuming streamed and ranged copies."""
+
+    def test_streamed_copy_resumes_after_verified_prefix(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        data = source.read_bytes()
+        dest = str(tmp_path / "copy" / "restart.nc")
+        engine = FSSpecTransferEngine(chunk_size=10_000)
+        engine.copy = self.with_checkpoint_size(engine.copy, 50_000)
+        journal = TransferJournal.in_directory(tmp_path / "journal", "get_1")
+
+        with pytest.raises(IOError, match="connection lost"):
+            copy_resumable(engine, journal, KEY, InterruptedFileSystem(fs, 120_000), str(source), fs, dest)
+        assert [(r.offset, r.length) for r in journal.ranges(KEY)] == [(0, 50_000), (50_000, 50_000)]
+
+        resumed = InterruptedFileSystem(fs, None)
+        progress = []
+        copied, offset = copy_resumable(engine, TransferJournal.in_directory(tmp_path / "journal", "get_1"),
+                                        KEY, resumed, str(source), fs, dest, progress=progress.append)
+
+        assert (offset, copied) == (100_000, len(data) - 100_000)
+        assert resumed.bytes_read == len(data) - 100_000
+        assert progress[-1] == len(data)
+        assert open(dest, "rb").read() == data
+
+    def test_corrupted_range_is_copied_again(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        data = source.read_bytes()
+        dest = str(tmp_path / "restart.nc.part")
+        engine = FSSpecTransferEngine(chunk_size=10_000)
+        engine.copy = self.with_checkpoint_size(engine.copy, 50_000)
+        journal = TransferJournal("get_1")
+
+        with pytest.raises(IOError):
+            copy_resumable(engine, journal, KEY, InterruptedFileSystem(fs, 160_000), str(source), fs, dest)
+        with open(dest, "r+b") as f:
+            f.seek(60_000)
+            f.write(b"bit rot")
+
+        _, offset = copy_resumable(engine, journal, KEY, fs, str(source), fs, dest)
+
+        assert offset == 50_000
+        assert open(dest, "rb").read() == data
+
+    def test_changed_source_is_copied_from_start(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        dest = str(tmp_path / "restart.nc.part")
+        engine = FSSpecTransferEngine(chunk_size=10_000)
+        journal = TransferJournal("get_1")
+        with pytest.raises(IOError):
+            copy_resumable(engine, journal, KEY, InterruptedFileSystem(fs, 120_000), str(source), fs, dest)
+
+        source.write_bytes(b"rerun" * 1000)
+        os.utime(source, ns=(1, 1))
+        _, offset = copy_resumable(engine, journal, KEY, fs, str(source), fs, dest)
+
+        assert offset == 0
+        assert open(dest, "rb").read() == b"rerun" * 1000
+
+    def test_completed_file_is_transferred(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        dest = str(tmp_path / "restart.nc.part")
+        journal = TransferJournal("get_1")
+        copy_resumable(FSSpecTransferEngine(), journal, KEY, fs, str(source), fs, dest)
+
+        assert not is_transferred(journal, KEY, fs, str(source), fs, dest)
+        journal.complete_file(KEY)
+        assert is_transferred(journal, KEY, fs, str(source), fs, dest)
+        os.truncate(dest, 10)
+        assert not is_transferred(journal, KEY, fs, str(source), fs, dest)
+
+    def test_ranged_copy_copies_missing_ranges(self, source, tmp_path):
+        fs = fsspec.filesystem("file")
+        data = source.read_bytes()
+        dest = str(tmp_path / "restart.nc.part")
+        engine = FSSpecTransferEngine(chunk_size=4096)
+        journal = TransferJournal("get_1")
+        with pytest.raises(IOError):
+            copy_ranges_resumable(engine, journal, KEY, InterruptedFileSystem(fs, 100_000), str(source),
+                                  fs, dest, streams=1, max_attempts=1)
+        done = journal.ranges(KEY)
+        assert done
+
+        resumed = InterruptedFileSystem(fs, None)
+        ranges, resumed_bytes = copy_ranges_resumable(engine, journal, KEY, resumed, str(source), fs, dest, streams=4)
+
+        assert resumed_bytes == sum(r.length for r in done)
+        assert resumed.bytes_read == len(data) - resumed_bytes
+        assert sum(r.length for r in ranges) == len(data)
+        assert all(r.checksum == hashlib.sha256(data[r.offset:r.end]).hexdigest() for r in ranges)
+        assert open(dest, "rb").read() == data
+
+    @staticmethod
+    def with_checkpoint_size(copy, checkpoint_size):
+        return lambda *args, **kwargs: copy(*args, checkpoint_size=checkpoint_size, **kwargs)
@@ -0,0 +1,68 @@
+"""
+Tests for the background event loop used by the sync repository wrappers.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from tellus.infrastructure.database.event_loop import BackgroundEventLoop
+
+
+async def current_thread():
+    await asyncio.sleep(0)
+    return threading.current_thread()
+
+
+@pytest.fixture
+def background_loop():
+    loop = BackgroundEventLoop(name="test-loop")
+    yield loop
+    loop.stop()
+
+
+class TestBackgroundEventLoop:
+    """Test running coroutines on the shared background loop."""
+
+    def test_calls_reuse_one_loop_thread(self, background_loop):
+        first = background_loop.run(current_thread())
+        second = background_loop.run(current_thread())
+
+        assert first is second
+        assert first is not threading.current_thread()
+        assert first.daemon
+
+    def test_exceptions_propagate(self, background_loop):
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            background_loop.run(fail())
+
+    def test_run_works_inside_a_running_loop(self, background_loop):
+        async def handler():
+            # What a sync service does when called from an async web handler
+            return background_loop.run(current_thread())
+
+        assert asyncio.run(handler()).name == "test-loop"
+
+    def test_submit_is_awaitable_from_another_loop(self, background_loop):
+        async def handler():
+            return await asyncio.gather(*(background_loop.submit(current_thread()) for _ in range(3)))
+
+        assert {thread.name for thread in asyncio.run(handler())} == {"test-loop"}
+
+    def test_blocking_from_the_loop_thread_is_refused(self, background_loop):
+        async def nested():
+            return background_loop.run(current_thread())
+
+        with pytest.raises(RuntimeError, match="own thread"):
+            background_loop.run(nested())
+
+    def test_restarts_after_stop(self, background_loop):
+        first = background_loop.run(current_thread())
+        background_loop.stop()
+
+        assert not first.is_alive()
+        assert background_loop.run(current_thread()).is_alive()
@@ -24,6 +24,15 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture
+def background_loop():
+    """Stand-in for the background event loop used by the sync wrappers."""
+    loop = MagicMock()
+    # Close the coroutine instead of running it
+    loop.run.side_effect = lambda coro: coro.close()
+    return loop
+
+
 @pytest.fixture
 def mock_session():
     """Create a mock AsyncSession for testing."""
@@ -0,0 +1,227 @@
+"""
+Tests for the indexed, append-only SimulationFile repository.
+"""
+
+import json
+import threading
+
+import pytest
+
+from tellus.domain.entities.simulation_file import (FileContentType, FileType,
+                                                    SimulationFile)
+from tellus.domain.repositories.exceptions import RepositoryError
+from tellus.infrastructure.repositories.indexed_simulation_file_repository import \
+    IndexedSimulationFileRepository
+
+
+def make_file(path, simulation_id="sim1", **kwargs):
+    attributes = kwargs.pop("attributes", {})
+    attributes.setdefault("simulation_id", simulation_id)
+    return SimulationFile(relative_path=path, attributes=attributes, **kwargs)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repo = IndexedSimulationFileRepository(storage_dir=str(tmp_path), background_compaction=False)
+    yield repo
+    repo.close()
+
+
+class TestIndexedSimulationFileRepository:
+    """Test the indexed SimulationFile repository."""
+
+    def test_save_appends_to_log(self, repository):
+        repository.save(make_file("output/a.nc"))
+        repository.save(make_file("output/b.nc"))
+
+        lines = repository.log_path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["data"]["relative_path"] == "output/b.nc"
+
+    def test_save_requires_simulation_id(self, repository):
+        with pytest.raises(RepositoryError):
+            repository.save(SimulationFile(relative_path="orphan.nc"))
+
+    def test_get_by_path(self, repository):
+        repository.save(make_file("restart/fesom.2000.nc", content_type=FileContentType.RESTART))
+
+        found = repository.get_by_path("restart/fesom.2000.nc")
+        assert found is not None
+        assert found.content_type == FileContentType.RESTART
+        assert repository.get_by_path("missing.nc") is None
+
+    def test_secondary_indexes(self, repository):
+        archive = make_file("archive.tar.gz", file_type=FileType.ARCHIVE,
+                            available_locations={"tape"})
+        archive.add_contained_file("out/a.nc")
+        repository.save(archive)
+        repository.save(make_file("out/a.nc", parent_file_id="archive.tar.gz",
+                                  available_locations={"tape", "disk"}))
+        repository.save(make_file("out/b.nc", parent_file_id="archive.tar.gz",
+                                  content_type=FileContentType.LOG))
+
+        assert [f.relative_path for f in repository.list_by_parent("archive.tar.gz")] == \
+            ["out/a.nc", "out/b.nc"]
+        assert [f.relative_path for f in repository.get_children("archive.tar.gz")] == \
+            ["out/a.nc", "out/b.nc"]
+        assert {f.relative_path for f in repository.list_by_location("tape")} == \
+            {"archive.tar.gz", "out/a.nc"}
+        assert [f.relative_path for f in repository.list_by_type(FileType.ARCHIVE)] == \
+            ["archive.tar.gz"]
+        assert [f.relative_path for f in repository.list_by_content_type(FileContentType.LOG)] == \
+            ["out/b.nc"]
+        assert repository.count_by_type()[FileType.REGULAR] == 2
+
+    def test_indexes_follow_updates_and_deletes(self, repository):
+        repository.save(make_file("a.nc", available_locations={"disk"}))
+        repository.save(make_file("a.nc", available_locations={"tape"}))
+
+        assert repository.list_by_location("disk") == []
+        assert len(repository.list_by_location("tape")) == 1
+
+        assert repository.delete("a.nc") is True
+        assert repository.delete("a.nc") is False
+        assert repository.list_by_location("tape") == []
+        assert not repository.exists("a.nc")
+
+    def test_state_survives_reopen(self, tmp_path, repository):
+        repository.save(make_file("a.nc"))
+        repository.save(make_file("b.nc", simulation_id="sim2"))
+        repository.delete("a.nc")
+
+        reopened = IndexedSimulationFileRepository(storage_dir=str(tmp_path))
+        assert [f.relative_path for f in reopened.list_all()] == ["b.nc"]
+        assert [f.relative_path for f in reopened.list_by_simulation("sim2")] == ["b.nc"]
+
+    def test_compaction_folds_log_into_snapshot(self, tmp_path):
+        repo = IndexedSimulationFileRepository(
+            storage_dir=str(tmp_path), compact_threshold=3, background_compaction=False
+        )
+        for i in range(5):
+            repo.save(make_file(f"out/{i}.nc"))
+
+        assert repo.snapshot_path.exists()
+        assert not repo.compacting_path.exists()
+        assert len(repo.log_path.read_text().splitlines()) == 2
+
+        reopened = IndexedSimulationFileRepository(storage_dir=str(tmp_path))
+        assert len(reopened.list_all()) == 5
+
+    def test_background_compaction(self, tmp_path):
+        repo = IndexedSimulationFileRepository(storage_dir=str(tmp_path), compact_threshold=2)
+        for i in range(4):
+            repo.save(make_file(f"out/{i}.nc"))
+        repo.close()
+
+        reopened = IndexedSimulationFileRepository(storage_dir=str(tmp_path))
+        assert len(reopened.list_all()) == 4
+
+    def test_interrupted_compaction_is_replayed(self, tmp_path, repository):
+        repository.save(make_file("a.nc"))
+        # Simulate a crash between rotating the log and writing the snapshot
+        repository.log_path.replace(repository.compacting_path)
+
+        reopened = IndexedSimulationFileRepository(storage_dir=str(tmp_path))
+        assert reopened.exists("a.nc")
+
+    def test_picks_up_writes_from_other_instances(self, tmp_path, repository):
+        other = IndexedSimulationFileRepository(storage_dir=str(tmp_path))
+        other.save(make_file("from_other.nc"))
+
+        assert repository.exists("from_other.nc")
+
+    def test_imports_legacy_json_files(self, tmp_path):
+        legacy = {"a.nc": make_file("a.nc", simulation_id="legacy").to_dict()}
+        (tmp_path / "simulation-files-legacy.json").write_text(json.dumps(legacy))
+
+        repo = IndexedSimulationFileRepository(storage_dir=str(tmp_path))
+        assert [f.relative_path for f in repo.list_by_simulation("legacy")] == ["a.nc"]
+        assert repo.snapshot_path.exists()
+
+    def test_search(self, repository):
+        repository.save(make_file("out/a.nc"))
+        repository.save(make_file("out/a.log"))
+        repository.save(make_file("archive.tar", file_type=FileType.ARCHIVE))
+
+        assert [f.relative_path for f in repository.search("out/*.nc")] == ["out/a.nc"]
+        assert [f.relative_path for f in repository.search("*", FileType.ARCHIVE)] == ["archive.tar"]
+
+    def test_save_many_appends_once(self, repository):
+        files = [make_file(f"out/{i}.nc") for i in range(5)]
+
+        appended = []
+        original = repository._append_to_log
+        repository._append_to_log = lambda entries: (appended.append(len(entries)), original(entries))
+        repository.save_many(files)
+
+        assert appended == [5]
+        assert len(repository.list_all()) == 5
+
+    def test_failed_batch_is_discarded(self, repository):
+        repository.save(make_file("kept.nc"))
+
+        with pytest.raises(RuntimeError):
+            with repository.batch():
+                repository.save(make_file("dropped.nc"))
+                repository.delete("kept.nc")
+                raise RuntimeError("abort")
+
+        assert repository.exists("kept.nc")
+        assert not repository.exists("dropped.nc")
+        assert len(repository.log_path.read_text().splitlines()) == 1
+
+
+class TestSharedStorage:
+    """Test instances, each standing in for a process, sharing one storage directory."""
+
+    def test_compaction_keeps_entries_appended_by_others(self, tmp_path, repository):
+        other = IndexedSimulationFileRepository(storage_dir=str(tmp_path), background_compaction=False)
+        repository.save(make_file("ours.nc"))
+        other.save(make_file("theirs.nc"))
+
+        repository.compact()
+
+        reopened = IndexedSimulationFileRepository(storage_dir=str(tmp_path))
+        assert reopened.exists("ours.nc") and reopened.exists("theirs.nc")
+
+    def test_batch_append_does_not_skip_entries_of_others(self, tmp_path, repository):
+        other = IndexedSimulationFileRepository(storage_dir=str(tmp_path), background_compaction=False)
+        with repository.batch():
+            repository.save(make_file("a.nc", file_type=FileType.REGULAR))
+            other.save(make_file("theirs.nc"))
+            other.save(make_file("a.nc", file_type=FileType.ARCHIVE))
+
+        assert repository.exists("theirs.nc")
+        # The batch was appended last, so its version of a.nc wins everywhere
+        assert repository.get_by_path("a.nc").file_type == FileType.REGULAR
+        reopened = IndexedSimulationFileRepository(storage_dir=str(tmp_path))
+        assert reopened.get_by_path("a.nc").file_type == FileType.REGULAR
+
+    def test_load_waits_for_running_compaction(self, tmp_path, monkeypatch):
+        repo = IndexedSimulationFileRepository(storage_dir=str(tmp_path), compact_threshold=1000)
+        repo.save(make_file("a.nc"))
+        writing = threading.Event()
+        release = threading.Event()
+        write_snapshot = repo._write_snapshot
+
+        def slow_write_snapshot(records):
+            writing.set()
+            release.wait(5)
+            write_snapshot(records)
+
+        monkeypatch.setattr(repo, "_write_snapshot", slow_write_snapshot)
+        repo.compact(wait=False)
+        assert writing.wait(5)
+
+        loaded = []
+        loader = threading.Thread(
+            target=lambda: loaded.append(IndexedSimulationFileRepository(storage_dir=str(tmp_path)))
+        )
+        loader.start()
+        loader.join(0.2)
+        assert loader.is_alive()  # Blocked until the rotated log is folded in
+
+        release.set()
+        loader.join(5)
+        repo.close()
+        assert loaded[0].exists("a.nc")
@@ -0,0 +1,183 @@
+"""
+Tests for the JSON SimulationFile repository and its reverse index.
+"""
+
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from tellus.domain.entities.simulation_file import FileType, SimulationFile
+from tellus.infrastructure.repositories.json_simulation_file_repository import \
+    JsonSimulationFileRepository
+
+
+def make_file(path, simulation_id="sim1", **kwargs):
+    attributes = kwargs.pop("attributes", {})
+    attributes.setdefault("simulation_id", simulation_id)
+    return SimulationFile(relative_path=path, attributes=attributes, **kwargs)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return JsonSimulationFileRepository(storage_dir=str(tmp_path))
+
+
+@pytest.fixture
+def populated(repository):
+    archive = make_file("archive.tar.gz", simulation_id="sim1", file_type=FileType.ARCHIVE)
+    archive.add_contained_file("out/a.nc")
+    repository.save(archive)
+    repository.save(make_file("out/a.nc", simulation_id="sim1", parent_file_id="archive.tar.gz"))
+    repository.save(make_file("out/b.nc", simulation_id="sim2", parent_file_id="archive.tar.gz"))
+    repository.save(make_file("other.nc", simulation_id="sim3"))
+    return repository
+
+
+class TestReverseIndex:
+    """Test the persistent path and parent indexes."""
+
+    def test_index_is_persisted(self, populated, tmp_path):
+        index_dir = tmp_path / JsonSimulationFileRepository.INDEX_DIRNAME
+        shards = {path.stem: json.loads(path.read_text()) for path in index_dir.glob("*.json")}
+
+        assert sorted(shards) == ["sim1", "sim2", "sim3"]
+        assert shards["sim2"]["paths"] == ["out/b.nc"]
+        assert shards["sim1"]["children"] == {"archive.tar.gz": ["out/a.nc"]}
+        assert shards["sim2"]["children"] == {"archive.tar.gz": ["out/b.nc"]}
+
+    def test_save_rewrites_only_its_simulation_shard(self, populated, tmp_path):
+        index_dir = tmp_path / JsonSimulationFileRepository.INDEX_DIRNAME
+        before = {path.name: path.stat().st_mtime_ns for path in index_dir.glob("*.json")}
+
+        with patch.object(populated, "_write_shard", wraps=populated._write_shard) as write_shard:
+            populated.save(make_file("out/c.nc", simulation_id="sim2"))
+            populated.delete("other.nc")
+
+        assert [c.args[0] for c in write_shard.call_args_list] == ["sim2", "sim3"]
+        assert (index_dir / "sim1.json").stat().st_mtime_ns == before["sim1.json"]
+
+    def test_lookups_do_not_scan_all_simulations(self, populated, tmp_path):
+        fresh = JsonSimulationFileRepository(storage_dir=str(tmp_path))
+        fresh._ensure_index()
+
+        with patch.object(fresh, "_load_all_simulations", side_effect=AssertionError("full scan")):
+            assert fresh.get_by_path("out/b.nc").attributes["simulation_id"] == "sim2"
+            assert fresh.exists("other.nc")
+            assert not fresh.exists("missing.nc")
+            assert {f.relative_path for f in fresh.list_by_parent("archive.tar.gz")} == \
+                {"out/a.nc", "out/b.nc"}
+            assert {f.relative_path for f in fresh.get_children("archive.tar.gz")} == \
+                {"out/a.nc", "out/b.nc"}
+
+    def test_index_follows_updates_and_deletes(self, populated):
+        populated.save(make_file("out/b.nc", simulation_id="sim2"))
+        assert [f.relative_path for f in populated.list_by_parent("archive.tar.gz")] == ["out/a.nc"]
+
+        assert populated.delete("out/a.nc")
+        assert not populated.exists("out/a.nc")
+        assert populated.list_by_parent("archive.tar.gz") == []
+        assert populated.delete("out/a.nc") is False
+
+    def test_index_shared_between_instances(self, populated, tmp_path):
+        other = JsonSimulationFileRepository(storage_dir=str(tmp_path))
+        other.save(make_file("new.nc", simulation_id="sim4"))
+
+        assert populated.get_by_path("new.nc") is not None
+
+    def test_missing_index_is_rebuilt(self, populated, tmp_path):
+        shard = tmp_path / JsonSimulationFileRepository.INDEX_DIRNAME / "sim1.json"
+        shard.unlink()
+
+        fresh = JsonSimulationFileRepository(storage_dir=str(tmp_path))
+        assert fresh.get_by_path("out/a.nc") is not None
+        assert shard.exists()
+
+    def test_legacy_index_is_replaced(self, populated, tmp_path):
+        index_dir = tmp_path / JsonSimulationFileRepository.INDEX_DIRNAME
+        for shard in index_dir.iterdir():
+            shard.unlink()
+        legacy = tmp_path / JsonSimulationFileRepository.LEGACY_INDEX_FILENAME
+        legacy.write_text(json.dumps({"version": 1, "paths": {}, "children": {}, "sources": {}}))
+
+        fresh = JsonSimulationFileRepository(storage_dir=str(tmp_path))
+        assert fresh.get_by_path("out/b.nc") is not None
+        assert not legacy.exists()
+        assert sorted(path.stem for path in index_dir.glob("*.json")) == ["sim1", "sim2", "sim3"]
+
+    def test_deleted_data_file_is_unindexed(self, populated, tmp_path):
+        (tmp_path / "simulation-files-sim3.json").unlink()
+
+        fresh = JsonSimulationFileRepository(storage_dir=str(tmp_path))
+        assert not fresh.exists("other.nc")
+        assert not (tmp_path / JsonSimulationFileRepository.INDEX_DIRNAME / "sim3.json").exists()
+
+    def test_externally_written_data_triggers_rebuild(self, populated, tmp_path):
+        external = {"ext.nc": make_file("ext.nc", simulation_id="sim9").to_dict()}
+        (tmp_path / "simulation-files-sim9.json").write_text(json.dumps(external))
+
+        fresh = JsonSimulationFileRepository(storage_dir=str(tmp_path))
+        assert fresh.get_by_path("ext.nc") is not None
+
+    def test_stale_index_entry_is_repaired(self, populated, tmp_path):
+        # Remove the record behind the index's back
+        data_file = tmp_path / "simulation-files-sim3.json"
+        data_file.write_text(json.dumps({}))
+        future = time.time() + 10
+        os.utime(data_file, (future, future))
+
+        assert populated.get_by_path("other.nc") is None
+        assert "other.nc" not in populated._path_index
+
+
+class TestBatch:
+    """Test bulk saving and transactional batches."""
+
+    def test_save_many_writes_each_simulation_once(self, repository):
+        files = [make_file(f"out/{i}.nc", simulation_id=f"sim{i % 2}") for i in range(10)]
+
+        with patch.object(repository, "_save_simulation_data",
+                          wraps=repository._save_simulation_data) as save_data, \
+                patch.object(repository, "_write_shard", wraps=repository._write_shard) as write_shard, \
+                patch.object(repository, "_rebuild_index", wraps=repository._rebuild_index) as rebuild:
+            repository.save_many(files)
+
+        assert rebuild.call_count <= 1
+        assert save_data.call_count == 2
+        assert write_shard.call_count == 2
+        assert len(repository.list_by_simulation("sim0")) == 5
+        assert repository.get_by_path("out/9.nc") is not None
+
+    def test_batch_defers_writes_until_exit(self, repository, tmp_path):
+        with repository.batch():
+            repository.save(make_file("a.nc"))
+            repository.save(make_file("b.nc", parent_file_id="a.nc"))
+            assert not (tmp_path / "simulation-files-sim1.json").exists()
+            # Reads inside the batch see the pending changes
+            assert [f.relative_path for f in repository.list_by_parent("a.nc")] == ["b.nc"]
+
+        fresh = JsonSimulationFileRepository(storage_dir=str(tmp_path))
+        assert fresh.exists("a.nc")
+        assert [f.relative_path for f in fresh.list_by_parent("a.nc")] == ["b.nc"]
+
+    def test_failed_batch_is_discarded(self, repository):
+        repository.save(make_file("kept.nc"))
+
+        with pytest.raises(RuntimeError):
+            with repository.batch():
+                repository.save(make_file("dropped.nc"))
+                repository.delete("kept.nc")
+                raise RuntimeError("abort")
+
+        assert repository.exists("kept.nc")
+        assert not repository.exists("dropped.nc")
+
+    def test_nested_batches_flush_once(self, repository, tmp_path):
+        with repository.batch():
+            with repository.batch():
+                repository.save(make_file("a.nc"))
+            assert not (tmp_path / "simulation-files-sim1.json").exists()
+
+        assert (tmp_path / "simulation-files-sim1.json").exists()
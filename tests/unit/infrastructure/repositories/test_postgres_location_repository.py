@@ -365,110 +365,102 @@ class TestPostgresLocationRepositoryErrorHandling:
 class TestAsyncLocationRepositoryWrapper:
     """Test the async to sync wrapper functionality."""
 
-    def test_wrapper_creation(self):
+    def test_wrapper_creation(self, background_loop):
         """Test creating the wrapper."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         assert wrapper.async_repo is async_repo
 
-    @patch('asyncio.run')
-    def test_wrapper_save(self, mock_asyncio_run, sample_location_entity):
+    def test_wrapper_save(self, background_loop, sample_location_entity):
         """Test sync wrapper for save operation."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.save(sample_location_entity)
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_get_by_name(self, mock_asyncio_run):
+    def test_wrapper_get_by_name(self, background_loop):
         """Test sync wrapper for get_by_name operation."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.get_by_name("test_location")
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_list_all(self, mock_asyncio_run):
+    def test_wrapper_list_all(self, background_loop):
         """Test sync wrapper for list_all operation."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.list_all()
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_delete(self, mock_asyncio_run):
+    def test_wrapper_delete(self, background_loop):
         """Test sync wrapper for delete operation."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.delete("test_location")
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_exists(self, mock_asyncio_run):
+    def test_wrapper_exists(self, background_loop):
         """Test sync wrapper for exists operation."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.exists("test_location")
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_find_by_kind(self, mock_asyncio_run):
+    def test_wrapper_find_by_kind(self, background_loop):
         """Test sync wrapper for find_by_kind operation."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.find_by_kind(LocationKind.COMPUTE)
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_find_by_protocol(self, mock_asyncio_run):
+    def test_wrapper_find_by_protocol(self, background_loop):
         """Test sync wrapper for find_by_protocol operation."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.find_by_protocol("ssh")
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_count(self, mock_asyncio_run):
+    def test_wrapper_count(self, background_loop):
         """Test sync wrapper for count operation."""
         from tellus.infrastructure.repositories.postgres_location_repository import AsyncLocationRepositoryWrapper
 
         async_repo = PostgresLocationRepository()
-        wrapper = AsyncLocationRepositoryWrapper(async_repo)
+        wrapper = AsyncLocationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.count()
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
 
 @pytest.mark.asyncio
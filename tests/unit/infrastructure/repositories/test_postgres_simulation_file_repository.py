@@ -0,0 +1,198 @@
+"""
+Tests for the database-backed SimulationFile repository.
+
+Runs against a temporary SQLite database, which uses the same models and
+queries as PostgreSQL.
+"""
+
+import threading
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+
+from tellus.domain.entities.simulation_file import (FileContentType, FileType,
+                                                    SimulationFile)
+from tellus.domain.repositories.exceptions import RepositoryError
+from tellus.infrastructure.database.config import DatabaseConfig, DatabaseManager
+from tellus.infrastructure.repositories.json_simulation_file_repository import \
+    JsonSimulationFileRepository
+from tellus.infrastructure.repositories.postgres_simulation_file_repository import (
+    AsyncSimulationFileRepositoryWrapper, PostgresSimulationFileRepository)
+
+
+def make_file(path, simulation_id="sim1", **kwargs):
+    attributes = kwargs.pop("attributes", {})
+    attributes.setdefault("simulation_id", simulation_id)
+    return SimulationFile(relative_path=path, attributes=attributes, **kwargs)
+
+
+def paths(files):
+    return [f.relative_path for f in files]
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    manager = DatabaseManager(DatabaseConfig.for_sqlite(str(tmp_path / "tellus.db")))
+    with patch('tellus.infrastructure.database.config.get_database_manager', return_value=manager):
+        yield manager
+
+
+@pytest.fixture
+def repository(db_manager):
+    repo = AsyncSimulationFileRepositoryWrapper(PostgresSimulationFileRepository())
+    repo._run(db_manager.create_tables())
+    yield repo
+    repo._run(db_manager.close())
+
+
+def restart_files():
+    files = []
+    for year in range(1995, 2020):
+        for location in ("tape", "disk"):
+            files.append(make_file(
+                f"restart/{location}/fesom.{year}.nc",
+                content_type=FileContentType.RESTART,
+                simulation_date=datetime(year, 12, 31),
+                available_locations={location},
+            ))
+    files.append(make_file("outdata/fesom.2000.nc", simulation_date=datetime(2000, 1, 1),
+                           available_locations={"tape"}))
+    return files
+
+
+class TestPostgresSimulationFileRepository:
+    """Test the database-backed SimulationFile repository."""
+
+    def test_save_and_get_by_path(self, repository):
+        repository.save(make_file("out/a.nc", size=42, available_locations={"disk"}))
+
+        found = repository.get_by_path("out/a.nc")
+        assert found.size == 42
+        assert found.available_locations == {"disk"}
+        assert found.attributes["simulation_id"] == "sim1"
+        assert repository.exists("out/a.nc")
+        assert repository.get_by_path("missing.nc") is None
+
+    def test_save_requires_simulation_id(self, repository):
+        with pytest.raises(RepositoryError):
+            repository.save(SimulationFile(relative_path="orphan.nc"))
+
+    def test_save_replaces_existing_row(self, repository):
+        repository.save(make_file("a.nc", available_locations={"disk"}))
+        repository.save(make_file("a.nc", available_locations={"tape"}, size=1))
+
+        assert repository.list_by_location("disk") == []
+        assert paths(repository.list_by_location("tape")) == ["a.nc"]
+        assert repository.get_by_path("a.nc").size == 1
+
+    def test_delete(self, repository):
+        repository.save(make_file("a.nc", available_locations={"disk"}))
+
+        assert repository.delete("a.nc") is True
+        assert repository.delete("a.nc") is False
+        assert not repository.exists("a.nc")
+        assert repository.list_by_location("disk") == []
+
+    def test_hierarchy(self, repository):
+        archive = make_file("archive.tar.gz", file_type=FileType.ARCHIVE)
+        archive.add_contained_file("out/b.nc")
+        repository.save_many([
+            archive,
+            make_file("out/a.nc", parent_file_id="archive.tar.gz"),
+            make_file("out/b.nc", simulation_id="sim2"),
+        ])
+
+        assert paths(repository.list_by_parent("archive.tar.gz")) == ["out/a.nc"]
+        assert sorted(paths(repository.get_children("archive.tar.gz"))) == ["out/a.nc", "out/b.nc"]
+        assert repository.count_by_type()[FileType.ARCHIVE] == 1
+        assert paths(repository.list_archives()) == ["archive.tar.gz"]
+
+    def test_query_filters_and_paginates(self, repository):
+        repository.save_many(restart_files())
+
+        query = dict(content_type=FileContentType.RESTART, location_name="tape",
+                     start_year=2000, end_year=2014)
+        matching = repository.query(**query)
+        assert paths(matching) == [f"restart/tape/fesom.{year}.nc" for year in range(2000, 2015)]
+
+        page = repository.query(offset=10, limit=3, **query)
+        assert paths(page) == paths(matching[10:13])
+        assert repository.count_matching(**query) == len(matching) == 15
+
+    def test_query_matches_in_memory_implementation(self, repository, tmp_path):
+        reference = JsonSimulationFileRepository(storage_dir=str(tmp_path / "json"))
+        files = restart_files() + [make_file("OUT/Upper.nc", simulation_id="sim2")]
+        repository.save_many(files)
+        reference.save_many(files)
+
+        for filters in (
+            dict(pattern="restart/*/fesom.20?0.nc"),
+            dict(pattern="out*"),
+            dict(pattern="restart/[dt]*/fesom.199[5-7].nc", limit=4),
+            dict(simulation_id="sim2"),
+            dict(file_type=FileType.REGULAR, location_name="disk", offset=5, limit=5),
+            dict(start_year=2019),
+        ):
+            assert paths(repository.query(**filters)) == paths(reference.query(**filters)), filters
+
+        for filters in (
+            dict(pattern="restart/*/fesom.20?0.nc"),
+            dict(pattern="restart/[dt]*/fesom.199[5-7].nc"),
+            dict(file_type=FileType.REGULAR, location_name="disk"),
+            dict(simulation_id="sim1", start_year=2019),
+        ):
+            assert repository.count_matching(**filters) == reference.count_matching(**filters) > 0, filters
+
+    def test_year_query_uses_index(self, repository, db_manager):
+        repository.save_many(restart_files())
+
+        async def explain():
+            async with db_manager.engine.connect() as conn:
+                result = await conn.execute(text(
+                    "EXPLAIN QUERY PLAN SELECT data FROM simulation_files "
+                    "WHERE content_type = 'restart' AND simulation_date >= '2000-01-01'"
+                ))
+                return " ".join(str(row) for row in result)
+
+        assert "ix_simulation_files_content_type_date" in repository._run(explain())
+
+    def test_batch_commits_once(self, repository):
+        with repository.batch():
+            repository.save(make_file("a.nc"))
+            repository.save(make_file("b.nc", parent_file_id="a.nc"))
+            # Reads inside the batch see the pending changes
+            assert paths(repository.list_by_parent("a.nc")) == ["b.nc"]
+
+        assert paths(repository.list_all()) == ["a.nc", "b.nc"]
+
+    def test_failed_batch_is_rolled_back(self, repository):
+        repository.save(make_file("kept.nc"))
+
+        with pytest.raises(RuntimeError):
+            with repository.batch():
+                repository.save(make_file("dropped.nc"))
+                repository.delete("kept.nc")
+                raise RuntimeError("abort")
+
+        assert repository.exists("kept.nc")
+        assert not repository.exists("dropped.nc")
+
+    def test_batch_is_not_shared_with_other_threads(self, repository):
+        seen_by_other_thread = []
+
+        with pytest.raises(RuntimeError):
+            with repository.batch():
+                repository.save(make_file("pending.nc"))
+                other = threading.Thread(
+                    target=lambda: seen_by_other_thread.append(repository.exists("pending.nc"))
+                )
+                other.start()
+                other.join()
+                assert repository.exists("pending.nc")
+                raise RuntimeError("abort")
+
+        # The other thread did not join the open transaction
+        assert seen_by_other_thread == [False]
+        assert not repository.exists("pending.nc")
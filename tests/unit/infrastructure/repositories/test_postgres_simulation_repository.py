@@ -1,16 +1,28 @@
 """
 Tests for PostgreSQL simulation repository.
 
-Uses mocked database infrastructure for unit testing without real database connections.
+Uses mocked database infrastructure for unit testing without real database connections,
+except for the query count regression tests and the sync wrapper round trip, which run
+against a temporary SQLite database.
 """
 
+import asyncio
+
 import pytest
+import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
 
-from tellus.infrastructure.repositories.postgres_simulation_repository import PostgresSimulationRepository
+from tellus.infrastructure.database.config import DatabaseConfig, DatabaseManager
+from tellus.infrastructure.database.event_loop import get_background_loop
+
+from tellus.infrastructure.repositories.postgres_simulation_repository import (
+    AsyncSimulationRepositoryWrapper, PostgresSimulationRepository)
 from tellus.domain.entities.simulation import SimulationEntity
-from tellus.domain.repositories.exceptions import SimulationExistsError, RepositoryError
+from tellus.domain.repositories.exceptions import (
+    InvalidPaginationError, RepositoryError, SimulationExistsError)
+from tellus.domain.repositories.simulation_repository import ISimulationRepository, SimulationFilters
 
 
 @pytest.fixture
@@ -194,8 +206,9 @@ class TestPostgresSimulationRepository:
     ):
         """Test counting simulations."""
         # Mock 3 simulations exist
-        models = [sample_simulation_model] * 3
-        mock_session.execute.return_value = mock_query_result(models=models)
+        result_mock = MagicMock()
+        result_mock.scalar_one.return_value = 3
+        mock_session.execute.return_value = result_mock
 
         result = await repository.count()
 
@@ -206,7 +219,9 @@ class TestPostgresSimulationRepository:
     ):
         """Test counting when no simulations exist."""
         # Mock empty result
-        mock_session.execute.return_value = mock_query_result(models=[])
+        result_mock = MagicMock()
+        result_mock.scalar_one.return_value = 0
+        mock_session.execute.return_value = result_mock
 
         result = await repository.count()
 
@@ -298,83 +313,282 @@ class TestPostgresSimulationRepositoryErrorHandling:
 class TestAsyncSimulationRepositoryWrapper:
     """Test the async to sync wrapper functionality."""
 
-    def test_wrapper_creation(self):
+    def test_wrapper_creation(self, background_loop):
         """Test creating the wrapper."""
         from tellus.infrastructure.repositories.postgres_simulation_repository import AsyncSimulationRepositoryWrapper
 
         async_repo = PostgresSimulationRepository()
-        wrapper = AsyncSimulationRepositoryWrapper(async_repo)
+        wrapper = AsyncSimulationRepositoryWrapper(async_repo, loop=background_loop)
 
         assert wrapper.async_repo is async_repo
 
-    @patch('asyncio.run')
-    def test_wrapper_save(self, mock_asyncio_run, sample_simulation_entity):
+    def test_wrapper_save(self, background_loop, sample_simulation_entity):
         """Test sync wrapper for save operation."""
         from tellus.infrastructure.repositories.postgres_simulation_repository import AsyncSimulationRepositoryWrapper
 
         async_repo = PostgresSimulationRepository()
-        wrapper = AsyncSimulationRepositoryWrapper(async_repo)
+        wrapper = AsyncSimulationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.save(sample_simulation_entity)
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_get_by_id(self, mock_asyncio_run):
+    def test_wrapper_get_by_id(self, background_loop):
         """Test sync wrapper for get_by_id operation."""
         from tellus.infrastructure.repositories.postgres_simulation_repository import AsyncSimulationRepositoryWrapper
 
         async_repo = PostgresSimulationRepository()
-        wrapper = AsyncSimulationRepositoryWrapper(async_repo)
+        wrapper = AsyncSimulationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.get_by_id("test_sim")
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_list_all(self, mock_asyncio_run):
+    def test_wrapper_list_all(self, background_loop):
         """Test sync wrapper for list_all operation."""
         from tellus.infrastructure.repositories.postgres_simulation_repository import AsyncSimulationRepositoryWrapper
 
         async_repo = PostgresSimulationRepository()
-        wrapper = AsyncSimulationRepositoryWrapper(async_repo)
+        wrapper = AsyncSimulationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.list_all()
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_delete(self, mock_asyncio_run):
+    def test_wrapper_delete(self, background_loop):
         """Test sync wrapper for delete operation."""
         from tellus.infrastructure.repositories.postgres_simulation_repository import AsyncSimulationRepositoryWrapper
 
         async_repo = PostgresSimulationRepository()
-        wrapper = AsyncSimulationRepositoryWrapper(async_repo)
+        wrapper = AsyncSimulationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.delete("test_sim")
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_exists(self, mock_asyncio_run):
+    def test_wrapper_exists(self, background_loop):
         """Test sync wrapper for exists operation."""
         from tellus.infrastructure.repositories.postgres_simulation_repository import AsyncSimulationRepositoryWrapper
 
         async_repo = PostgresSimulationRepository()
-        wrapper = AsyncSimulationRepositoryWrapper(async_repo)
+        wrapper = AsyncSimulationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.exists("test_sim")
 
-        mock_asyncio_run.assert_called_once()
+        background_loop.run.assert_called_once()
 
-    @patch('asyncio.run')
-    def test_wrapper_count(self, mock_asyncio_run):
+    def test_wrapper_count(self, background_loop):
         """Test sync wrapper for count operation."""
         from tellus.infrastructure.repositories.postgres_simulation_repository import AsyncSimulationRepositoryWrapper
 
         async_repo = PostgresSimulationRepository()
-        wrapper = AsyncSimulationRepositoryWrapper(async_repo)
+        wrapper = AsyncSimulationRepositoryWrapper(async_repo, loop=background_loop)
 
         wrapper.count()
 
-        mock_asyncio_run.assert_called_once()
\ No newline at end of file
+        background_loop.run.assert_called_once()
+
+
+@pytest.fixture
+def sqlite_wrapper(tmp_path):
+    """Sync wrapper over a temporary SQLite database on the shared background loop."""
+    loop = get_background_loop()
+    manager = DatabaseManager(DatabaseConfig.for_sqlite(str(tmp_path / "tellus.db")))
+    loop.run(manager.create_tables())
+    with patch('tellus.infrastructure.database.config.get_database_manager', return_value=manager):
+        yield AsyncSimulationRepositoryWrapper(PostgresSimulationRepository())
+    loop.run(manager.close())
+
+
+class TestAsyncSimulationRepositoryWrapperOnSQLite:
+    """Test the sync wrapper against a real database."""
+
+    def test_round_trip(self, sqlite_wrapper, sample_simulation_entity):
+        sqlite_wrapper.save(sample_simulation_entity)
+
+        found = sqlite_wrapper.get_by_id(sample_simulation_entity.simulation_id)
+        assert found.model_id == sample_simulation_entity.model_id
+        assert sqlite_wrapper.count() == 1
+
+    def test_usable_from_a_running_event_loop(self, sqlite_wrapper, sample_simulation_entity):
+        sqlite_wrapper.save(sample_simulation_entity)
+
+        async def handler():
+            # asyncio.run() per call failed here with a running loop
+            return sqlite_wrapper.exists(sample_simulation_entity.simulation_id)
+
+        assert asyncio.run(handler())
+
+
+@pytest_asyncio.fixture
+async def sqlite_manager(tmp_path):
+    """Database manager for a temporary SQLite database with tables created."""
+    manager = DatabaseManager(DatabaseConfig.for_sqlite(str(tmp_path / "tellus.db")))
+    await manager.create_tables()
+    with patch('tellus.infrastructure.database.config.get_database_manager', return_value=manager):
+        yield manager
+    await manager.close()
+
+
+@pytest.fixture
+def statement_counter(sqlite_manager):
+    """Count the SQL statements executed on the SQLite engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = sqlite_manager.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.asyncio
+class TestPostgresSimulationRepositoryQueryCount:
+    """Regression tests for the number of statements issued per operation."""
+
+    async def _populate(self, count):
+        repository = PostgresSimulationRepository()
+        for i in range(count):
+            await repository.save(SimulationEntity(
+                simulation_id=f"sim_{i:03d}",
+                location_contexts={"cluster": {"path_prefix": f"/work/{i}"}},
+            ))
+        return repository
+
+    async def test_list_all_does_not_query_per_simulation(self, sqlite_manager, statement_counter):
+        """list_all issues a constant number of statements."""
+        repository = await self._populate(25)
+        statement_counter.clear()
+
+        simulations = await repository.list_all()
+
+        assert len(simulations) == 25
+        assert simulations[3].location_contexts == {"cluster": {"path_prefix": "/work/3"}}
+        assert len(statement_counter) == 2
+
+    async def test_count_uses_single_count_query(self, sqlite_manager, statement_counter):
+        """count issues one SELECT COUNT(*) instead of loading rows."""
+        repository = await self._populate(5)
+        statement_counter.clear()
+
+        assert await repository.count() == 5
+        assert len(statement_counter) == 1
+        assert "count(*)" in statement_counter[0].lower()
+
+
+class InMemorySimulationRepository(ISimulationRepository):
+    """Minimal repository relying on the interface's in-memory query fallback."""
+
+    def __init__(self, simulations):
+        self._simulations = {sim.simulation_id: sim for sim in simulations}
+
+    def save(self, simulation):
+        self._simulations[simulation.simulation_id] = simulation
+
+    def get_by_id(self, simulation_id):
+        return self._simulations.get(simulation_id)
+
+    def list_all(self):
+        return list(self._simulations.values())
+
+    def delete(self, simulation_id):
+        return self._simulations.pop(simulation_id, None) is not None
+
+    def exists(self, simulation_id):
+        return simulation_id in self._simulations
+
+    def count(self):
+        return len(self._simulations)
+
+
+def query_simulations():
+    simulations = []
+    for i in range(30):
+        simulations.append(SimulationEntity(
+            simulation_id=f"run_{i:02d}",
+            model_id=["FESOM2", "ICON", None][i % 3],
+            attrs={"experiment": "historical" if i % 2 else "piControl",
+                   "tags": ["cmip6"] if i % 5 == 0 else []},
+            associated_locations={"hpc"} if i % 4 == 0 else set(),
+            location_contexts={"hpc": {}} if i % 4 == 0 else {},
+        ))
+    return simulations
+
+
+@pytest.mark.asyncio
+class TestPostgresSimulationRepositoryQuery:
+    """Test filtering, ordering and pagination pushed down to SQL."""
+
+    async def _populate(self):
+        repository = PostgresSimulationRepository()
+        for simulation in query_simulations():
+            await repository.save(simulation)
+        return repository
+
+    async def _all_pages(self, repository, page_size, **kwargs):
+        ids, cursor = [], None
+        while True:
+            page = repository.query(limit=page_size, cursor=cursor, **kwargs)
+            if hasattr(page, "__await__"):
+                page = await page
+            ids.extend(sim.simulation_id for sim in page.simulations)
+            cursor = page.next_cursor
+            if cursor is None:
+                return ids
+
+    @pytest.mark.parametrize("filters", [
+        None,
+        SimulationFilters(search_term="icon"),
+        SimulationFilters(search_term="PICONTROL"),
+        SimulationFilters(search_term="experiment"),
+        SimulationFilters(attributes={"experiment": "historical"}),
+        SimulationFilters(location_names={"hpc"}),
+        SimulationFilters(tags={"cmip6"}, attributes={"experiment": "piControl"}),
+    ])
+    async def test_query_matches_in_memory_fallback(self, sqlite_manager, filters):
+        repository = await self._populate()
+        reference = InMemorySimulationRepository(query_simulations())
+
+        for order_by in ("simulation_id", "-model_id"):
+            expected = await self._all_pages(reference, 4, filters=filters, order_by=order_by)
+            assert await self._all_pages(repository, 4, filters=filters, order_by=order_by) == expected
+            assert await repository.count_matching(filters) == len(expected)
+
+    async def test_offset_pagination_and_contexts(self, sqlite_manager):
+        repository = await self._populate()
+
+        page = await repository.query(offset=4, limit=2)
+
+        assert [sim.simulation_id for sim in page.simulations] == ["run_04", "run_05"]
+        assert page.simulations[0].associated_locations == {"hpc"}
+        assert page.next_cursor is not None
+
+    async def test_deep_keyset_page_uses_constant_queries(self, sqlite_manager, statement_counter):
+        repository = await self._populate()
+        first = await repository.query(limit=25)
+        statement_counter.clear()
+
+        page = await repository.query(limit=25, cursor=first.next_cursor)
+
+        assert [sim.simulation_id for sim in page.simulations] == [f"run_{i}" for i in range(25, 30)]
+        assert page.next_cursor is None
+        assert len(statement_counter) == 2
+
+    async def test_search_matches_attribute_values_not_keys(self, sqlite_manager):
+        repository = await self._populate()
+
+        assert await repository.count_matching(SimulationFilters(search_term="experiment")) == 0
+        assert await repository.count_matching(SimulationFilters(search_term="cmip6")) == 6
+        assert await repository.count_matching(SimulationFilters(search_term="torical")) == 15
+
+    async def test_invalid_cursor_is_rejected(self, sqlite_manager):
+        repository = PostgresSimulationRepository()
+
+        with pytest.raises(InvalidPaginationError) as excinfo:
+            await repository.query(cursor="not-a-cursor")
+        assert excinfo.value.field == "cursor"
+        with pytest.raises(InvalidPaginationError) as excinfo:
+            await repository.query(order_by="uid")
+        assert excinfo.value.field == "order_by"